@@ -0,0 +1,4 @@
+"""
+Benchmarks module
+Performance checks that run the real bot code against a disposable local database
+"""
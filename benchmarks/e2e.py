@@ -0,0 +1,345 @@
+"""
+End-to-End Benchmark
+Drives the real dispatcher with Update payloads against a seeded tenant and reports per-route latency
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import re
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import asyncpg
+
+from core.bot.telegram_bot import TelegramBotCore
+from core.utils.lifecycle import LifecycleManager
+from telegram_bot import TelegramBot
+from .fake_bot_api import RecordingSession, BENCH_BOT_USER
+from .harness import bench_dsn, open_database, QueryRecorder
+from .seed import Volumes, Fixture, seed, is_seeded, load_fixture
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+# Warnings the router and feature handlers log for callback data they do not handle
+UNHANDLED_CALLBACK = re.compile(r'unknown callback|unhandled callback', re.IGNORECASE)
+PERCENTILES = (50, 90, 95, 99)
+
+# Screens a typical admin session walks through; {channel} comes from the fixture
+DEFAULT_SCENARIO = (
+    'message:/start', 'message:/help',
+    'callback:account_manager', 'callback:am_list_accounts',
+    'callback:channel_manager', 'callback:cm_list_channels', 'callback:cm_channel_{channel}',
+    'callback:views_manager', 'callback:vm_select_channels',
+    'callback:analytics', 'callback:an_channel_{channel}', 'callback:an_channel_growth',
+    'callback:an_growth_{channel}', 'callback:an_compare',
+    'callback:emoji_reaction', 'callback:er_stats',
+    'callback:poll_manager', 'callback:pm_stats',
+    'callback:live_manager',
+    'callback:refresh_main',
+)
+
+
+class ErrorCapture(logging.Handler):
+    """Keeps the first ERROR record, or unhandled-callback warning, logged while an update is handled"""
+    
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.first: Optional[str] = None
+    
+    def emit(self, record: logging.LogRecord):
+        if self.first is not None:
+            return
+        message = record.getMessage()
+        if record.levelno >= logging.ERROR or UNHANDLED_CALLBACK.search(message):
+            self.first = f"{record.name}: {message}"
+    
+    def reset(self) -> Optional[str]:
+        first, self.first = self.first, None
+        return first
+
+
+class BenchTelegramBot(TelegramBot):
+    """The real bot wired to a recording Bot API session and no Telethon clients"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = RecordingSession()
+    
+    async def _create_transport(self):
+        await super()._create_transport()
+        self.bot.session = self.session
+    
+    async def _start_bot_core(self):
+        # No stored sessions are loaded, so every get_client() misses like an offline account
+        self.bot_core = TelegramBotCore(self.config, self.db_manager)
+
+
+class UpdateFactory:
+    """Builds Bot API Update payloads the way Telegram sends them"""
+    
+    def __init__(self):
+        self._next_id = 1
+    
+    def _id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+    
+    @staticmethod
+    def _user(user_id: int) -> Dict[str, Any]:
+        return {'id': user_id, 'is_bot': False, 'first_name': f"User {user_id}", 'username': f"bench_user_{user_id}"}
+    
+    def message(self, user_id: int, text: str) -> Dict[str, Any]:
+        message: Dict[str, Any] = {
+            'message_id': self._id(),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            'text': text
+        }
+        if text.startswith('/'):
+            message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+        return {'update_id': self._id(), 'message': message}
+    
+    def callback(self, user_id: int, data: str) -> Dict[str, Any]:
+        return {
+            'update_id': self._id(),
+            'callback_query': {
+                'id': str(self._id()),
+                'from': self._user(user_id),
+                'chat_instance': 'bench',
+                'data': data,
+                'message': {
+                    'message_id': self._id(),
+                    'date': int(time.time()),
+                    'chat': {'id': user_id, 'type': 'private'},
+                    'from': BENCH_BOT_USER,
+                    'text': 'menu'
+                }
+            }
+        }
+    
+    def from_step(self, step: str, user_id: int, fixture: Fixture) -> Dict[str, Any]:
+        """Payload of one scenario step such as 'callback:cm_channel_{channel}'"""
+        kind, _, value = step.partition(':')
+        value = value.format(**asdict(fixture))
+        if kind == 'message':
+            return self.message(user_id, value)
+        if kind == 'callback':
+            return self.callback(user_id, value)
+        raise ValueError(f"Unknown scenario step: {step}")
+
+
+def route_of(payload: Dict[str, Any]) -> str:
+    """Route label of an update: the command or the callback data with ids masked"""
+    if 'callback_query' in payload:
+        return 'cb:' + re.sub(r'-?\d+', '<id>', payload['callback_query'].get('data') or '')
+    message = payload.get('message') or payload.get('edited_message') or {}
+    text = message.get('text') or ''
+    if text.startswith('/'):
+        return 'cmd:' + text.split()[0].split('@')[0]
+    return 'message'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def load_updates(path: Path) -> List[Dict[str, Any]]:
+    """Recorded Update payloads, one JSON object per line"""
+    with open(path, encoding='utf-8') as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def build_updates(fixture: Fixture, iterations: int, scenario: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """The scenario walked by the heavy and the typical owner, repeated"""
+    factory = UpdateFactory()
+    return [
+        factory.from_step(step, user_id, fixture)
+        for _ in range(iterations)
+        for user_id in (fixture.heavy_user, fixture.user)
+        for step in scenario
+    ]
+
+
+async def drive(bot: BenchTelegramBot, recorder: QueryRecorder, capture: ErrorCapture,
+                updates: List[Dict[str, Any]], trace_memory: bool) -> Dict[str, List[Dict[str, Any]]]:
+    """Feed updates one at a time and measure each; handlers log failures rather than raise them"""
+    samples: Dict[str, List[Dict[str, Any]]] = {}
+    for payload in updates:
+        route = route_of(payload)
+        bot.session.reset()
+        capture.reset()
+        if trace_memory:
+            tracemalloc.reset_peak()
+            baseline_memory = tracemalloc.get_traced_memory()[0]
+        error = None
+        started = time.perf_counter()
+        async with recorder.record(cold=False) as queries:
+            try:
+                await bot.dp.feed_raw_update(bot.bot, payload)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - started
+        calls = bot.session.reset()
+        samples.setdefault(route, []).append({
+            'latency': elapsed,
+            'queries': len(queries),
+            'api_calls': len(calls),
+            'alloc_peak': tracemalloc.get_traced_memory()[1] - baseline_memory if trace_memory else None,
+            'error': error or capture.reset()
+        })
+    return samples
+
+
+def summarize(samples: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Per-route percentiles and per-update database and API counts"""
+    routes = {}
+    for route, runs in sorted(samples.items()):
+        latencies = [run['latency'] * 1000 for run in runs]
+        warm = latencies[1:] or latencies
+        allocs = [run['alloc_peak'] for run in runs if run['alloc_peak'] is not None]
+        errors = [run['error'] for run in runs if run['error']]
+        routes[route] = {
+            'count': len(runs),
+            'errors': len(errors),
+            'first_error': errors[0] if errors else None,
+            # The first run starts from cold caches and is reported apart from the percentiles
+            'cold_ms': latencies[0],
+            **{f"p{pct}_ms": percentile(warm, pct) for pct in PERCENTILES},
+            'max_ms': max(warm),
+            'mean_ms': sum(warm) / len(warm),
+            'queries_per_update': sum(run['queries'] for run in runs) / len(runs),
+            'max_queries': max(run['queries'] for run in runs),
+            'api_calls_per_update': sum(run['api_calls'] for run in runs) / len(runs),
+            'alloc_peak_kb': max(allocs) / 1024 if allocs else None
+        }
+    return routes
+
+
+def git_revision() -> Optional[str]:
+    """Commit the benchmark ran against"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(dsn: str, volumes: Volumes, iterations: int, updates_path: Optional[Path] = None,
+                        reseed: bool = False, trace_memory: bool = False) -> Dict[str, Any]:
+    """Seed the tenant, start the bot against it, replay updates and summarize"""
+    async with open_database(dsn) as db:
+        conn = await asyncpg.connect(dsn)
+        try:
+            if reseed or not await is_seeded(conn, volumes):
+                logger.warning("🌱 Seeding benchmark tenant, this takes a few minutes")
+                await seed(conn, volumes)
+            fixture = await load_fixture(conn)
+        finally:
+            await conn.close()
+        
+        bot = BenchTelegramBot(db.config, db)
+        lifecycle = LifecycleManager()
+        lifecycle.register('database')
+        bot.register_components(lifecycle, database='database')
+        started = time.perf_counter()
+        await lifecycle.start_all()
+        startup = time.perf_counter() - started
+        
+        updates = load_updates(updates_path) if updates_path else build_updates(fixture, iterations, DEFAULT_SCENARIO)
+        recorder = QueryRecorder(db)
+        capture = ErrorCapture()
+        logging.getLogger().addHandler(capture)
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            started = time.perf_counter()
+            samples = await drive(bot, recorder, capture, updates, trace_memory)
+            wall = time.perf_counter() - started
+        finally:
+            logging.getLogger().removeHandler(capture)
+            if trace_memory:
+                tracemalloc.stop()
+            await lifecycle.stop_all(db.config.SHUTDOWN_TIMEOUT)
+    
+    return {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'revision': git_revision(),
+        'volumes': asdict(volumes),
+        'updates': len(updates),
+        'startup_s': startup,
+        'wall_s': wall,
+        'updates_per_second': len(updates) / wall if wall else 0.0,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'routes': summarize(samples)
+    }
+
+
+def print_report(report: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+    """Route table, with the p95 change against an earlier report when given"""
+    print(f"{report['updates']} updates in {report['wall_s']:.1f}s "
+          f"({report['updates_per_second']:.1f}/s), peak RSS {report['peak_rss_kb'] / 1024:.0f} MB")
+    print(f"{'route':<36} {'n':>4} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'cold':>8} {'q/upd':>6} {'api':>4}  vs prev")
+    old_routes = (previous or {}).get('routes', {})
+    for route, stats in report['routes'].items():
+        change = ''
+        old = old_routes.get(route)
+        if old and old['p95_ms']:
+            change = f"{(stats['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100:+.0f}%"
+        print(f"{route:<36} {stats['count']:>4} {stats['errors']:>4} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['cold_ms']:>8.1f} {stats['queries_per_update']:>6.1f} "
+              f"{stats['api_calls_per_update']:>4.1f}  {change}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay Telegram updates through the real dispatcher against a seeded local Postgres"
+    )
+    parser.add_argument('--dsn', default='', help="benchmark database URL (default: $BENCH_DB_URL)")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply the default tenant volumes")
+    parser.add_argument('--reseed', action='store_true', help="truncate and seed even if data exists")
+    parser.add_argument('--iterations', type=int, default=20, help="times each user walks the scenario")
+    parser.add_argument('--updates', type=Path, help="replay recorded Update payloads (JSON lines) instead")
+    parser.add_argument('--trace-memory', action='store_true', help="track allocation peaks per update")
+    parser.add_argument('--output', type=Path, help="report path (default: benchmarks/results/e2e-<time>.json)")
+    parser.add_argument('--compare', type=Path, help="earlier report to compare p95 latencies against")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+    report = asyncio.run(run_benchmark(
+        bench_dsn(args.dsn), Volumes().scaled(args.scale), args.iterations,
+        args.updates, args.reseed, args.trace_memory
+    ))
+    
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            previous = json.load(handle)
+    print_report(report, previous)
+    
+    output = args.output or RESULTS_DIR / f"e2e-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Report written to {output}")
+    return 0 if not any(stats['errors'] for stats in report['routes'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
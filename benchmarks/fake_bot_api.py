@@ -0,0 +1,90 @@
+"""
+Fake Bot API Session
+Answers Bot API calls locally with plausible results and records every outgoing call
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional, Union, get_args
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.types import Chat, Document, Message, PhotoSize, User
+
+BENCH_BOT_USER = {'id': 123456789, 'is_bot': True, 'first_name': 'Bench Bot', 'username': 'bench_bot'}
+
+
+@dataclass
+class RecordedCall:
+    """One Bot API call a handler made"""
+    method: str
+    chat_id: Optional[Union[int, str]]
+    text_length: int
+    at: float
+
+
+def _returns(method: TelegramMethod, cls: type) -> bool:
+    """Whether a method's declared result is, or may be, the given type"""
+    returning = getattr(method, '__returning__', None)
+    return returning is cls or cls in get_args(returning)
+
+
+class RecordingSession(BaseSession):
+    """Bot API session that never touches the network"""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls: List[RecordedCall] = []
+        self._ids = itertools.count(1_000_000)
+    
+    async def close(self):
+        pass
+    
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None) -> Any:
+        text = getattr(method, 'text', None) or getattr(method, 'caption', None) or ''
+        chat_id = getattr(method, 'chat_id', None)
+        self.calls.append(RecordedCall(type(method).__name__, chat_id, len(text), time.perf_counter()))
+        return self._result(bot, method, chat_id, text)
+    
+    def _result(self, bot: Bot, method: TelegramMethod, chat_id: Any, text: str) -> Any:
+        """A result of the declared type, bound to the bot like a parsed API response"""
+        if _returns(method, Message):
+            message: Dict[str, Any] = {
+                'message_id': getattr(method, 'message_id', None) or next(self._ids),
+                'date': datetime.now(),
+                'chat': Chat(id=chat_id if isinstance(chat_id, int) else 0, type='private'),
+                'from_user': User(**BENCH_BOT_USER)
+            }
+            if getattr(method, 'photo', None) is not None:
+                file_id = f"bench-photo-{next(self._ids)}"
+                message['photo'] = [PhotoSize(file_id=file_id, file_unique_id=file_id, width=1000, height=600)]
+                message['caption'] = text or None
+            elif getattr(method, 'document', None) is not None:
+                file_id = f"bench-document-{next(self._ids)}"
+                message['document'] = Document(file_id=file_id, file_unique_id=file_id)
+                message['caption'] = text or None
+            else:
+                message['text'] = text or None
+            return Message(**message).as_(bot)
+        if _returns(method, User):
+            return User(**BENCH_BOT_USER).as_(bot)
+        if _returns(method, bool):
+            return True
+        returning = getattr(method, '__returning__', None)
+        if getattr(returning, '__origin__', None) is list:
+            return []
+        return True
+    
+    async def stream_content(self, url: str, headers: Optional[Dict[str, Any]] = None, timeout: int = 30,
+                             chunk_size: int = 65536, raise_for_status: bool = True) -> AsyncGenerator[bytes, None]:
+        """File downloads are not simulated; yields nothing"""
+        for chunk in ():
+            yield chunk
+    
+    def reset(self) -> List[RecordedCall]:
+        """Hand over the calls recorded so far and start a new list"""
+        calls, self.calls = self.calls, []
+        return calls
@@ -0,0 +1,169 @@
+"""
+Handler Micro-Benchmark
+Drives the real dispatcher against the in-memory database to time handler code without Postgres
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from core.utils.lifecycle import LifecycleManager
+from .e2e import (
+    RESULTS_DIR, DEFAULT_SCENARIO, BenchTelegramBot, ErrorCapture, build_updates, route_of, summarize, print_report, git_revision
+)
+from .memory_db import InMemoryDatabaseManager
+from .seed import Fixture
+
+HEAVY_USER = 1
+USER = 2
+# Tenant of the heavy owner; the typical owner gets one of each
+CHANNELS = 20
+ACCOUNTS = 10
+CAMPAIGNS_PER_CHANNEL = 5
+LOGS_PER_CAMPAIGN = 10
+MEMBER_SAMPLES = 30
+EMOJIS = ('👍', '🔥', '❤️', '🎉')
+
+
+async def seed_owner(db: InMemoryDatabaseManager, user_id: int, channels: int, accounts: int) -> Dict[str, int]:
+    """Channels with member history, accounts, campaigns with boost logs and reactions for one owner"""
+    await db.create_user(user_id, f"bench_user_{user_id}", f"User {user_id}")
+    for index in range(accounts):
+        await db.add_telegram_account(user_id, f"+1555{user_id:03d}{index:04d}", 100000 + index, f"hash{index}")
+    first: Dict[str, int] = {}
+    for index in range(channels):
+        telegram_channel = -1000000000000 - user_id * 10000 - index
+        channel = await db.add_channel(user_id, telegram_channel, f"bench_{user_id}_{index}", f"Channel {index}")
+        # Channels added through the bot carry their title in channel_title, which add_channel leaves empty
+        db.tables['telegram_channels'].update(
+            channel, channel_title=f"Channel {index}", channel_identifier=f"@bench_{user_id}_{index}"
+        )
+        for sample in range(MEMBER_SAMPLES):
+            await db.record_member_count(channel, 1000 + index * 10 + sample)
+        for number in range(CAMPAIGNS_PER_CHANNEL):
+            campaign = await db.create_view_boost_campaign(user_id, channel, number + 1, 500)
+            for _ in range(LOGS_PER_CAMPAIGN):
+                await db.log_view_boost(campaign, 1, 10, True)
+            await db.update_campaign_progress(campaign, 10 * LOGS_PER_CAMPAIGN, 'completed' if number else 'active')
+            first.setdefault('campaign', campaign)
+        for message_id, emoji in enumerate(EMOJIS, 1):
+            # Reactions are only written by the Telethon worker, which the benchmark does not run
+            db.tables['emoji_reactions'].insert(
+                user_id=user_id, channel_id=channel, message_id=message_id, emoji=emoji,
+                reaction_count=message_id, auto_react_enabled=index == 0
+            )
+        first.setdefault('channel', channel)
+        first.setdefault('telegram_channel', telegram_channel)
+    return first
+
+
+async def seed_fixture(db: InMemoryDatabaseManager) -> Fixture:
+    heavy = await seed_owner(db, HEAVY_USER, CHANNELS, ACCOUNTS)
+    await seed_owner(db, USER, 1, 1)
+    account = (await db.get_user_accounts(HEAVY_USER))[-1]['id']
+    return Fixture(
+        heavy_user=HEAVY_USER, user=USER, channel=heavy['channel'], telegram_channel=heavy['telegram_channel'],
+        account=account, campaign=heavy['campaign']
+    )
+
+
+async def drive(bot: BenchTelegramBot, capture: ErrorCapture,
+                updates: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Feed updates one at a time and measure each; handlers log failures rather than raise them"""
+    samples: Dict[str, List[Dict[str, Any]]] = {}
+    for payload in updates:
+        route = route_of(payload)
+        bot.session.reset()
+        capture.reset()
+        error = None
+        started = time.perf_counter()
+        try:
+            await bot.dp.feed_raw_update(bot.bot, payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - started
+        calls = bot.session.reset()
+        samples.setdefault(route, []).append({
+            'latency': elapsed,
+            # Nothing reaches a database, so there are no statements to count
+            'queries': 0,
+            'api_calls': len(calls),
+            'alloc_peak': None,
+            'error': error or capture.reset()
+        })
+    return samples
+
+
+async def run_benchmark(iterations: int) -> Dict[str, Any]:
+    """Seed the double, start the bot on it, walk the scenario and summarize"""
+    db = InMemoryDatabaseManager()
+    fixture = await seed_fixture(db)
+    
+    bot = BenchTelegramBot(db.config, db)
+    lifecycle = LifecycleManager()
+    lifecycle.register('database')
+    bot.register_components(lifecycle, database='database')
+    started = time.perf_counter()
+    await lifecycle.start_all()
+    startup = time.perf_counter() - started
+    
+    updates = build_updates(fixture, iterations, DEFAULT_SCENARIO)
+    capture = ErrorCapture()
+    logging.getLogger().addHandler(capture)
+    try:
+        started = time.perf_counter()
+        samples = await drive(bot, capture, updates)
+        wall = time.perf_counter() - started
+    finally:
+        logging.getLogger().removeHandler(capture)
+        await lifecycle.stop_all(db.config.SHUTDOWN_TIMEOUT)
+    
+    return {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'revision': git_revision(),
+        'backend': 'memory',
+        'updates': len(updates),
+        'startup_s': startup,
+        'wall_s': wall,
+        'updates_per_second': len(updates) / wall if wall else 0.0,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'routes': summarize(samples)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay Telegram updates through the real dispatcher against the in-memory database"
+    )
+    parser.add_argument('--iterations', type=int, default=50, help="times each user walks the scenario")
+    parser.add_argument('--output', type=Path, help="report path (default: benchmarks/results/handlers-<time>.json)")
+    parser.add_argument('--compare', type=Path, help="earlier report to compare p95 latencies against")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+    report = asyncio.run(run_benchmark(args.iterations))
+    
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            previous = json.load(handle)
+    print_report(report, previous)
+    
+    output = args.output or RESULTS_DIR / f"handlers-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Report written to {output}")
+    return 0 if not any(stats['errors'] for stats in report['routes'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
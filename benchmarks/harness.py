@@ -0,0 +1,158 @@
+"""
+Benchmark Harness
+Points the real database layer at a disposable local Postgres and records the SQL it sends
+"""
+
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+from urllib.parse import urlparse, unquote, parse_qs
+
+from core.config.config import Config
+from core.database.unified_database import DatabaseManager
+from core.database.pools import INTERACTIVE
+from core.utils.cache_manager import cache
+
+DEFAULT_DSN = 'postgresql://postgres@localhost:5432/arcx_bench'
+BENCH_BOT_TOKEN = '123456789:BENCHMARK-token-not-used-for-network'
+# The heavy owner and the typical owner of the seeded fixture (users 1 and 2) see the admin menus
+BENCH_ADMIN_IDS = (1, 2)
+# Seeding truncates every bot table, so only databases named as scratch databases are accepted
+SCRATCH_MARKERS = ('bench', 'test')
+
+
+def bench_dsn(dsn: str = '') -> str:
+    """Connection string of the benchmark database, refusing anything that looks like a real one"""
+    dsn = dsn or os.getenv('BENCH_DB_URL', DEFAULT_DSN)
+    name = urlparse(dsn).path.lstrip('/')
+    if not any(marker in name for marker in SCRATCH_MARKERS):
+        raise ValueError(f"Refusing to use database '{name}': benchmark database names must contain 'bench' or 'test'")
+    return dsn
+
+
+class BenchConfig(Config):
+    """Configuration for a local benchmark database; env and data.env are not loaded"""
+    
+    def __init__(self, dsn: str):
+        # The environment files point at the production database and are deliberately skipped
+        url = urlparse(dsn)
+        self._db = {
+            # libpq style ?host=/path selects a Unix socket directory
+            'host': parse_qs(url.query).get('host', [url.hostname or 'localhost'])[0],
+            'port': url.port or 5432,
+            'name': url.path.lstrip('/'),
+            'user': unquote(url.username or 'postgres'),
+            'password': unquote(url.password or '')
+        }
+    
+    @property
+    def DB_HOST(self) -> str:
+        return self._db['host']
+    
+    @property
+    def DB_PORT(self) -> int:
+        return self._db['port']
+    
+    @property
+    def DB_NAME(self) -> str:
+        return self._db['name']
+    
+    @property
+    def DB_USER(self) -> str:
+        return self._db['user']
+    
+    @property
+    def DB_PASSWORD(self) -> str:
+        return self._db['password']
+    
+    @property
+    def ANALYTICS_DB_URL(self) -> str:
+        return ''
+    
+    @property
+    def ARCHIVE_ENABLED(self) -> bool:
+        return False
+    
+    @property
+    def BOT_TOKEN(self) -> str:
+        return BENCH_BOT_TOKEN
+    
+    @property
+    def ADMIN_IDS(self) -> List[int]:
+        return list(BENCH_ADMIN_IDS)
+    
+    @property
+    def CALLBACK_DEBOUNCE_SECONDS(self) -> float:
+        # Benchmarks press the same button back to back on purpose
+        return 0.0
+    
+    @property
+    def EDIT_GROUP_INTERVAL(self) -> float:
+        # Edits go to a fake transport, so Telegram's pacing would only measure sleeps
+        return 0.0
+    
+    @property
+    def CHANNEL_STATS_ENABLED(self) -> bool:
+        # Sampling would call Telethon, which the benchmarks never connect
+        return False
+
+
+@asynccontextmanager
+async def open_database(dsn: str):
+    """Initialized DatabaseManager against the benchmark database"""
+    db = DatabaseManager(BenchConfig(dsn))
+    await db.initialize()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+@dataclass
+class RecordedQuery:
+    """One statement sent to the database"""
+    query: str
+    args: Tuple[Any, ...]
+    pool: str
+
+
+class QueryRecorder:
+    """Captures every statement sent through a manager's coordinator while recording"""
+    
+    def __init__(self, db: DatabaseManager):
+        self.queries: List[RecordedQuery] = []
+        self._recording = False
+        
+        coordinator = db.coordinator
+        get_connection = coordinator.get_connection
+        
+        @asynccontextmanager
+        async def recording_connection(pool: str = INTERACTIVE):
+            async with get_connection(pool) as conn:
+                if not self._recording:
+                    yield conn
+                else:
+                    def listener(record):
+                        self.queries.append(RecordedQuery(record.query, tuple(record.args or ()), pool))
+                    
+                    conn.add_query_logger(listener)
+                    try:
+                        yield conn
+                    finally:
+                        conn.remove_query_logger(listener)
+        
+        # Every component shares the coordinator, so one instance attribute covers them all
+        coordinator.get_connection = recording_connection
+    
+    @asynccontextmanager
+    async def record(self, cold: bool = True):
+        """Collect the statements of one operation, by default starting from a cold in-process cache"""
+        if cold:
+            cache.clear()
+        self.queries = []
+        self._recording = True
+        try:
+            yield self.queries
+        finally:
+            self._recording = False
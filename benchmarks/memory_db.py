@@ -0,0 +1,928 @@
+"""
+In-Memory Database Double
+Implements the typed DatabaseManager surface over indexed dicts so handlers can run without Postgres
+"""
+
+import copy
+import itertools
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterable, Iterator
+
+from core.config.config import Config
+from core.database.unified_database import DatabaseManager
+from core.database.error_tracker import ErrorAggregator
+from core.database.invalidation import InvalidationBus, ALL_KEYS
+from core.database.leadership import LeaderElection
+from core.database.series import BUCKETS, AGGREGATES, METRIC_SOURCES, metric_source, summarize_series
+from .harness import BenchConfig, DEFAULT_DSN
+
+logger = logging.getLogger(__name__)
+
+# Column default that is filled with the insert time
+NOW = object()
+
+
+def _now() -> datetime:
+    """Naive UTC timestamp, as NOW() stores it in the bot's TIMESTAMP columns"""
+    return datetime.utcnow()
+
+
+class Table:
+    """Rows keyed by primary key with hash indexes on selected columns"""
+    
+    def __init__(self, name: str, columns: Dict[str, Any], key: Any = 'id', serial: bool = True,
+                 unique: Iterable[str] = (), indexes: Iterable[str] = ()):
+        self.name = name
+        self.columns = columns
+        self.key = key
+        self.unique = tuple(unique)
+        self._serial = itertools.count(1) if serial else None
+        self._rows: Dict[Any, Dict[str, Any]] = {}
+        self._indexes: Dict[str, Dict[Any, set]] = {
+            column: defaultdict(set) for column in (*self.unique, *indexes)
+        }
+    
+    def _key_of(self, row: Dict[str, Any]) -> Any:
+        if isinstance(self.key, tuple):
+            return tuple(row[column] for column in self.key)
+        return row[self.key]
+    
+    def _index(self, row: Dict[str, Any], pk: Any):
+        for column, index in self._indexes.items():
+            index[row[column]].add(pk)
+    
+    def _unindex(self, row: Dict[str, Any], pk: Any):
+        for column, index in self._indexes.items():
+            keys = index.get(row[column])
+            if keys is not None:
+                keys.discard(pk)
+                if not keys:
+                    del index[row[column]]
+    
+    def _check_unique(self, row: Dict[str, Any], pk: Any = None):
+        for column in self.unique:
+            value = row[column]
+            if value is not None and self._indexes[column].get(value, set()) - {pk}:
+                raise ValueError(f"duplicate key value violates unique constraint on {self.name}.{column}")
+    
+    def insert(self, **values: Any) -> Dict[str, Any]:
+        """Insert a row with column defaults filled in; returns the stored row"""
+        now = _now()
+        row: Dict[str, Any] = {}
+        for column, default in self.columns.items():
+            if column in values:
+                row[column] = copy.deepcopy(values[column])
+            elif default is NOW:
+                row[column] = now
+            else:
+                row[column] = copy.deepcopy(default)
+        if self._serial is not None and row.get(self.key) is None:
+            row[self.key] = next(self._serial)
+        pk = self._key_of(row)
+        if pk in self._rows:
+            raise ValueError(f"duplicate key value violates primary key of {self.name}")
+        self._check_unique(row)
+        self._rows[pk] = row
+        self._index(row, pk)
+        return row
+    
+    def update(self, pk: Any, **changes: Any) -> Optional[Dict[str, Any]]:
+        """Apply changes to one row, keeping the indexes current; returns the row or None"""
+        row = self._rows.get(pk)
+        if row is None:
+            return None
+        updated = {**row, **{column: copy.deepcopy(value) for column, value in changes.items()}}
+        self._check_unique(updated, pk)
+        self._unindex(row, pk)
+        row.update(updated)
+        self._index(row, pk)
+        return row
+    
+    def get(self, pk: Any) -> Optional[Dict[str, Any]]:
+        return self._rows.get(pk)
+    
+    def lookup(self, column: str, value: Any) -> List[Dict[str, Any]]:
+        """Rows whose column equals a value, through the index when there is one"""
+        index = self._indexes.get(column)
+        if index is None:
+            return [row for row in self._rows.values() if row[column] == value]
+        return [self._rows[pk] for pk in index.get(value, ())]
+    
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._rows.values()))
+    
+    def delete_where(self, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        """Delete matching rows; returns how many were removed"""
+        doomed = [pk for pk, row in self._rows.items() if predicate(row)]
+        for pk in doomed:
+            self._unindex(self._rows.pop(pk), pk)
+        return len(doomed)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def _build_tables() -> Dict[str, Table]:
+    """Empty tables with the columns and defaults of the coordinator's schema"""
+    return {table.name: table for table in (
+        Table('users', {
+            'user_id': None, 'username': None, 'first_name': None, 'last_name': None,
+            'is_admin': False, 'is_active': True, 'first_seen': NOW, 'last_seen': NOW,
+            'settings': {}, 'created_at': NOW, 'updated_at': NOW
+        }, key='user_id', serial=False),
+        Table('telegram_accounts', {
+            'id': None, 'user_id': None, 'phone_number': None, 'username': None, 'api_id': None,
+            'api_hash': None, 'unique_id': None, 'session_data': None, 'is_active': True,
+            'is_verified': False, 'last_login': None, 'rate_limit_data': {}, 'settings': {},
+            'created_at': NOW, 'updated_at': NOW
+        }, unique=('phone_number', 'unique_id'), indexes=('user_id',)),
+        Table('telegram_channels', {
+            'id': None, 'user_id': None, 'channel_id': None, 'channel_identifier': None,
+            'channel_title': None, 'channel_type': None, 'username': None, 'title': None,
+            'description': None, 'unique_id': None, 'original_link': None, 'member_count': 0,
+            'is_active': True, 'settings': {}, 'created_at': NOW, 'updated_at': NOW
+        }, unique=('channel_id', 'unique_id'), indexes=('user_id',)),
+        Table('view_boost_campaigns', {
+            'id': None, 'user_id': None, 'channel_id': None, 'message_id': None, 'target_views': None,
+            'current_views': 0, 'status': 'pending', 'campaign_type': 'manual', 'start_time': None,
+            'end_time': None, 'settings': {}, 'created_at': NOW, 'updated_at': NOW
+        }, indexes=('user_id', 'channel_id')),
+        Table('view_boost_logs', {
+            'id': None, 'campaign_id': None, 'account_id': None, 'views_added': None,
+            'success': None, 'error_message': None, 'timestamp': NOW
+        }, indexes=('campaign_id', 'account_id')),
+        Table('analytics_data', {
+            'id': None, 'entity_type': None, 'entity_id': None, 'metric_name': None,
+            'metric_value': None, 'metadata': {}, 'timestamp': NOW
+        }, indexes=('entity_id',)),
+        Table('system_logs', {
+            'id': None, 'log_level': None, 'module': None, 'message': None, 'metadata': {}, 'timestamp': NOW
+        }),
+        Table('channel_member_points', {
+            'channel_id': None, 'sampled_at': NOW, 'member_count': None, 'delta': 0
+        }, key=('channel_id', 'sampled_at'), serial=False, indexes=('channel_id',)),
+        Table('channel_member_daily', {
+            'channel_id': None, 'day': None, 'member_count': None, 'growth': 0
+        }, key=('channel_id', 'day'), serial=False, indexes=('channel_id',)),
+        Table('boost_configs', {
+            'id': None, 'user_id': None, 'channel_id': None, 'is_enabled': True, 'boost_count': 50,
+            'cooldown_minutes': 30, 'timing_messages': [], 'created_at': NOW, 'updated_at': NOW
+        }, indexes=('user_id',)),
+        Table('emoji_reactions', {
+            'id': None, 'user_id': None, 'channel_id': None, 'message_id': None, 'emoji': None,
+            'reaction_count': 0, 'auto_react_enabled': False, 'settings': {}, 'created_at': NOW, 'updated_at': NOW
+        }, indexes=('user_id', 'channel_id')),
+    )}
+
+
+def _columns(spec: str) -> Tuple[str, ...]:
+    return tuple(column.strip() for column in spec.split(','))
+
+
+def _truncate(moment: datetime, unit: str) -> datetime:
+    """date_trunc of a naive timestamp"""
+    if unit == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if unit == 'day':
+        return day
+    if unit == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _shift(bucket: datetime, unit: str, steps: int) -> datetime:
+    """A truncated bucket moved by whole units"""
+    if unit == 'month':
+        months = bucket.year * 12 + bucket.month - 1 + steps
+        return bucket.replace(year=months // 12, month=months % 12 + 1)
+    size = {'hour': timedelta(hours=1), 'day': timedelta(days=1), 'week': timedelta(weeks=1)}[unit]
+    return bucket + size * steps
+
+
+def _aggregate(values: List[Any], aggregate: str) -> Any:
+    if aggregate == 'count':
+        return len(values)
+    if aggregate == 'sum':
+        return sum(values)
+    if aggregate == 'avg':
+        return sum(values) / len(values)
+    return max(values) if aggregate == 'max' else min(values)
+
+
+class LocalCoordinator:
+    """Coordinator stand-in without connection pools"""
+    
+    def __init__(self):
+        self.pool = None
+        self.pools: Dict[str, Any] = {}
+    
+    async def get_health_status(self) -> Dict[str, Any]:
+        return {'status': 'in_memory', 'pool': None, 'pools': {}}
+
+
+class LocalLeadership(LeaderElection):
+    """Election of a single process, which is always the leader while running"""
+    
+    async def start(self):
+        self._running = True
+        await self._set_leader(True)
+    
+    async def stop(self):
+        self._running = False
+        await self._set_leader(False)
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """Invalidation bus of a single process; events are applied locally and never sent"""
+    
+    def __init__(self, config: Config):
+        super().__init__(None, config)
+    
+    async def start(self):
+        self._running = True
+    
+    async def stop(self):
+        self._running = False
+    
+    def publish(self, entity: str, entity_key: Optional[Any] = None):
+        self._dispatch(entity, ALL_KEYS if entity_key is None else str(entity_key))
+        self.stats['published'] += 1
+
+
+class MemoryErrorAggregator(ErrorAggregator):
+    """Error aggregator whose hourly counters live in process memory"""
+    
+    def __init__(self, config: Config):
+        super().__init__(None, config)
+        self.fingerprints: Dict[str, Dict[str, Any]] = {}
+        self.counts: Dict[Tuple[datetime, str], int] = defaultdict(int)
+        self.requests: Dict[datetime, int] = defaultdict(int)
+    
+    async def _flush(self):
+        """Merge buffered fingerprints, hourly counts and request totals into the counters"""
+        pending = self._take_pending()
+        if self._request_source is not None:
+            total = self._request_source()
+            if total > self._requests_flushed:
+                self.requests[_truncate(_now(), 'hour')] += total - self._requests_flushed
+            self._requests_flushed = total
+    
+        for fingerprint, entry in pending.items():
+            stored = self.fingerprints.get(fingerprint)
+            if stored is None:
+                stored = self.fingerprints[fingerprint] = {
+                    'fingerprint': fingerprint, 'log_level': entry['log_level'], 'module': entry['module'],
+                    'message': entry['message'], 'stack': entry['stack'],
+                    'first_seen': entry['first_seen'], 'last_seen': entry['last_seen'], 'total_count': 0
+                }
+            stored['sample_message'] = entry['sample']
+            stored['last_seen'] = max(stored['last_seen'], entry['last_seen'])
+            stored['total_count'] += sum(entry['counts'].values())
+            for bucket, count in entry['counts'].items():
+                self.counts[(bucket, fingerprint)] += count
+        if pending:
+            self.stats['flushes'] += 1
+    
+    async def get_summary(self, hours: int = 24, top: int = 5) -> Dict[str, Any]:
+        """Per-fingerprint counts for the window and the one before it, with request totals"""
+        since = _now() - timedelta(hours=hours)
+        previous = since - timedelta(hours=hours)
+        windows: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        per_bucket: Dict[datetime, int] = defaultdict(int)
+        for (bucket, fingerprint), count in self.counts.items():
+            if bucket >= since:
+                windows[fingerprint][0] += count
+                per_bucket[bucket] += count
+            elif bucket >= previous:
+                windows[fingerprint][1] += count
+    
+        rows = sorted(
+            (
+                {**self.fingerprints[fingerprint], 'current_count': current, 'previous_count': earlier}
+                for fingerprint, (current, earlier) in windows.items()
+            ),
+            key=lambda row: (row['current_count'], row['last_seen']), reverse=True
+        )
+        current = [row for row in rows if row['current_count']]
+        errors = [row for row in current if row['log_level'] in ('ERROR', 'CRITICAL')]
+        total_errors = sum(row['current_count'] for row in errors)
+        requests = sum(count for bucket, count in self.requests.items() if bucket >= since)
+    
+        return {
+            'total_errors': total_errors,
+            'critical_errors': sum(row['current_count'] for row in errors if row['log_level'] == 'CRITICAL'),
+            'warnings': sum(row['current_count'] for row in current if row['log_level'] == 'WARNING'),
+            'requests': requests,
+            'error_rate': total_errors / requests * 100 if requests else 0.0,
+            'previous_errors': sum(
+                row['previous_count'] for row in rows if row['log_level'] in ('ERROR', 'CRITICAL')
+            ),
+            'previous_requests': sum(
+                count for bucket, count in self.requests.items() if previous <= bucket < since
+            ),
+            'peak_hour': max(per_bucket, key=per_bucket.get).hour if per_bucket else None,
+            'distinct_fingerprints': len(current),
+            'top': errors[:top],
+            'recent': sorted(errors, key=lambda row: row['last_seen'], reverse=True)[:top]
+        }
+
+
+class InMemoryDatabaseManager:
+    """DatabaseManager double backed by process memory
+    
+    Typed operations return the same shapes as DatabaseManager, and the handlers the benchmarks
+    drive only use typed operations. Raw SQL raises NotImplementedError.
+    """
+    
+    # Handlers interpolate the column lists into SQL, so the strings stay as they are
+    ACCOUNT_COLUMNS = DatabaseManager.ACCOUNT_COLUMNS
+    USER_COLUMNS = DatabaseManager.USER_COLUMNS
+    ACCOUNT_FIELDS = _columns(ACCOUNT_COLUMNS)
+    USER_FIELDS = _columns(USER_COLUMNS)
+    
+    def __init__(self, config: Optional[Config] = None):
+        # Config() insists on the production database settings, which are never used here
+        self.config = config or BenchConfig(DEFAULT_DSN)
+        self.tables = _build_tables()
+        # Single-process versions of the real manager's components
+        self.coordinator = LocalCoordinator()
+        self.leadership = LocalLeadership(self.config)
+        self.invalidation = LocalInvalidationBus(self.config)
+        self.errors = MemoryErrorAggregator(self.config)
+        self.archive = None
+        self._initialized = False
+    
+    async def initialize(self):
+        """Start the components; the tables exist from construction"""
+        if self._initialized:
+            return
+        self._initialized = True
+        await self.invalidation.start()
+        await self.errors.start()
+        await self.leadership.start()
+        logger.info("✅ In-memory database manager initialized")
+    
+    async def close(self):
+        await self.leadership.stop()
+        await self.errors.stop()
+        await self.invalidation.stop()
+        self._initialized = False
+    
+    def reset(self):
+        """Drop every row and restart the id sequences"""
+        self.tables = _build_tables()
+    
+    def _unsupported(self, operation: str):
+        raise NotImplementedError(
+            f"{operation} runs raw SQL, which the in-memory database does not emulate; "
+            f"use a typed DatabaseManager method or a benchmark Postgres"
+        )
+    
+    async def execute_query(self, query: str, *args, **kwargs) -> Any:
+        self._unsupported('execute_query')
+    
+    async def fetch_one(self, query: str, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        self._unsupported('fetch_one')
+    
+    async def fetch_all(self, query: str, *args, **kwargs) -> List[Dict[str, Any]]:
+        self._unsupported('fetch_all')
+    
+    async def export_query(self, query: str, *args, **kwargs):
+        self._unsupported('export_query')
+    
+    def invalidate(self, entity: str, entity_key: Optional[Any] = None):
+        """Notify subscribers; nothing is cached in front of the tables themselves"""
+        self.invalidation.publish(entity, entity_key)
+    
+    @staticmethod
+    def _copy(row: Optional[Dict[str, Any]], columns: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Detached copy of a stored row, optionally narrowed to a column list"""
+        if row is None:
+            return None
+        if columns is not None:
+            row = {column: row[column] for column in columns}
+        return copy.deepcopy(row)
+    
+    @staticmethod
+    def _newest_first(rows: Iterable[Dict[str, Any]], column: str, tiebreak: str = 'id') -> List[Dict[str, Any]]:
+        return sorted(rows, key=lambda row: (row[column], row.get(tiebreak) or 0), reverse=True)
+    
+    # User Management Operations
+    async def create_user(self, user_id: int, username: Optional[str] = None, first_name: Optional[str] = None,
+                         last_name: Optional[str] = None, is_admin: bool = False) -> bool:
+        """Create or update user"""
+        users = self.tables['users']
+        now = _now()
+        if users.get(user_id) is None:
+            users.insert(user_id=user_id, username=username, first_name=first_name, last_name=last_name,
+                         is_admin=is_admin, first_seen=now, last_seen=now)
+        else:
+            users.update(user_id, username=username, first_name=first_name, last_name=last_name,
+                         last_seen=now, updated_at=now)
+        return True
+    
+    async def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        return self._copy(self.tables['users'].get(user_id), self.USER_FIELDS)
+    
+    async def get_all_users(self, active_only: bool = True) -> List[Dict[str, Any]]:
+        columns = [column for column in self.USER_FIELDS if column not in ('settings', 'updated_at')]
+        rows = [row for row in self.tables['users'].scan() if row['is_active'] or not active_only]
+        return [self._copy(row, columns) for row in self._newest_first(rows, 'created_at', 'user_id')]
+    
+    async def update_user_settings(self, user_id: int, settings: Dict[str, Any]) -> bool:
+        self.tables['users'].update(user_id, settings=settings, updated_at=_now())
+        return True
+    
+    async def get_user_status_summary(self) -> Dict[str, Any]:
+        day_ago = _now() - timedelta(hours=24)
+        users = list(self.tables['users'].scan())
+        return {
+            'total_users': len(users),
+            'active_users': sum(1 for row in users if row['is_active']),
+            'admin_users': sum(1 for row in users if row['is_admin']),
+            'new_users_24h': sum(1 for row in users if row['created_at'] >= day_ago),
+            'seen_users_24h': sum(1 for row in users if row['last_seen'] >= day_ago)
+        }
+    
+    # Telegram Account Management
+    async def add_telegram_account(self, user_id: int, phone_number: str,
+                                  api_id: int, api_hash: str, unique_id: Optional[str] = None) -> Optional[int]:
+        try:
+            row = self.tables['telegram_accounts'].insert(
+                user_id=user_id, phone_number=phone_number, api_id=api_id, api_hash=api_hash,
+                unique_id=unique_id if unique_id is not None else str(uuid.uuid4())[:8]
+            )
+            return row['id']
+        except ValueError as e:
+            logger.error(f"Failed to add Telegram account {phone_number}: {e}")
+            return None
+    
+    async def get_user_accounts(self, user_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
+        rows = [row for row in self.tables['telegram_accounts'].lookup('user_id', user_id)
+                if row['is_active'] or not active_only]
+        return [self._copy(row, self.ACCOUNT_FIELDS) for row in self._newest_first(rows, 'created_at')]
+    
+    async def get_account_by_id(self, account_id: int) -> Optional[Dict[str, Any]]:
+        return self._copy(self.tables['telegram_accounts'].get(account_id), self.ACCOUNT_FIELDS)
+    
+    async def get_verified_accounts(self, after_id: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = sorted(
+            (row for row in self.tables['telegram_accounts'].scan()
+             if row['is_verified'] and row['is_active'] and row['id'] > after_id),
+            key=lambda row: row['id']
+        )
+        return [self._copy(row, ('id', 'phone_number', 'api_id', 'api_hash')) for row in rows[:limit]]
+    
+    async def claim_orphaned_accounts(self, user_id: int) -> int:
+        accounts = self.tables['telegram_accounts']
+        orphaned = [row['id'] for row in accounts.scan() if row['user_id'] is None]
+        for account_id in orphaned:
+            accounts.update(account_id, user_id=user_id)
+        return len(orphaned)
+    
+    async def update_account_session(self, account_id: int, session_data: str) -> bool:
+        now = _now()
+        self.tables['telegram_accounts'].update(
+            account_id, session_data=session_data, is_verified=True, last_login=now, updated_at=now
+        )
+        return True
+    
+    async def deactivate_account(self, account_id: int) -> bool:
+        self.tables['telegram_accounts'].update(account_id, is_active=False, updated_at=_now())
+        return True
+    
+    async def get_account_status_summary(self, stale_days: int = 7) -> Dict[str, Any]:
+        now = _now()
+        day_ago = now - timedelta(hours=24)
+        stale = now - timedelta(days=stale_days)
+        accounts = list(self.tables['telegram_accounts'].scan())
+        
+        def health(row: Dict[str, Any]) -> int:
+            return (
+                100
+                - (0 if row['is_verified'] else 30)
+                - (0 if row['is_active'] else 50)
+                - (20 if row['last_login'] is None or row['last_login'] < stale else 0)
+            )
+        
+        scores = [(row, health(row)) for row in accounts]
+        return {
+            'total_accounts': len(accounts),
+            'active_accounts': sum(1 for row in accounts if row['is_active']),
+            'verified_accounts': sum(1 for row in accounts if row['is_verified']),
+            'inactive_accounts': sum(1 for row in accounts if not row['is_active']),
+            'auth_issues': sum(1 for row in accounts if row['is_active'] and not row['is_verified']),
+            'healthy_count': sum(1 for _, score in scores if score >= 80),
+            'warning_count': sum(1 for _, score in scores if 50 <= score < 80),
+            'critical_count': sum(1 for _, score in scores if score < 50),
+            'avg_health': float(sum(score for _, score in scores) / len(scores)) if scores else 0.0,
+            'users_with_issues': len({row['user_id'] for row, score in scores if score < 50}),
+            'new_accounts_24h': sum(1 for row in accounts if row['created_at'] >= day_ago),
+            'activated_24h': sum(
+                1 for row in accounts
+                if row['is_active'] and row['is_verified'] and row['last_login'] and row['last_login'] >= day_ago
+            ),
+            'deactivated_24h': sum(
+                1 for row in accounts if not row['is_active'] and row['updated_at'] >= day_ago
+            )
+        }
+    
+    # Channel Management
+    async def add_channel(self, user_id: int, channel_id: int, username: Optional[str] = None,
+                         title: Optional[str] = None, description: Optional[str] = None) -> Optional[int]:
+        channels = self.tables['telegram_channels']
+        existing = channels.lookup('channel_id', channel_id)
+        if existing:
+            # Like ON CONFLICT (channel_id), the owner of an existing channel is kept
+            row = channels.update(existing[0]['id'], username=username, title=title,
+                                  description=description, updated_at=_now())
+        else:
+            row = channels.insert(user_id=user_id, channel_id=channel_id, username=username,
+                                  title=title, description=description)
+        return row['id']
+    
+    async def get_user_channels(self, user_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
+        rows = [row for row in self.tables['telegram_channels'].lookup('user_id', user_id)
+                if row['is_active'] or not active_only]
+        return [self._copy(row) for row in self._newest_first(rows, 'created_at')]
+    
+    async def get_channel_by_id(self, channel_db_id: int) -> Optional[Dict[str, Any]]:
+        return self._copy(self.tables['telegram_channels'].get(channel_db_id))
+    
+    async def get_channel_by_channel_id(self, channel_id: int) -> Optional[Dict[str, Any]]:
+        rows = self.tables['telegram_channels'].lookup('channel_id', channel_id)
+        return self._copy(rows[0]) if rows else None
+    
+    async def get_monitored_channels(self) -> List[Dict[str, Any]]:
+        users = self.tables['users']
+        result = []
+        for row in self.tables['telegram_channels'].scan():
+            owner = users.get(row['user_id'])
+            if row['is_active'] and owner is not None and owner['is_active']:
+                # As with c.*, u.settings the owner's settings replace the channel's
+                result.append({**self._copy(row), 'settings': copy.deepcopy(owner['settings'])})
+        return result
+    
+    async def update_channel_info(self, channel_db_id: int, title: Optional[str] = None,
+                                 description: Optional[str] = None, member_count: Optional[int] = None) -> bool:
+        changes = {
+            column: value for column, value in
+            (('title', title), ('description', description), ('member_count', member_count))
+            if value is not None
+        }
+        if changes:
+            self.tables['telegram_channels'].update(channel_db_id, updated_at=_now(), **changes)
+        return True
+    
+    # View Boost Campaign Management
+    async def create_view_boost_campaign(self, user_id: int, channel_db_id: int,
+                                       message_id: int, target_views: int,
+                                       campaign_type: str = 'manual') -> Optional[int]:
+        if self.tables['telegram_channels'].get(channel_db_id) is None:
+            logger.error(f"Failed to create view boost campaign: channel {channel_db_id} does not exist")
+            return None
+        row = self.tables['view_boost_campaigns'].insert(
+            user_id=user_id, channel_id=channel_db_id, message_id=message_id,
+            target_views=target_views, campaign_type=campaign_type
+        )
+        return row['id']
+    
+    async def get_user_campaigns(self, user_id: int, status: Optional[str] = None,
+                                 campaign_type: Optional[str] = None,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        channels = self.tables['telegram_channels']
+        result = []
+        for row in self._newest_first(self.tables['view_boost_campaigns'].lookup('user_id', user_id), 'created_at'):
+            channel = channels.get(row['channel_id'])
+            if channel is None or (status is not None and row['status'] != status):
+                continue
+            if campaign_type is not None and row['campaign_type'] != campaign_type:
+                continue
+            campaign = self._copy(row)
+            campaign['channel_title'] = channel['title']
+            campaign['channel_username'] = channel['username']
+            result.append(campaign)
+        return result if limit is None else result[:limit]
+    
+    async def get_campaign_status_summary(self) -> Dict[str, Any]:
+        day_ago = _now() - timedelta(hours=24)
+        campaigns = list(self.tables['view_boost_campaigns'].scan())
+        return {
+            'total_campaigns': len(campaigns),
+            'active_campaigns': sum(1 for row in campaigns if row['status'] == 'active'),
+            'completed_campaigns': sum(1 for row in campaigns if row['status'] == 'completed'),
+            'new_campaigns_24h': sum(1 for row in campaigns if row['created_at'] >= day_ago)
+        }
+    
+    async def get_campaign_totals(self, user_id: int) -> List[Dict[str, Any]]:
+        now = _now()
+        windows = (('views_1d', timedelta(days=1)), ('views_7d', timedelta(days=7)), ('views_30d', timedelta(days=30)))
+        totals: Dict[str, Dict[str, Any]] = {}
+        for row in self.tables['view_boost_campaigns'].lookup('user_id', user_id):
+            status = totals.setdefault(row['status'], {
+                'status': row['status'], 'count': 0, 'target_views': 0, 'current_views': 0,
+                **{name: 0 for name, _ in windows}
+            })
+            status['count'] += 1
+            status['target_views'] += row['target_views'] or 0
+            status['current_views'] += row['current_views'] or 0
+            for name, span in windows:
+                if row['created_at'] >= now - span:
+                    status[name] += row['current_views'] or 0
+        return [totals[status] for status in sorted(totals)]
+    
+    async def update_campaign_progress(self, campaign_id: int, current_views: int,
+                                     status: Optional[str] = None) -> bool:
+        changes: Dict[str, Any] = {'current_views': current_views, 'updated_at': _now()}
+        if status is not None:
+            changes['status'] = status
+        self.tables['view_boost_campaigns'].update(campaign_id, **changes)
+        return True
+    
+    async def log_view_boost(self, campaign_id: int, account_id: int, views_added: int,
+                           success: bool, error_message: Optional[str] = None) -> bool:
+        self.tables['view_boost_logs'].insert(
+            campaign_id=campaign_id, account_id=account_id, views_added=views_added,
+            success=success, error_message=error_message
+        )
+        return True
+    
+    async def get_enabled_boost_configs(self, user_id: int) -> List[Dict[str, Any]]:
+        channels = self.tables['telegram_channels']
+        result = []
+        for row in self.tables['boost_configs'].lookup('user_id', user_id):
+            channel = channels.get(row['channel_id'])
+            if row['is_enabled'] and channel is not None:
+                config = self._copy(row)
+                config['channel_title'] = channel['channel_title']
+                config['channel_identifier'] = channel['channel_identifier']
+                result.append(config)
+        return result
+    
+    # Analytics Operations
+    async def store_analytics_data(self, entity_type: str, entity_id: int,
+                                  metric_name: str, metric_value: float,
+                                  metadata: Optional[Dict[str, Any]] = None) -> bool:
+        self.tables['analytics_data'].insert(
+            entity_type=entity_type, entity_id=entity_id, metric_name=metric_name,
+            metric_value=metric_value, metadata=metadata or {}
+        )
+        return True
+    
+    async def record_member_count(self, channel_db_id: int, member_count: int) -> Optional[int]:
+        points = self.tables['channel_member_points']
+        history = points.lookup('channel_id', channel_db_id)
+        last = max(history, key=lambda row: row['sampled_at']) if history else None
+        if last is not None and last['member_count'] == member_count:
+            return None
+        
+        now = _now()
+        delta = member_count - last['member_count'] if last is not None else 0
+        points.insert(channel_id=channel_db_id, sampled_at=now, member_count=member_count, delta=delta)
+        
+        daily = self.tables['channel_member_daily']
+        day = (channel_db_id, now.date())
+        current = daily.get(day)
+        if current is None:
+            daily.insert(channel_id=channel_db_id, day=now.date(), member_count=member_count, growth=delta)
+        else:
+            daily.update(day, member_count=member_count, growth=current['growth'] + delta)
+        return delta
+    
+    def _metric_events(self, entity_type: str, entity_id: int, metric: str) -> List[Tuple[datetime, Any]]:
+        """(time, value) of every raw event behind a metric, mirroring METRIC_SOURCES"""
+        logs = self.tables['view_boost_logs']
+        if (entity_type, metric) not in METRIC_SOURCES:
+            return [
+                (row['timestamp'], row['metric_value'])
+                for row in self.tables['analytics_data'].lookup('entity_id', entity_id)
+                if row['entity_type'] == entity_type and row['metric_name'] == metric
+            ]
+        if entity_type == 'channel':
+            campaigns = self.tables['view_boost_campaigns'].lookup('channel_id', entity_id)
+            if metric == 'campaigns':
+                return [(row['created_at'], 1) for row in campaigns]
+            if metric == 'member_growth':
+                return [
+                    (datetime.combine(row['day'], datetime.min.time()), row['growth'])
+                    for row in self.tables['channel_member_daily'].lookup('channel_id', entity_id)
+                ]
+            boosts = [log for campaign in campaigns for log in logs.lookup('campaign_id', campaign['id'])]
+        else:
+            boosts = logs.lookup('account_id', entity_id)
+        if metric == 'views_boosted':
+            return [(log['timestamp'], log['views_added']) for log in boosts if log['success']]
+        if metric == 'failed_boosts':
+            return [(log['timestamp'], 1) for log in boosts if not log['success']]
+        return [(log['timestamp'], 1) for log in boosts]
+    
+    async def get_metric_series(self, entity_type: str, entity_id: int, metric: str,
+                                bucket: str = 'day', buckets: int = 30,
+                                aggregate: Optional[str] = None) -> Dict[str, Any]:
+        """Gap-filled bucketed series of a metric plus its total, average and peak"""
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unsupported bucket: {bucket}")
+        aggregate = aggregate or metric_source(entity_type, metric).aggregate
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unsupported aggregate: {aggregate}")
+        
+        last_bucket = _truncate(_now(), bucket)
+        first_bucket = _shift(last_bucket, bucket, -(buckets - 1))
+        grouped: Dict[datetime, List[Any]] = defaultdict(list)
+        for moment, value in self._metric_events(entity_type, entity_id, metric):
+            if moment >= first_bucket:
+                grouped[_truncate(moment, bucket)].append(value)
+        data = {key: (_aggregate(values, aggregate), len(values)) for key, values in grouped.items()}
+        
+        empty = 0 if aggregate in ('sum', 'count') else None
+        series = [_shift(first_bucket, bucket, step) for step in range(buckets)]
+        values = [data[key][0] if key in data else empty for key in series]
+        present = [value for value in values if value is not None]
+        observed = [data[key][0] for key in series if key in data]
+        window = {
+            'total': sum(observed) if observed else None,
+            'average': sum(present) / len(present) if present else None,
+            'peak': max(observed) if observed else None,
+            'total_samples': sum(data[key][1] for key in series if key in data)
+        }
+        rows = [
+            {'bucket': key, 'value': value, 'samples': data[key][1] if key in data else 0, **window}
+            for key, value in zip(series, values)
+        ]
+        return summarize_series(rows)
+    
+    async def get_campaign_summary(self, channel_db_id: int) -> Dict[str, Any]:
+        campaigns = self.tables['view_boost_campaigns'].lookup('channel_id', channel_db_id)
+        return {
+            'total_campaigns': len(campaigns),
+            'active_campaigns': sum(1 for row in campaigns if row['status'] == 'active'),
+            'completed_campaigns': sum(1 for row in campaigns if row['status'] == 'completed'),
+            'total_views': sum(row['current_views'] for row in campaigns),
+            'total_target_views': sum(row['target_views'] for row in campaigns),
+            'best_campaign_views': max((row['current_views'] for row in campaigns), default=0),
+            'last_campaign_at': max((row['created_at'] for row in campaigns), default=None)
+        }
+    
+    def _boosted_views(self, campaigns: Iterable[Dict[str, Any]], since: datetime) -> Dict[Tuple[int, Any], int]:
+        """Views added by successful boosts since a time, keyed by (channel, day)"""
+        views: Dict[Tuple[int, Any], int] = defaultdict(int)
+        logs = self.tables['view_boost_logs']
+        for campaign in campaigns:
+            for log in logs.lookup('campaign_id', campaign['id']):
+                if log['success'] and log['timestamp'] >= since:
+                    views[(campaign['channel_id'], log['timestamp'].date())] += log['views_added']
+        return views
+    
+    def _member_growth(self, channel_db_ids: Iterable[int], after: Any) -> Dict[Tuple[int, Any], int]:
+        """Daily member growth after a day, keyed by (channel, day)"""
+        daily = self.tables['channel_member_daily']
+        return {
+            (row['channel_id'], row['day']): row['growth']
+            for channel_db_id in channel_db_ids
+            for row in daily.lookup('channel_id', channel_db_id)
+            if row['day'] > after
+        }
+    
+    async def get_growth_series(self, user_id: int, channel_db_id: Optional[int] = None,
+                                days: int = 30) -> List[Dict[str, Any]]:
+        today = _now().date()
+        first = today - timedelta(days=days - 1)
+        channels = [
+            row['id'] for row in self.tables['telegram_channels'].lookup('user_id', user_id)
+            if channel_db_id is None or row['id'] == channel_db_id
+        ]
+        campaigns = [
+            row for row in self.tables['view_boost_campaigns'].lookup('user_id', user_id)
+            if channel_db_id is None or row['channel_id'] == channel_db_id
+        ]
+        growth: Dict[Any, int] = defaultdict(int)
+        for (_, day), value in self._member_growth(channels, today - timedelta(days=days)).items():
+            growth[day] += value
+        views: Dict[Any, int] = defaultdict(int)
+        for (_, day), value in self._boosted_views(campaigns, datetime.combine(first, datetime.min.time())).items():
+            views[day] += value
+        return [
+            {'day': day, 'member_growth': growth.get(day, 0), 'views': views.get(day, 0)}
+            for day in (first + timedelta(days=offset) for offset in range(days))
+        ]
+    
+    async def get_channel_comparison(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        channels = [row for row in self.tables['telegram_channels'].lookup('user_id', user_id) if row['is_active']]
+        growth: Dict[int, int] = defaultdict(int)
+        for (channel_db_id, _), value in self._member_growth(
+                (row['id'] for row in channels), _now().date() - timedelta(days=30)).items():
+            growth[channel_db_id] += value
+        views: Dict[int, int] = defaultdict(int)
+        campaigns = self.tables['view_boost_campaigns'].lookup('user_id', user_id)
+        for (channel_db_id, _), value in self._boosted_views(campaigns, _now() - timedelta(days=30)).items():
+            views[channel_db_id] += value
+        rows = [
+            {'title': row['title'], 'members': row['member_count'] or 0,
+             'member_growth': growth.get(row['id'], 0), 'views': views.get(row['id'], 0)}
+            for row in channels
+        ]
+        rows.sort(key=lambda row: (row['views'], row['members']), reverse=True)
+        return rows[:limit]
+    
+    async def get_analytics_data(self, entity_type: str, entity_id: Optional[int] = None,
+                               metric_name: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        table = self.tables['analytics_data']
+        rows = table.lookup('entity_id', entity_id) if entity_id is not None else table.scan()
+        matching = [
+            row for row in rows
+            if row['entity_type'] == entity_type and (metric_name is None or row['metric_name'] == metric_name)
+        ]
+        return [self._copy(row) for row in self._newest_first(matching, 'timestamp')[:limit]]
+    
+    # Emoji Reaction Operations
+    async def get_reaction_stats(self, user_id: int, top: int = 5) -> Dict[str, Any]:
+        now = _now()
+        today = _truncate(now, 'day')
+        reactions = self.tables['emoji_reactions'].lookup('user_id', user_id)
+        
+        def total(since: Optional[datetime] = None) -> int:
+            return sum(row['reaction_count'] for row in reactions if since is None or row['updated_at'] >= since)
+        
+        stats: Dict[str, Any] = {
+            'total_reactions': total(),
+            'reactions_today': total(today),
+            'weekly_reactions': total(now - timedelta(days=7)),
+            'monthly_reactions': total(now - timedelta(days=30)),
+            'active_channels': len({row['channel_id'] for row in reactions if row['auto_react_enabled']}),
+            'top_emojis': [],
+            'top_channels': []
+        }
+        if not top:
+            return stats
+        
+        emojis: Dict[str, int] = defaultdict(int)
+        per_channel: Dict[int, int] = defaultdict(int)
+        for row in reactions:
+            emojis[row['emoji']] += row['reaction_count']
+            per_channel[row['channel_id']] += row['reaction_count']
+        stats['top_emojis'] = [
+            {'emoji': emoji, 'total': count}
+            for emoji, count in sorted(emojis.items(), key=lambda item: (-item[1], item[0]))[:top]
+        ]
+        channels = self.tables['telegram_channels']
+        stats['top_channels'] = [
+            {'title': channels.get(channel_db_id)['title'], 'reactions': count}
+            for channel_db_id, count in sorted(per_channel.items(), key=lambda item: (-item[1], item[0]))
+            if channels.get(channel_db_id) is not None
+        ][:top]
+        return stats
+    
+    async def get_auto_react_channels(self) -> List[Dict[str, Any]]:
+        channels = self.tables['telegram_channels']
+        seen = set()
+        result = []
+        for row in self.tables['emoji_reactions'].scan():
+            channel = channels.get(row['channel_id'])
+            key = (row['channel_id'], row['user_id'])
+            if row['auto_react_enabled'] and channel is not None and key not in seen:
+                seen.add(key)
+                result.append({'id': channel['id'], 'channel_id': row['channel_id'],
+                               'user_id': row['user_id'], 'title': channel['title']})
+        return result
+    
+    # System Operations
+    async def log_system_event(self, log_level: str, module: str, message: str,
+                             metadata: Optional[Dict[str, Any]] = None) -> bool:
+        self.tables['system_logs'].insert(log_level=log_level, module=module, message=message,
+                                          metadata=metadata or {})
+        return True
+    
+    async def get_system_logs(self, log_level: Optional[str] = None, module: Optional[str] = None,
+                            limit: int = 100) -> List[Dict[str, Any]]:
+        rows = [
+            row for row in self.tables['system_logs'].scan()
+            if (log_level is None or row['log_level'] == log_level) and (module is None or row['module'] == module)
+        ]
+        return [self._copy(row) for row in self._newest_first(rows, 'timestamp')[:limit]]
+    
+    async def get_recent_activity(self, hours: int = 1) -> Dict[str, int]:
+        since = _now() - timedelta(hours=hours)
+        return {
+            'campaigns': sum(1 for row in self.tables['view_boost_campaigns'].scan() if row['created_at'] >= since),
+            'errors': sum(
+                1 for row in self.tables['system_logs'].scan()
+                if row['log_level'] == 'ERROR' and row['timestamp'] >= since
+            )
+        }
+    
+    async def cleanup_old_logs(self, days: Optional[int] = None) -> int:
+        if days is None:
+            days = self.config.LOG_CLEANUP_DAYS
+        cutoff = _now() - timedelta(days=days)
+        return self.tables['system_logs'].delete_where(lambda row: row['timestamp'] < cutoff)
+    
+    async def get_health_status(self) -> Dict[str, Any]:
+        return {
+            'coordinator': {'status': 'in_memory'},
+            'tables': [{'tablename': name, 'rows': len(table)} for name, table in self.tables.items()],
+            'initialized': self._initialized
+        }
@@ -0,0 +1,317 @@
+"""
+Query Plan Regression Suite
+EXPLAINs the SQL that registered operations send to a seeded database and checks index use, cost and a baseline
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sys
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, Iterator
+
+import asyncpg
+
+from core.database.unified_database import DatabaseManager
+from core.database.universal_access import UniversalDatabaseAccess
+from core.database.pools import MAINTENANCE
+from .harness import bench_dsn, open_database, QueryRecorder, RecordedQuery
+from .seed import Volumes, Fixture, seed, is_seeded, load_fixture
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).parent / 'baselines' / 'query_plans.json'
+# Tables large enough in production that a sequential scan is a regression
+LARGE_TABLES = {
+    'analytics_data', 'system_logs', 'view_boost_logs', 'view_boost_campaigns', 'telegram_channels',
+    'telegram_accounts', 'channel_member_daily', 'channel_member_points', 'channel_stat_schedule'
+}
+# Estimated cost may grow this much over the baseline before it counts as a regression
+COST_TOLERANCE = 1.5
+EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+# Statements the bot sends that are not data access: health pings, advisory locks, catalogs, session settings
+IGNORED = re.compile(
+    r'^\s*SELECT\s+1\s*$|pg_try_advisory_lock|pg_advisory_unlock|\bpg_stat_|\bpg_catalog\.|\bset_config\(',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class PlanCase:
+    """One bot operation whose SQL is captured and explained"""
+    name: str
+    run: Callable[[DatabaseManager, Fixture], Awaitable[Any]]
+    # Every listed index must appear in at least one of the operation's plans
+    indexes: Tuple[str, ...] = ()
+    # Large tables this operation is expected to read in full, e.g. whole-table status counters
+    seq_scans: Tuple[str, ...] = ()
+    # Ceiling on the estimated total cost of any single statement
+    max_cost: float = 5000.0
+
+
+@dataclass
+class PlanSummary:
+    """What one statement's plan does"""
+    query: str
+    cost: float
+    seq_scans: List[str] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
+    nodes: List[str] = field(default_factory=list)
+    
+    @property
+    def key(self) -> str:
+        """Stable id of the statement text"""
+        normalized = ' '.join(self.query.split())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'query': ' '.join(self.query.split())[:300],
+            'cost': self.cost,
+            'seq_scans': self.seq_scans,
+            'indexes': self.indexes,
+            'nodes': self.nodes
+        }
+
+
+def _universal(db: DatabaseManager) -> UniversalDatabaseAccess:
+    return UniversalDatabaseAccess(db)
+
+
+async def _analytics_report(db: DatabaseManager, fixture: Fixture):
+    # Imported here: the analytics package pulls in the bot framework
+    from features.analytics.report_engine import ReportEngine
+    return await ReportEngine(db, db.config).build_report(fixture.heavy_user)
+
+
+CASES: List[PlanCase] = [
+    PlanCase('users.get', lambda db, f: db.get_user(f.heavy_user), indexes=('users_pkey',)),
+    PlanCase('accounts.by_user', lambda db, f: db.get_user_accounts(f.heavy_user),
+             indexes=('idx_accounts_user_created',)),
+    PlanCase('accounts.by_id', lambda db, f: db.get_account_by_id(f.account), indexes=('telegram_accounts_pkey',)),
+    PlanCase('channels.by_user', lambda db, f: db.get_user_channels(f.heavy_user),
+             indexes=('idx_channels_user_created',)),
+    PlanCase('channels.by_id', lambda db, f: db.get_channel_by_id(f.channel), indexes=('telegram_channels_pkey',)),
+    PlanCase('channels.by_telegram_id', lambda db, f: db.get_channel_by_channel_id(f.telegram_channel),
+             indexes=('telegram_channels_channel_id_key',)),
+    # The heavy owner's campaigns span hundreds of channels, so hashing the channel table beats index probes
+    PlanCase('campaigns.by_user', lambda db, f: db.get_user_campaigns(f.heavy_user),
+             indexes=('idx_campaigns_user_created',), seq_scans=('telegram_channels',)),
+    PlanCase('campaigns.summary', lambda db, f: db.get_campaign_summary(f.channel),
+             indexes=('idx_campaigns_channel_created',)),
+    PlanCase('analytics.points', lambda db, f: db.get_analytics_data('channel', f.channel, 'views', limit=100),
+             indexes=('idx_analytics_series',)),
+    PlanCase('series.channel_views', lambda db, f: db.get_metric_series('channel', f.channel, 'views_boosted'),
+             indexes=('idx_boost_logs_campaign',)),
+    PlanCase('series.account_boosts', lambda db, f: db.get_metric_series('account', f.account, 'boosts', 'day', 7),
+             indexes=('idx_boost_logs_account_timestamp',)),
+    PlanCase('series.member_growth', lambda db, f: db.get_metric_series('channel', f.channel, 'member_growth'),
+             indexes=('channel_member_daily_pkey',)),
+    PlanCase('series.generic', lambda db, f: db.get_metric_series('channel', f.channel, 'views', 'hour', 48),
+             indexes=('idx_analytics_series',)),
+    PlanCase('logs.recent', lambda db, f: db.get_system_logs(limit=100), indexes=('idx_logs_timestamp',)),
+    PlanCase('logs.by_level', lambda db, f: db.get_system_logs(log_level='ERROR', limit=100)),
+    PlanCase('status.users', lambda db, f: db.get_user_status_summary(), max_cost=1000.0),
+    PlanCase('status.accounts', lambda db, f: db.get_account_status_summary(),
+             seq_scans=('telegram_accounts',)),
+    PlanCase('status.campaigns', lambda db, f: db.get_campaign_status_summary(),
+             seq_scans=('view_boost_campaigns',)),
+    PlanCase('universal.channels_with_stats', lambda db, f: _universal(db).get_user_channels_with_stats(f.user),
+             indexes=('idx_channels_user_created', 'idx_analytics_series')),
+    PlanCase('universal.campaign_progress', lambda db, f: _universal(db).get_campaign_progress(f.campaign),
+             indexes=('idx_boost_logs_campaign',)),
+    # Whole-history aggregates for the heavy owner, rebuilt in the background rather than per request
+    PlanCase('analytics.report', _analytics_report, max_cost=50000.0,
+             seq_scans=('view_boost_campaigns', 'view_boost_logs', 'channel_member_daily')),
+]
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Every node of an EXPLAIN JSON plan tree"""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def summarize_plan(query: str, explained: Any) -> PlanSummary:
+    """Reduce EXPLAIN (FORMAT JSON) output to scans, indexes and cost"""
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    root = explained[0]['Plan']
+    summary = PlanSummary(query=query, cost=float(root['Total Cost']))
+    for node in plan_nodes(root):
+        summary.nodes.append(node['Node Type'])
+        if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') not in summary.seq_scans:
+            summary.seq_scans.append(node['Relation Name'])
+        if 'Index Name' in node and node['Index Name'] not in summary.indexes:
+            summary.indexes.append(node['Index Name'])
+    return summary
+
+
+async def explain(db: DatabaseManager, queries: List[RecordedQuery]) -> List[PlanSummary]:
+    """Plans of the distinct data statements among the captured ones"""
+    seen = set()
+    summaries = []
+    async with db.coordinator.get_connection(MAINTENANCE) as conn:
+        for recorded in queries:
+            if not EXPLAINABLE.match(recorded.query) or IGNORED.search(recorded.query):
+                continue
+            if recorded.query in seen:
+                continue
+            seen.add(recorded.query)
+            explained = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {recorded.query}", *recorded.args)
+            summaries.append(summarize_plan(recorded.query, explained))
+    return summaries
+
+
+def check_case(case: PlanCase, summaries: List[PlanSummary],
+               baseline: Optional[Dict[str, Any]]) -> List[str]:
+    """Failures of one case against its expectations and the recorded baseline"""
+    if not summaries:
+        return ["no SQL captured"]
+    
+    failures = []
+    used = {index for summary in summaries for index in summary.indexes}
+    for index in case.indexes:
+        if index not in used:
+            failures.append(f"expected index {index} is not used")
+    
+    for summary in summaries:
+        for table in summary.seq_scans:
+            if table in LARGE_TABLES and table not in case.seq_scans:
+                failures.append(f"Seq Scan on {table} [{summary.key}]")
+        if summary.cost > case.max_cost:
+            failures.append(f"cost {summary.cost:.0f} exceeds ceiling {case.max_cost:.0f} [{summary.key}]")
+    
+    if baseline:
+        recorded = {statement['key']: statement for statement in baseline.get('statements', [])}
+        for summary in summaries:
+            previous = recorded.get(summary.key)
+            if previous is None:
+                continue
+            if summary.cost > previous['cost'] * COST_TOLERANCE:
+                failures.append(
+                    f"cost {summary.cost:.0f} regressed from baseline {previous['cost']:.0f} [{summary.key}]"
+                )
+            for index in previous['indexes']:
+                if index not in summary.indexes:
+                    failures.append(f"index {index} no longer used [{summary.key}]")
+    return failures
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    """Recorded plans per case, empty when no baseline exists yet"""
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle).get('cases', {})
+
+
+def store_baseline(path: Path, results: Dict[str, Any], volumes: Volumes):
+    """Record the current plans of the cases that ran, keeping the baseline of the others"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cases = load_baseline(path)
+    cases.update({name: {'statements': result['statements']} for name, result in results.items()})
+    payload = {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'volumes': asdict(volumes),
+        'cases': cases
+    }
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+async def run_suite(dsn: str, volumes: Volumes, reseed: bool = False,
+                    cases: Optional[List[PlanCase]] = None,
+                    baseline_path: Optional[Path] = BASELINE_PATH) -> Dict[str, Any]:
+    """Seed if needed, capture and explain every case, and check the results
+
+    Without a baseline path only each case's own expectations are checked.
+    """
+    async with open_database(dsn) as db:
+        conn = await asyncpg.connect(dsn)
+        try:
+            if reseed or not await is_seeded(conn, volumes):
+                logger.warning("🌱 Seeding benchmark database, this takes a few minutes")
+                await seed(conn, volumes)
+            fixture = await load_fixture(conn)
+        finally:
+            await conn.close()
+        
+        baseline = load_baseline(baseline_path) if baseline_path else {}
+        recorder = QueryRecorder(db)
+        results: Dict[str, Any] = {}
+        for case in cases or CASES:
+            try:
+                async with recorder.record() as queries:
+                    await case.run(db, fixture)
+                summaries = await explain(db, queries)
+                failures = check_case(case, summaries, baseline.get(case.name))
+            except Exception as e:
+                summaries, failures = [], [f"{type(e).__name__}: {e}"]
+            results[case.name] = {
+                'passed': not failures,
+                'failures': failures,
+                'statements': [summary.to_dict() for summary in summaries]
+            }
+        return results
+
+
+def print_report(results: Dict[str, Any]):
+    """One line per case, failures indented below"""
+    for name, result in results.items():
+        costs = [statement['cost'] for statement in result['statements']]
+        indexes = sorted({index for statement in result['statements'] for index in statement['indexes']})
+        status = 'PASS' if result['passed'] else 'FAIL'
+        print(f"{status}  {name:<34} statements={len(costs):<3} max_cost={max(costs, default=0):>10.1f}  "
+              f"indexes={','.join(indexes) or '-'}")
+        for failure in result['failures']:
+            print(f"      - {failure}")
+    failed = sum(1 for result in results.values() if not result['passed'])
+    print(f"\n{len(results) - failed} passed, {failed} failed")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the query plans of the bot's SQL against a seeded local Postgres"
+    )
+    parser.add_argument('--dsn', default='', help="benchmark database URL (default: $BENCH_DB_URL)")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply the default seed volumes")
+    parser.add_argument('--reseed', action='store_true', help="truncate and seed even if data exists")
+    parser.add_argument('--case', action='append', default=[], help="only run cases with this name prefix")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="baseline file")
+    parser.add_argument('--update-baseline', action='store_true', help="record the current plans as the baseline")
+    parser.add_argument('--output', type=Path, help="write the full results as JSON")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+    volumes = Volumes().scaled(args.scale)
+    cases = [case for case in CASES if not args.case or case.name.startswith(tuple(args.case))]
+    
+    # A new baseline replaces the recorded plans, so only the cases' own expectations apply
+    baseline = None if args.update_baseline else args.baseline
+    results = asyncio.run(run_suite(bench_dsn(args.dsn), volumes, args.reseed, cases, baseline))
+    print_report(results)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, default=str)
+    failed = [name for name, result in results.items() if not result['passed']]
+    if args.update_baseline:
+        if failed:
+            print(f"Refusing to update the baseline while {len(failed)} cases fail: {', '.join(failed)}")
+            return 1
+        store_baseline(args.baseline, results, volumes)
+        print(f"Baseline written to {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Synthetic Data Generator
+Fills the bot tables with realistic, skewed volumes using server-side generate_series inserts
+"""
+
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Truncated together so foreign keys never block the reset
+SEEDED_TABLES = (
+    'users', 'telegram_accounts', 'telegram_channels', 'view_boost_campaigns', 'view_boost_logs',
+    'analytics_data', 'system_logs', 'channel_member_daily', 'channel_member_points',
+    'channel_stat_schedule', 'error_fingerprints', 'error_counts', 'request_counts', 'maintenance_runs'
+)
+
+
+@dataclass
+class Volumes:
+    """Row counts of one seeded dataset"""
+    users: int = 1000
+    accounts: int = 2000
+    channels: int = 10000
+    # Channels owned by user 1; real deployments have a few owners with hundreds of channels
+    heavy_user_channels: int = 500
+    campaigns: int = 50000
+    boost_logs: int = 200000
+    analytics_points: int = 1000000
+    system_logs: int = 100000
+    member_days: int = 30
+    
+    def scaled(self, factor: float) -> 'Volumes':
+        """Volumes multiplied by a factor; the member history length is kept"""
+        values = {name: max(1, int(value * factor)) for name, value in asdict(self).items()}
+        values['member_days'] = self.member_days
+        return Volumes(**values)
+
+
+@dataclass
+class Fixture:
+    """Ids of seeded rows that benchmark cases operate on"""
+    heavy_user: int
+    user: int
+    channel: int
+    telegram_channel: int
+    account: int
+    campaign: int
+
+
+def seed_statements(volumes: Volumes) -> List[Tuple[str, str, Tuple[Any, ...]]]:
+    """(table, insert, parameters) in dependency order; ids are 1..N after RESTART IDENTITY"""
+    return [
+        ('users', """
+            INSERT INTO users (user_id, username, first_name, is_active, first_seen, last_seen, created_at)
+            SELECT g, 'bench_user_' || g, 'User ' || g, g % 20 <> 0,
+                   NOW() - random() * interval '365 days', NOW() - random() * interval '30 days',
+                   NOW() - random() * interval '365 days'
+            FROM generate_series(1, $1::int) g
+        """, (volumes.users,)),
+        ('telegram_accounts', """
+            INSERT INTO telegram_accounts
+                (user_id, phone_number, username, api_id, api_hash, unique_id, is_active, is_verified,
+                 last_login, created_at)
+            SELECT 1 + g % $2::int, '+1555' || lpad(g::text, 7, '0'), 'bench_account_' || g, 100000 + g,
+                   md5(g::text), 'account_' || g, g % 10 <> 0, TRUE,
+                   NOW() - random() * interval '14 days', NOW() - random() * interval '365 days'
+            FROM generate_series(1, $1::int) g
+        """, (volumes.accounts, volumes.users)),
+        ('telegram_channels', """
+            INSERT INTO telegram_channels
+                (user_id, channel_id, username, title, unique_id, member_count, is_active, created_at)
+            SELECT CASE WHEN g <= $3::int THEN 1 ELSE 1 + g % $2::int END,
+                   -1000000000000 - g, 'bench_channel_' || g, 'Channel ' || g, 'channel_' || g,
+                   (random() * 100000)::int, g % 15 <> 0, NOW() - random() * interval '365 days'
+            FROM generate_series(1, $1::int) g
+        """, (volumes.channels, volumes.users, volumes.heavy_user_channels)),
+        ('view_boost_campaigns', """
+            INSERT INTO view_boost_campaigns
+                (user_id, channel_id, message_id, target_views, current_views, status, campaign_type,
+                 created_at, updated_at)
+            SELECT user_id, channel_id, g, 1000, (random() * 1000)::int,
+                   (ARRAY['scheduled', 'active', 'completed', 'completed', 'paused'])[1 + g % 5], 'manual',
+                   created, created + random() * interval '7 days'
+            FROM (
+                SELECT g, c.user_id, c.id AS channel_id, NOW() - random() * interval '180 days' AS created
+                FROM generate_series(1, $1::int) g
+                JOIN telegram_channels c ON c.id = 1 + g % $2::int
+            ) s
+        """, (volumes.campaigns, volumes.channels)),
+        ('view_boost_logs', """
+            INSERT INTO view_boost_logs (campaign_id, account_id, views_added, success, error_message, timestamp)
+            SELECT 1 + g % $2::int, 1 + g % $3::int, 1 + (random() * 50)::int, ok,
+                   CASE WHEN ok THEN NULL ELSE 'FloodWaitError' END, NOW() - random() * interval '90 days'
+            FROM (SELECT g, random() > 0.1 AS ok FROM generate_series(1, $1::int) g) s
+        """, (volumes.boost_logs, volumes.campaigns, volumes.accounts)),
+        ('analytics_data', """
+            INSERT INTO analytics_data (entity_type, entity_id, metric_name, metric_value, metadata, timestamp)
+            SELECT CASE WHEN g % 10 = 0 THEN 'account' ELSE 'channel' END,
+                   CASE WHEN g % 10 = 0 THEN 1 + g % $3::int ELSE 1 + g % $2::int END,
+                   (ARRAY['views', 'views_boosted', 'reactions', 'engagement', 'member_count'])[1 + (g / 7) % 5],
+                   round((random() * 1000)::numeric, 2), '{}'::jsonb, NOW() - random() * interval '180 days'
+            FROM generate_series(1, $1::int) g
+        """, (volumes.analytics_points, volumes.channels, volumes.accounts)),
+        ('system_logs', """
+            INSERT INTO system_logs (log_level, module, message, metadata, timestamp)
+            SELECT (ARRAY['INFO', 'INFO', 'INFO', 'INFO', 'WARNING', 'WARNING', 'ERROR', 'CRITICAL'])[1 + g % 8],
+                   (ARRAY['bot.core', 'database', 'view_manager', 'channel_management', 'analytics', 'live_stream'])
+                       [1 + (g / 8) % 6],
+                   'Benchmark event ' || g, '{}'::jsonb, NOW() - random() * interval '60 days'
+            FROM generate_series(1, $1::int) g
+        """, (volumes.system_logs,)),
+        ('channel_member_daily', """
+            INSERT INTO channel_member_daily (channel_id, day, member_count, growth)
+            SELECT c.id, CURRENT_DATE - i, GREATEST(0, c.member_count - i * 10), (random() * 40 - 10)::bigint
+            FROM telegram_channels c
+            CROSS JOIN generate_series(0, $1::int - 1) i
+        """, (volumes.member_days,)),
+        ('channel_stat_schedule', """
+            INSERT INTO channel_stat_schedule
+                (channel_id, last_value, last_sampled_at, interval_seconds, next_sample_at, unchanged_samples, failures)
+            SELECT id, member_count, NOW() - interval '1 hour', 3600,
+                   NOW() + (random() * 2 - 1) * interval '1 day', 0, 0
+            FROM telegram_channels
+            WHERE is_active
+        """, ()),
+    ]
+
+
+async def is_seeded(conn: asyncpg.Connection, volumes: Volumes) -> bool:
+    """Whether the database already holds a dataset of these volumes"""
+    counts = await conn.fetchrow(
+        """
+        SELECT (SELECT COUNT(*) FROM telegram_channels) AS channels,
+               (SELECT COUNT(*) FROM analytics_data) AS analytics_points
+        """
+    )
+    return counts['channels'] == volumes.channels and counts['analytics_points'] == volumes.analytics_points
+
+
+async def seed(conn: asyncpg.Connection, volumes: Volumes) -> Dict[str, float]:
+    """Replace the contents of the bot tables with a synthetic dataset; returns seconds per table"""
+    timings: Dict[str, float] = {}
+    await conn.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+    for table, statement, params in seed_statements(volumes):
+        started = time.perf_counter()
+        await conn.execute(statement, *params)
+        timings[table] = time.perf_counter() - started
+        logger.info(f"🌱 Seeded {table} in {timings[table]:.1f}s")
+    
+    # Plans are only meaningful with fresh statistics
+    started = time.perf_counter()
+    await conn.execute("ANALYZE")
+    timings['analyze'] = time.perf_counter() - started
+    return timings
+
+
+async def load_fixture(conn: asyncpg.Connection) -> Fixture:
+    """Pick representative ids from a seeded database"""
+    channel = await conn.fetchval(
+        """
+        SELECT channel_id FROM view_boost_campaigns
+        WHERE user_id = 1
+        GROUP BY channel_id
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+        """
+    )
+    return Fixture(
+        heavy_user=1,
+        user=await conn.fetchval("SELECT MIN(user_id) FROM telegram_channels WHERE user_id <> 1"),
+        channel=channel,
+        telegram_channel=await conn.fetchval("SELECT channel_id FROM telegram_channels WHERE id = $1", channel),
+        account=await conn.fetchval("SELECT id FROM telegram_accounts WHERE user_id = 1 ORDER BY id LIMIT 1"),
+        campaign=await conn.fetchval(
+            "SELECT id FROM view_boost_campaigns WHERE channel_id = $1 ORDER BY created_at DESC LIMIT 1", channel
+        )
+    )
+
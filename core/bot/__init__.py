@@ -3,5 +3,8 @@ Bot core module
 """
 
 from .telegram_bot import TelegramBotCore
+from .middleware import InFlightMiddleware, CallbackAdmissionMiddleware
+from .rendering import renderer, MessageRenderer, memoized_keyboard
 
-__all__ = ['TelegramBotCore']
+__all__ = ['TelegramBotCore', 'InFlightMiddleware', 'CallbackAdmissionMiddleware',
+           'renderer', 'MessageRenderer', 'memoized_keyboard']
@@ -0,0 +1,153 @@
+"""
+Dispatcher Middleware
+Update-level middleware shared by all feature handlers
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Callable, Awaitable, Sequence, Set, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, CallbackQuery
+
+logger = logging.getLogger(__name__)
+
+# Buttons whose screens run several aggregate queries
+HEAVY_CALLBACK_PREFIXES = ('an_', 'sh_')
+# Recently finished presses remembered for debouncing
+MAX_RECENT_CALLBACKS = 5000
+
+
+class InFlightMiddleware(BaseMiddleware):
+    """Counts updates being handled so shutdown can wait for them to finish"""
+    
+    def __init__(self):
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.handled = 0
+    
+    @property
+    def in_flight(self) -> int:
+        """Updates currently being handled"""
+        return self._in_flight
+    
+    async def __call__(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                       event: TelegramObject, data: Dict[str, Any]) -> Any:
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight -= 1
+            self.handled += 1
+            if self._in_flight == 0:
+                self._idle.set()
+    
+    async def drain(self, timeout: float) -> bool:
+        """Wait until no update is being handled; False if the timeout expired first"""
+        if self._in_flight:
+            logger.info(f"⏳ Draining {self._in_flight} in-flight updates...")
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ {self._in_flight} updates still running after {timeout:.0f}s drain")
+            return False
+
+
+class CallbackAdmissionMiddleware(BaseMiddleware):
+    """Drops duplicate and repeated button presses and caps concurrent heavy screens"""
+    
+    def __init__(self, debounce_seconds: float = 1.0, per_user_limit: int = 1,
+                 global_limit: int = 8, heavy_prefixes: Sequence[str] = HEAVY_CALLBACK_PREFIXES):
+        self.debounce_seconds = debounce_seconds
+        self.per_user_limit = max(1, per_user_limit)
+        self.heavy_prefixes = tuple(heavy_prefixes)
+        self._global = asyncio.Semaphore(max(1, global_limit))
+        self._in_flight: Set[Tuple[int, str]] = set()
+        self._recent: Dict[Tuple[int, str], float] = {}
+        self._heavy_per_user: Dict[int, int] = {}
+        self.stats = {
+            'admitted': 0,
+            'coalesced': 0,
+            'debounced': 0,
+            'rejected_user': 0,
+            'rejected_global': 0
+        }
+    
+    def _is_heavy(self, data: str) -> bool:
+        """Whether a button opens a screen that runs aggregate queries"""
+        return data.startswith(self.heavy_prefixes)
+    
+    async def _reject(self, callback: CallbackQuery, text: str, reason: str):
+        """Answer a press that will not be handled so the client stops its spinner"""
+        self.stats[reason] += 1
+        try:
+            await callback.answer(text or None)
+        except Exception as e:
+            logger.debug(f"Could not answer dropped callback: {e}")
+    
+    async def __call__(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                       event: TelegramObject, data: Dict[str, Any]) -> Any:
+        if not isinstance(event, CallbackQuery) or not event.data or event.from_user is None:
+            return await handler(event, data)
+        
+        user_id = event.from_user.id
+        key = (user_id, event.data)
+        now = time.monotonic()
+        
+        # The same press is already running: the first one will deliver the screen
+        if key in self._in_flight:
+            return await self._reject(event, "⏳ Still loading...", 'coalesced')
+        
+        finished = self._recent.get(key)
+        if finished is not None and now - finished < self.debounce_seconds:
+            return await self._reject(event, "", 'debounced')
+        
+        if not self._is_heavy(event.data):
+            return await self._run(handler, event, data, key)
+        
+        if self._heavy_per_user.get(user_id, 0) >= self.per_user_limit:
+            return await self._reject(event, "⏳ Still loading your previous request...", 'rejected_user')
+        if self._global.locked():
+            return await self._reject(event, "⏳ Bot is busy, please try again in a moment", 'rejected_global')
+        
+        self._heavy_per_user[user_id] = self._heavy_per_user.get(user_id, 0) + 1
+        try:
+            async with self._global:
+                return await self._run(handler, event, data, key)
+        finally:
+            remaining = self._heavy_per_user.get(user_id, 1) - 1
+            if remaining > 0:
+                self._heavy_per_user[user_id] = remaining
+            else:
+                self._heavy_per_user.pop(user_id, None)
+    
+    async def _run(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                   event: CallbackQuery, data: Dict[str, Any], key: Tuple[int, str]) -> Any:
+        """Handle an admitted press and remember when it finished"""
+        self.stats['admitted'] += 1
+        self._in_flight.add(key)
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight.discard(key)
+            self._remember(key)
+    
+    def _remember(self, key: Tuple[int, str]):
+        """Record a finished press, pruning entries that left the debounce window"""
+        now = time.monotonic()
+        self._recent[key] = now
+        if len(self._recent) > MAX_RECENT_CALLBACKS:
+            cutoff = now - self.debounce_seconds
+            self._recent = {k: t for k, t in self._recent.items() if t >= cutoff}
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Current load and drop counters"""
+        return {
+            'in_flight': len(self._in_flight),
+            'heavy_users': len(self._heavy_per_user),
+            **self.stats
+        }
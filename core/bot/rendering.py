@@ -0,0 +1,164 @@
+"""
+Message Rendering
+Skips edits that would not change a message, throttles edits in groups and memoizes static keyboards
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup, Message
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows 20 messages per minute in a group; private chats are only held back after a RetryAfter
+GROUP_CHAT_INTERVAL = 3.0
+# Rendered message hashes remembered for skipping no-op edits
+MAX_TRACKED_MESSAGES = 10000
+# Distinct argument combinations kept per memoized keyboard builder
+MAX_KEYBOARDS_PER_BUILDER = 512
+
+
+def memoized_keyboard(builder):
+    """Reuse the markup built for the same arguments; the builder must not depend on instance state"""
+    markups: Dict[Tuple, InlineKeyboardMarkup] = {}
+    
+    @functools.wraps(builder)
+    def wrapper(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            markup = markups.get(key)
+        except TypeError:
+            # Unhashable arguments such as row lists are built every time
+            return builder(self, *args, **kwargs)
+        if markup is None:
+            markup = builder(self, *args, **kwargs)
+            if len(markups) >= MAX_KEYBOARDS_PER_BUILDER:
+                markups.clear()
+            markups[key] = markup
+        return markup
+    
+    wrapper.cache_size = lambda: len(markups)
+    return wrapper
+
+
+class MessageRenderer:
+    """Edits bot messages only when their content changes, at a rate Telegram accepts"""
+    
+    def __init__(self, group_interval: float = GROUP_CHAT_INTERVAL):
+        self.group_interval = group_interval
+        self._hashes: OrderedDict = OrderedDict()
+        self._versions: Dict[Tuple[int, int], int] = {}
+        self._next_edit: Dict[int, float] = {}
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self.stats = {
+            'edits': 0,
+            'skipped_unchanged': 0,
+            'superseded': 0,
+            'not_modified': 0,
+            'throttled': 0
+        }
+    
+    @staticmethod
+    def _content_hash(text: str, reply_markup: Optional[InlineKeyboardMarkup], options: Dict[str, Any]) -> str:
+        """Fingerprint of everything an edit would send"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(text.encode('utf-8'))
+        if reply_markup is not None:
+            digest.update(reply_markup.model_dump_json(exclude_none=True).encode('utf-8'))
+        if options:
+            digest.update(repr(sorted(options.items())).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _remember(self, key: Tuple[int, int], content_hash: str):
+        """Store the hash of what a message now shows"""
+        self._hashes[key] = content_hash
+        self._hashes.move_to_end(key)
+        while len(self._hashes) > MAX_TRACKED_MESSAGES:
+            old_key, _ = self._hashes.popitem(last=False)
+            self._versions.pop(old_key, None)
+    
+    def forget(self, chat_id: int, message_id: int):
+        """Drop the remembered content of a message, e.g. after it was deleted"""
+        self._hashes.pop((chat_id, message_id), None)
+        self._versions.pop((chat_id, message_id), None)
+    
+    async def _wait_turn(self, chat_id: int):
+        """Space edits in groups and channels, and in any chat Telegram has rate limited"""
+        interval = self.group_interval if chat_id < 0 else 0.0
+        if not interval and chat_id not in self._next_edit:
+            return
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            wait = self._next_edit.get(chat_id, 0.0) - now
+            if wait > 0:
+                self.stats['throttled'] += 1
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            if interval:
+                self._next_edit[chat_id] = now + interval
+            else:
+                # The rate limit window has passed; private chats go back to unthrottled edits
+                self._next_edit.pop(chat_id, None)
+        
+        if len(self._next_edit) > MAX_TRACKED_MESSAGES:
+            now = time.monotonic()
+            for idle_chat in [c for c, t in self._next_edit.items() if t < now]:
+                self._next_edit.pop(idle_chat, None)
+                lock = self._chat_locks.get(idle_chat)
+                if lock is not None and not lock.locked():
+                    del self._chat_locks[idle_chat]
+    
+    async def edit(self, message: Message, text: str,
+                   reply_markup: Optional[InlineKeyboardMarkup] = None, **kwargs) -> bool:
+        """Edit a message's text; returns False when the edit was unnecessary or superseded"""
+        key = (message.chat.id, message.message_id)
+        content_hash = self._content_hash(text, reply_markup, kwargs)
+        if self._hashes.get(key) == content_hash:
+            self.stats['skipped_unchanged'] += 1
+            return False
+        
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        await self._wait_turn(message.chat.id)
+        if self._versions.get(key) != version:
+            # A newer render of the same message was requested while this one waited
+            self.stats['superseded'] += 1
+            return False
+        
+        try:
+            try:
+                await message.edit_text(text, reply_markup=reply_markup, **kwargs)
+            except TelegramRetryAfter as e:
+                logger.warning(f"⚠️ Edit rate limited in chat {message.chat.id}, retrying in {e.retry_after}s")
+                # Later edits in this chat wait out the same window, private chats included
+                self._next_edit[message.chat.id] = time.monotonic() + e.retry_after
+                await asyncio.sleep(e.retry_after)
+                await message.edit_text(text, reply_markup=reply_markup, **kwargs)
+        except TelegramBadRequest as e:
+            if "message is not modified" not in str(e):
+                raise
+            self.stats['not_modified'] += 1
+            self._remember(key, content_hash)
+            return False
+        
+        self.stats['edits'] += 1
+        self._remember(key, content_hash)
+        return True
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Edit counters for status screens"""
+        return {
+            'tracked_messages': len(self._hashes),
+            **self.stats
+        }
+
+
+# Global renderer instance
+renderer = MessageRenderer()
@@ -18,6 +18,9 @@ from core.database.unified_database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Accounts fetched per page while loading stored sessions at startup
+SESSION_PAGE_SIZE = 50
+
 
 class TelegramBotCore:
     """Core Telegram bot functionality for client management"""
@@ -26,7 +29,6 @@ class TelegramBotCore:
         self.config = config
         self.db = db_manager
         self.clients: Dict[int, TelegramClient] = {}
-        self.client_sessions: Dict[int, str] = {}
         self._rate_limiters: Dict[int, Dict[str, Any]] = {}
         
     async def initialize(self):
@@ -55,19 +57,22 @@ class TelegramBotCore:
             # First, check for orphaned session files and recover them
             await self._recover_orphaned_sessions()
             
-            # Get all verified accounts from database
-            accounts = await self.db.fetch_all(
-                "SELECT * FROM telegram_accounts WHERE is_verified = TRUE AND is_active = TRUE"
-            )
-            
+            # Page by id so no connection or transaction stays open while clients connect;
+            # clients read their session files, so the session_data blobs are not fetched
             loaded_count = 0
-            for account in accounts:
-                try:
-                    success = await self._create_client_session(account)
-                    if success:
-                        loaded_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to load session for account {account['id']}: {e}")
+            last_id = 0
+            while True:
+                accounts = await self.db.get_verified_accounts(last_id, SESSION_PAGE_SIZE)
+                for account in accounts:
+                    try:
+                        success = await self._create_client_session(account)
+                        if success:
+                            loaded_count += 1
+                    except Exception as e:
+                        logger.error(f"Failed to load session for account {account['id']}: {e}")
+                if len(accounts) < SESSION_PAGE_SIZE:
+                    break
+                last_id = accounts[-1]['id']
             
             logger.info(f"✅ Loaded {loaded_count} existing sessions")
             
@@ -98,9 +103,7 @@ class TelegramBotCore:
                     
                     # Check if this session is already in database (only for known account_id)
                     if account_id:
-                        existing = await self.db.fetch_one(
-                            "SELECT id FROM telegram_accounts WHERE id = $1", account_id
-                        )
+                        existing = await self.db.get_account_by_id(account_id)
                         if existing:
                             continue  # Already in database
                     
@@ -171,7 +174,6 @@ class TelegramBotCore:
             
             if await client.is_user_authorized():
                 self.clients[account_id] = client
-                self.client_sessions[account_id] = account['session_data']
                 
                 # Initialize rate limiter for this account
                 self._rate_limiters[account_id] = {
@@ -235,7 +237,6 @@ class TelegramBotCore:
                 await self.db.update_account_session(account_id, session_data)
                 
                 self.clients[account_id] = client
-                self.client_sessions[account_id] = session_data
                 
                 return {
                     'success': True,
@@ -291,7 +292,6 @@ class TelegramBotCore:
             
             # Store client
             self.clients[account_id] = client
-            self.client_sessions[account_id] = session_data
             
             # Initialize rate limiter
             self._rate_limiters[account_id] = {
@@ -411,9 +411,6 @@ class TelegramBotCore:
                 await client.disconnect()
                 del self.clients[account_id]
             
-            if account_id in self.client_sessions:
-                del self.client_sessions[account_id]
-            
             if account_id in self._rate_limiters:
                 del self._rate_limiters[account_id]
             
@@ -444,7 +441,6 @@ class TelegramBotCore:
             
             # Clear all data
             self.clients.clear()
-            self.client_sessions.clear()
             self._rate_limiters.clear()
             
             logger.info("✅ All Telegram clients shut down")
@@ -21,7 +21,7 @@ class Config:
         self._load_environment_files()
         self._override_replit_database()
         self._validate_configuration()
-        
+    
     def _load_environment_files(self):
         """Load environment files in priority order"""
         # Load env file first (bot configuration)
@@ -164,6 +164,57 @@ class Config:
         """Database connection timeout"""
         return int(os.getenv('DB_TIMEOUT', '30'))
     
+    # Connection Pool Classes
+    @property
+    def INTERACTIVE_STATEMENT_TIMEOUT(self) -> float:
+        """Statement timeout in seconds for menu and lookup queries"""
+        return float(os.getenv('INTERACTIVE_STATEMENT_TIMEOUT', str(self.DB_TIMEOUT)))
+    
+    @property
+    def INTERACTIVE_ACQUIRE_TIMEOUT(self) -> float:
+        """Seconds an interactive query waits for a free connection"""
+        return float(os.getenv('INTERACTIVE_ACQUIRE_TIMEOUT', '10'))
+    
+    @property
+    def ANALYTICS_POOL_SIZE(self) -> int:
+        """Minimum connections kept for analytics and dashboard aggregates"""
+        return int(os.getenv('ANALYTICS_POOL_SIZE', '1'))
+    
+    @property
+    def ANALYTICS_MAX_POOL_SIZE(self) -> int:
+        """Maximum connections analytics and dashboard aggregates may use"""
+        return int(os.getenv('ANALYTICS_MAX_POOL_SIZE', '5'))
+    
+    @property
+    def ANALYTICS_STATEMENT_TIMEOUT(self) -> float:
+        """Statement timeout in seconds for analytics aggregates and exports"""
+        return float(os.getenv('ANALYTICS_STATEMENT_TIMEOUT', '120'))
+    
+    @property
+    def ANALYTICS_ACQUIRE_TIMEOUT(self) -> float:
+        """Seconds an analytics query waits for a free connection"""
+        return float(os.getenv('ANALYTICS_ACQUIRE_TIMEOUT', '30'))
+    
+    @property
+    def ANALYTICS_DB_URL(self) -> str:
+        """Optional read-replica connection string for analytics reads"""
+        return os.getenv('ANALYTICS_DB_URL', '')
+    
+    @property
+    def MAINTENANCE_MAX_POOL_SIZE(self) -> int:
+        """Maximum connections retention and vacuum may use"""
+        return int(os.getenv('MAINTENANCE_MAX_POOL_SIZE', '2'))
+    
+    @property
+    def MAINTENANCE_STATEMENT_TIMEOUT(self) -> float:
+        """Statement timeout in seconds for retention batches and vacuum"""
+        return float(os.getenv('MAINTENANCE_STATEMENT_TIMEOUT', '600'))
+    
+    @property
+    def MAINTENANCE_ACQUIRE_TIMEOUT(self) -> float:
+        """Seconds a maintenance task waits for a free connection"""
+        return float(os.getenv('MAINTENANCE_ACQUIRE_TIMEOUT', '60'))
+    
     # Rate Limiting
     @property
     def CALLS_PER_MINUTE_PER_ACCOUNT(self) -> int:
@@ -175,6 +226,27 @@ class Config:
         """API calls per hour per account"""
         return int(os.getenv('CALLS_PER_HOUR_PER_ACCOUNT', '500'))
     
+    # Callback Admission Settings
+    @property
+    def CALLBACK_DEBOUNCE_SECONDS(self) -> float:
+        """Window in which a repeated identical button press is ignored"""
+        return float(os.getenv('CALLBACK_DEBOUNCE_SECONDS', '1.0'))
+    
+    @property
+    def EDIT_GROUP_INTERVAL(self) -> float:
+        """Minimum seconds between message edits in one group or channel"""
+        return float(os.getenv('EDIT_GROUP_INTERVAL', '3.0'))
+    
+    @property
+    def HEAVY_CALLBACKS_PER_USER(self) -> int:
+        """Concurrent analytics/health screens one user may be loading"""
+        return int(os.getenv('HEAVY_CALLBACKS_PER_USER', '1'))
+    
+    @property
+    def HEAVY_CALLBACKS_GLOBAL(self) -> int:
+        """Concurrent analytics/health screens across all users"""
+        return int(os.getenv('HEAVY_CALLBACKS_GLOBAL', '8'))
+    
     # Processing Settings
     @property
     def BATCH_SIZE(self) -> int:
@@ -201,6 +273,43 @@ class Config:
         """Maximum retry attempts for failed operations"""
         return int(os.getenv('MAX_RETRY_ATTEMPTS', '3'))
     
+    # Channel Statistics Collector
+    @property
+    def CHANNEL_STATS_ENABLED(self) -> bool:
+        """Sample member counts of active channels in the background"""
+        return os.getenv('CHANNEL_STATS_ENABLED', 'true').lower() == 'true'
+    
+    @property
+    def CHANNEL_STATS_TICK(self) -> int:
+        """Seconds between scans for channels due a sample"""
+        return int(os.getenv('CHANNEL_STATS_TICK', '60'))
+    
+    @property
+    def CHANNEL_STATS_MIN_INTERVAL(self) -> int:
+        """Shortest sampling interval of a channel whose count keeps changing (seconds)"""
+        return int(os.getenv('CHANNEL_STATS_MIN_INTERVAL', '900'))
+    
+    @property
+    def CHANNEL_STATS_MAX_INTERVAL(self) -> int:
+        """Longest sampling interval of a channel whose count is stable (seconds)"""
+        return int(os.getenv('CHANNEL_STATS_MAX_INTERVAL', '86400'))
+    
+    @property
+    def CHANNEL_STATS_BATCH_SIZE(self) -> int:
+        """Channels sampled per tick at most"""
+        return int(os.getenv('CHANNEL_STATS_BATCH_SIZE', '20'))
+    
+    @property
+    def CHANNEL_STATS_CALL_SPACING(self) -> float:
+        """Seconds between consecutive API calls within a tick"""
+        return float(os.getenv('CHANNEL_STATS_CALL_SPACING', '2'))
+    
+    # Chart Rendering
+    @property
+    def CHART_WORKERS(self) -> int:
+        """Worker processes rendering analytics charts"""
+        return int(os.getenv('CHART_WORKERS', '1'))
+    
     # Session Management
     @property
     def SESSION_DIR(self) -> str:
@@ -218,17 +327,145 @@ class Config:
         """Days to keep log files"""
         return int(os.getenv('LOG_CLEANUP_DAYS', '30'))
     
+    @property
+    def ANALYTICS_RETENTION_DAYS(self) -> int:
+        """Days to keep analytics data points"""
+        return int(os.getenv('ANALYTICS_RETENTION_DAYS', '90'))
+    
+    @property
+    def VIEW_BOOST_LOG_RETENTION_DAYS(self) -> int:
+        """Days to keep view boost logs"""
+        return int(os.getenv('VIEW_BOOST_LOG_RETENTION_DAYS', '30'))
+    
+    @property
+    def CAMPAIGN_RETENTION_DAYS(self) -> int:
+        """Days to keep completed campaigns"""
+        return int(os.getenv('CAMPAIGN_RETENTION_DAYS', '30'))
+    
+    @property
+    def MAINTENANCE_INTERVAL(self) -> int:
+        """Retention maintenance interval in seconds"""
+        return int(os.getenv('MAINTENANCE_INTERVAL', '3600'))
+    
+    @property
+    def MAINTENANCE_BATCH_SIZE(self) -> int:
+        """Rows deleted per retention batch"""
+        return int(os.getenv('MAINTENANCE_BATCH_SIZE', '1000'))
+    
+    @property
+    def MAINTENANCE_BATCH_DELAY(self) -> float:
+        """Pause between retention batches in seconds"""
+        return float(os.getenv('MAINTENANCE_BATCH_DELAY', '0.1'))
+    
+    @property
+    def ARCHIVE_ENABLED(self) -> bool:
+        """Move rows past retention to compressed archive files instead of deleting them"""
+        return os.getenv('ARCHIVE_ENABLED', 'true').lower() == 'true'
+    
+    @property
+    def ARCHIVE_DIR(self) -> str:
+        """Directory holding archived partitions and their manifest"""
+        return os.getenv('ARCHIVE_DIR', 'archive')
+    
+    @property
+    def ARCHIVE_RETENTION_DAYS(self) -> int:
+        """Days archived partitions are kept before they are deleted; 0 keeps them forever"""
+        return int(os.getenv('ARCHIVE_RETENTION_DAYS', '365'))
+    
+    # Lifecycle Settings
+    @property
+    def SHUTDOWN_TIMEOUT(self) -> float:
+        """Seconds allowed for the whole ordered shutdown"""
+        return float(os.getenv('SHUTDOWN_TIMEOUT', '30'))
+    
+    @property
+    def UPDATE_DRAIN_TIMEOUT(self) -> float:
+        """Seconds to wait for in-flight updates after polling stops"""
+        return float(os.getenv('UPDATE_DRAIN_TIMEOUT', '10'))
+    
+    # Leadership Settings
+    @property
+    def NODE_ID(self) -> str:
+        """Identifier of this bot process in leader election"""
+        import socket
+        return os.getenv('NODE_ID', f"{socket.gethostname()}:{os.getpid()}")
+    
+    @property
+    def LEADER_LOCK_NAME(self) -> str:
+        """Advisory lock name shared by all processes of one deployment"""
+        return os.getenv('LEADER_LOCK_NAME', 'arcx:singleton-loops')
+    
+    @property
+    def LEADER_RENEW_INTERVAL(self) -> float:
+        """Seconds between leadership lease renewals and follower election attempts"""
+        return float(os.getenv('LEADER_RENEW_INTERVAL', '5'))
+    
+    @property
+    def INVALIDATION_BATCH_WINDOW(self) -> float:
+        """Seconds cache invalidation events are collected before one NOTIFY is sent"""
+        return float(os.getenv('INVALIDATION_BATCH_WINDOW', '0.05'))
+    
+    @property
+    def ENTITY_CACHE_TTL(self) -> int:
+        """Seconds user and channel rows stay in the in-process cache"""
+        return int(os.getenv('ENTITY_CACHE_TTL', '60'))
+    
     # Monitoring Settings
     @property
     def HEALTH_CHECK_INTERVAL(self) -> int:
         """Health check interval in seconds"""
         return int(os.getenv('HEALTH_CHECK_INTERVAL', '300'))
     
+    @property
+    def HEALTH_SAMPLE_INTERVAL(self) -> int:
+        """System metric sampling interval in seconds"""
+        return int(os.getenv('HEALTH_SAMPLE_INTERVAL', '10'))
+    
+    @property
+    def ERROR_FLUSH_INTERVAL(self) -> int:
+        """Seconds between batched writes of error fingerprint counters"""
+        return int(os.getenv('ERROR_FLUSH_INTERVAL', '30'))
+    
     @property
     def PERFORMANCE_LOG_INTERVAL(self) -> int:
         """Performance logging interval in seconds"""
         return int(os.getenv('PERFORMANCE_LOG_INTERVAL', '600'))
     
+    @property
+    def PROFILE_DURATION(self) -> int:
+        """Seconds an on-demand profile samples the event loop"""
+        return int(os.getenv('PROFILE_DURATION', '30'))
+    
+    @property
+    def PROFILE_INTERVAL(self) -> float:
+        """Seconds between profiler samples before any overhead backoff"""
+        return float(os.getenv('PROFILE_INTERVAL', '0.02'))
+    
+    @property
+    def PROFILE_MAX_OVERHEAD(self) -> float:
+        """Share of wall time the profiler may spend sampling before it samples less often"""
+        return float(os.getenv('PROFILE_MAX_OVERHEAD', '0.02'))
+    
+    @property
+    def PROFILE_DIR(self) -> str:
+        """Directory collapsed-stack profiles are written to"""
+        return os.getenv('PROFILE_DIR', 'profiles')
+    
+    @property
+    def PROFILE_SIGNAL(self) -> str:
+        """Signal that starts a profile and sends it to the admins; empty disables it"""
+        return os.getenv('PROFILE_SIGNAL', 'SIGUSR2')
+    
+    @property
+    def ANALYTICS_REPORT_TTL(self) -> int:
+        """Seconds an analytics report is served as fresh"""
+        return int(os.getenv('ANALYTICS_REPORT_TTL', '300'))
+    
+    @property
+    def ANALYTICS_REPORT_MAX_AGE(self) -> int:
+        """Seconds a stale analytics report may still be served while it rebuilds"""
+        return int(os.getenv('ANALYTICS_REPORT_MAX_AGE', '3600'))
+    
     # Feature-specific Settings
     @property
     def AUTO_JOIN_DELAY_MIN(self) -> int:
@@ -5,5 +5,11 @@ Database management module
 from .unified_database import DatabaseManager
 from .coordinator import DatabaseCoordinator
 from .universal_access import UniversalDatabaseAccess
+from .maintenance import DatabaseMaintenance
+from .leadership import LeaderElection
+from .invalidation import InvalidationBus
+from .error_tracker import ErrorAggregator
+from .pools import NamedPool
+from .archive import ColdArchive
 
-__all__ = ['DatabaseManager', 'DatabaseCoordinator', 'UniversalDatabaseAccess']
+__all__ = ['DatabaseManager', 'DatabaseCoordinator', 'UniversalDatabaseAccess', 'DatabaseMaintenance', 'LeaderElection', 'InvalidationBus', 'ErrorAggregator', 'NamedPool', 'ColdArchive']
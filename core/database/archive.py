@@ -0,0 +1,389 @@
+"""
+Cold Storage Archive
+Moves aged rows into compressed date-partitioned files with a manifest and reads them back
+"""
+
+import asyncio
+import csv
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Optional, List, Callable, Tuple, AsyncIterator
+
+from core.config.config import Config
+from .coordinator import DatabaseCoordinator
+from .pools import MAINTENANCE
+from core.utils.data_export import pa, pq, _plain_value
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def _columnar_value(value: Any) -> Any:
+    """Database value in a form pyarrow can type consistently"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, (datetime, date)):
+        return value
+    return _plain_value(value)
+
+
+def _write_part(path: str, fmt: str, columns: List[str], rows: List[Dict[str, Any]]):
+    """Encode one partition file; runs in a worker thread"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == 'parquet':
+        table = pa.Table.from_pylist(
+            [{column: _columnar_value(row[column]) for column in columns} for row in rows]
+        )
+        pq.write_table(table, path, compression='zstd')
+    else:
+        with gzip.open(path, 'wt', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(columns)
+            writer.writerows([[_plain_value(row[column]) for column in columns] for row in rows])
+
+
+def _read_part(path: str, fmt: str) -> List[Dict[str, Any]]:
+    """Decode one partition file; CSV parts return text values"""
+    if fmt == 'parquet':
+        return pq.read_table(path).to_pylist()
+    with gzip.open(path, 'rt', newline='', encoding='utf-8') as handle:
+        return list(csv.DictReader(handle))
+
+
+class ColdArchive:
+    """Archives rows older than their retention age instead of deleting them"""
+    
+    # Archived tables and the timestamp column that decides their partition
+    TABLES = {
+        'system_logs': 'timestamp',
+        'analytics_data': 'timestamp',
+        'view_boost_logs': 'timestamp',
+        'view_boost_campaigns': 'updated_at'
+    }
+    
+    def __init__(self, coordinator: DatabaseCoordinator, config: Config):
+        self.coordinator = coordinator
+        self.config = config
+        self.root = config.ARCHIVE_DIR
+        # Parquet when pyarrow is installed, gzip-compressed CSV otherwise
+        self.fmt = 'parquet' if pa is not None else 'csv.gz'
+        self._manifest: Dict[str, Any] = {'version': 1, 'parts': []}
+        self._manifest_lock = asyncio.Lock()
+        self.stats = {
+            'rows_archived': 0,
+            'parts_written': 0,
+            'parts_discarded': 0,
+            'parts_pruned': 0
+        }
+    
+    async def start(self):
+        """Load the manifest and settle parts left pending by an interrupted run"""
+        loop = asyncio.get_running_loop()
+        self._manifest = await loop.run_in_executor(None, self._load_manifest)
+        await self._recover_pending()
+        logger.info(f"✅ Cold archive ready at {self.root} ({len(self._manifest['parts'])} parts, {self.fmt})")
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Read the manifest from disk"""
+        path = os.path.join(self.root, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {'version': 1, 'parts': []}
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    
+    def _store_manifest(self, manifest: Dict[str, Any]):
+        """Atomically replace the manifest on disk"""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_NAME)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle, default=str, indent=1)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    
+    async def _save_manifest(self):
+        """Persist the in-memory manifest"""
+        loop = asyncio.get_running_loop()
+        snapshot = {'version': 1, 'parts': [dict(part) for part in self._manifest['parts']]}
+        await loop.run_in_executor(None, self._store_manifest, snapshot)
+    
+    async def _recover_pending(self):
+        """Keep pending parts whose rows were deleted and discard those whose delete rolled back"""
+        pending = [part for part in self._manifest['parts'] if part['status'] == 'pending']
+        if not pending:
+            return
+        
+        async with self._manifest_lock:
+            for part in pending:
+                # Rows of a part are deleted in one transaction, so one id tells which way it went
+                async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                    still_live = await conn.fetchval(
+                        f"SELECT EXISTS(SELECT 1 FROM {part['table']} WHERE id = $1)", part['first_id']
+                    )
+                if still_live:
+                    self._discard_part(part)
+                else:
+                    part['status'] = 'committed'
+            await self._save_manifest()
+    
+    def _discard_part(self, part: Dict[str, Any]):
+        """Remove a part whose rows stayed in the database"""
+        try:
+            os.unlink(os.path.join(self.root, part['path']))
+        except OSError:
+            pass
+        self._manifest['parts'].remove(part)
+        self.stats['parts_discarded'] += 1
+    
+    async def _write_parts(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write rows as one file per partition day and register them as pending"""
+        column = self.TABLES[table]
+        by_day: Dict[date, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            by_day[(row[column] or datetime.utcnow()).date()].append(row)
+        
+        loop = asyncio.get_running_loop()
+        columns = list(rows[0].keys())
+        parts = []
+        for day, day_rows in sorted(by_day.items()):
+            ids = [row['id'] for row in day_rows]
+            relative = os.path.join(table, f"date={day.isoformat()}", f"part-{min(ids)}-{max(ids)}.{self.fmt}")
+            await loop.run_in_executor(
+                None, _write_part, os.path.join(self.root, relative), self.fmt, columns, day_rows
+            )
+            parts.append({
+                'table': table,
+                'date': day.isoformat(),
+                'path': relative,
+                'format': self.fmt,
+                'rows': len(day_rows),
+                'first_id': min(ids),
+                'last_id': max(ids),
+                'created_at': datetime.utcnow().isoformat(),
+                'status': 'pending'
+            })
+        
+        async with self._manifest_lock:
+            self._manifest['parts'].extend(parts)
+            await self._save_manifest()
+        return parts
+    
+    async def _commit_parts(self, parts: List[Dict[str, Any]], committed: bool):
+        """Mark parts committed after their rows were deleted, or drop them after a rollback"""
+        async with self._manifest_lock:
+            for part in parts:
+                if committed:
+                    part['status'] = 'committed'
+                    self.stats['parts_written'] += 1
+                    self.stats['rows_archived'] += part['rows']
+                elif part in self._manifest['parts']:
+                    self._discard_part(part)
+            await self._save_manifest()
+    
+    async def archive_older_than(self, table: str, days: int) -> int:
+        """Move rows older than the given age to the archive in keyset-ordered batches"""
+        if table not in self.TABLES or table == 'view_boost_campaigns':
+            raise ValueError(f"Table {table} is not archived by age")
+        
+        column = self.TABLES[table]
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        batch_size = self.config.MAINTENANCE_BATCH_SIZE
+        
+        total = 0
+        last_id = 0
+        while True:
+            parts: List[Dict[str, Any]] = []
+            try:
+                async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                    async with conn.transaction():
+                        rows = [dict(row) for row in await conn.fetch(
+                            f"""
+                            SELECT * FROM {table}
+                            WHERE {column} < $1 AND id > $2
+                            ORDER BY id
+                            LIMIT $3
+                            FOR UPDATE SKIP LOCKED
+                            """,
+                            cutoff, last_id, batch_size
+                        )]
+                        if not rows:
+                            break
+                        
+                        # Files are written before the delete commits; a rollback discards them
+                        parts = await self._write_parts(table, rows)
+                        await conn.execute(
+                            f"DELETE FROM {table} WHERE id = ANY($1::bigint[])", [row['id'] for row in rows]
+                        )
+            except Exception:
+                if parts:
+                    await self._commit_parts(parts, committed=False)
+                raise
+            await self._commit_parts(parts, committed=True)
+            
+            total += len(rows)
+            last_id = rows[-1]['id']
+            if len(rows) < batch_size:
+                break
+            await asyncio.sleep(self.config.MAINTENANCE_BATCH_DELAY)
+        
+        return total
+    
+    async def archive_completed_campaigns(self, days: int) -> Tuple[int, int]:
+        """Move old completed campaigns and their boost logs to the archive"""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        batch_size = self.config.MAINTENANCE_BATCH_SIZE
+        
+        campaigns_archived = 0
+        logs_archived = 0
+        last_id = 0
+        while True:
+            parts: List[Dict[str, Any]] = []
+            try:
+                async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                    async with conn.transaction():
+                        campaigns = [dict(row) for row in await conn.fetch(
+                            """
+                            SELECT * FROM view_boost_campaigns
+                            WHERE status = 'completed' AND updated_at < $1 AND id > $2
+                            ORDER BY id
+                            LIMIT $3
+                            FOR UPDATE SKIP LOCKED
+                            """,
+                            cutoff, last_id, batch_size
+                        )]
+                        if not campaigns:
+                            break
+                        
+                        campaign_ids = [campaign['id'] for campaign in campaigns]
+                        logs = [dict(row) for row in await conn.fetch(
+                            "SELECT * FROM view_boost_logs WHERE campaign_id = ANY($1::int[]) ORDER BY id",
+                            campaign_ids
+                        )]
+                        if logs:
+                            parts += await self._write_parts('view_boost_logs', logs)
+                        parts += await self._write_parts('view_boost_campaigns', campaigns)
+                        
+                        await conn.execute(
+                            "DELETE FROM view_boost_logs WHERE campaign_id = ANY($1::int[])", campaign_ids
+                        )
+                        await conn.execute(
+                            "DELETE FROM view_boost_campaigns WHERE id = ANY($1::int[])", campaign_ids
+                        )
+            except Exception:
+                if parts:
+                    await self._commit_parts(parts, committed=False)
+                raise
+            await self._commit_parts(parts, committed=True)
+            
+            campaigns_archived += len(campaigns)
+            logs_archived += len(logs)
+            last_id = campaign_ids[-1]
+            if len(campaigns) < batch_size:
+                break
+            await asyncio.sleep(self.config.MAINTENANCE_BATCH_DELAY)
+        
+        return campaigns_archived, logs_archived
+    
+    def covers(self, table: str, since: datetime) -> bool:
+        """Whether any archived partition of a table falls on or after the given time"""
+        day = since.date().isoformat()
+        return any(
+            part['table'] == table and part['status'] == 'committed' and part['date'] >= day
+            for part in self._manifest['parts']
+        )
+    
+    async def iter_parts(self, table: str, since: datetime, until: Optional[datetime] = None,
+                         predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Archived rows of a table within a time range, one partition file at a time, oldest day first"""
+        column = self.TABLES[table]
+        first_day = since.date().isoformat()
+        last_day = until.date().isoformat() if until else None
+        parts = sorted(
+            (
+                part for part in self._manifest['parts']
+                if part['table'] == table and part['status'] == 'committed'
+                and part['date'] >= first_day and (last_day is None or part['date'] <= last_day)
+            ),
+            key=lambda p: (p['date'], p['first_id'])
+        )
+        
+        def load(part: Dict[str, Any]) -> List[Dict[str, Any]]:
+            rows = []
+            for row in _read_part(os.path.join(self.root, part['path']), part['format']):
+                stamp = row[column]
+                if isinstance(stamp, str):
+                    stamp = row[column] = datetime.fromisoformat(stamp)
+                if stamp < since or (until is not None and stamp >= until):
+                    continue
+                if predicate is None or predicate(row):
+                    rows.append(row)
+            rows.sort(key=lambda row: row[column])
+            return rows
+        
+        loop = asyncio.get_running_loop()
+        for part in parts:
+            rows = await loop.run_in_executor(None, load, part)
+            if rows:
+                yield rows
+    
+    async def read(self, table: str, since: datetime, until: Optional[datetime] = None,
+                   predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Archived rows of a table within a time range, oldest first"""
+        rows: List[Dict[str, Any]] = []
+        async for part_rows in self.iter_parts(table, since, until, predicate):
+            rows.extend(part_rows)
+        rows.sort(key=lambda row: row[self.TABLES[table]])
+        return rows
+    
+    async def prune(self, days: int) -> int:
+        """Delete archived partitions older than the archive retention age"""
+        cutoff = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
+        
+        def unlink(paths: List[str]):
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                # Drop the date directory once its last part is gone
+                try:
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
+        
+        async with self._manifest_lock:
+            expired = [
+                part for part in self._manifest['parts']
+                if part['status'] == 'committed' and part['date'] < cutoff
+            ]
+            if not expired:
+                return 0
+            # The manifest stops listing parts before their files go, so readers never miss a file
+            for part in expired:
+                self._manifest['parts'].remove(part)
+            await self._save_manifest()
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, unlink, [os.path.join(self.root, part['path']) for part in expired])
+        self.stats['parts_pruned'] += len(expired)
+        return len(expired)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Partition counts per table and archiving counters"""
+        tables: Dict[str, Dict[str, int]] = defaultdict(lambda: {'parts': 0, 'rows': 0})
+        for part in self._manifest['parts']:
+            if part['status'] == 'committed':
+                tables[part['table']]['parts'] += 1
+                tables[part['table']]['rows'] += part['rows']
+        return {
+            'root': self.root,
+            'format': self.fmt,
+            'tables': dict(tables),
+            **self.stats
+        }
@@ -11,6 +11,9 @@ import asyncpg
 from contextlib import asynccontextmanager
 
 from core.config.config import Config
+from .json_codec import json_backend
+from .pools import NamedPool, pool_specs, INTERACTIVE, ANALYTICS, MAINTENANCE
+from core.utils.supervisor import supervisor
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,10 @@ class DatabaseCoordinator:
     
     def __init__(self, config: Config):
         self.config = config
+        # Workload classes get separate pools so slow aggregates cannot starve menu lookups
+        self.pools: Dict[str, NamedPool] = {
+            name: NamedPool(spec) for name, spec in pool_specs(config).items()
+        }
         self.pool: Optional[asyncpg.Pool] = None
         self.connection_stats = {
             'total_connections': 0,
@@ -27,7 +34,6 @@ class DatabaseCoordinator:
             'failed_connections': 0,
             'last_health_check': None
         }
-        self._health_check_task: Optional[asyncio.Task] = None
         
     async def initialize(self):
         """Initialize database connection pool"""
@@ -39,21 +45,14 @@ class DatabaseCoordinator:
             logger.info(f"   Database: {self.config.DB_NAME}")
             logger.info(f"   User: {self.config.DB_USER}")
             
-            # Create connection pool
-            self.pool = await asyncpg.create_pool(
-                host=self.config.DB_HOST,
-                port=self.config.DB_PORT,
-                database=self.config.DB_NAME,
-                user=self.config.DB_USER,
-                password=self.config.DB_PASSWORD,
-                min_size=self.config.DB_POOL_SIZE,
-                max_size=self.config.DB_MAX_POOL_SIZE,
-                command_timeout=self.config.DB_TIMEOUT,
-                server_settings={
-                    'application_name': 'telegram_channel_bot',
-                    'timezone': 'UTC'
-                }
+            # Create connection pools; the interactive pool is the default for every query
+            await self.pools[INTERACTIVE].open(self.config)
+            self.pool = self.pools[INTERACTIVE].pool
+            await asyncio.gather(
+                self._open_analytics_pool(),
+                self.pools[MAINTENANCE].open(self.config)
             )
+            logger.info(f"🧩 JSON codecs registered ({json_backend()})")
             
             # Test connection
             logger.info("🔍 Testing database connection...")
@@ -73,6 +72,18 @@ class DatabaseCoordinator:
             logger.error(f"❌ Failed to initialize database coordinator: {e}")
             raise
     
+    async def _open_analytics_pool(self):
+        """Open the analytics pool on the read replica when configured, else on the primary"""
+        analytics = self.pools[ANALYTICS]
+        if analytics.spec.dsn:
+            try:
+                await analytics.open(self.config, dsn=analytics.spec.dsn)
+                logger.info("📚 Analytics reads routed to the read replica")
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Read replica unavailable, analytics will use the primary: {e}")
+        await analytics.open(self.config)
+    
     async def _test_connection(self):
         """Test database connection"""
         try:
@@ -101,6 +112,13 @@ class DatabaseCoordinator:
             async with self.pool.acquire() as conn:
                 # Drop tables in reverse dependency order
                 drop_queries = [
+                    "DROP TABLE IF EXISTS channel_stat_schedule CASCADE",
+                    "DROP TABLE IF EXISTS channel_member_daily CASCADE",
+                    "DROP TABLE IF EXISTS channel_member_points CASCADE",
+                    "DROP TABLE IF EXISTS request_counts CASCADE",
+                    "DROP TABLE IF EXISTS error_counts CASCADE",
+                    "DROP TABLE IF EXISTS error_fingerprints CASCADE",
+                    "DROP TABLE IF EXISTS maintenance_runs CASCADE",
                     "DROP TABLE IF EXISTS system_logs CASCADE",
                     "DROP TABLE IF EXISTS analytics_data CASCADE", 
                     "DROP TABLE IF EXISTS emoji_reactions CASCADE",
@@ -339,6 +357,82 @@ class DatabaseCoordinator:
                 )
                 """,
                 
+                # Maintenance runs table
+                """
+                CREATE TABLE IF NOT EXISTS maintenance_runs (
+                    id SERIAL PRIMARY KEY,
+                    task VARCHAR(100) NOT NULL,
+                    started_at TIMESTAMP NOT NULL,
+                    duration_ms INTEGER DEFAULT 0,
+                    rows_deleted JSONB DEFAULT '{}',
+                    success BOOLEAN DEFAULT TRUE,
+                    error_message TEXT
+                )
+                """,
+                
+                # Error aggregation tables: one row per failure fingerprint plus hourly counters
+                """
+                CREATE TABLE IF NOT EXISTS error_fingerprints (
+                    id SERIAL PRIMARY KEY,
+                    fingerprint VARCHAR(32) UNIQUE NOT NULL,
+                    log_level VARCHAR(20) NOT NULL,
+                    module VARCHAR(100) NOT NULL,
+                    message TEXT NOT NULL,
+                    sample_message TEXT,
+                    stack TEXT,
+                    first_seen TIMESTAMP NOT NULL,
+                    last_seen TIMESTAMP NOT NULL,
+                    total_count BIGINT DEFAULT 0
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS error_counts (
+                    id BIGSERIAL PRIMARY KEY,
+                    bucket TIMESTAMP NOT NULL,
+                    fingerprint VARCHAR(32) NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    UNIQUE (bucket, fingerprint)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS request_counts (
+                    id SERIAL PRIMARY KEY,
+                    bucket TIMESTAMP UNIQUE NOT NULL,
+                    count BIGINT DEFAULT 0
+                )
+                """,
+                
+                # Channel member counts: a point only when the count changes, daily growth and sampling cadence
+                """
+                CREATE TABLE IF NOT EXISTS channel_member_points (
+                    channel_id INTEGER REFERENCES telegram_channels(id) ON DELETE CASCADE,
+                    sampled_at TIMESTAMP NOT NULL,
+                    member_count BIGINT NOT NULL,
+                    delta BIGINT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (channel_id, sampled_at)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS channel_member_daily (
+                    channel_id INTEGER REFERENCES telegram_channels(id) ON DELETE CASCADE,
+                    day DATE NOT NULL,
+                    member_count BIGINT NOT NULL,
+                    growth BIGINT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (channel_id, day)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS channel_stat_schedule (
+                    channel_id INTEGER PRIMARY KEY REFERENCES telegram_channels(id) ON DELETE CASCADE,
+                    last_value BIGINT,
+                    last_sampled_at TIMESTAMP,
+                    interval_seconds INTEGER NOT NULL,
+                    next_sample_at TIMESTAMP NOT NULL,
+                    unchanged_samples INTEGER DEFAULT 0,
+                    failures INTEGER DEFAULT 0
+                )
+                """,
+                
                 # Create indexes separately (PostgreSQL syntax)
                 """
                 CREATE INDEX IF NOT EXISTS idx_analytics_entity ON analytics_data (entity_type, entity_id)
@@ -357,6 +451,44 @@ class DatabaseCoordinator:
                 """,
                 """
                 CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON system_logs (timestamp)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_boost_logs_timestamp ON view_boost_logs (timestamp)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_boost_logs_campaign ON view_boost_logs (campaign_id)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_campaigns_status_updated ON view_boost_campaigns (status, updated_at)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_maintenance_runs_started ON maintenance_runs (started_at)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_error_fingerprints_last_seen ON error_fingerprints (last_seen)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_channel_stat_schedule_next ON channel_stat_schedule (next_sample_at)
+                """,
+                # Bucketed series read one entity's rows within a time window
+                """
+                CREATE INDEX IF NOT EXISTS idx_analytics_series ON analytics_data (entity_type, entity_id, metric_name, timestamp)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_boost_logs_account_timestamp ON view_boost_logs (account_id, timestamp)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_campaigns_channel_created ON view_boost_campaigns (channel_id, created_at)
+                """,
+                # Per-user list screens
+                """
+                CREATE INDEX IF NOT EXISTS idx_channels_user_created ON telegram_channels (user_id, created_at)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_accounts_user_created ON telegram_accounts (user_id, created_at)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_campaigns_user_created ON view_boost_campaigns (user_id, created_at)
                 """
             ]
             
@@ -377,29 +509,34 @@ class DatabaseCoordinator:
             raise
     
     @asynccontextmanager
-    async def get_connection(self):
-        """Get database connection from pool"""
-        if not self.pool:
+    async def get_connection(self, pool: str = INTERACTIVE):
+        """Get database connection from the named pool"""
+        named = self.pools.get(pool)
+        if named is None or named.pool is None:
+            # Fall back to the default pool rather than failing the query
+            named = self.pools[INTERACTIVE]
+        if named.pool is None:
             raise RuntimeError("Database pool not initialized")
         
-        conn = None
+        acquired = False
         try:
-            conn = await self.pool.acquire()
-            self.connection_stats['active_connections'] += 1
-            yield conn
+            async with named.acquire() as conn:
+                acquired = True
+                self.connection_stats['active_connections'] += 1
+                try:
+                    yield conn
+                finally:
+                    self.connection_stats['active_connections'] -= 1
         except Exception as e:
-            self.connection_stats['failed_connections'] += 1
-            logger.error(f"Database connection error: {e}")
+            if not acquired:
+                self.connection_stats['failed_connections'] += 1
+                logger.error(f"Database connection error ({named.spec.name}): {e}")
             raise
-        finally:
-            if conn:
-                await self.pool.release(conn)
-                self.connection_stats['active_connections'] -= 1
     
-    async def execute_query(self, query: str, *args) -> Any:
+    async def execute_query(self, query: str, *args, pool: str = INTERACTIVE) -> Any:
         """Execute a database query"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_connection(pool) as conn:
                 return await conn.fetchval(query, *args)
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
@@ -414,42 +551,39 @@ class DatabaseCoordinator:
             logger.error(f"Batch query execution failed: {e}")
             raise
     
-    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
-        """Fetch single row"""
+    async def fetch_one(self, query: str, *args, records: bool = False,
+                        pool: str = INTERACTIVE) -> Optional[Dict[str, Any]]:
+        """Fetch single row; records=True returns the asyncpg Record without copying"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_connection(pool) as conn:
                 row = await conn.fetchrow(query, *args)
-                return dict(row) if row else None
+                if row is None or records:
+                    return row
+                return dict(row)
         except Exception as e:
             logger.error(f"Fetch one failed: {e}")
             raise
     
-    async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Fetch all rows"""
+    async def fetch_all(self, query: str, *args, records: bool = False,
+                        pool: str = INTERACTIVE) -> List[Dict[str, Any]]:
+        """Fetch all rows; records=True returns asyncpg Records without copying"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_connection(pool) as conn:
                 rows = await conn.fetch(query, *args)
-                return [dict(row) for row in rows]
+                return rows if records else [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Fetch all failed: {e}")
             raise
     
     def _start_health_monitoring(self):
         """Start background health monitoring"""
-        self._health_check_task = asyncio.create_task(self._health_check_loop())
+        supervisor.spawn_periodic(
+            'db.health_check', self._perform_health_check,
+            self.config.HEALTH_CHECK_INTERVAL,
+            initial_delay=self.config.HEALTH_CHECK_INTERVAL
+        )
         logger.info("✅ Database health monitoring started")
     
-    async def _health_check_loop(self):
-        """Background health check loop"""
-        while True:
-            try:
-                await asyncio.sleep(self.config.HEALTH_CHECK_INTERVAL)
-                await self._perform_health_check()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Health check error: {e}")
-    
     async def _perform_health_check(self):
         """Perform database health check"""
         try:
@@ -468,6 +602,7 @@ class DatabaseCoordinator:
             
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
+            raise
     
     async def get_health_status(self) -> Dict[str, Any]:
         """Get database health status"""
@@ -482,6 +617,7 @@ class DatabaseCoordinator:
                 'max_size': self.pool.get_max_size(),
                 'idle_connections': self.pool.get_idle_size()
             },
+            'pools': {name: named.get_stats() for name, named in self.pools.items()},
             'stats': self.connection_stats.copy(),
             'last_health_check': self.connection_stats['last_health_check']
         }
@@ -489,18 +625,14 @@ class DatabaseCoordinator:
     async def close(self):
         """Close database connections and cleanup"""
         try:
-            # Cancel health monitoring
-            if self._health_check_task:
-                self._health_check_task.cancel()
-                try:
-                    await self._health_check_task
-                except asyncio.CancelledError:
-                    pass
+            # Stop health monitoring
+            await supervisor.stop('db.health_check')
             
-            # Close connection pool
-            if self.pool:
-                await self.pool.close()
-                logger.info("✅ Database connection pool closed")
+            # Close connection pools
+            for named in self.pools.values():
+                await named.close()
+            self.pool = None
+            logger.info("✅ Database connection pools closed")
             
         except Exception as e:
             logger.error(f"Error closing database coordinator: {e}")
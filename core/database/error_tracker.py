@@ -0,0 +1,307 @@
+"""
+Error Aggregation
+Fingerprints logged errors by normalized message and stack and keeps batched hourly counters
+"""
+
+import contextvars
+import hashlib
+import logging
+import os
+import re
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable
+
+from core.config.config import Config
+from .coordinator import DatabaseCoordinator
+from .pools import ANALYTICS
+from core.utils.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+# Variable parts of a message replaced so repeats of one failure share a fingerprint
+MESSAGE_NORMALIZERS = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<hex>'),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), '<str>'),
+    (re.compile(r'@\w+'), '<user>'),
+    (re.compile(r'-?\d+(\.\d+)?'), '<n>')
+]
+MAX_MESSAGE_LENGTH = 300
+# Innermost frames that identify where an exception was raised
+STACK_DEPTH = 6
+# Distinct fingerprints buffered between flushes
+MAX_PENDING_FINGERPRINTS = 1000
+# The aggregator's own records are never counted
+IGNORED_LOGGERS = ('core.database.error_tracker',)
+# Set while flush() runs; database errors it logs would otherwise refill the buffer it is draining
+_flushing: contextvars.ContextVar[bool] = contextvars.ContextVar('error_flush', default=False)
+
+
+def normalize_message(message: str) -> str:
+    """Strip ids, numbers and quoted values from an error message"""
+    normalized = message.strip().splitlines()[0] if message.strip() else ''
+    for pattern, replacement in MESSAGE_NORMALIZERS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized[:MAX_MESSAGE_LENGTH]
+
+
+def stack_signature(record: logging.LogRecord) -> str:
+    """Exception type and innermost frames, or the logging call site when there is no exception"""
+    if record.exc_info and record.exc_info[1] is not None:
+        exc_type, _, tb = record.exc_info
+        frames = traceback.extract_tb(tb)[-STACK_DEPTH:]
+        stack = ' > '.join(f"{os.path.basename(frame.filename)}:{frame.name}" for frame in frames)
+        return f"{exc_type.__name__} @ {stack}"
+    return f"{os.path.basename(record.pathname)}:{record.funcName}"
+
+
+def error_fingerprint(module: str, message: str, stack: str) -> str:
+    """Stable short id of a failure"""
+    digest = hashlib.blake2b(f"{module}|{message}|{stack}".encode('utf-8'), digest_size=8)
+    return digest.hexdigest()
+
+
+class ErrorAggregationHandler(logging.Handler):
+    """Feeds WARNING and above records into the aggregator without blocking the caller"""
+    
+    def __init__(self, aggregator: 'ErrorAggregator'):
+        super().__init__(level=logging.WARNING)
+        self.aggregator = aggregator
+        self.addFilter(self._outside_flush_path)
+    
+    @staticmethod
+    def _outside_flush_path(record: logging.LogRecord) -> bool:
+        """Skip records of the aggregator itself and any logged while its flush is running"""
+        return not _flushing.get() and not record.name.startswith(IGNORED_LOGGERS)
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.aggregator.record(record)
+        except Exception:
+            self.handleError(record)
+
+
+class ErrorAggregator:
+    """Buffers per-fingerprint counts in memory and upserts them into hourly buckets"""
+    
+    def __init__(self, coordinator: DatabaseCoordinator, config: Config):
+        self.coordinator = coordinator
+        self.config = config
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._handler: Optional[ErrorAggregationHandler] = None
+        self._request_source: Optional[Callable[[], int]] = None
+        self._requests_flushed = 0
+        self.stats = {
+            'recorded': 0,
+            'dropped': 0,
+            'flushes': 0,
+            'rows_written': 0
+        }
+    
+    def set_request_source(self, source: Callable[[], int]):
+        """Use a monotonically increasing handled-request total as the error rate denominator"""
+        self._request_source = source
+        self._requests_flushed = source()
+    
+    async def start(self):
+        """Attach to the root logger and start the batch flush loop"""
+        if self._handler is not None:
+            return
+        
+        self._handler = ErrorAggregationHandler(self)
+        logging.getLogger().addHandler(self._handler)
+        supervisor.spawn_periodic(
+            'db.error_flush', self.flush, self.config.ERROR_FLUSH_INTERVAL,
+            initial_delay=self.config.ERROR_FLUSH_INTERVAL
+        )
+        logger.info("✅ Error aggregation started")
+    
+    async def stop(self):
+        """Detach from logging and write the last batch"""
+        if self._handler is not None:
+            logging.getLogger().removeHandler(self._handler)
+            self._handler = None
+        await supervisor.stop('db.error_flush')
+        await self.flush()
+        logger.info("⏹️ Error aggregation stopped")
+    
+    def record(self, record: logging.LogRecord):
+        """Count one log record under its fingerprint"""
+        message = normalize_message(record.getMessage())
+        stack = stack_signature(record)
+        fingerprint = error_fingerprint(record.name, message, stack)
+        now = datetime.utcnow()
+        
+        with self._pending_lock:
+            entry = self._pending.get(fingerprint)
+            if entry is None:
+                if len(self._pending) >= MAX_PENDING_FINGERPRINTS:
+                    self.stats['dropped'] += 1
+                    return
+                entry = self._pending[fingerprint] = {
+                    'log_level': record.levelname,
+                    'module': record.name[:100],
+                    'message': message,
+                    'sample': record.getMessage()[:1000],
+                    'stack': stack,
+                    'first_seen': now,
+                    'counts': {}
+                }
+            bucket = now.replace(minute=0, second=0, microsecond=0)
+            entry['counts'][bucket] = entry['counts'].get(bucket, 0) + 1
+            entry['last_seen'] = now
+            self.stats['recorded'] += 1
+    
+    def _take_pending(self) -> Dict[str, Dict[str, Any]]:
+        """Swap out the buffered counts"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        return pending
+    
+    def _restore_pending(self, pending: Dict[str, Dict[str, Any]]):
+        """Merge counts back after a failed flush so they are written next time"""
+        with self._pending_lock:
+            for fingerprint, entry in pending.items():
+                current = self._pending.get(fingerprint)
+                if current is None:
+                    self._pending[fingerprint] = entry
+                    continue
+                current['first_seen'] = min(current['first_seen'], entry['first_seen'])
+                current['last_seen'] = max(current['last_seen'], entry['last_seen'])
+                for bucket, count in entry['counts'].items():
+                    current['counts'][bucket] = current['counts'].get(bucket, 0) + count
+    
+    async def flush(self):
+        """Upsert buffered fingerprints, hourly counts and request totals in one transaction"""
+        token = _flushing.set(True)
+        try:
+            await self._flush()
+        finally:
+            _flushing.reset(token)
+    
+    async def _flush(self):
+        pending = self._take_pending()
+        requests = 0
+        if self._request_source is not None:
+            total = self._request_source()
+            requests = total - self._requests_flushed
+            self._requests_flushed = total
+        if not pending and not requests:
+            return
+        
+        current_bucket = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        
+        fingerprint_rows = [
+            (fingerprint, entry['log_level'], entry['module'], entry['message'], entry['sample'],
+             entry['stack'], entry['first_seen'], entry['last_seen'], sum(entry['counts'].values()))
+            for fingerprint, entry in pending.items()
+        ]
+        count_rows = [
+            (bucket, fingerprint, count)
+            for fingerprint, entry in pending.items()
+            for bucket, count in entry['counts'].items()
+        ]
+        try:
+            async with self.coordinator.get_connection() as conn:
+                async with conn.transaction():
+                    if fingerprint_rows:
+                        await conn.executemany(
+                            """
+                            INSERT INTO error_fingerprints
+                                (fingerprint, log_level, module, message, sample_message, stack,
+                                 first_seen, last_seen, total_count)
+                            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                            ON CONFLICT (fingerprint) DO UPDATE SET
+                                last_seen = GREATEST(error_fingerprints.last_seen, EXCLUDED.last_seen),
+                                sample_message = EXCLUDED.sample_message,
+                                total_count = error_fingerprints.total_count + EXCLUDED.total_count
+                            """,
+                            fingerprint_rows
+                        )
+                        await conn.executemany(
+                            """
+                            INSERT INTO error_counts (bucket, fingerprint, count)
+                            VALUES ($1, $2, $3)
+                            ON CONFLICT (bucket, fingerprint) DO UPDATE SET
+                                count = error_counts.count + EXCLUDED.count
+                            """,
+                            count_rows
+                        )
+                    if requests:
+                        await conn.execute(
+                            """
+                            INSERT INTO request_counts (bucket, count)
+                            VALUES ($1, $2)
+                            ON CONFLICT (bucket) DO UPDATE SET
+                                count = request_counts.count + EXCLUDED.count
+                            """,
+                            current_bucket, requests
+                        )
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(fingerprint_rows) + len(count_rows)
+        except Exception as e:
+            self._restore_pending(pending)
+            self._requests_flushed -= requests
+            logger.warning(f"⚠️ Failed to flush error counters: {e}")
+    
+    async def get_summary(self, hours: int = 24, top: int = 5) -> Dict[str, Any]:
+        """Per-fingerprint counts for the window and the one before it, with request totals"""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        previous = since - timedelta(hours=hours)
+        async with self.coordinator.get_connection(ANALYTICS) as conn:
+            rows = await conn.fetch(
+                """
+                WITH windowed AS (
+                    SELECT fingerprint,
+                           COALESCE(SUM(count) FILTER (WHERE bucket >= $1), 0) AS current_count,
+                           COALESCE(SUM(count) FILTER (WHERE bucket < $1), 0) AS previous_count
+                    FROM error_counts
+                    WHERE bucket >= $2
+                    GROUP BY fingerprint
+                )
+                SELECT f.fingerprint, f.log_level, f.module, f.message, f.sample_message,
+                       f.first_seen, f.last_seen, f.total_count,
+                       w.current_count, w.previous_count,
+                       (SELECT COALESCE(SUM(count), 0) FROM request_counts WHERE bucket >= $1) AS requests,
+                       (SELECT COALESCE(SUM(count), 0) FROM request_counts
+                        WHERE bucket >= $2 AND bucket < $1) AS previous_requests,
+                       (SELECT EXTRACT(HOUR FROM bucket)::int FROM error_counts WHERE bucket >= $1
+                        GROUP BY bucket ORDER BY SUM(count) DESC LIMIT 1) AS peak_hour
+                FROM windowed w
+                JOIN error_fingerprints f USING (fingerprint)
+                ORDER BY w.current_count DESC, f.last_seen DESC
+                """,
+                since, previous
+            )
+        
+        current = [dict(row) for row in rows if row['current_count']]
+        errors = [row for row in current if row['log_level'] in ('ERROR', 'CRITICAL')]
+        total_errors = sum(row['current_count'] for row in errors)
+        previous_errors = sum(
+            row['previous_count'] for row in rows if row['log_level'] in ('ERROR', 'CRITICAL')
+        )
+        requests = rows[0]['requests'] if rows else 0
+        
+        return {
+            'total_errors': total_errors,
+            'critical_errors': sum(row['current_count'] for row in errors if row['log_level'] == 'CRITICAL'),
+            'warnings': sum(row['current_count'] for row in current if row['log_level'] == 'WARNING'),
+            'requests': requests,
+            'error_rate': total_errors / requests * 100 if requests else 0.0,
+            'previous_errors': previous_errors,
+            'previous_requests': rows[0]['previous_requests'] if rows else 0,
+            'peak_hour': rows[0]['peak_hour'] if rows else None,
+            'distinct_fingerprints': len(current),
+            'top': errors[:top],
+            'recent': sorted(errors, key=lambda row: row['last_seen'], reverse=True)[:top]
+        }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Buffer size and flush counters"""
+        return {
+            'pending_fingerprints': len(self._pending),
+            **self.stats
+        }
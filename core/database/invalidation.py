@@ -0,0 +1,209 @@
+"""
+Cache Invalidation Bus
+Batched entity-change events over Postgres NOTIFY/LISTEN so every process evicts stale cache entries
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List, Callable, Set
+
+import asyncpg
+
+from core.config.config import Config
+from .coordinator import DatabaseCoordinator
+from .json_codec import dumps, loads
+from core.utils.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'arcx_cache_invalidation'
+# NOTIFY payloads must stay below 8000 bytes
+MAX_PAYLOAD_BYTES = 7500
+# Marks an event that covers every key of an entity type
+ALL_KEYS = '*'
+
+
+class InvalidationBus:
+    """Publishes entity changes with NOTIFY and applies them from a dedicated LISTEN connection"""
+    
+    def __init__(self, coordinator: DatabaseCoordinator, config: Config):
+        self.coordinator = coordinator
+        self.config = config
+        self.node_id = config.NODE_ID
+        self._handlers: Dict[str, List[Callable[[Optional[str]], Any]]] = {}
+        self._pending: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._listen_conn: Optional[asyncpg.Connection] = None
+        self._running = False
+        self.stats = {
+            'published': 0,
+            'notifications_sent': 0,
+            'received': 0,
+            'reconnects': 0
+        }
+    
+    def subscribe(self, entity: str, handler: Callable[[Optional[str]], Any]):
+        """Register an eviction handler; it receives the entity key, or None for all keys"""
+        self._handlers.setdefault(entity, []).append(handler)
+    
+    async def start(self):
+        """Open the LISTEN connection and start the reconnect watchdog"""
+        if self._running:
+            return
+        
+        self._running = True
+        await self._connect_listener()
+        supervisor.spawn_periodic(
+            'db.invalidation_listener', self._ensure_listener, self.config.LEADER_RENEW_INTERVAL,
+            initial_delay=self.config.LEADER_RENEW_INTERVAL
+        )
+        logger.info("✅ Cache invalidation bus started")
+    
+    async def stop(self):
+        """Send pending events and close the LISTEN connection"""
+        self._running = False
+        await self.flush()
+        
+        await supervisor.stop('db.invalidation_listener')
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        
+        await self._close_listener()
+        logger.info("⏹️ Cache invalidation bus stopped")
+    
+    def publish(self, entity: str, entity_key: Optional[Any] = None):
+        """Evict locally now and queue the event for other processes"""
+        key = ALL_KEYS if entity_key is None else str(entity_key)
+        self._dispatch(entity, key)
+        self.stats['published'] += 1
+        
+        self._pending.add(f"{entity}:{key}")
+        if self._running and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+    
+    async def _delayed_flush(self):
+        """Collect events for one batch window, then send them"""
+        await asyncio.sleep(self.config.INVALIDATION_BATCH_WINDOW)
+        await self.flush()
+    
+    async def flush(self):
+        """Send queued events as few NOTIFY payloads as possible"""
+        if not self._pending:
+            return
+        
+        events = sorted(self._pending)
+        self._pending.clear()
+        try:
+            async with self.coordinator.get_connection() as conn:
+                for payload in self._build_payloads(events):
+                    await conn.execute("SELECT pg_notify($1, $2)", INVALIDATION_CHANNEL, payload)
+                    self.stats['notifications_sent'] += 1
+        except Exception as e:
+            logger.error(f"Failed to publish cache invalidations: {e}")
+    
+    def _build_payloads(self, events: List[str]) -> List[str]:
+        """Split events into payloads below the NOTIFY size limit"""
+        payloads = []
+        batch: List[str] = []
+        size = 0
+        for event in events:
+            event_size = len(event.encode('utf-8')) + 3
+            if batch and size + event_size > MAX_PAYLOAD_BYTES:
+                payloads.append(dumps({'origin': self.node_id, 'events': batch}))
+                batch = []
+                size = 0
+            batch.append(event)
+            size += event_size
+        if batch:
+            payloads.append(dumps({'origin': self.node_id, 'events': batch}))
+        return payloads
+    
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        """Apply events published by other processes"""
+        try:
+            message = loads(payload)
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring malformed invalidation payload: {e}")
+            return
+        
+        if message.get('origin') == self.node_id:
+            # Already applied locally when published
+            return
+        
+        for event in message.get('events', []):
+            entity, _, key = event.partition(':')
+            self._dispatch(entity, key)
+            self.stats['received'] += 1
+    
+    def _dispatch(self, entity: str, key: str):
+        """Run eviction handlers for one event"""
+        for handler in self._handlers.get(entity, []):
+            try:
+                result = handler(None if key == ALL_KEYS else key)
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(result)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {entity} failed: {e}")
+    
+    def _evict_everything(self):
+        """Drop all subscribed entities after a gap in which events may have been missed"""
+        for entity in list(self._handlers):
+            self._dispatch(entity, ALL_KEYS)
+    
+    async def _connect_listener(self) -> bool:
+        """Open the dedicated LISTEN connection"""
+        try:
+            self._listen_conn = await asyncpg.connect(
+                host=self.config.DB_HOST,
+                port=self.config.DB_PORT,
+                database=self.config.DB_NAME,
+                user=self.config.DB_USER,
+                password=self.config.DB_PASSWORD,
+                timeout=self.config.DB_TIMEOUT,
+                server_settings={'application_name': 'telegram_channel_bot_listener'}
+            )
+            await self._listen_conn.add_listener(INVALIDATION_CHANNEL, self._on_notification)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to open invalidation listener: {e}")
+            await self._close_listener()
+            return False
+    
+    async def _close_listener(self):
+        """Close the LISTEN connection"""
+        if self._listen_conn is None:
+            return
+        try:
+            if not self._listen_conn.is_closed():
+                await self._listen_conn.remove_listener(INVALIDATION_CHANNEL, self._on_notification)
+                await self._listen_conn.close()
+        except Exception:
+            self._listen_conn.terminate()
+        self._listen_conn = None
+    
+    async def _ensure_listener(self):
+        """Reconnect the listener whenever its connection drops"""
+        if self._listen_conn is not None and not self._listen_conn.is_closed():
+            return
+        
+        logger.warning("⚠️ Invalidation listener disconnected, reconnecting...")
+        await self._close_listener()
+        if not await self._connect_listener():
+            raise ConnectionError("Invalidation listener reconnect failed")
+        
+        self.stats['reconnects'] += 1
+        self._evict_everything()
+        logger.info("🔄 Invalidation listener reconnected")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get bus connection state and counters"""
+        return {
+            'listening': self._listen_conn is not None and not self._listen_conn.is_closed(),
+            'pending': len(self._pending),
+            **self.stats
+        }
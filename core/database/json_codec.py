@@ -0,0 +1,59 @@
+"""
+JSON Codecs
+Fast json/jsonb type codecs registered on every pool connection
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    """Encode values the JSON encoder does not handle natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+if orjson is not None:
+    def dumps(value: Any) -> str:
+        """Serialize a value to JSON text"""
+        return orjson.dumps(value, default=_default).decode('utf-8')
+    
+    loads = orjson.loads
+else:
+    def dumps(value: Any) -> str:
+        """Serialize a value to JSON text"""
+        return json.dumps(value, default=_default, separators=(',', ':'))
+    
+    loads = json.loads
+
+
+async def register_json_codecs(conn):
+    """Pool init hook: exchange json and jsonb values as Python objects"""
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            type_name,
+            encoder=dumps,
+            decoder=loads,
+            schema='pg_catalog',
+            format='text'
+        )
+
+
+def json_backend() -> str:
+    """Name of the active JSON backend"""
+    return 'orjson' if orjson is not None else 'json'
@@ -0,0 +1,186 @@
+"""
+Leader Election
+Postgres advisory lock leadership so singleton background loops run on one process
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+import asyncpg
+
+from core.config.config import Config
+from core.utils.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a lock name"""
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class LeaderElection:
+    """Holds a session advisory lock on a dedicated connection and renews it as a lease"""
+    
+    def __init__(self, config: Config):
+        self.config = config
+        self.node_id = config.NODE_ID
+        self.lock_name = config.LEADER_LOCK_NAME
+        self.lock_key = advisory_lock_key(self.lock_name)
+        # pg_locks exposes a bigint advisory key as two 32-bit halves
+        self._classid = (self.lock_key >> 32) & 0xFFFFFFFF
+        self._objid = self.lock_key & 0xFFFFFFFF
+        
+        self._conn: Optional[asyncpg.Connection] = None
+        self._is_leader = False
+        self._running = False
+        self._elected = asyncio.Event()
+        self._listeners: List[Callable[[bool], Awaitable[None]]] = []
+        self.leader_since: Optional[datetime] = None
+        self.transitions = 0
+    
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process currently runs the singleton loops"""
+        return self._is_leader
+    
+    def add_listener(self, callback: Callable[[bool], Awaitable[None]]):
+        """Register a coroutine called with True on election and False on demotion"""
+        self._listeners.append(callback)
+    
+    async def wait_for_leadership(self):
+        """Block until this process is elected"""
+        await self._elected.wait()
+    
+    async def start(self):
+        """Run a first election round, then keep campaigning in the background"""
+        if self._running:
+            return
+        
+        self._running = True
+        await self._campaign()
+        supervisor.spawn_periodic(
+            'db.leader_election', self._campaign, self.config.LEADER_RENEW_INTERVAL,
+            initial_delay=self.config.LEADER_RENEW_INTERVAL
+        )
+        logger.info(
+            f"✅ Leader election started for {self.node_id} "
+            f"({'leader' if self._is_leader else 'follower'})"
+        )
+    
+    async def stop(self):
+        """Stop campaigning and hand leadership over immediately"""
+        self._running = False
+        await supervisor.stop('db.leader_election')
+        
+        if self._is_leader and self._conn and not self._conn.is_closed():
+            try:
+                await self._conn.execute("SELECT pg_advisory_unlock($1)", self.lock_key)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to release leadership lock: {e}")
+        await self._set_leader(False)
+        await self._close_connection()
+        logger.info("⏹️ Leader election stopped")
+    
+    async def _campaign(self):
+        """Renew the lease as leader or try to take over as follower, bounded by the renew interval"""
+        timeout = self.config.LEADER_RENEW_INTERVAL
+        try:
+            if self._conn is None or self._conn.is_closed():
+                self._conn = await self._connect()
+            
+            if self._is_leader:
+                held = await asyncio.wait_for(
+                    self._conn.fetchval(
+                        """
+                        SELECT EXISTS (
+                            SELECT 1 FROM pg_locks
+                            WHERE locktype = 'advisory' AND granted
+                              AND pid = pg_backend_pid()
+                              AND classid::bigint = $1 AND objid::bigint = $2
+                        )
+                        """,
+                        self._classid, self._objid
+                    ),
+                    timeout
+                )
+                if not held:
+                    logger.warning(f"⚠️ {self.node_id} lost the leadership lock")
+                    await self._set_leader(False)
+            else:
+                acquired = await asyncio.wait_for(
+                    self._conn.fetchval("SELECT pg_try_advisory_lock($1)", self.lock_key),
+                    timeout
+                )
+                if acquired:
+                    await self._set_leader(True)
+        except Exception as e:
+            # A leader that cannot renew its lease must step down before a follower takes over
+            logger.warning(f"⚠️ Leadership lease check failed on {self.node_id}: {e}")
+            await self._set_leader(False)
+            await self._close_connection()
+    
+    async def _connect(self) -> asyncpg.Connection:
+        """Open the dedicated lock connection with aggressive keepalives"""
+        interval = max(1, int(self.config.LEADER_RENEW_INTERVAL))
+        return await asyncpg.connect(
+            host=self.config.DB_HOST,
+            port=self.config.DB_PORT,
+            database=self.config.DB_NAME,
+            user=self.config.DB_USER,
+            password=self.config.DB_PASSWORD,
+            timeout=self.config.LEADER_RENEW_INTERVAL,
+            server_settings={
+                'application_name': f'telegram_channel_bot_leader:{self.node_id}'[:63],
+                # The server drops a dead leader's session, and with it the lock, within a few renew intervals
+                'tcp_keepalives_idle': str(interval),
+                'tcp_keepalives_interval': str(interval),
+                'tcp_keepalives_count': '2'
+            }
+        )
+    
+    async def _close_connection(self):
+        """Drop the lock connection, releasing the lock if it was still held"""
+        if self._conn is None:
+            return
+        try:
+            await asyncio.wait_for(self._conn.close(), self.config.LEADER_RENEW_INTERVAL)
+        except Exception:
+            self._conn.terminate()
+        self._conn = None
+    
+    async def _set_leader(self, is_leader: bool):
+        """Record a leadership transition and notify listeners"""
+        if is_leader == self._is_leader:
+            return
+        
+        self._is_leader = is_leader
+        self.transitions += 1
+        if is_leader:
+            self.leader_since = datetime.utcnow()
+            self._elected.set()
+            logger.info(f"👑 {self.node_id} elected leader for singleton loops")
+        else:
+            self.leader_since = None
+            self._elected.clear()
+            logger.info(f"🔄 {self.node_id} is now a follower")
+        
+        for callback in list(self._listeners):
+            try:
+                await callback(is_leader)
+            except Exception as e:
+                logger.error(f"Leadership listener failed: {e}")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get election state for status screens"""
+        return {
+            'node_id': self.node_id,
+            'is_leader': self._is_leader,
+            'leader_since': self.leader_since,
+            'transitions': self.transitions,
+            'lock_name': self.lock_name
+        }
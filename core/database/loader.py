@@ -0,0 +1,89 @@
+"""
+Batch Loader
+Coalesces concurrent point lookups made in one event loop tick into a single ANY($1) query
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List, Set, Callable, Awaitable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class BatchLoader:
+    """Future-returning loader that fetches every key requested in the same tick with one query"""
+    
+    def __init__(self, name: str, fetch_many: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+                 max_batch_size: int = 500):
+        self.name = name
+        self.fetch_many = fetch_many
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._scheduled = False
+        # The loop only holds weak references to tasks; these keep in-flight fetches alive
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {
+            'loads': 0,
+            'batches': 0,
+            'keys_fetched': 0,
+            'coalesced': 0
+        }
+    
+    async def load(self, key: Hashable) -> Optional[Any]:
+        """Resolve one key; callers in the same tick share a query, callers of the same key share a result"""
+        self.stats['loads'] += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if not self._scheduled:
+                # Runs after every coroutine already scheduled for this tick has queued its key
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        else:
+            self.stats['coalesced'] += 1
+        # Shielded so one cancelled caller does not cancel the lookup for the others
+        return await asyncio.shield(future)
+    
+    async def load_many(self, keys: List[Hashable]) -> List[Optional[Any]]:
+        """Resolve several keys in one batch"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+    
+    def _dispatch(self):
+        """Hand the keys collected so far to a fetch task"""
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+            task = asyncio.create_task(self._fetch(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _fetch(self, futures: Dict[Hashable, asyncio.Future]):
+        """Run one query and fan its rows back out to the waiting futures"""
+        try:
+            rows = await self.fetch_many(list(futures))
+        except Exception as e:
+            logger.error(f"Batch load of {len(futures)} {self.name} keys failed: {e}")
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Every caller may have been cancelled; mark it retrieved so nothing logs it as lost
+                    future.exception()
+            return
+        
+        self.stats['batches'] += 1
+        self.stats['keys_fetched'] += len(futures)
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(rows.get(key))
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Batching counters; loads per batch shows how much was coalesced"""
+        return {
+            'pending': len(self._pending),
+            'in_flight': len(self._tasks),
+            **self.stats
+        }
@@ -0,0 +1,265 @@
+"""
+Database Maintenance
+Scheduled retention with small keyset-batched deletes or archiving and post-purge vacuum hints
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
+
+from core.config.config import Config
+from .coordinator import DatabaseCoordinator
+from .leadership import LeaderElection
+from .pools import MAINTENANCE
+from .archive import ColdArchive
+from core.utils.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseMaintenance:
+    """Runs table retention on a schedule without holding long locks"""
+    
+    # Tables purged by timestamp column; values are (timestamp column, config retention attribute)
+    RETENTION_TABLES = {
+        'system_logs': ('timestamp', 'LOG_CLEANUP_DAYS'),
+        'analytics_data': ('timestamp', 'ANALYTICS_RETENTION_DAYS'),
+        'view_boost_logs': ('timestamp', 'VIEW_BOOST_LOG_RETENTION_DAYS'),
+        'maintenance_runs': ('started_at', 'LOG_CLEANUP_DAYS'),
+        'error_counts': ('bucket', 'LOG_CLEANUP_DAYS'),
+        'request_counts': ('bucket', 'LOG_CLEANUP_DAYS'),
+        'error_fingerprints': ('last_seen', 'LOG_CLEANUP_DAYS')
+    }
+    
+    def __init__(self, coordinator: DatabaseCoordinator, config: Config,
+                 leadership: Optional[LeaderElection] = None, archive: Optional[ColdArchive] = None):
+        self.coordinator = coordinator
+        self.config = config
+        self.leadership = leadership
+        # Tables the archive manages are moved to cold storage instead of deleted
+        self.archive = archive
+        self._running = False
+        self._lock = asyncio.Lock()
+        self._last_run: Optional[Dict[str, Any]] = None
+    
+    async def start(self):
+        """Start the background maintenance loop"""
+        if self._running:
+            return
+        
+        self._running = True
+        # Retention runs once per deployment, on the elected process
+        supervisor.spawn_periodic(
+            'db.maintenance', self.run_retention, self.config.MAINTENANCE_INTERVAL,
+            initial_delay=self.config.MAINTENANCE_INTERVAL,
+            gate=lambda: self.leadership is None or self.leadership.is_leader
+        )
+        logger.info(f"✅ Database maintenance scheduled every {self.config.MAINTENANCE_INTERVAL}s")
+    
+    async def stop(self):
+        """Stop the background maintenance loop"""
+        self._running = False
+        await supervisor.stop('db.maintenance')
+        logger.info("⏹️ Database maintenance stopped")
+    
+    async def run_retention(self, days: Optional[int] = None) -> Dict[str, int]:
+        """Run retention for every managed table and record the run"""
+        async with self._lock:
+            started_at = datetime.utcnow()
+            start = time.perf_counter()
+            results: Dict[str, int] = {}
+            error_message = None
+            
+            try:
+                for table, (column, retention_attr) in self.RETENTION_TABLES.items():
+                    retention_days = days if days is not None else getattr(self.config, retention_attr)
+                    if self.archive and table in self.archive.TABLES:
+                        results[table] = await self.archive.archive_older_than(table, retention_days)
+                    else:
+                        results[table] = await self.purge_older_than(table, column, retention_days)
+                
+                campaign_days = days if days is not None else self.config.CAMPAIGN_RETENTION_DAYS
+                if self.archive:
+                    campaigns_deleted, logs_deleted = await self.archive.archive_completed_campaigns(campaign_days)
+                else:
+                    campaigns_deleted, logs_deleted = await self.purge_completed_campaigns(campaign_days)
+                results['view_boost_campaigns'] = campaigns_deleted
+                results['view_boost_logs'] += logs_deleted
+                
+                # Archived partitions get their own, longer retention so the archive stays bounded
+                if self.archive and self.config.ARCHIVE_RETENTION_DAYS > 0:
+                    pruned = await self.archive.prune(self.config.ARCHIVE_RETENTION_DAYS)
+                    if pruned:
+                        logger.info(f"🗄️ Pruned {pruned} archived partitions older than {self.config.ARCHIVE_RETENTION_DAYS} days")
+                
+                await self._vacuum_tables([table for table, deleted in results.items() if deleted > 0])
+            except Exception as e:
+                error_message = str(e)
+                logger.error(f"❌ Retention run failed: {e}")
+            
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            await self._record_run('retention', started_at, duration_ms, results, error_message)
+            
+            self._last_run = {
+                'started_at': started_at,
+                'duration_ms': duration_ms,
+                'rows_deleted': results,
+                'success': error_message is None
+            }
+            
+            total_deleted = sum(results.values())
+            if total_deleted:
+                logger.info(f"🔄 Retention removed {total_deleted} rows in {duration_ms}ms: {results}")
+            
+            return results
+    
+    async def purge_older_than(self, table: str, column: str, days: int) -> int:
+        """Delete rows older than the given age in keyset-ordered batches"""
+        if table not in self.RETENTION_TABLES:
+            raise ValueError(f"Table {table} is not managed by retention")
+        
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        batch_size = self.config.MAINTENANCE_BATCH_SIZE
+        query = f"""
+            WITH batch AS (
+                SELECT id FROM {table}
+                WHERE {column} < $1 AND id > $2
+                ORDER BY id
+                LIMIT $3
+            ), deleted AS (
+                DELETE FROM {table} WHERE id IN (SELECT id FROM batch) RETURNING id
+            )
+            SELECT COUNT(*) AS deleted, MAX(id) AS last_id FROM deleted
+        """
+        
+        total_deleted = 0
+        last_id = 0
+        while True:
+            async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                row = await conn.fetchrow(query, cutoff, last_id, batch_size)
+            
+            deleted = row['deleted'] if row else 0
+            if not deleted:
+                break
+            
+            total_deleted += deleted
+            last_id = row['last_id']
+            if deleted < batch_size:
+                break
+            
+            # Yield the pool between batches so foreground queries are not starved
+            await asyncio.sleep(self.config.MAINTENANCE_BATCH_DELAY)
+        
+        return total_deleted
+    
+    async def purge_completed_campaigns(self, days: int) -> tuple:
+        """Delete old completed campaigns together with their boost logs"""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        batch_size = self.config.MAINTENANCE_BATCH_SIZE
+        
+        campaigns_deleted = 0
+        logs_deleted = 0
+        last_id = 0
+        while True:
+            async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                async with conn.transaction():
+                    campaign_ids = [
+                        row['id'] for row in await conn.fetch(
+                            """
+                            SELECT id FROM view_boost_campaigns
+                            WHERE status = 'completed' AND updated_at < $1 AND id > $2
+                            ORDER BY id
+                            LIMIT $3
+                            FOR UPDATE SKIP LOCKED
+                            """,
+                            cutoff, last_id, batch_size
+                        )
+                    ]
+                    if not campaign_ids:
+                        break
+                    
+                    logs_deleted += await conn.fetchval(
+                        """
+                        WITH deleted AS (
+                            DELETE FROM view_boost_logs WHERE campaign_id = ANY($1::int[]) RETURNING 1
+                        )
+                        SELECT COUNT(*) FROM deleted
+                        """,
+                        campaign_ids
+                    )
+                    campaigns_deleted += await conn.fetchval(
+                        """
+                        WITH deleted AS (
+                            DELETE FROM view_boost_campaigns WHERE id = ANY($1::int[]) RETURNING 1
+                        )
+                        SELECT COUNT(*) FROM deleted
+                        """,
+                        campaign_ids
+                    )
+            
+            last_id = campaign_ids[-1]
+            if len(campaign_ids) < batch_size:
+                break
+            
+            await asyncio.sleep(self.config.MAINTENANCE_BATCH_DELAY)
+        
+        return campaigns_deleted, logs_deleted
+    
+    async def _vacuum_tables(self, tables: List[str]):
+        """Refresh planner statistics and reclaim space after purges"""
+        for table in tables:
+            try:
+                async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                    await conn.execute(f"VACUUM (ANALYZE) {table}")
+            except Exception as e:
+                # VACUUM needs table ownership; fall back to a plain ANALYZE
+                logger.warning(f"⚠️ VACUUM {table} skipped: {e}")
+                try:
+                    async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                        await conn.execute(f"ANALYZE {table}")
+                except Exception as analyze_error:
+                    logger.error(f"ANALYZE {table} failed: {analyze_error}")
+    
+    async def _record_run(self, task: str, started_at: datetime, duration_ms: int,
+                          rows_deleted: Dict[str, int], error_message: Optional[str] = None):
+        """Persist the outcome of a maintenance run"""
+        try:
+            async with self.coordinator.get_connection(MAINTENANCE) as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO maintenance_runs (task, started_at, duration_ms, rows_deleted, success, error_message)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    """,
+                    task, started_at, duration_ms, rows_deleted,
+                    error_message is None, error_message
+                )
+        except Exception as e:
+            logger.error(f"Failed to record maintenance run: {e}")
+    
+    async def get_recent_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most recent maintenance runs"""
+        try:
+            return await self.coordinator.fetch_all(
+                """
+                SELECT task, started_at, duration_ms, rows_deleted, success, error_message
+                FROM maintenance_runs
+                ORDER BY started_at DESC
+                LIMIT $1
+                """,
+                limit
+            )
+        except Exception as e:
+            logger.error(f"Failed to get maintenance runs: {e}")
+            return []
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get scheduler status and the last run summary"""
+        return {
+            'running': self._running,
+            'leader': self.leadership.is_leader if self.leadership else True,
+            'interval': self.config.MAINTENANCE_INTERVAL,
+            'last_run': self._last_run,
+            'archive': self.archive.get_status() if self.archive else None
+        }
@@ -0,0 +1,167 @@
+"""
+Named Connection Pools
+Separate asyncpg pools per workload class with their own sizes, timeouts and saturation metrics
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import asyncpg
+
+from core.config.config import Config
+from .json_codec import register_json_codecs
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+ANALYTICS = 'analytics'
+MAINTENANCE = 'maintenance'
+
+
+@dataclass
+class PoolSpec:
+    """Size and timeouts of one workload class"""
+    name: str
+    min_size: int
+    max_size: int
+    statement_timeout: float
+    acquire_timeout: float
+    # Connection string of a read replica; the primary is used when empty
+    dsn: Optional[str] = None
+    read_only: bool = False
+
+
+def pool_specs(config: Config) -> Dict[str, PoolSpec]:
+    """Pool classes configured for this process"""
+    return {
+        INTERACTIVE: PoolSpec(
+            name=INTERACTIVE,
+            min_size=config.DB_POOL_SIZE,
+            max_size=config.DB_MAX_POOL_SIZE,
+            statement_timeout=config.INTERACTIVE_STATEMENT_TIMEOUT,
+            acquire_timeout=config.INTERACTIVE_ACQUIRE_TIMEOUT
+        ),
+        ANALYTICS: PoolSpec(
+            name=ANALYTICS,
+            min_size=config.ANALYTICS_POOL_SIZE,
+            max_size=config.ANALYTICS_MAX_POOL_SIZE,
+            statement_timeout=config.ANALYTICS_STATEMENT_TIMEOUT,
+            acquire_timeout=config.ANALYTICS_ACQUIRE_TIMEOUT,
+            dsn=config.ANALYTICS_DB_URL or None,
+            read_only=True
+        ),
+        MAINTENANCE: PoolSpec(
+            name=MAINTENANCE,
+            min_size=0,
+            max_size=config.MAINTENANCE_MAX_POOL_SIZE,
+            statement_timeout=config.MAINTENANCE_STATEMENT_TIMEOUT,
+            acquire_timeout=config.MAINTENANCE_ACQUIRE_TIMEOUT
+        )
+    }
+
+
+class NamedPool:
+    """An asyncpg pool that records how long callers wait for it and how full it is"""
+    
+    def __init__(self, spec: PoolSpec):
+        self.spec = spec
+        self.pool: Optional[asyncpg.Pool] = None
+        self.on_replica = False
+        self._in_use = 0
+        self._waiting = 0
+        self.stats = {
+            'acquires': 0,
+            'acquire_timeouts': 0,
+            'max_in_use': 0,
+            'max_waiting': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0
+        }
+    
+    async def open(self, config: Config, dsn: Optional[str] = None):
+        """Create the underlying pool against the primary or the given DSN"""
+        server_settings = {
+            'application_name': f'telegram_channel_bot:{self.spec.name}',
+            'timezone': 'UTC',
+            'statement_timeout': str(int(self.spec.statement_timeout * 1000))
+        }
+        if self.spec.read_only:
+            server_settings['default_transaction_read_only'] = 'on'
+        
+        connect_args: Dict[str, Any] = {'dsn': dsn} if dsn else {
+            'host': config.DB_HOST,
+            'port': config.DB_PORT,
+            'database': config.DB_NAME,
+            'user': config.DB_USER,
+            'password': config.DB_PASSWORD
+        }
+        self.pool = await asyncpg.create_pool(
+            **connect_args,
+            min_size=min(self.spec.min_size, self.spec.max_size),
+            max_size=self.spec.max_size,
+            # Client-side guard slightly above the server-side statement timeout
+            command_timeout=self.spec.statement_timeout + 5,
+            timeout=config.DB_TIMEOUT,
+            server_settings=server_settings,
+            init=register_json_codecs
+        )
+        self.on_replica = bool(dsn)
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a connection, failing fast when the pool stays saturated"""
+        if self.pool is None:
+            raise RuntimeError(f"Database pool {self.spec.name} not initialized")
+        
+        started = time.monotonic()
+        self._waiting += 1
+        self.stats['max_waiting'] = max(self.stats['max_waiting'], self._waiting)
+        try:
+            conn = await self.pool.acquire(timeout=self.spec.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats['acquire_timeouts'] += 1
+            logger.warning(f"⚠️ Timed out after {self.spec.acquire_timeout}s waiting for the {self.spec.name} pool")
+            raise
+        finally:
+            self._waiting -= 1
+        
+        wait = time.monotonic() - started
+        self.stats['acquires'] += 1
+        self.stats['total_wait'] += wait
+        self.stats['max_wait'] = max(self.stats['max_wait'], wait)
+        self._in_use += 1
+        self.stats['max_in_use'] = max(self.stats['max_in_use'], self._in_use)
+        try:
+            yield conn
+        finally:
+            self._in_use -= 1
+            await self.pool.release(conn)
+    
+    async def close(self):
+        """Close the underlying pool"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Saturation and wait metrics"""
+        acquires = self.stats['acquires']
+        return {
+            'size': self.pool.get_size() if self.pool else 0,
+            'max_size': self.spec.max_size,
+            'idle': self.pool.get_idle_size() if self.pool else 0,
+            'in_use': self._in_use,
+            'waiting': self._waiting,
+            'saturation': self._in_use / self.spec.max_size * 100 if self.spec.max_size else 0.0,
+            'avg_wait_ms': self.stats['total_wait'] / acquires * 1000 if acquires else 0.0,
+            'max_wait_ms': self.stats['max_wait'] * 1000,
+            'acquires': acquires,
+            'acquire_timeouts': self.stats['acquire_timeouts'],
+            'max_in_use': self.stats['max_in_use'],
+            'statement_timeout': self.spec.statement_timeout,
+            'replica': self.on_replica
+        }
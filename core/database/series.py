@@ -0,0 +1,140 @@
+"""
+Time-Bucketed Metric Series
+Builds single-query date_trunc series with generate_series gap filling and summary aggregates
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Tuple
+
+BUCKETS = ('hour', 'day', 'week', 'month')
+AGGREGATES = ('sum', 'avg', 'max', 'min', 'count')
+
+
+@dataclass(frozen=True)
+class MetricSource:
+    """Where a metric's raw events live and how one event contributes to a bucket"""
+    source: str
+    time_column: str
+    value: str
+    entity_column: str
+    aggregate: str = 'sum'
+    condition: str = 'TRUE'
+
+
+# Metrics backed by their own tables; anything else is read from analytics_data
+METRIC_SOURCES: Dict[Tuple[str, str], MetricSource] = {
+    ('channel', 'views_boosted'): MetricSource(
+        source="view_boost_logs vbl JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id",
+        time_column='vbl.timestamp', value='vbl.views_added', entity_column='vbc.channel_id',
+        condition='vbl.success'
+    ),
+    ('channel', 'boosts'): MetricSource(
+        source="view_boost_logs vbl JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id",
+        time_column='vbl.timestamp', value='1', entity_column='vbc.channel_id', aggregate='count'
+    ),
+    ('channel', 'campaigns'): MetricSource(
+        source='view_boost_campaigns', time_column='created_at', value='1',
+        entity_column='channel_id', aggregate='count'
+    ),
+    ('channel', 'member_growth'): MetricSource(
+        source='channel_member_daily', time_column='day::timestamp', value='growth',
+        entity_column='channel_id'
+    ),
+    ('account', 'views_boosted'): MetricSource(
+        source='view_boost_logs', time_column='timestamp', value='views_added',
+        entity_column='account_id', condition='success'
+    ),
+    ('account', 'boosts'): MetricSource(
+        source='view_boost_logs', time_column='timestamp', value='1',
+        entity_column='account_id', aggregate='count'
+    ),
+    ('account', 'failed_boosts'): MetricSource(
+        source='view_boost_logs', time_column='timestamp', value='1',
+        entity_column='account_id', aggregate='count', condition='NOT success'
+    ),
+}
+
+
+def metric_source(entity_type: str, metric: str) -> MetricSource:
+    """Registered source of a metric, falling back to generic analytics_data points"""
+    source = METRIC_SOURCES.get((entity_type, metric))
+    if source is not None:
+        return source
+    return MetricSource(
+        source='analytics_data', time_column='timestamp', value='metric_value',
+        entity_column='entity_id',
+        # $4 and $5 carry the entity type and metric name of the generic lookup
+        condition='entity_type = $4 AND metric_name = $5'
+    )
+
+
+def build_series_query(entity_type: str, metric: str, aggregate: Optional[str] = None) -> Tuple[str, bool]:
+    """SQL for one bucketed series; returns the query and whether it takes the generic parameters
+
+    Parameters: $1 entity id, $2 bucket unit, $3 number of buckets ending with the current one.
+    """
+    source = metric_source(entity_type, metric)
+    aggregate = aggregate or source.aggregate
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Unsupported aggregate: {aggregate}")
+    value = 'COUNT(*)' if aggregate == 'count' else f"{aggregate.upper()}({source.value})"
+    # Counts and sums of missing buckets are zero; averages and extremes stay empty
+    empty = '0' if aggregate in ('sum', 'count') else 'NULL'
+    
+    query = f"""
+        WITH bounds AS (
+            SELECT date_trunc($2::text, LOCALTIMESTAMP) - (($3::int - 1) || ' ' || $2::text)::interval AS first_bucket,
+                   date_trunc($2::text, LOCALTIMESTAMP) AS last_bucket
+        ), buckets AS (
+            SELECT generate_series(first_bucket, last_bucket, ('1 ' || $2::text)::interval) AS bucket
+            FROM bounds
+        ), data AS (
+            SELECT date_trunc($2::text, {source.time_column}) AS bucket,
+                   {value}::numeric AS value,
+                   COUNT(*) AS samples
+            FROM {source.source}
+            WHERE {source.entity_column} = $1
+              AND {source.time_column} >= (SELECT first_bucket FROM bounds)
+              AND {source.condition}
+            GROUP BY 1
+        )
+        SELECT b.bucket,
+               COALESCE(d.value, {empty}) AS value,
+               COALESCE(d.samples, 0) AS samples,
+               SUM(d.value) OVER () AS total,
+               AVG(COALESCE(d.value, {empty})) OVER () AS average,
+               MAX(d.value) OVER () AS peak,
+               SUM(COALESCE(d.samples, 0)) OVER () AS total_samples
+        FROM buckets b
+        LEFT JOIN data d USING (bucket)
+        ORDER BY b.bucket
+    """
+    return query, (entity_type, metric) not in METRIC_SOURCES
+
+
+def _number(value: Any) -> Any:
+    """Plain int or float of a numeric aggregate"""
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def summarize_series(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Split the per-row window aggregates off into a summary"""
+    first = rows[0] if rows else {}
+    peak = _number(first.get('peak'))
+    buckets = [
+        {'bucket': row['bucket'], 'value': _number(row['value']), 'samples': row['samples']}
+        for row in rows
+    ]
+    return {
+        'buckets': buckets,
+        'total': _number(first.get('total')) or 0,
+        'average': float(first.get('average') or 0),
+        'peak': peak or 0,
+        'peak_bucket': next((b['bucket'] for b in buckets if peak is not None and b['value'] == peak), None),
+        'samples': int(first.get('total_samples') or 0)
+    }
@@ -4,13 +4,24 @@ Main database interface for all bot operations
 """
 
 import asyncio
+import json
 import logging
 from typing import Dict, Any, Optional, List, Union
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 
 from core.config.config import Config
 from .coordinator import DatabaseCoordinator
+from .maintenance import DatabaseMaintenance
+from .archive import ColdArchive
+from .leadership import LeaderElection
+from .invalidation import InvalidationBus
+from .error_tracker import ErrorAggregator
+from .loader import BatchLoader
+from .pools import INTERACTIVE, ANALYTICS
+from .series import BUCKETS, build_series_query, summarize_series
+from core.utils.data_export import StreamingExporter, ExportResult
+from core.utils.cache_manager import cache
+from core.utils.supervisor import supervisor
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +29,33 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     """Unified database manager for all bot operations"""
     
-    def __init__(self):
-        self.config = Config()
+    # Account columns needed by screens; session_data and rate_limit_data stay in the database
+    ACCOUNT_COLUMNS = (
+        "id, user_id, phone_number, username, api_id, api_hash, unique_id, "
+        "is_active, is_verified, last_login, created_at, updated_at"
+    )
+    USER_COLUMNS = (
+        "user_id, username, first_name, last_name, is_admin, is_active, "
+        "first_seen, last_seen, settings, created_at, updated_at"
+    )
+    
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.coordinator = DatabaseCoordinator(self.config)
+        self.leadership = LeaderElection(self.config)
+        self.archive = ColdArchive(self.coordinator, self.config) if self.config.ARCHIVE_ENABLED else None
+        self.maintenance = DatabaseMaintenance(self.coordinator, self.config, self.leadership, self.archive)
+        self.exporter = StreamingExporter(self.coordinator, pool=ANALYTICS)
+        self.invalidation = InvalidationBus(self.coordinator, self.config)
+        self.errors = ErrorAggregator(self.coordinator, self.config)
+        # Concurrent point lookups by primary key share one ANY($1) query per tick
+        self.user_loader = BatchLoader('user', self._load_users)
+        self.account_loader = BatchLoader('account', self._load_accounts)
+        self.channel_loader = BatchLoader('channel', self._load_channels)
+        # Bumped on every invalidation; a load that overlaps one does not fill the cache
+        self._generations: Dict[str, int] = {'user': 0, 'channel': 0}
+        self.invalidation.subscribe('user', lambda key: self._evict('user', key))
+        self.invalidation.subscribe('channel', lambda key: self._evict('channel', key))
         self._initialized = False
         
     async def initialize(self):
@@ -31,31 +66,124 @@ class DatabaseManager:
         try:
             await self.coordinator.initialize()
             self._initialized = True
+            await self.invalidation.start()
+            await self.errors.start()
+            await self.leadership.start()
+            if self.archive:
+                await self.archive.start()
+            await self.maintenance.start()
+            supervisor.spawn_periodic(
+                'cache.cleanup', self._cleanup_cache, self.config.ENTITY_CACHE_TTL,
+                initial_delay=self.config.ENTITY_CACHE_TTL
+            )
             logger.info("✅ Database manager initialized")
         except Exception as e:
             logger.error(f"Failed to initialize database manager: {e}")
             raise
     
-    async def execute_query(self, query: str, *args) -> Any:
+    async def execute_query(self, query: str, *args, pool: str = INTERACTIVE) -> Any:
         """Execute a database query"""
         if not self._initialized:
             raise RuntimeError("Database manager not initialized")
         
-        return await self.coordinator.execute_query(query, *args)
+        return await self.coordinator.execute_query(query, *args, pool=pool)
+    
+    async def fetch_one(self, query: str, *args, records: bool = False,
+                        pool: str = INTERACTIVE) -> Optional[Dict[str, Any]]:
+        """Fetch single row; pool=ANALYTICS sends heavy reads to the analytics pool"""
+        if not self._initialized:
+            raise RuntimeError("Database manager not initialized")
+        
+        return await self.coordinator.fetch_one(query, *args, records=records, pool=pool)
     
-    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
-        """Fetch single row"""
+    async def fetch_all(self, query: str, *args, records: bool = False,
+                        pool: str = INTERACTIVE) -> List[Dict[str, Any]]:
+        """Fetch all rows; pool=ANALYTICS sends heavy reads to the analytics pool"""
         if not self._initialized:
             raise RuntimeError("Database manager not initialized")
         
-        return await self.coordinator.fetch_one(query, *args)
+        return await self.coordinator.fetch_all(query, *args, records=records, pool=pool)
     
-    async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Fetch all rows"""
+    async def export_query(self, query: str, *args, fmt: str = 'csv') -> ExportResult:
+        """Stream query results into an export file"""
+        if not self._initialized:
+            raise RuntimeError("Database manager not initialized")
+        
+        return await self.exporter.export(query, *args, fmt=fmt)
+    
+    async def fetch_history(self, table: str, since: datetime, until: Optional[datetime] = None,
+                            **filters) -> List[Dict[str, Any]]:
+        """Rows of an archivable table in a time range, merging archived partitions with live rows
+        
+        Filters are column equality matches applied to both sources.
+        """
         if not self._initialized:
             raise RuntimeError("Database manager not initialized")
+        if table not in ColdArchive.TABLES:
+            raise ValueError(f"Table {table} has no history")
         
-        return await self.coordinator.fetch_all(query, *args)
+        column = ColdArchive.TABLES[table]
+        conditions = [f"{column} >= $1"]
+        params: List[Any] = [since]
+        if until is not None:
+            params.append(until)
+            conditions.append(f"{column} < ${len(params)}")
+        for name, value in filters.items():
+            if not name.isidentifier():
+                raise ValueError(f"Invalid filter column: {name}")
+            params.append(value)
+            conditions.append(f"{name} = ${len(params)}")
+        
+        live = await self.fetch_all(
+            f"SELECT * FROM {table} WHERE {' AND '.join(conditions)} ORDER BY {column}",
+            *params, pool=ANALYTICS
+        )
+        if not self.archive or not self.archive.covers(table, since):
+            return live
+        
+        archived = await self.archive.read(
+            table, since, until,
+            predicate=lambda row: all(str(row.get(name)) == str(value) for name, value in filters.items())
+        )
+        # Archived rows are older than anything still live except around the retention boundary
+        live_ids = {row['id'] for row in live}
+        merged = [row for row in archived if int(row['id']) not in live_ids] + live
+        merged.sort(key=lambda row: row[column])
+        return merged
+    
+    def invalidate(self, entity: str, entity_key: Optional[Any] = None):
+        """Evict cached rows for an entity in this and every other bot process"""
+        self.invalidation.publish(entity, entity_key)
+    
+    def _evict(self, entity: str, entity_key: Optional[str]):
+        """Drop cached rows and void fills that started before this invalidation"""
+        self._generations[entity] += 1
+        cache.invalidate(entity, entity_key)
+    
+    # Batch loader queries
+    async def _load_users(self, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch users keyed by user_id"""
+        rows = await self.fetch_all(
+            f"SELECT {self.USER_COLUMNS} FROM users WHERE user_id = ANY($1::bigint[])",
+            user_ids
+        )
+        return {row['user_id']: row for row in rows}
+    
+    async def _load_accounts(self, account_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch accounts keyed by id"""
+        rows = await self.fetch_all(
+            f"SELECT {self.ACCOUNT_COLUMNS} FROM telegram_accounts WHERE id = ANY($1::int[])",
+            account_ids
+        )
+        return {row['id']: row for row in rows}
+    
+    async def _load_channels(self, channel_db_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch channels keyed by database id"""
+        rows = await self.fetch_all(
+            "SELECT * FROM telegram_channels WHERE id = ANY($1::int[])",
+            channel_db_ids
+        )
+        return {row['id']: row for row in rows}
     
     # User Management Operations
     async def create_user(self, user_id: int, username: Optional[str] = None, first_name: Optional[str] = None, 
@@ -76,21 +204,32 @@ class DatabaseManager:
                 """,
                 user_id, username, first_name, last_name, is_admin
             )
+            self.invalidate('user', user_id)
             return True
         except Exception as e:
             logger.error(f"Failed to create/update user {user_id}: {e}")
             return False
     
     async def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Get user by ID"""
-        return await self.fetch_one(
-            "SELECT * FROM users WHERE user_id = $1",
-            user_id
-        )
+        """Get user by ID, served from the in-process cache when possible"""
+        cache_key = f"user:{user_id}:row"
+        user = cache.get(cache_key)
+        if user is None:
+            generation = self._generations['user']
+            user = await self.user_loader.load(user_id)
+            if user is None:
+                return None
+            # A write that landed during the load may have been read before it committed
+            if self._generations['user'] == generation:
+                cache.set(cache_key, user, ttl=self.config.ENTITY_CACHE_TTL)
+        return dict(user)
     
     async def get_all_users(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all users"""
-        query = "SELECT * FROM users"
+        query = (
+            "SELECT user_id, username, first_name, last_name, is_admin, is_active, "
+            "first_seen, last_seen, created_at FROM users"
+        )
         if active_only:
             query += " WHERE is_active = TRUE"
         query += " ORDER BY created_at DESC"
@@ -102,13 +241,34 @@ class DatabaseManager:
         try:
             await self.execute_query(
                 "UPDATE users SET settings = $2, updated_at = NOW() WHERE user_id = $1",
-                user_id, json.dumps(settings)
+                user_id, settings
             )
+            self.invalidate('user', user_id)
             return True
         except Exception as e:
             logger.error(f"Failed to update user settings for {user_id}: {e}")
             return False
     
+    async def get_user_status_summary(self) -> Dict[str, Any]:
+        """Get system-wide user counts in a single aggregate query"""
+        try:
+            row = await self.fetch_one(
+                """
+                SELECT
+                    COUNT(*) AS total_users,
+                    COUNT(*) FILTER (WHERE is_active) AS active_users,
+                    COUNT(*) FILTER (WHERE is_admin) AS admin_users,
+                    COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') AS new_users_24h,
+                    COUNT(*) FILTER (WHERE last_seen >= NOW() - INTERVAL '24 hours') AS seen_users_24h
+                FROM users
+                """,
+                pool=ANALYTICS
+            )
+            return row or {}
+        except Exception as e:
+            logger.error(f"Failed to get user status summary: {e}")
+            return {}
+    
     # Telegram Account Management
     async def add_telegram_account(self, user_id: int, phone_number: str, 
                                   api_id: int, api_hash: str, unique_id: Optional[str] = None) -> Optional[int]:
@@ -134,7 +294,7 @@ class DatabaseManager:
     
     async def get_user_accounts(self, user_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get user's Telegram accounts"""
-        query = "SELECT * FROM telegram_accounts WHERE user_id = $1"
+        query = f"SELECT {self.ACCOUNT_COLUMNS} FROM telegram_accounts WHERE user_id = $1"
         if active_only:
             query += " AND is_active = TRUE"
         query += " ORDER BY created_at DESC"
@@ -143,11 +303,41 @@ class DatabaseManager:
     
     async def get_account_by_id(self, account_id: int) -> Optional[Dict[str, Any]]:
         """Get account by ID"""
-        return await self.fetch_one(
-            "SELECT * FROM telegram_accounts WHERE id = $1",
-            account_id
+        account = await self.account_loader.load(account_id)
+        # Callers sharing a batch must not share a mutable row
+        return dict(account) if account is not None else None
+    
+    async def get_verified_accounts(self, after_id: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """One page of active verified accounts with their API credentials, ordered by id after after_id"""
+        return await self.fetch_all(
+            """
+            SELECT id, phone_number, api_id, api_hash
+            FROM telegram_accounts
+            WHERE is_verified = TRUE AND is_active = TRUE AND id > $1
+            ORDER BY id
+            LIMIT $2
+            """,
+            after_id, limit
         )
     
+    async def claim_orphaned_accounts(self, user_id: int) -> int:
+        """Give accounts recovered from session files without an owner to a user; returns how many"""
+        try:
+            return await self.execute_query(
+                """
+                WITH claimed AS (
+                    UPDATE telegram_accounts SET user_id = $1
+                    WHERE user_id IS NULL
+                    RETURNING id
+                )
+                SELECT COUNT(*) FROM claimed
+                """,
+                user_id
+            )
+        except Exception as e:
+            logger.error(f"Failed to claim orphaned accounts for user {user_id}: {e}")
+            return 0
+    
     async def update_account_session(self, account_id: int, session_data: str) -> bool:
         """Update account session data"""
         try:
@@ -176,6 +366,51 @@ class DatabaseManager:
             logger.error(f"Failed to deactivate account {account_id}: {e}")
             return False
     
+    async def get_account_status_summary(self, stale_days: int = 7) -> Dict[str, Any]:
+        """Get system-wide account counts and health buckets in a single aggregate query"""
+        try:
+            row = await self.fetch_one(
+                """
+                WITH scored AS (
+                    SELECT
+                        user_id, is_active, is_verified, last_login, created_at, updated_at,
+                        100
+                        - CASE WHEN is_verified THEN 0 ELSE 30 END
+                        - CASE WHEN is_active THEN 0 ELSE 50 END
+                        - CASE WHEN last_login IS NULL OR last_login < NOW() - make_interval(days => $1)
+                               THEN 20 ELSE 0 END AS health_score
+                    FROM telegram_accounts
+                )
+                SELECT
+                    COUNT(*) AS total_accounts,
+                    COUNT(*) FILTER (WHERE is_active) AS active_accounts,
+                    COUNT(*) FILTER (WHERE is_verified) AS verified_accounts,
+                    COUNT(*) FILTER (WHERE NOT is_active) AS inactive_accounts,
+                    COUNT(*) FILTER (WHERE is_active AND NOT is_verified) AS auth_issues,
+                    COUNT(*) FILTER (WHERE health_score >= 80) AS healthy_count,
+                    COUNT(*) FILTER (WHERE health_score >= 50 AND health_score < 80) AS warning_count,
+                    COUNT(*) FILTER (WHERE health_score < 50) AS critical_count,
+                    COALESCE(AVG(health_score), 0) AS avg_health,
+                    COUNT(DISTINCT user_id) FILTER (WHERE health_score < 50) AS users_with_issues,
+                    COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') AS new_accounts_24h,
+                    COUNT(*) FILTER (
+                        WHERE is_active AND is_verified AND last_login >= NOW() - INTERVAL '24 hours'
+                    ) AS activated_24h,
+                    COUNT(*) FILTER (
+                        WHERE NOT is_active AND updated_at >= NOW() - INTERVAL '24 hours'
+                    ) AS deactivated_24h
+                FROM scored
+                """,
+                stale_days,
+                pool=ANALYTICS
+            )
+            if row:
+                row['avg_health'] = float(row['avg_health'])
+            return row or {}
+        except Exception as e:
+            logger.error(f"Failed to get account status summary: {e}")
+            return {}
+    
     # Channel Management
     async def add_channel(self, user_id: int, channel_id: int, username: Optional[str] = None,
                          title: Optional[str] = None, description: Optional[str] = None) -> Optional[int]:
@@ -195,20 +430,28 @@ class DatabaseManager:
                 """,
                 user_id, channel_id, username, title, description
             )
+            self.invalidate('channel', user_id)
             return db_channel_id
         except Exception as e:
             logger.error(f"Failed to add channel {channel_id}: {e}")
             return None
     
     async def get_user_channels(self, user_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
-        """Get user's channels"""
+        """Get user's channels, served from the in-process cache when possible"""
         try:
-            query = "SELECT * FROM telegram_channels WHERE user_id = $1"
-            if active_only:
-                query += " AND is_active = TRUE"
-            query += " ORDER BY created_at DESC"
-            
-            return await self.fetch_all(query, user_id)
+            cache_key = f"channel:{user_id}:list:{active_only}"
+            channels = cache.get(cache_key)
+            if channels is None:
+                query = "SELECT * FROM telegram_channels WHERE user_id = $1"
+                if active_only:
+                    query += " AND is_active = TRUE"
+                query += " ORDER BY created_at DESC"
+                
+                generation = self._generations['channel']
+                channels = await self.fetch_all(query, user_id)
+                if self._generations['channel'] == generation:
+                    cache.set(cache_key, channels, ttl=self.config.ENTITY_CACHE_TTL)
+            return [dict(channel) for channel in channels]
         except Exception as e:
             logger.error(f"Failed to get user channels: {e}")
             return []
@@ -216,10 +459,8 @@ class DatabaseManager:
     async def get_channel_by_id(self, channel_db_id: int) -> Optional[Dict[str, Any]]:
         """Get channel by database ID"""
         try:
-            return await self.fetch_one(
-                "SELECT * FROM telegram_channels WHERE id = $1",
-                channel_db_id
-            )
+            channel = await self.channel_loader.load(channel_db_id)
+            return dict(channel) if channel is not None else None
         except Exception as e:
             logger.error(f"Failed to get channel by id {channel_db_id}: {e}")
             return None
@@ -231,6 +472,17 @@ class DatabaseManager:
             channel_id
         )
     
+    async def get_monitored_channels(self) -> List[Dict[str, Any]]:
+        """Active channels of active users; settings holds the owner's user settings"""
+        return await self.fetch_all(
+            """
+            SELECT c.*, u.settings
+            FROM telegram_channels c
+            JOIN users u ON c.user_id = u.user_id
+            WHERE c.is_active = TRUE AND u.is_active = TRUE
+            """
+        )
+    
     async def update_channel_info(self, channel_db_id: int, title: Optional[str] = None, 
                                  description: Optional[str] = None, member_count: Optional[int] = None) -> bool:
         """Update channel information"""
@@ -260,9 +512,12 @@ class DatabaseManager:
             updates.append(f"updated_at = NOW()")
             params.append(channel_db_id)
             
-            query = f"UPDATE telegram_channels SET {', '.join(updates)} WHERE id = ${param_count}"
+            query = f"UPDATE telegram_channels SET {', '.join(updates)} WHERE id = ${param_count} RETURNING user_id"
             
-            await self.execute_query(query, *params)
+            user_id = await self.execute_query(query, *params)
+            # No row means no such channel; a None key would evict every user's channel lists
+            if user_id is not None:
+                self.invalidate('channel', user_id)
             return True
         except Exception as e:
             logger.error(f"Failed to update channel {channel_db_id}: {e}")
@@ -288,24 +543,73 @@ class DatabaseManager:
             logger.error(f"Failed to create view boost campaign: {e}")
             return None
     
-    async def get_user_campaigns(self, user_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get user's view boost campaigns"""
+    async def get_user_campaigns(self, user_id: int, status: Optional[str] = None,
+                                 campaign_type: Optional[str] = None,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get user's view boost campaigns, newest first"""
         query = """
         SELECT vbc.*, c.title as channel_title, c.username as channel_username
         FROM view_boost_campaigns vbc
-        JOIN channels c ON vbc.channel_id = c.id
+        JOIN telegram_channels c ON vbc.channel_id = c.id
         WHERE vbc.user_id = $1
         """
         params: List[Any] = [user_id]
         
         if status is not None:
-            query += " AND vbc.status = $2"
             params.append(status)
+            query += f" AND vbc.status = ${len(params)}"
+        
+        if campaign_type is not None:
+            params.append(campaign_type)
+            query += f" AND vbc.campaign_type = ${len(params)}"
         
         query += " ORDER BY vbc.created_at DESC"
         
+        if limit is not None:
+            params.append(limit)
+            query += f" LIMIT ${len(params)}"
+        
         return await self.fetch_all(query, *params)
     
+    async def get_campaign_status_summary(self) -> Dict[str, Any]:
+        """Get system-wide campaign counts in a single aggregate query"""
+        try:
+            row = await self.fetch_one(
+                """
+                SELECT
+                    COUNT(*) AS total_campaigns,
+                    COUNT(*) FILTER (WHERE status = 'active') AS active_campaigns,
+                    COUNT(*) FILTER (WHERE status = 'completed') AS completed_campaigns,
+                    COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') AS new_campaigns_24h
+                FROM view_boost_campaigns
+                """,
+                pool=ANALYTICS
+            )
+            return row or {}
+        except Exception as e:
+            logger.error(f"Failed to get campaign status summary: {e}")
+            return {}
+    
+    async def get_campaign_totals(self, user_id: int) -> List[Dict[str, Any]]:
+        """Campaign counts and view totals of a user per status, with views of recently created campaigns"""
+        return await self.fetch_all(
+            """
+            SELECT status,
+                   COUNT(*) AS count,
+                   COALESCE(SUM(target_views), 0)::bigint AS target_views,
+                   COALESCE(SUM(current_views), 0)::bigint AS current_views,
+                   COALESCE(SUM(current_views) FILTER (WHERE created_at >= NOW() - INTERVAL '1 day'), 0)::bigint AS views_1d,
+                   COALESCE(SUM(current_views) FILTER (WHERE created_at >= NOW() - INTERVAL '7 days'), 0)::bigint AS views_7d,
+                   COALESCE(SUM(current_views) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days'), 0)::bigint AS views_30d
+            FROM view_boost_campaigns
+            WHERE user_id = $1
+            GROUP BY status
+            ORDER BY status
+            """,
+            user_id,
+            pool=ANALYTICS
+        )
+    
     async def update_campaign_progress(self, campaign_id: int, current_views: int, 
                                      status: Optional[str] = None) -> bool:
         """Update campaign progress"""
@@ -342,6 +646,18 @@ class DatabaseManager:
             logger.error(f"Failed to log view boost: {e}")
             return False
     
+    async def get_enabled_boost_configs(self, user_id: int) -> List[Dict[str, Any]]:
+        """Auto boost configurations a user has enabled, with their channel's title"""
+        return await self.fetch_all(
+            """
+            SELECT bc.*, tc.channel_title, tc.channel_identifier 
+            FROM boost_configs bc
+            JOIN telegram_channels tc ON bc.channel_id = tc.id
+            WHERE bc.user_id = $1 AND bc.is_enabled = TRUE
+            """,
+            user_id
+        )
+    
     # Analytics Operations
     async def store_analytics_data(self, entity_type: str, entity_id: int, 
                                   metric_name: str, metric_value: float,
@@ -353,14 +669,138 @@ class DatabaseManager:
                 INSERT INTO analytics_data (entity_type, entity_id, metric_name, metric_value, metadata, timestamp)
                 VALUES ($1, $2, $3, $4, $5, NOW())
                 """,
-                entity_type, entity_id, metric_name, metric_value, 
-                json.dumps(metadata or {})
+                entity_type, entity_id, metric_name, metric_value, metadata or {}
             )
             return True
         except Exception as e:
             logger.error(f"Failed to store analytics data: {e}")
             return False
     
+    async def record_member_count(self, channel_db_id: int, member_count: int) -> Optional[int]:
+        """Store a member count point only when it differs from the last one; returns the change or None"""
+        try:
+            return await self.execute_query(
+                """
+                WITH last AS (
+                    SELECT member_count FROM channel_member_points
+                    WHERE channel_id = $1
+                    ORDER BY sampled_at DESC
+                    LIMIT 1
+                ), point AS (
+                    INSERT INTO channel_member_points (channel_id, sampled_at, member_count, delta)
+                    SELECT $1, NOW(), $2, $2 - COALESCE((SELECT member_count FROM last), $2)
+                    WHERE NOT EXISTS (SELECT 1 FROM last WHERE member_count = $2)
+                    RETURNING delta
+                ), daily AS (
+                    INSERT INTO channel_member_daily (channel_id, day, member_count, growth)
+                    SELECT $1, CURRENT_DATE, $2, delta FROM point
+                    ON CONFLICT (channel_id, day) DO UPDATE SET
+                        member_count = EXCLUDED.member_count,
+                        growth = channel_member_daily.growth + EXCLUDED.growth
+                )
+                SELECT delta FROM point
+                """,
+                channel_db_id, member_count
+            )
+        except Exception as e:
+            logger.error(f"Failed to record member count for channel {channel_db_id}: {e}")
+            return None
+    
+    async def get_metric_series(self, entity_type: str, entity_id: int, metric: str,
+                                bucket: str = 'day', buckets: int = 30,
+                                aggregate: Optional[str] = None) -> Dict[str, Any]:
+        """Gap-filled bucketed series of a metric plus its total, average and peak, in one query"""
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unsupported bucket: {bucket}")
+        query, generic = build_series_query(entity_type, metric, aggregate)
+        args: List[Any] = [entity_id, bucket, buckets]
+        if generic:
+            args += [entity_type, metric]
+        rows = await self.fetch_all(query, *args, pool=ANALYTICS)
+        return summarize_series(rows)
+    
+    async def get_campaign_summary(self, channel_db_id: int) -> Dict[str, Any]:
+        """Campaign counts and view totals of a channel aggregated in the database"""
+        row = await self.fetch_one(
+            """
+            SELECT
+                COUNT(*) AS total_campaigns,
+                COUNT(*) FILTER (WHERE status = 'active') AS active_campaigns,
+                COUNT(*) FILTER (WHERE status = 'completed') AS completed_campaigns,
+                COALESCE(SUM(current_views), 0)::bigint AS total_views,
+                COALESCE(SUM(target_views), 0)::bigint AS total_target_views,
+                COALESCE(MAX(current_views), 0) AS best_campaign_views,
+                MAX(created_at) AS last_campaign_at
+            FROM view_boost_campaigns
+            WHERE channel_id = $1
+            """,
+            channel_db_id,
+            pool=ANALYTICS
+        )
+        return row or {}
+    
+    async def get_growth_series(self, user_id: int, channel_db_id: Optional[int] = None,
+                                days: int = 30) -> List[Dict[str, Any]]:
+        """Daily member growth and boosted views of a user's channels, or one of them, one row per day"""
+        return await self.fetch_all(
+            """
+            WITH days AS (
+                SELECT generate_series(CURRENT_DATE - ($3::int - 1), CURRENT_DATE, INTERVAL '1 day')::date AS day
+            ), members AS (
+                SELECT m.day, SUM(m.growth) AS member_growth
+                FROM channel_member_daily m
+                JOIN telegram_channels c ON m.channel_id = c.id
+                WHERE c.user_id = $1 AND ($2::int IS NULL OR c.id = $2) AND m.day > CURRENT_DATE - $3::int
+                GROUP BY m.day
+            ), views AS (
+                SELECT vbl.timestamp::date AS day, SUM(vbl.views_added) AS views
+                FROM view_boost_logs vbl
+                JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id
+                WHERE vbc.user_id = $1 AND ($2::int IS NULL OR vbc.channel_id = $2)
+                  AND vbl.success AND vbl.timestamp >= CURRENT_DATE - ($3::int - 1)
+                GROUP BY 1
+            )
+            SELECT days.day,
+                   COALESCE(members.member_growth, 0)::bigint AS member_growth,
+                   COALESCE(views.views, 0)::bigint AS views
+            FROM days
+            LEFT JOIN members USING (day)
+            LEFT JOIN views USING (day)
+            ORDER BY days.day
+            """,
+            user_id, channel_db_id, days,
+            pool=ANALYTICS
+        )
+    
+    async def get_channel_comparison(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Members, 30 day growth and boosted views of a user's most boosted active channels"""
+        return await self.fetch_all(
+            """
+            SELECT c.title, COALESCE(c.member_count, 0) AS members,
+                   COALESCE(m.member_growth, 0)::bigint AS member_growth,
+                   COALESCE(v.views, 0)::bigint AS views
+            FROM telegram_channels c
+            LEFT JOIN (
+                SELECT channel_id, SUM(growth) AS member_growth
+                FROM channel_member_daily
+                WHERE day > CURRENT_DATE - 30
+                GROUP BY channel_id
+            ) m ON m.channel_id = c.id
+            LEFT JOIN (
+                SELECT vbc.channel_id, SUM(vbl.views_added) AS views
+                FROM view_boost_logs vbl
+                JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id
+                WHERE vbc.user_id = $1 AND vbl.success AND vbl.timestamp >= NOW() - INTERVAL '30 days'
+                GROUP BY vbc.channel_id
+            ) v ON v.channel_id = c.id
+            WHERE c.user_id = $1 AND c.is_active = TRUE
+            ORDER BY views DESC, members DESC
+            LIMIT $2
+            """,
+            user_id, limit,
+            pool=ANALYTICS
+        )
+    
     async def get_analytics_data(self, entity_type: str, entity_id: Optional[int] = None,
                                metric_name: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get analytics data"""
@@ -381,7 +821,134 @@ class DatabaseManager:
         query += f" ORDER BY timestamp DESC LIMIT ${param_count}"
         params.append(limit)
         
-        return await self.fetch_all(query, *params)
+        return await self.fetch_all(query, *params, pool=ANALYTICS)
+    
+    async def export_user_channels(self, user_id: int, fmt: str = 'csv') -> ExportResult:
+        """Export a user's channels with campaign totals"""
+        return await self.export_query(
+            """
+            SELECT
+                c.id, c.channel_id, c.title, c.username, c.member_count, c.is_active, c.created_at,
+                COUNT(vbc.id) AS campaigns,
+                COALESCE(SUM(vbc.current_views), 0) AS views_boosted
+            FROM telegram_channels c
+            LEFT JOIN view_boost_campaigns vbc ON vbc.channel_id = c.id
+            WHERE c.user_id = $1
+            GROUP BY c.id
+            ORDER BY c.created_at DESC
+            """,
+            user_id, fmt=fmt
+        )
+    
+    async def export_user_analytics(self, user_id: int, days: int = 90, fmt: str = 'csv') -> ExportResult:
+        """Export analytics data points for a user's channels, including archived points"""
+        if not self._initialized:
+            raise RuntimeError("Database manager not initialized")
+        
+        # Archive partitions are dated in UTC like the rows they were cut from
+        since = datetime.utcnow() - timedelta(days=days)
+        archived = None
+        if self.archive and self.archive.covers('analytics_data', since):
+            channels = {
+                channel['id']: channel['title']
+                for channel in await self.get_user_channels(user_id, active_only=False)
+            }
+            
+            async def archived_batches():
+                """Archived points one partition at a time, so the export never holds them all"""
+                async for rows in self.archive.iter_parts(
+                    'analytics_data', since,
+                    predicate=lambda row: row['entity_type'] == 'channel' and int(row['entity_id']) in channels
+                ):
+                    # Gzip CSV partitions hold text; align archived values with the live column types
+                    yield [
+                        {
+                            'timestamp': row['timestamp'],
+                            'channel_db_id': int(row['entity_id']),
+                            'channel_title': channels[int(row['entity_id'])],
+                            'metric_name': row['metric_name'],
+                            'metric_value': float(row['metric_value']) if row['metric_value'] not in (None, '') else None,
+                            'metadata': json.loads(row['metadata']) if isinstance(row['metadata'], str) and row['metadata'] else row['metadata']
+                        }
+                        for row in rows
+                    ]
+            
+            archived = archived_batches()
+        
+        return await self.exporter.export(
+            """
+            SELECT
+                ad.timestamp, ad.entity_id AS channel_db_id, c.title AS channel_title,
+                ad.metric_name, ad.metric_value, ad.metadata
+            FROM analytics_data ad
+            JOIN telegram_channels c ON ad.entity_type = 'channel' AND ad.entity_id = c.id
+            WHERE c.user_id = $1 AND ad.timestamp >= NOW() - make_interval(days => $2)
+            ORDER BY ad.timestamp
+            """,
+            user_id, days, fmt=fmt, prepend=archived
+        )
+    
+    # Emoji Reaction Operations
+    async def get_reaction_stats(self, user_id: int, top: int = 5) -> Dict[str, Any]:
+        """Reaction totals of a user over several windows with the most used emojis and channels
+        
+        top=0 returns the totals alone.
+        """
+        totals = await self.fetch_one(
+            """
+            SELECT
+                COALESCE(SUM(reaction_count), 0)::bigint AS total_reactions,
+                COALESCE(SUM(reaction_count) FILTER (WHERE updated_at >= CURRENT_DATE), 0)::bigint AS reactions_today,
+                COALESCE(SUM(reaction_count) FILTER (WHERE updated_at >= NOW() - INTERVAL '7 days'), 0)::bigint AS weekly_reactions,
+                COALESCE(SUM(reaction_count) FILTER (WHERE updated_at >= NOW() - INTERVAL '30 days'), 0)::bigint AS monthly_reactions,
+                COUNT(DISTINCT channel_id) FILTER (WHERE auto_react_enabled) AS active_channels
+            FROM emoji_reactions
+            WHERE user_id = $1
+            """,
+            user_id,
+            pool=ANALYTICS
+        )
+        stats = {**(totals or {}), 'top_emojis': [], 'top_channels': []}
+        if not top:
+            return stats
+        
+        stats['top_emojis'] = await self.fetch_all(
+            """
+            SELECT emoji, SUM(reaction_count)::bigint AS total
+            FROM emoji_reactions
+            WHERE user_id = $1
+            GROUP BY emoji
+            ORDER BY total DESC, emoji
+            LIMIT $2
+            """,
+            user_id, top,
+            pool=ANALYTICS
+        )
+        stats['top_channels'] = await self.fetch_all(
+            """
+            SELECT c.title, SUM(er.reaction_count)::bigint AS reactions
+            FROM emoji_reactions er
+            JOIN telegram_channels c ON er.channel_id = c.id
+            WHERE er.user_id = $1
+            GROUP BY c.id, c.title
+            ORDER BY reactions DESC, c.id
+            LIMIT $2
+            """,
+            user_id, top,
+            pool=ANALYTICS
+        )
+        return stats
+    
+    async def get_auto_react_channels(self) -> List[Dict[str, Any]]:
+        """Channels with automatic reactions enabled by any user"""
+        return await self.fetch_all(
+            """
+            SELECT DISTINCT c.id, er.channel_id, er.user_id, c.title
+            FROM telegram_channels c
+            JOIN emoji_reactions er ON c.id = er.channel_id
+            WHERE er.auto_react_enabled = TRUE
+            """
+        )
     
     # System Operations
     async def log_system_event(self, log_level: str, module: str, message: str,
@@ -393,7 +960,7 @@ class DatabaseManager:
                 INSERT INTO system_logs (log_level, module, message, metadata, timestamp)
                 VALUES ($1, $2, $3, $4, NOW())
                 """,
-                log_level, module, message, json.dumps(metadata or {})
+                log_level, module, message, metadata or {}
             )
             return True
         except Exception as e:
@@ -422,17 +989,28 @@ class DatabaseManager:
         
         return await self.fetch_all(query, *params)
     
+    async def get_recent_activity(self, hours: int = 1) -> Dict[str, int]:
+        """Campaigns created and errors logged system-wide in the last hours"""
+        row = await self.fetch_one(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM view_boost_campaigns
+                 WHERE created_at >= NOW() - make_interval(hours => $1)) AS campaigns,
+                (SELECT COUNT(*) FROM system_logs
+                 WHERE log_level = 'ERROR' AND timestamp >= NOW() - make_interval(hours => $1)) AS errors
+            """,
+            hours,
+            pool=ANALYTICS
+        )
+        return row or {'campaigns': 0, 'errors': 0}
+    
     async def cleanup_old_logs(self, days: Optional[int] = None) -> int:
         """Cleanup old log entries"""
         if days is None:
             days = self.config.LOG_CLEANUP_DAYS
         
         try:
-            deleted_count = await self.execute_query(
-                "DELETE FROM system_logs WHERE timestamp < NOW() - INTERVAL '%s days' RETURNING COUNT(*)",
-                days
-            )
-            return deleted_count or 0
+            return await self.maintenance.purge_older_than('system_logs', 'timestamp', days)
         except Exception as e:
             logger.error(f"Failed to cleanup old logs: {e}")
             return 0
@@ -460,9 +1038,24 @@ class DatabaseManager:
             logger.error(f"Failed to get health status: {e}")
             return {'error': str(e)}
     
+    async def _cleanup_cache(self):
+        """Drop expired entries so rows nobody asks for again do not stay in memory"""
+        removed = cache.cleanup_expired()
+        if removed:
+            logger.debug(f"🧹 Removed {removed} expired cache entries")
+    
     async def close(self):
         """Close database manager"""
         try:
+            await supervisor.stop('cache.cleanup')
+            if self.maintenance:
+                await self.maintenance.stop()
+            if self.leadership:
+                await self.leadership.stop()
+            if self.errors:
+                await self.errors.stop()
+            if self.invalidation:
+                await self.invalidation.stop()
             if self.coordinator:
                 await self.coordinator.close()
             self._initialized = False
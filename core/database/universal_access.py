@@ -28,22 +28,20 @@ class UniversalDatabaseAccess:
         return await self.db.get_user(user_id)
     
     async def get_user_with_settings(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Get user with parsed settings"""
+        """Get user with settings decoded by the JSONB codec"""
         user = await self.db.get_user(user_id)
-        if user and user.get('settings'):
-            try:
-                import json
-                user['settings'] = json.loads(user['settings'])
-            except:
-                user['settings'] = {}
+        if user and not isinstance(user.get('settings'), dict):
+            user['settings'] = {}
         return user
     
     async def update_user_last_seen(self, user_id: int) -> bool:
         """Update user's last seen timestamp"""
-        return await self.db.execute_query(
-            "UPDATE users SET last_seen = NOW(), updated_at = NOW() WHERE user_id = $1",
+        updated = await self.db.execute_query(
+            "UPDATE users SET last_seen = NOW(), updated_at = NOW() WHERE user_id = $1 RETURNING user_id",
             user_id
-        ) is not None
+        )
+        self.db.invalidate('user', user_id)
+        return updated is not None
     
     # Channel Operations with Validation
     async def add_channel_safe(self, user_id: int, channel_id: int, username: str = None,
@@ -205,7 +203,7 @@ class UniversalDatabaseAccess:
                 if settings:
                     await self.db.execute_query(
                         "UPDATE view_boost_campaigns SET settings = $2 WHERE id = $1",
-                        campaign_id, json.dumps(settings)
+                        campaign_id, settings
                     )
                 
                 # Log campaign creation
@@ -244,7 +242,7 @@ class UniversalDatabaseAccess:
             """
             SELECT vbc.*, c.title as channel_title, c.username as channel_username
             FROM view_boost_campaigns vbc
-            JOIN channels c ON vbc.channel_id = c.id
+            JOIN telegram_channels c ON vbc.channel_id = c.id
             WHERE vbc.id = $1
             """,
             campaign_id
@@ -344,18 +342,15 @@ class UniversalDatabaseAccess:
             # Get database health
             db_health = await self.db.get_health_status()
             
-            # Get user statistics
-            total_users = len(await self.db.get_all_users(active_only=False))
-            active_users = len(await self.db.get_all_users(active_only=True))
-            
-            # Get account statistics
-            all_accounts = await self.db.fetch_all("SELECT * FROM telegram_accounts")
-            active_accounts = [a for a in all_accounts if a['is_active']]
-            verified_accounts = [a for a in all_accounts if a['is_verified']]
+            # Aggregate counts server-side instead of loading whole tables
+            users = await self.db.get_user_status_summary()
+            accounts = await self.db.get_account_status_summary()
+            campaigns = await self.db.get_campaign_status_summary()
             
-            # Get campaign statistics
-            all_campaigns = await self.db.fetch_all("SELECT * FROM view_boost_campaigns")
-            active_campaigns = [c for c in all_campaigns if c['status'] == 'active']
+            total_users = users.get('total_users', 0)
+            active_users = users.get('active_users', 0)
+            total_accounts = accounts.get('total_accounts', 0)
+            verified_accounts = accounts.get('verified_accounts', 0)
             
             # Get recent errors
             recent_errors = await self.db.get_system_logs('ERROR', limit=10)
@@ -368,14 +363,14 @@ class UniversalDatabaseAccess:
                     'activity_rate': (active_users / total_users * 100) if total_users > 0 else 0
                 },
                 'accounts': {
-                    'total': len(all_accounts),
-                    'active': len(active_accounts),
-                    'verified': len(verified_accounts),
-                    'verification_rate': (len(verified_accounts) / len(all_accounts) * 100) if all_accounts else 0
+                    'total': total_accounts,
+                    'active': accounts.get('active_accounts', 0),
+                    'verified': verified_accounts,
+                    'verification_rate': (verified_accounts / total_accounts * 100) if total_accounts > 0 else 0
                 },
                 'campaigns': {
-                    'total': len(all_campaigns),
-                    'active': len(active_campaigns)
+                    'total': campaigns.get('total_campaigns', 0),
+                    'active': campaigns.get('active_campaigns', 0)
                 },
                 'recent_errors': recent_errors,
                 'timestamp': datetime.now()
@@ -417,25 +412,17 @@ class UniversalDatabaseAccess:
             logs_deleted = await self.db.cleanup_old_logs(days)
             cleanup_results['logs'] = logs_deleted
             
-            # Cleanup old analytics data (keep last 90 days)
-            analytics_days = days or 90
-            analytics_deleted = await self.db.execute_query(
-                "DELETE FROM analytics_data WHERE timestamp < NOW() - INTERVAL '%s days' RETURNING COUNT(*)",
-                analytics_days
+            # Cleanup old analytics data (keep last 90 days by default)
+            analytics_days = days or self.db.config.ANALYTICS_RETENTION_DAYS
+            cleanup_results['analytics'] = await self.db.maintenance.purge_older_than(
+                'analytics_data', 'timestamp', analytics_days
             )
-            cleanup_results['analytics'] = analytics_deleted or 0
             
-            # Cleanup old completed campaigns (keep last 30 days)
-            campaigns_days = 30
-            campaigns_deleted = await self.db.execute_query(
-                """
-                DELETE FROM view_boost_campaigns 
-                WHERE status = 'completed' AND updated_at < NOW() - INTERVAL '%s days' 
-                RETURNING COUNT(*)
-                """,
-                campaigns_days
-            )
-            cleanup_results['campaigns'] = campaigns_deleted or 0
+            # Cleanup old completed campaigns together with their boost logs
+            campaigns_days = days or self.db.config.CAMPAIGN_RETENTION_DAYS
+            campaigns_deleted, logs_deleted = await self.db.maintenance.purge_completed_campaigns(campaigns_days)
+            cleanup_results['campaigns'] = campaigns_deleted
+            cleanup_results['campaign_logs'] = logs_deleted
             
             return cleanup_results
             
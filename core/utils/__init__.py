@@ -8,6 +8,12 @@ from .cache_manager import cache, CacheManager, cached
 from .request_batcher import request_batcher, RequestBatcher, Priority, BatchRequest
 from .circuit_breaker import CircuitBreaker, telegram_api_breaker, database_breaker, external_api_breaker
 from .performance_monitor import performance_monitor, PerformanceMonitor
+from .time_series import MetricHistory, TimeSeries, RingSeries, sparkline
+from .supervisor import supervisor, TaskSupervisor, SupervisedTask
+from .lifecycle import LifecycleManager, Component
+from .snapshots import snapshots, SnapshotService, Snapshot
+from .charts import charts, ChartRenderer, ChartSpec, ChartSeries
+from .profiler import profiler, SamplingProfiler, ProfileResult
 
 __all__ = [
     'http_client',
@@ -24,5 +30,24 @@ __all__ = [
     'database_breaker', 
     'external_api_breaker',
     'performance_monitor',
-    'PerformanceMonitor'
+    'PerformanceMonitor',
+    'MetricHistory',
+    'TimeSeries',
+    'RingSeries',
+    'sparkline',
+    'supervisor',
+    'TaskSupervisor',
+    'SupervisedTask',
+    'LifecycleManager',
+    'Component',
+    'snapshots',
+    'SnapshotService',
+    'Snapshot',
+    'charts',
+    'ChartRenderer',
+    'ChartSpec',
+    'ChartSeries',
+    'profiler',
+    'SamplingProfiler',
+    'ProfileResult'
 ]
\ No newline at end of file
@@ -7,7 +7,7 @@ import asyncio
 import time
 import json
 import logging
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Set
 from functools import wraps
 from datetime import datetime, timedelta
 
@@ -20,6 +20,8 @@ class CacheManager:
     def __init__(self):
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._ttl_cache: Dict[str, float] = {}
+        # 'entity:key:...' keys by entity and entity key, so invalidation never scans the cache
+        self._index: Dict[str, Dict[str, Set[str]]] = {}
         self._hit_count = 0
         self._miss_count = 0
         
@@ -44,16 +46,42 @@ class CacheManager:
             'created_at': time.time()
         }
         self._ttl_cache[key] = time.time() + ttl
+        parts = key.split(':', 2)
+        if len(parts) == 3:
+            self._index.setdefault(parts[0], {}).setdefault(parts[1], set()).add(key)
     
     def delete(self, key: str) -> None:
         """Delete key from cache"""
-        self._cache.pop(key, None)
+        if self._cache.pop(key, None) is None:
+            return
         self._ttl_cache.pop(key, None)
+        parts = key.split(':', 2)
+        if len(parts) == 3:
+            keys_by_entity = self._index.get(parts[0], {})
+            keys = keys_by_entity.get(parts[1])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del keys_by_entity[parts[1]]
+    
+    def invalidate(self, entity: str, entity_key: Optional[Any] = None) -> int:
+        """Evict entries cached for one entity, or for every entity of that type"""
+        keys_by_entity = self._index.get(entity)
+        if not keys_by_entity:
+            return 0
+        if entity_key is None:
+            keys = [key for entity_keys in keys_by_entity.values() for key in entity_keys]
+        else:
+            keys = list(keys_by_entity.get(str(entity_key), ()))
+        for key in keys:
+            self.delete(key)
+        return len(keys)
     
     def clear(self) -> None:
         """Clear all cache"""
         self._cache.clear()
         self._ttl_cache.clear()
+        self._index.clear()
     
     def cleanup_expired(self) -> int:
         """Remove expired entries"""
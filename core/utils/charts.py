@@ -0,0 +1,210 @@
+"""
+Chart Rendering
+Renders time series to PNG in worker processes and caches images and Telegram file ids by data hash
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import matplotlib
+except ImportError:  # Image charts are optional
+    matplotlib = None
+
+logger = logging.getLogger(__name__)
+
+# Rendered PNGs kept in memory; repeat views are usually served by file id instead
+MAX_CACHED_IMAGES = 128
+# Telegram file ids of charts already uploaded
+MAX_FILE_IDS = 4096
+# Worker processes are recycled so matplotlib state cannot grow without bound
+TASKS_PER_WORKER = 100
+
+
+@dataclass
+class ChartSeries:
+    """One labelled series of (x label, value) points"""
+    label: str
+    points: List[Tuple[str, float]]
+    
+    def values(self) -> List[float]:
+        """Values without their labels"""
+        return [value for _, value in self.points]
+
+
+@dataclass
+class ChartSpec:
+    """Everything that determines how a chart looks; equal specs render equal images"""
+    title: str
+    series: List[ChartSeries] = field(default_factory=list)
+    # 'line' or 'bar'; every series is drawn in its own panel sharing the x axis
+    kind: str = 'line'
+    width: int = 1000
+    height: int = 600
+    
+    def key(self) -> str:
+        """Hash of the data and resolution"""
+        payload = json.dumps(
+            [self.title, self.kind, self.width, self.height,
+             [(series.label, series.points) for series in self.series]],
+            default=str
+        )
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def render_png(spec: ChartSpec) -> bytes:
+    """Draw a chart; runs in a worker process"""
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    
+    dpi = 100
+    panels = max(1, len(spec.series))
+    fig, axes = plt.subplots(
+        panels, 1, sharex=True, squeeze=False,
+        figsize=(spec.width / dpi, spec.height / dpi), dpi=dpi
+    )
+    try:
+        fig.suptitle(spec.title)
+        for ax, series in zip(axes[:, 0], spec.series):
+            positions = range(len(series.points))
+            if spec.kind == 'bar':
+                ax.bar(positions, series.values(), color='#4c72b0')
+            else:
+                ax.plot(positions, series.values(), color='#4c72b0', linewidth=2,
+                        marker='o' if len(series.points) <= 31 else None, markersize=3)
+            ax.set_ylabel(series.label)
+            ax.grid(axis='y', alpha=0.3)
+        
+        labels = [label for label, _ in spec.series[0].points] if spec.series else []
+        step = max(1, len(labels) // 10)
+        bottom = axes[-1, 0]
+        bottom.set_xticks(range(0, len(labels), step))
+        bottom.set_xticklabels(labels[::step], rotation=30, ha='right')
+        fig.tight_layout()
+        
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class ChartRenderer:
+    """Renders charts off the event loop; identical charts are rendered and uploaded once"""
+    
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._images: OrderedDict = OrderedDict()
+        self._file_ids: OrderedDict = OrderedDict()
+        self._rendering: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'renders': 0,
+            'image_hits': 0,
+            'file_id_hits': 0,
+            'failures': 0,
+            'render_time': 0.0
+        }
+    
+    @staticmethod
+    def available() -> bool:
+        """Whether image charts can be rendered in this environment"""
+        return matplotlib is not None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use"""
+        if self._executor is None:
+            # Spawned workers do not inherit the bot's sockets, threads or event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                max_tasks_per_child=TASKS_PER_WORKER
+            )
+        return self._executor
+    
+    def file_id(self, key: str) -> Optional[str]:
+        """Telegram file id of a chart that was already sent"""
+        file_id = self._file_ids.get(key)
+        if file_id is not None:
+            self._file_ids.move_to_end(key)
+            self.stats['file_id_hits'] += 1
+        return file_id
+    
+    def remember_file_id(self, key: str, file_id: str):
+        """Reuse an uploaded chart for later views of the same data"""
+        self._file_ids[key] = file_id
+        self._file_ids.move_to_end(key)
+        while len(self._file_ids) > MAX_FILE_IDS:
+            self._file_ids.popitem(last=False)
+    
+    def forget_file_id(self, key: str):
+        """Drop a file id Telegram no longer accepts"""
+        self._file_ids.pop(key, None)
+    
+    async def render(self, spec: ChartSpec) -> bytes:
+        """PNG bytes of a chart; concurrent requests for the same chart share one render"""
+        if not self.available():
+            raise RuntimeError("matplotlib is not installed")
+        
+        key = spec.key()
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.stats['image_hits'] += 1
+            return image
+        
+        task = self._rendering.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(key, spec))
+            self._rendering[key] = task
+        # Shielded so one cancelled viewer does not cancel the render for the others
+        return await asyncio.shield(task)
+    
+    async def _render(self, key: str, spec: ChartSpec) -> bytes:
+        """Render in a worker process and cache the image"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            image = await loop.run_in_executor(self._get_executor(), render_png, spec)
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Failed to render chart {spec.title}: {e}")
+            raise
+        finally:
+            self._rendering.pop(key, None)
+        
+        self.stats['renders'] += 1
+        self.stats['render_time'] += time.perf_counter() - started
+        self._images[key] = image
+        while len(self._images) > MAX_CACHED_IMAGES:
+            self._images.popitem(last=False)
+        return image
+    
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Cache sizes and render counters"""
+        return {
+            'available': self.available(),
+            'cached_images': len(self._images),
+            'file_ids': len(self._file_ids),
+            'rendering': len(self._rendering),
+            **self.stats
+        }
+
+
+# Global chart renderer instance
+charts = ChartRenderer()
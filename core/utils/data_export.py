@@ -0,0 +1,232 @@
+"""
+Streaming Data Export
+Encodes cursor-fed row batches to CSV, JSONL or Parquet files in a worker thread
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, Dict, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportResult:
+    """Finished export file"""
+    path: str
+    fmt: str
+    rows: int
+    size_bytes: int
+    duration: float
+
+
+def _plain_value(value: Any) -> Any:
+    """Convert database values into plain serializable types"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for values the encoder does not know"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class _CsvWriter:
+    """Incremental CSV encoder"""
+    
+    def __init__(self, path: str, columns: Sequence[str], types: Sequence[str]):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+    
+    def write(self, rows: List[Sequence[Any]]):
+        self._writer.writerows([[_plain_value(v) for v in row] for row in rows])
+    
+    def close(self):
+        self._file.close()
+
+
+class _JsonlWriter:
+    """Incremental JSON Lines encoder"""
+    
+    def __init__(self, path: str, columns: Sequence[str], types: Sequence[str]):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._columns = list(columns)
+    
+    def write(self, rows: List[Sequence[Any]]):
+        self._file.writelines(
+            json.dumps(dict(zip(self._columns, row)), default=_json_default, ensure_ascii=False) + '\n'
+            for row in rows
+        )
+    
+    def close(self):
+        self._file.close()
+
+
+def _arrow_type(pg_type: str):
+    """Arrow type of a Postgres column type; anything unmapped is written as text"""
+    return {
+        'bool': pa.bool_(),
+        'int2': pa.int16(),
+        'int4': pa.int32(),
+        'int8': pa.int64(),
+        'float4': pa.float32(),
+        'float8': pa.float64(),
+        'numeric': pa.float64(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us'),
+        'timestamptz': pa.timestamp('us', tz='UTC'),
+        'interval': pa.duration('us'),
+        'bytea': pa.binary()
+    }.get(pg_type, pa.string())
+
+
+def _text_value(value: Any) -> Optional[str]:
+    """Value of a column exported as text"""
+    if value is None or isinstance(value, str):
+        return value
+    return str(_plain_value(value))
+
+
+class _ParquetWriter:
+    """Incremental Parquet encoder writing one row group per batch"""
+    
+    def __init__(self, path: str, columns: Sequence[str], types: Sequence[str]):
+        # The schema comes from the query's column types, so columns that are NULL in early batches keep their type
+        self._schema = pa.schema([pa.field(name, _arrow_type(pg_type)) for name, pg_type in zip(columns, types)])
+        self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+    
+    def write(self, rows: List[Sequence[Any]]):
+        data = {}
+        for i, field in enumerate(self._schema):
+            if pa.types.is_string(field.type):
+                data[field.name] = [_text_value(row[i]) for row in rows]
+            elif pa.types.is_floating(field.type):
+                data[field.name] = [float(row[i]) if isinstance(row[i], Decimal) else row[i] for row in rows]
+            else:
+                data[field.name] = [row[i] for row in rows]
+        self._writer.write_table(pa.table(data, schema=self._schema))
+    
+    def close(self):
+        self._writer.close()
+
+
+EXPORT_WRITERS = {
+    'csv': _CsvWriter,
+    'jsonl': _JsonlWriter,
+    'parquet': _ParquetWriter
+}
+
+
+def available_formats() -> List[str]:
+    """Export formats usable in this environment"""
+    return [fmt for fmt in EXPORT_WRITERS if fmt != 'parquet' or pa is not None]
+
+
+class StreamingExporter:
+    """Streams query results through a server-side cursor into an export file"""
+    
+    def __init__(self, coordinator, batch_size: int = 2000, pool: Optional[str] = None):
+        self.coordinator = coordinator
+        self.batch_size = batch_size
+        # Named coordinator pool to read from; None uses the default pool
+        self.pool = pool
+    
+    async def export(self, query: str, *args, fmt: str = 'csv',
+                     prepend: Optional[AsyncIterable[List[Dict[str, Any]]]] = None) -> ExportResult:
+        """Run a query and encode its rows to a temporary file, after any prepended rows"""
+        if fmt not in available_formats():
+            raise ValueError(f"Unsupported export format: {fmt}")
+        
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        fd, path = tempfile.mkstemp(prefix='export_', suffix=f'.{fmt}')
+        os.close(fd)
+        
+        writer = None
+        pending: Optional[asyncio.Future] = None
+        rows_written = 0
+        try:
+            connection = self.coordinator.get_connection(self.pool) if self.pool else self.coordinator.get_connection()
+            async with connection as conn:
+                async with conn.transaction():
+                    statement = await conn.prepare(query)
+                    attributes = statement.get_attributes()
+                    columns = [attr.name for attr in attributes]
+                    types = [attr.type.name for attr in attributes]
+                    writer = await loop.run_in_executor(None, EXPORT_WRITERS[fmt], path, columns, types)
+                    
+                    # Rows from outside the database, e.g. archived partitions, come first
+                    if prepend is not None:
+                        async for rows in prepend:
+                            for start in range(0, len(rows), self.batch_size):
+                                batch = [tuple(row.get(name) for name in columns)
+                                         for row in rows[start:start + self.batch_size]]
+                                await loop.run_in_executor(None, writer.write, batch)
+                                rows_written += len(batch)
+                    
+                    cursor = await statement.cursor(*args)
+                    while True:
+                        batch = await cursor.fetch(self.batch_size)
+                        # Encoding of the previous batch overlaps with this fetch
+                        if pending is not None:
+                            await pending
+                            pending = None
+                        if not batch:
+                            break
+                        rows_written += len(batch)
+                        pending = loop.run_in_executor(None, writer.write, batch)
+            
+            await loop.run_in_executor(None, writer.close)
+            writer = None
+            
+            return ExportResult(
+                path=path,
+                fmt=fmt,
+                rows=rows_written,
+                size_bytes=os.path.getsize(path),
+                duration=time.perf_counter() - started
+            )
+        except Exception:
+            # The writer is not thread safe; let an in-flight write finish before closing it
+            if pending is not None:
+                try:
+                    await pending
+                except Exception:
+                    pass
+            if writer is not None:
+                await loop.run_in_executor(None, writer.close)
+            self.discard(path)
+            raise
+    
+    @staticmethod
+    def discard(path: str):
+        """Remove an export file once it has been delivered"""
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -0,0 +1,145 @@
+"""
+Component Lifecycle Manager
+Dependency-ordered parallel startup and reverse-ordered shutdown with a deadline
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Component:
+    """A named unit with optional start and stop coroutines"""
+    name: str
+    start: Optional[Callable[[], Awaitable[Any]]] = None
+    stop: Optional[Callable[[], Awaitable[Any]]] = None
+    depends_on: Sequence[str] = ()
+    state: str = 'registered'
+    start_duration: float = 0.0
+    stop_duration: float = 0.0
+    error: Optional[str] = None
+
+
+class LifecycleManager:
+    """Starts independent components in parallel and stops them in reverse dependency order"""
+    
+    def __init__(self):
+        self._components: Dict[str, Component] = {}
+    
+    def register(self, name: str, start: Optional[Callable[[], Awaitable[Any]]] = None,
+                 stop: Optional[Callable[[], Awaitable[Any]]] = None,
+                 depends_on: Sequence[str] = ()) -> Component:
+        """Declare a component and the components it needs to be running first"""
+        if name in self._components:
+            raise ValueError(f"Component {name} is already registered")
+        component = Component(name=name, start=start, stop=stop, depends_on=tuple(depends_on))
+        self._components[name] = component
+        return component
+    
+    def _levels(self) -> List[List[str]]:
+        """Group components into layers whose dependencies are all in earlier layers"""
+        for component in self._components.values():
+            missing = [dep for dep in component.depends_on if dep not in self._components]
+            if missing:
+                raise ValueError(f"Component {component.name} depends on unknown {missing}")
+        
+        remaining = dict(self._components)
+        placed = set()
+        levels: List[List[str]] = []
+        while remaining:
+            level = [
+                name for name, component in remaining.items()
+                if all(dep in placed for dep in component.depends_on)
+            ]
+            if not level:
+                raise ValueError(f"Dependency cycle between components: {sorted(remaining)}")
+            levels.append(level)
+            placed.update(level)
+            for name in level:
+                del remaining[name]
+        return levels
+    
+    async def _start_component(self, component: Component):
+        """Start one component and record its timing"""
+        started = time.perf_counter()
+        component.state = 'starting'
+        try:
+            if component.start:
+                await component.start()
+            component.state = 'running'
+        except Exception as e:
+            component.state = 'failed'
+            component.error = str(e)
+            raise
+        finally:
+            component.start_duration = time.perf_counter() - started
+        logger.info(f"✅ {component.name} started in {component.start_duration * 1000:.0f}ms")
+    
+    async def start_all(self):
+        """Start every component, running each dependency layer in parallel"""
+        started = time.perf_counter()
+        for level in self._levels():
+            results = await asyncio.gather(
+                *(self._start_component(self._components[name]) for name in level),
+                return_exceptions=True
+            )
+            failures = [
+                (name, result) for name, result in zip(level, results)
+                if isinstance(result, BaseException)
+            ]
+            if failures:
+                for name, error in failures:
+                    logger.error(f"❌ Failed to start {name}: {error}")
+                # Unwind whatever already came up before reporting the failure
+                await self.stop_all()
+                raise failures[0][1]
+        logger.info(f"🚀 All components started in {time.perf_counter() - started:.2f}s")
+    
+    async def _stop_component(self, component: Component, deadline: float):
+        """Stop one component within whatever remains of the shutdown deadline"""
+        if component.state not in ('running', 'failed', 'starting'):
+            return
+        started = time.perf_counter()
+        component.state = 'stopping'
+        try:
+            if component.stop:
+                remaining = max(0.1, deadline - time.monotonic())
+                await asyncio.wait_for(component.stop(), remaining)
+            component.state = 'stopped'
+        except asyncio.TimeoutError:
+            component.state = 'timed_out'
+            logger.error(f"⏱️ {component.name} did not stop before the shutdown deadline")
+        except Exception as e:
+            component.state = 'stopped'
+            component.error = str(e)
+            logger.error(f"Error stopping {component.name}: {e}")
+        finally:
+            component.stop_duration = time.perf_counter() - started
+    
+    async def stop_all(self, timeout: float = 30.0):
+        """Stop components in reverse dependency order, each layer in parallel"""
+        deadline = time.monotonic() + timeout
+        for level in reversed(self._levels()):
+            await asyncio.gather(
+                *(self._stop_component(self._components[name], deadline) for name in level)
+            )
+        logger.info("⏹️ All components stopped")
+    
+    def get_status(self) -> List[Dict[str, Any]]:
+        """State and timings of every component"""
+        return [
+            {
+                'name': component.name,
+                'state': component.state,
+                'depends_on': list(component.depends_on),
+                'start_duration': component.start_duration,
+                'stop_duration': component.stop_duration,
+                'error': component.error
+            }
+            for component in self._components.values()
+        ]
@@ -0,0 +1,253 @@
+"""
+Sampling Profiler
+Samples the event loop on an interval timer and aggregates stacks by the running coroutine
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+# Pseudo frames at the root of a collapsed stack
+IDLE_FRAME = '[idle]'
+LOOP_FRAME = '[event loop]'
+CALLBACK_FRAME = '[callback]'
+# The sampling interval backs off up to this when sampling costs more than its budget
+MAX_INTERVAL = 0.1
+
+
+@dataclass
+class ProfileResult:
+    """Stacks sampled over one profiling run"""
+    trigger: str
+    started_at: datetime
+    duration: float
+    interval: float
+    final_interval: float = 0.0
+    samples: int = 0
+    # Seconds spent in the sampling handler, during which the event loop could not run
+    overhead: float = 0.0
+    # Extra loop iterations caused by timer signals reaching the loop's wakeup fd, and their estimated cost
+    wakeups: int = 0
+    wakeup_overhead: float = 0.0
+    backoffs: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    
+    @property
+    def idle_samples(self) -> int:
+        return self.stacks[(IDLE_FRAME,)]
+    
+    @property
+    def overhead_pct(self) -> float:
+        return (self.overhead + self.wakeup_overhead) / self.duration * 100 if self.duration else 0.0
+    
+    @property
+    def wakeup_overhead_pct(self) -> float:
+        return self.wakeup_overhead / self.duration * 100 if self.duration else 0.0
+    
+    def collapsed(self) -> str:
+        """Collapsed stack lines ('root;...;leaf count') for flamegraph.pl, speedscope or inferno"""
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+    
+    def hot_functions(self, limit: int = 5) -> List[Tuple[str, float]]:
+        """Functions with the most self samples and their share of the busy samples"""
+        busy = self.samples - self.idle_samples
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack != (IDLE_FRAME,):
+                leaves[stack[-1]] += count
+        return [(name, count / busy * 100) for name, count in leaves.most_common(limit)] if busy else []
+    
+    def hot_coroutines(self, limit: int = 5) -> List[Tuple[str, float]]:
+        """Root coroutines with the most samples and their share of the busy samples"""
+        busy = self.samples - self.idle_samples
+        roots: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack != (IDLE_FRAME,):
+                roots[stack[0]] += count
+        return [(name, count / busy * 100) for name, count in roots.most_common(limit)] if busy else []
+    
+    def filename(self) -> str:
+        return f"profile-{self.started_at.strftime('%Y%m%d-%H%M%S')}.folded"
+    
+    def write(self, directory: Path) -> Path:
+        """Save the collapsed stacks under a timestamped name"""
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.filename()
+        path.write_text(self.collapsed(), encoding='utf-8')
+        return path
+    
+    def get_stats(self) -> Dict[str, Any]:
+        busy = self.samples - self.idle_samples
+        return {
+            'trigger': self.trigger,
+            'duration': self.duration,
+            'samples': self.samples,
+            'busy_pct': busy / self.samples * 100 if self.samples else 0.0,
+            'interval_ms': self.interval * 1000,
+            'final_interval_ms': self.final_interval * 1000,
+            'overhead_pct': self.overhead_pct,
+            'wakeups': self.wakeups,
+            'wakeup_overhead_pct': self.wakeup_overhead_pct,
+            'backoffs': self.backoffs,
+            'unique_stacks': len(self.stacks)
+        }
+
+
+class SamplingProfiler:
+    """On-demand statistical profiler for the event loop
+
+    An interval timer interrupts the loop thread and the signal handler records the frame it
+    interrupted, so nothing is instrumented and samples land where time is really spent;
+    a sampler thread would only get the GIL while the loop waits in select(). Each stack
+    is rooted at the coroutine of the running task, which groups samples per handler or job.
+    
+    Once the loop has a signal handler (add_signal_handler), Python writes every signal,
+    SIGALRM included, to the loop's wakeup fd, so each tick also costs one extra loop
+    iteration to drain it. That cost is measured before the run and counted as overhead.
+    """
+    
+    def __init__(self):
+        self.running = False
+        self.last_result: Optional[ProfileResult] = None
+        self._labels: Dict[Any, str] = {}
+        self._result: Optional[ProfileResult] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._interval = 0.0
+        self._max_overhead = 0.0
+        self._wakeup_cost = 0.0
+        self._started = 0.0
+    
+    def _label(self, code) -> str:
+        """'qualname (file:line)' of a code object, cached for the run"""
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            if filename.startswith(PROJECT_ROOT):
+                filename = filename[len(PROJECT_ROOT):]
+            else:
+                filename = '/'.join(Path(filename).parts[-2:])
+            name = getattr(code, 'co_qualname', code.co_name)
+            # ';' separates frames and the last space separates the count
+            label = f"{name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+            self._labels[code] = label
+        return label
+    
+    def _stack(self, frame) -> Tuple[str, ...]:
+        """Collapsed stack of the interrupted frame, rooted at the running coroutine"""
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        
+        leaf = codes[-1]
+        if leaf.co_name == 'select' and leaf.co_filename.endswith('selectors.py'):
+            return (IDLE_FRAME,)
+        
+        # Everything above Handle._run is asyncio itself; below it is the task or callback
+        start = None
+        for index, code in enumerate(codes):
+            if code.co_name == '_run' and code.co_filename.startswith(ASYNCIO_DIR):
+                start = index + 1
+        if start is None or start >= len(codes):
+            # Scheduling and I/O processing inside the loop itself
+            return (LOOP_FRAME, self._label(leaf))
+        
+        task = asyncio.current_task(self._loop)
+        root = f"[task] {getattr(task.get_coro(), '__qualname__', task.get_name())}" if task else CALLBACK_FRAME
+        return (root,) + tuple(self._label(code) for code in codes[start:])
+    
+    def _on_timer(self, signum, frame):
+        """SIGALRM handler; runs on the loop thread between two bytecodes"""
+        result = self._result
+        if result is None or frame is None:
+            return
+        started = time.perf_counter()
+        result.stacks[self._stack(frame)] += 1
+        result.samples += 1
+        finished = time.perf_counter()
+        result.overhead += finished - started
+        if self._wakeup_cost:
+            result.wakeups += 1
+            result.wakeup_overhead += self._wakeup_cost
+        # Sample less often while sampling has cost more than its share of the run so far
+        spent = result.overhead + result.wakeup_overhead
+        if spent > (finished - self._started) * self._max_overhead and self._interval < MAX_INTERVAL:
+            self._interval = min(self._interval * 2, MAX_INTERVAL)
+            signal.setitimer(signal.ITIMER_REAL, self._interval, self._interval)
+            result.backoffs += 1
+    
+    @staticmethod
+    def _wakeup_fd_installed() -> bool:
+        """Whether delivered signals are also written to an event loop's wakeup fd"""
+        fd = signal.set_wakeup_fd(-1)
+        if fd != -1:
+            signal.set_wakeup_fd(fd)
+        return fd != -1
+    
+    @staticmethod
+    async def _iteration_cost(rounds: int = 20) -> float:
+        """Cheapest observed round trip through the event loop, an estimate of one idle iteration"""
+        best = float('inf')
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            best = min(best, time.perf_counter() - started)
+        return best
+    
+    async def profile(self, duration: float, interval: float = 0.02, max_overhead: float = 0.02,
+                      trigger: str = 'manual') -> ProfileResult:
+        """Sample the running event loop for a number of seconds"""
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        if not hasattr(signal, 'setitimer'):
+            raise RuntimeError("Sampling needs interval timers, which this platform does not provide")
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("Only an event loop running in the main thread can be sampled")
+        
+        result = ProfileResult(trigger=trigger, started_at=datetime.now(), duration=duration, interval=interval)
+        self._loop = asyncio.get_running_loop()
+        self._interval = interval
+        self._max_overhead = max_overhead
+        self._wakeup_cost = await self._iteration_cost() if self._wakeup_fd_installed() else 0.0
+        self._result = result
+        
+        self.running = True
+        logger.info(f"🔬 Profiling the event loop for {duration:.0f}s ({trigger})")
+        previous = signal.signal(signal.SIGALRM, self._on_timer)
+        self._started = time.perf_counter()
+        signal.setitimer(signal.ITIMER_REAL, interval, interval)
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+            result.duration = time.perf_counter() - self._started
+            result.final_interval = self._interval
+            self._result = None
+            self._loop = None
+            self._labels.clear()
+            self.running = False
+        
+        self.last_result = result
+        logger.info(
+            f"🔬 Profile finished: {result.samples} samples, {len(result.stacks)} stacks, "
+            f"{result.overhead_pct:.2f}% overhead"
+        )
+        return result
+
+
+# Global profiler instance
+profiler = SamplingProfiler()
@@ -10,6 +10,8 @@ from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 
+from .supervisor import supervisor
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,23 +52,18 @@ class RequestBatcher:
         }
         self._processors: Dict[str, Callable] = {}
         self._running = False
-        self._batch_task: Optional[asyncio.Task] = None
         
     async def start(self):
         """Start the batching system"""
         self._running = True
-        self._batch_task = asyncio.create_task(self._batch_processor())
+        supervisor.spawn_periodic('request_batcher.flush', self._flush_all, self.flush_interval)
         logger.info("✅ Request batcher started")
     
     async def stop(self):
-        """Stop the batching system"""
+        """Stop the batching system after sending whatever is still queued"""
         self._running = False
-        if self._batch_task:
-            self._batch_task.cancel()
-            try:
-                await self._batch_task
-            except asyncio.CancelledError:
-                pass
+        await supervisor.stop('request_batcher.flush')
+        await self._flush_all()
         logger.info("✅ Request batcher stopped")
     
     def register_processor(self, operation: str, processor: Callable):
@@ -85,22 +82,11 @@ class RequestBatcher:
         
         return request.id
     
-    async def _batch_processor(self):
-        """Main batch processing loop"""
-        while self._running:
-            try:
-                # Process all priority queues
-                for priority in [Priority.URGENT, Priority.HIGH, Priority.NORMAL, Priority.LOW]:
-                    if self._queues[priority]:
-                        await self._flush_priority_queue(priority)
-                
-                await asyncio.sleep(self.flush_interval)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in batch processor: {e}")
-                await asyncio.sleep(1)
+    async def _flush_all(self):
+        """Flush every priority queue, most urgent first"""
+        for priority in [Priority.URGENT, Priority.HIGH, Priority.NORMAL, Priority.LOW]:
+            if self._queues[priority]:
+                await self._flush_priority_queue(priority)
     
     async def _flush_priority_queue(self, priority: Priority):
         """Flush a specific priority queue"""
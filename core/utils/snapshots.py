@@ -0,0 +1,148 @@
+"""
+Dashboard Snapshot Service
+Refreshes dashboard data models in the background and serves the latest snapshot instantly
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from .supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Snapshot:
+    """One computed data model and when it was taken"""
+    value: Any
+    taken_at: datetime
+    taken_monotonic: float
+    duration: float
+    
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.monotonic() - self.taken_monotonic
+    
+    def age_text(self) -> str:
+        """Human readable age for dashboard footers"""
+        age = int(self.age())
+        if age < 5:
+            return "just now"
+        if age < 60:
+            return f"{age}s ago"
+        if age < 3600:
+            return f"{age // 60}m {age % 60}s ago"
+        return f"{age // 3600}h {age % 3600 // 60}m ago"
+
+
+@dataclass
+class SnapshotSource:
+    """A registered producer and the latest snapshot it returned"""
+    name: str
+    producer: Callable[[], Awaitable[Any]]
+    interval: float
+    snapshot: Optional[Snapshot] = None
+    last_access: Optional[float] = None
+    refreshing: Optional[asyncio.Task] = None
+    refreshes: int = 0
+    failures: int = 0
+
+
+class SnapshotService:
+    """Stale-while-revalidate cache of dashboard data refreshed by supervised loops"""
+    
+    def __init__(self, idle_after: float = 600.0):
+        # Dashboards nobody opened for this long stop refreshing in the background
+        self.idle_after = idle_after
+        self._sources: Dict[str, SnapshotSource] = {}
+    
+    def register(self, name: str, producer: Callable[[], Awaitable[Any]], interval: float):
+        """Register a producer refreshed every interval seconds while its dashboard is watched"""
+        self._sources[name] = SnapshotSource(name=name, producer=producer, interval=interval)
+        supervisor.spawn_periodic(
+            f"snapshot.{name}", lambda: self.refresh(name), interval,
+            gate=lambda: self._is_watched(name)
+        )
+    
+    async def stop(self, *names: str):
+        """Stop background refreshes of the named snapshots"""
+        await supervisor.stop(*[f"snapshot.{name}" for name in names])
+        for name in names:
+            source = self._sources.get(name)
+            if source and source.refreshing and not source.refreshing.done():
+                source.refreshing.cancel()
+    
+    def _is_watched(self, name: str) -> bool:
+        """Whether the dashboard was opened recently enough to keep refreshing"""
+        source = self._sources[name]
+        return source.last_access is not None and time.monotonic() - source.last_access < self.idle_after
+    
+    async def _produce(self, source: SnapshotSource):
+        """Run the producer, keeping the previous snapshot when it fails"""
+        started = time.monotonic()
+        try:
+            value = await source.producer()
+        except Exception as e:
+            source.failures += 1
+            logger.error(f"Failed to refresh snapshot {source.name}: {e}")
+            return
+        
+        if not value:
+            # Producers return an empty model when their queries fail
+            source.failures += 1
+            return
+        
+        source.refreshes += 1
+        source.snapshot = Snapshot(
+            value=value,
+            taken_at=datetime.now(),
+            taken_monotonic=time.monotonic(),
+            duration=time.monotonic() - started
+        )
+    
+    def _start_refresh(self, source: SnapshotSource) -> asyncio.Task:
+        """Start a refresh unless one is already running"""
+        if source.refreshing is None or source.refreshing.done():
+            source.refreshing = asyncio.create_task(self._produce(source))
+        return source.refreshing
+    
+    async def refresh(self, name: str) -> Optional[Snapshot]:
+        """Recompute a snapshot now; concurrent callers share one computation"""
+        source = self._sources[name]
+        await asyncio.shield(self._start_refresh(source))
+        return source.snapshot
+    
+    async def get(self, name: str, force: bool = False) -> Optional[Snapshot]:
+        """Latest snapshot, revalidated in the background when stale or recomputed when forced"""
+        source = self._sources[name]
+        source.last_access = time.monotonic()
+        
+        if force or source.snapshot is None:
+            return await self.refresh(name)
+        
+        if source.snapshot.age() > source.interval:
+            # Serve what we have and let the next open see fresh data
+            self._start_refresh(source)
+        return source.snapshot
+    
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot ages and refresh counters"""
+        return {
+            name: {
+                'age': source.snapshot.age() if source.snapshot else None,
+                'last_duration': source.snapshot.duration if source.snapshot else None,
+                'interval': source.interval,
+                'watched': self._is_watched(name),
+                'refreshes': source.refreshes,
+                'failures': source.failures
+            }
+            for name, source in self._sources.items()
+        }
+
+
+# Global snapshot service instance
+snapshots = SnapshotService()
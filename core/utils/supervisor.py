@@ -0,0 +1,287 @@
+"""
+Background Task Supervisor
+Runs named periodic and worker loops with crash restarts, backoff and per-iteration timing
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Sequence
+
+logger = logging.getLogger(__name__)
+
+PERIODIC = 'periodic'
+WORKER = 'worker'
+
+
+@dataclass
+class SupervisedTask:
+    """Registration and runtime statistics of one supervised loop"""
+    name: str
+    kind: str
+    func: Callable[[], Awaitable[Any]]
+    interval: float = 0.0
+    initial_delay: float = 0.0
+    depends_on: Sequence[str] = ()
+    gate: Optional[Callable[[], bool]] = None
+    max_backoff: float = 300.0
+    
+    state: str = 'registered'
+    task: Optional[asyncio.Task] = None
+    iterations: int = 0
+    skipped: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    restarts: int = 0
+    last_duration: float = 0.0
+    avg_duration: float = 0.0
+    max_duration: float = 0.0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    iteration_started: Optional[float] = None
+    last_success: Optional[datetime] = None
+    last_success_monotonic: Optional[float] = None
+    last_error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    
+    def backoff(self) -> float:
+        """Exponential restart delay based on consecutive failures"""
+        delay = min(self.max_backoff, 2 ** min(self.consecutive_failures, 10))
+        # A failing periodic loop never retries more often than it would run when healthy
+        return max(self.interval, delay) if self.kind == PERIODIC else delay
+    
+    def record_iteration(self, duration: float):
+        """Fold a finished iteration into the timing statistics"""
+        self.iterations += 1
+        self.consecutive_failures = 0
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        # Exponential moving average keeps the figure stable for long-lived loops
+        self.avg_duration = duration if self.iterations == 1 else self.avg_duration * 0.9 + duration * 0.1
+        self.last_success = datetime.utcnow()
+        self.last_success_monotonic = time.monotonic()
+    
+    def record_failure(self, error: Exception):
+        """Record a crashed iteration"""
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+    
+    def is_stuck(self) -> bool:
+        """Whether an iteration has run for far longer than the loop period"""
+        if self.iteration_started is None or self.kind != PERIODIC:
+            return False
+        limit = max(60.0, self.interval * 3)
+        return time.monotonic() - self.iteration_started > limit
+    
+    def is_overdue(self) -> bool:
+        """Whether a periodic loop has gone several periods without a successful iteration"""
+        if self.kind != PERIODIC or self.state not in ('running', 'backoff'):
+            return False
+        reference = self.last_success_monotonic
+        if reference is None:
+            return False
+        return time.monotonic() - reference > max(60.0, self.interval * 3 + self.initial_delay)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain status dict for health screens"""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'state': self.state,
+            'interval': self.interval,
+            'iterations': self.iterations,
+            'skipped': self.skipped,
+            'failures': self.failures,
+            'restarts': self.restarts,
+            'last_duration': self.last_duration,
+            'avg_duration': self.avg_duration,
+            'max_duration': self.max_duration,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'last_success': self.last_success,
+            'last_error': self.last_error,
+            'stuck': self.is_stuck(),
+            'overdue': self.is_overdue()
+        }
+
+
+class TaskSupervisor:
+    """Central registry that starts, restarts, times and stops background loops"""
+    
+    def __init__(self):
+        self._tasks: Dict[str, SupervisedTask] = {}
+    
+    def periodic(self, name: str, func: Callable[[], Awaitable[Any]], interval: float,
+                 initial_delay: float = 0.0, depends_on: Sequence[str] = (),
+                 gate: Optional[Callable[[], bool]] = None) -> SupervisedTask:
+        """Register a function run once per interval; gate() False skips an iteration"""
+        return self._register(SupervisedTask(
+            name=name, kind=PERIODIC, func=func, interval=interval,
+            initial_delay=initial_delay, depends_on=tuple(depends_on), gate=gate
+        ))
+    
+    def worker(self, name: str, func: Callable[[], Awaitable[Any]],
+               depends_on: Sequence[str] = ()) -> SupervisedTask:
+        """Register a long-running coroutine restarted with backoff when it crashes"""
+        return self._register(SupervisedTask(
+            name=name, kind=WORKER, func=func, depends_on=tuple(depends_on)
+        ))
+    
+    def _register(self, supervised: SupervisedTask) -> SupervisedTask:
+        """Add or replace a registration"""
+        existing = self._tasks.get(supervised.name)
+        if existing and existing.task and not existing.task.done():
+            raise RuntimeError(f"Supervised task {supervised.name} is already running")
+        self._tasks[supervised.name] = supervised
+        return supervised
+    
+    def start(self, name: str) -> SupervisedTask:
+        """Start a registered task"""
+        supervised = self._tasks[name]
+        if supervised.task and not supervised.task.done():
+            return supervised
+        
+        runner = self._run_periodic if supervised.kind == PERIODIC else self._run_worker
+        supervised.state = 'running'
+        supervised.started_at = datetime.utcnow()
+        supervised.task = asyncio.create_task(runner(supervised), name=f"supervised:{name}")
+        return supervised
+    
+    def spawn_periodic(self, name: str, func: Callable[[], Awaitable[Any]], interval: float,
+                       **kwargs) -> SupervisedTask:
+        """Register and start a periodic task"""
+        self.periodic(name, func, interval, **kwargs)
+        return self.start(name)
+    
+    def spawn_worker(self, name: str, func: Callable[[], Awaitable[Any]],
+                     **kwargs) -> SupervisedTask:
+        """Register and start a worker task"""
+        self.worker(name, func, **kwargs)
+        return self.start(name)
+    
+    async def _run_periodic(self, supervised: SupervisedTask):
+        """Fixed-rate loop that measures lag against the intended schedule"""
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + supervised.initial_delay
+        while True:
+            delay = next_run - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            started = loop.time()
+            supervised.last_lag = max(0.0, started - next_run)
+            supervised.max_lag = max(supervised.max_lag, supervised.last_lag)
+            
+            if supervised.gate is not None and not supervised.gate():
+                supervised.skipped += 1
+                next_run = started + supervised.interval
+                continue
+            
+            supervised.iteration_started = time.monotonic()
+            try:
+                await supervised.func()
+                supervised.record_iteration(loop.time() - started)
+                supervised.state = 'running'
+                next_run += supervised.interval
+                if next_run < loop.time():
+                    # Missed periods are skipped rather than run back to back
+                    next_run = loop.time() + supervised.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                supervised.record_failure(e)
+                supervised.state = 'backoff'
+                backoff = supervised.backoff()
+                logger.error(f"❌ Task {supervised.name} failed, retrying in {backoff:.0f}s: {e}")
+                next_run = loop.time() + backoff
+            finally:
+                supervised.iteration_started = None
+    
+    async def _run_worker(self, supervised: SupervisedTask):
+        """Keep a long-running coroutine alive, restarting it after crashes"""
+        while True:
+            started = time.monotonic()
+            try:
+                supervised.state = 'running'
+                await supervised.func()
+                # A worker that returns on its own has finished its job
+                supervised.record_iteration(time.monotonic() - started)
+                supervised.state = 'finished'
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                supervised.record_failure(e)
+                supervised.state = 'backoff'
+                backoff = supervised.backoff()
+                logger.error(f"❌ Worker {supervised.name} crashed, restarting in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                supervised.restarts += 1
+    
+    def _stop_order(self, names: Sequence[str]) -> List[str]:
+        """Order names so dependents stop before the tasks they depend on"""
+        selected = set(names)
+        ordered: List[str] = []
+        visited = set()
+        
+        def visit(name: str):
+            if name in visited:
+                return
+            visited.add(name)
+            # Stop everything that depends on this task first
+            for other in self._tasks.values():
+                if name in other.depends_on and other.name in selected:
+                    visit(other.name)
+            ordered.append(name)
+        
+        for name in names:
+            visit(name)
+        return ordered
+    
+    async def stop(self, *names: str, timeout: float = 10.0):
+        """Cancel tasks in dependency order and wait for each to exit"""
+        targets = list(names) if names else list(self._tasks)
+        for name in self._stop_order([n for n in targets if n in self._tasks]):
+            supervised = self._tasks[name]
+            task = supervised.task
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await asyncio.wait_for(task, timeout)
+                except (asyncio.CancelledError, asyncio.TimeoutError):
+                    pass
+                except Exception as e:
+                    logger.error(f"Error stopping task {name}: {e}")
+            supervised.state = 'stopped'
+            supervised.task = None
+    
+    async def stop_prefix(self, prefix: str, timeout: float = 10.0):
+        """Stop every task whose name starts with prefix"""
+        await self.stop(*[name for name in self._tasks if name.startswith(prefix)], timeout=timeout)
+    
+    async def shutdown(self, timeout: float = 10.0):
+        """Stop every supervised task"""
+        await self.stop(timeout=timeout)
+        logger.info("⏹️ Task supervisor stopped all tasks")
+    
+    def get(self, name: str) -> Optional[SupervisedTask]:
+        """Get a registration by name"""
+        return self._tasks.get(name)
+    
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Snapshot of every registered task"""
+        return [supervised.snapshot() for supervised in self._tasks.values()]
+    
+    def get_unhealthy(self) -> List[Dict[str, Any]]:
+        """Tasks that are stuck, overdue or backing off after failures"""
+        return [
+            status for status in self.get_status()
+            if status['stuck'] or status['overdue'] or status['state'] == 'backoff'
+        ]
+
+
+# Global supervisor instance
+supervisor = TaskSupervisor()
@@ -0,0 +1,279 @@
+"""
+Fixed-Memory Time Series
+Array-backed ring buffers with multiple resolutions and O(1) rolling window stats
+"""
+
+import math
+import time
+from array import array
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
+
+# Default resolutions: 10 second slots for the last hour, 5 minute slots for the last day
+DEFAULT_RESOLUTIONS: Tuple[Tuple[int, int], ...] = ((10, 360), (300, 288))
+
+
+class RingSeries:
+    """Preallocated slot ring for one metric at one resolution
+    
+    Timestamps are time.monotonic() seconds so wall-clock steps cannot reorder slots.
+    """
+    
+    def __init__(self, step: float, capacity: int):
+        self.step = step
+        self.capacity = capacity
+        self.span = step * capacity
+        
+        # One preallocated array per aggregate; slot ids mark which time slot a position holds
+        self._slot_ids = array('q', [-1]) * capacity
+        self._mins = array('d', [0.0]) * capacity
+        self._maxs = array('d', [0.0]) * capacity
+        self._sums = array('d', [0.0]) * capacity
+        self._counts = array('l', [0]) * capacity
+        
+        self._current = -1
+        self._closed_sum = 0.0
+        self._closed_count = 0
+        # Monotonic deques of (slot_id, value) over closed slots for rolling min/max
+        self._min_queue: deque = deque()
+        self._max_queue: deque = deque()
+    
+    def add(self, value: float, timestamp: Optional[float] = None):
+        """Fold a sample into its time slot"""
+        slot = int((timestamp if timestamp is not None else time.monotonic()) // self.step)
+        if slot < self._current:
+            # Closed slots are already folded into the rolling sums and min/max deques
+            return
+        if slot > self._current:
+            self._advance(slot)
+        
+        pos = slot % self.capacity
+        
+        if self._counts[pos] == 0:
+            self._mins[pos] = value
+            self._maxs[pos] = value
+        else:
+            if value < self._mins[pos]:
+                self._mins[pos] = value
+            if value > self._maxs[pos]:
+                self._maxs[pos] = value
+        self._sums[pos] += value
+        self._counts[pos] += 1
+    
+    def _advance(self, slot: int):
+        """Close the current slot and evict slots that fall out of the window"""
+        if self._current >= 0:
+            pos = self._current % self.capacity
+            count = self._counts[pos]
+            if count:
+                self._closed_sum += self._sums[pos]
+                self._closed_count += count
+                
+                low = self._mins[pos]
+                while self._min_queue and self._min_queue[-1][1] >= low:
+                    self._min_queue.pop()
+                self._min_queue.append((self._current, low))
+                
+                high = self._maxs[pos]
+                while self._max_queue and self._max_queue[-1][1] <= high:
+                    self._max_queue.pop()
+                self._max_queue.append((self._current, high))
+            
+            # Only slots between the old and new window start can be evicted
+            old_low = self._current - self.capacity + 1
+            new_low = slot - self.capacity + 1
+            for slot_id in range(max(old_low, 0), min(new_low, self._current + 1)):
+                evict_pos = slot_id % self.capacity
+                if self._slot_ids[evict_pos] == slot_id:
+                    self._closed_sum -= self._sums[evict_pos]
+                    self._closed_count -= self._counts[evict_pos]
+                    self._slot_ids[evict_pos] = -1
+            
+            while self._min_queue and self._min_queue[0][0] < new_low:
+                self._min_queue.popleft()
+            while self._max_queue and self._max_queue[0][0] < new_low:
+                self._max_queue.popleft()
+        
+        self._current = slot
+        pos = slot % self.capacity
+        self._slot_ids[pos] = slot
+        self._mins[pos] = 0.0
+        self._maxs[pos] = 0.0
+        self._sums[pos] = 0.0
+        self._counts[pos] = 0
+    
+    def stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Rolling min/max/avg over the full span in O(1) amortized time"""
+        slot = int((now if now is not None else time.monotonic()) // self.step)
+        if slot > self._current >= 0:
+            self._advance(slot)
+        
+        count = self._closed_count
+        total = self._closed_sum
+        low = self._min_queue[0][1] if self._min_queue else math.inf
+        high = self._max_queue[0][1] if self._max_queue else -math.inf
+        
+        if self._current >= 0:
+            pos = self._current % self.capacity
+            if self._counts[pos]:
+                count += self._counts[pos]
+                total += self._sums[pos]
+                low = min(low, self._mins[pos])
+                high = max(high, self._maxs[pos])
+        
+        if not count:
+            return {'count': 0, 'min': 0.0, 'max': 0.0, 'avg': 0.0}
+        return {'count': count, 'min': low, 'max': high, 'avg': total / count}
+    
+    def window_stats(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Min/max/avg over a window shorter than the span by scanning its slots"""
+        if seconds >= self.span:
+            return self.stats(now)
+        
+        slot = int((now if now is not None else time.monotonic()) // self.step)
+        first = slot - max(1, int(math.ceil(seconds / self.step))) + 1
+        count = 0
+        total = 0.0
+        low = math.inf
+        high = -math.inf
+        for slot_id in range(first, slot + 1):
+            pos = slot_id % self.capacity
+            if self._slot_ids[pos] != slot_id or not self._counts[pos]:
+                continue
+            count += self._counts[pos]
+            total += self._sums[pos]
+            low = min(low, self._mins[pos])
+            high = max(high, self._maxs[pos])
+        
+        if not count:
+            return {'count': 0, 'min': 0.0, 'max': 0.0, 'avg': 0.0}
+        return {'count': count, 'min': low, 'max': high, 'avg': total / count}
+    
+    def points(self, now: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Slot start (on the series clock) and average for every populated slot, oldest first"""
+        slot = int((now if now is not None else time.monotonic()) // self.step)
+        result = []
+        for slot_id in range(slot - self.capacity + 1, slot + 1):
+            pos = slot_id % self.capacity
+            if self._slot_ids[pos] == slot_id and self._counts[pos]:
+                result.append((slot_id * self.step, self._sums[pos] / self._counts[pos]))
+        return result
+    
+    def latest(self) -> Optional[float]:
+        """Average of the most recent populated slot"""
+        if self._current < 0:
+            return None
+        pos = self._current % self.capacity
+        if not self._counts[pos]:
+            return None
+        return self._sums[pos] / self._counts[pos]
+    
+    def memory_bytes(self) -> int:
+        """Bytes held by the preallocated slot arrays"""
+        return sum(
+            buf.itemsize * len(buf)
+            for buf in (self._slot_ids, self._mins, self._maxs, self._sums, self._counts)
+        )
+
+
+class TimeSeries:
+    """One metric recorded at several resolutions"""
+    
+    def __init__(self, resolutions: Tuple[Tuple[int, int], ...] = DEFAULT_RESOLUTIONS):
+        self.resolutions = [RingSeries(step, capacity) for step, capacity in resolutions]
+        self._last_value: Optional[float] = None
+    
+    def add(self, value: float, timestamp: Optional[float] = None):
+        """Record a sample at every resolution"""
+        timestamp = timestamp if timestamp is not None else time.monotonic()
+        for series in self.resolutions:
+            series.add(value, timestamp)
+        self._last_value = value
+    
+    def _series_for(self, seconds: float) -> RingSeries:
+        """Finest resolution whose span covers the window"""
+        for series in self.resolutions:
+            if series.span >= seconds:
+                return series
+        return self.resolutions[-1]
+    
+    def stats(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Min/max/avg over the last N seconds"""
+        return self._series_for(seconds).window_stats(seconds, now)
+    
+    def points(self, seconds: float, now: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Per-slot averages covering the last N seconds"""
+        now = now if now is not None else time.monotonic()
+        cutoff = now - seconds
+        return [p for p in self._series_for(seconds).points(now) if p[0] >= cutoff]
+    
+    @property
+    def last(self) -> Optional[float]:
+        """Most recent raw sample"""
+        return self._last_value
+    
+    def memory_bytes(self) -> int:
+        """Bytes held by all resolutions"""
+        return sum(series.memory_bytes() for series in self.resolutions)
+
+
+class MetricHistory:
+    """Named collection of fixed-memory time series"""
+    
+    def __init__(self, metrics: List[str], resolutions: Tuple[Tuple[int, int], ...] = DEFAULT_RESOLUTIONS):
+        self.resolutions = resolutions
+        self._series: Dict[str, TimeSeries] = {name: TimeSeries(resolutions) for name in metrics}
+    
+    def record(self, values: Dict[str, float], timestamp: Optional[float] = None):
+        """Record a sample for each known metric"""
+        timestamp = timestamp if timestamp is not None else time.monotonic()
+        for name, value in values.items():
+            series = self._series.get(name)
+            if series is not None and value is not None:
+                series.add(float(value), timestamp)
+    
+    def get(self, name: str) -> Optional[TimeSeries]:
+        """Get the series for a metric"""
+        return self._series.get(name)
+    
+    def stats(self, name: str, seconds: float) -> Dict[str, Any]:
+        """Window stats for a metric"""
+        series = self._series.get(name)
+        if series is None:
+            return {'count': 0, 'min': 0.0, 'max': 0.0, 'avg': 0.0}
+        return series.stats(seconds)
+    
+    def points(self, name: str, seconds: float) -> List[Tuple[float, float]]:
+        """Per-slot averages for a metric"""
+        series = self._series.get(name)
+        return series.points(seconds) if series else []
+    
+    def latest(self, name: str) -> Optional[float]:
+        """Most recent raw sample for a metric"""
+        series = self._series.get(name)
+        return series.last if series else None
+    
+    def memory_bytes(self) -> int:
+        """Total bytes held by all series"""
+        return sum(series.memory_bytes() for series in self._series.values())
+
+
+def sparkline(values: List[float], width: int = 24) -> str:
+    """Render values as a unicode sparkline, downsampling to the given width"""
+    if not values:
+        return ""
+    
+    if len(values) > width:
+        bucket = len(values) / width
+        values = [
+            sum(values[int(i * bucket):int((i + 1) * bucket)]) / max(1, int((i + 1) * bucket) - int(i * bucket))
+            for i in range(width)
+        ]
+    
+    ticks = "▁▂▃▄▅▆▇█"
+    low = min(values)
+    high = max(values)
+    spread = high - low
+    if spread == 0:
+        return ticks[0] * len(values)
+    return "".join(ticks[min(len(ticks) - 1, int((v - low) / spread * (len(ticks) - 1) + 0.5))] for v in values)
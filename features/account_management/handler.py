@@ -16,6 +16,7 @@ from aiogram.fsm.state import State, StatesGroup
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.bot.rendering import renderer, memoized_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -97,7 +98,7 @@ class AccountManagementHandler:
             # Check account limit
             accounts = await self._get_user_accounts(user_id)
             if len(accounts) >= 100:  # As per user spec - max 1000 but load 100 at a time
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | Account Limit Reached</b>\\n\\n"
                     "You have reached the maximum limit of 100 active accounts.\\n"
                     "Remove some accounts before adding new ones.",
@@ -118,7 +119,7 @@ Choose API configuration:
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📱 Choose API type")
             
         except Exception as e:
@@ -151,7 +152,7 @@ Please send your phone number in international format:
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await state.set_state(AccountStates.waiting_for_phone)
             await callback.answer("📱 Enter phone number")
             
@@ -183,7 +184,7 @@ Send your API credentials in this format:
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await state.set_state(AccountStates.waiting_for_custom_api)
             await callback.answer("⚙️ Send custom API credentials")
             
@@ -519,7 +520,7 @@ Account is ready for secure operations!
             
             accounts = await self._get_user_accounts(user_id)
             if not accounts:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | No Accounts Found</b>\\n\\n"
                     "You don't have any accounts to remove.",
                     reply_markup=self._get_back_keyboard()
@@ -543,7 +544,7 @@ Account is ready for secure operations!
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🗑️ Select account to remove")
             
         except Exception as e:
@@ -557,7 +558,7 @@ Account is ready for secure operations!
             
             accounts = await self._get_user_accounts(user_id)
             if not accounts:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | No Accounts</b>\\n\\n"
                     "You haven't added any accounts yet.\\n"
                     "Add your first account to get started!",
@@ -591,7 +592,7 @@ Account is ready for secure operations!
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"📋 {len(accounts)} accounts loaded")
             
         except Exception as e:
@@ -603,17 +604,20 @@ Account is ready for secure operations!
         try:
             account_id = int(callback.data.split('_')[2])
             
-            account = await self.db.fetch_one(
-                "SELECT * FROM telegram_accounts WHERE id = $1", account_id
-            )
+            account = await self.db.get_account_by_id(account_id)
             
             if not account:
                 await callback.answer("❌ Account not found", show_alert=True)
                 return
             
             # Calculate account health and status
-            health_score = await self._calculate_health_score(account)
+            health_score, boosts, failed = await asyncio.gather(
+                self._calculate_health_score(account),
+                self.db.get_metric_series('account', account_id, 'boosts', 'day', 7),
+                self.db.get_metric_series('account', account_id, 'failed_boosts', 'day', 7)
+            )
             status = "🟢 Active" if account['is_active'] else "🔴 Inactive"
+            success_rate = (boosts['total'] - failed['total']) / boosts['total'] * 100 if boosts['total'] else 0
             
             info_text = f"""📱 Account Info
 
@@ -621,6 +625,7 @@ Phone: {account['phone_number']}
 Status: {status}
 Health: {health_score}/100
 Verified: {"✅" if account['is_verified'] else "❌"}
+Boosts (7d): {boosts['total']:,} ({success_rate:.0f}% ok)
 
 Added: {account['created_at'].strftime('%Y-%m-%d')}
 API: {"Default" if account['api_id'] == self.config.DEFAULT_API_ID else "Custom"}"""
@@ -648,7 +653,7 @@ API: {"Default" if account['api_id'] == self.config.DEFAULT_API_ID else "Custom"
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🔄 Accounts refreshed!")
             
         except Exception as e:
@@ -661,9 +666,7 @@ API: {"Default" if account['api_id'] == self.config.DEFAULT_API_ID else "Custom"
             account_id = int(callback.data.split('_')[2])
             
             # Get account details
-            account = await self.db.fetch_one(
-                "SELECT * FROM telegram_accounts WHERE id = $1", account_id
-            )
+            account = await self.db.get_account_by_id(account_id)
             
             if not account:
                 await callback.answer("❌ Account not found", show_alert=True)
@@ -700,7 +703,7 @@ All data and session files have been cleaned up.
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("✅ Account removed successfully!")
             
         except Exception as e:
@@ -714,22 +717,11 @@ All data and session files have been cleaned up.
         await self._claim_orphaned_accounts(user_id)
         
         # Then return user's accounts
-        return await self.db.fetch_all(
-            "SELECT * FROM telegram_accounts WHERE user_id = $1 ORDER BY created_at DESC",
-            user_id
-        )
+        return await self.db.get_user_accounts(user_id, active_only=False)
     
     async def _ensure_user_exists(self, user):
         """Ensure user exists in database"""
-        await self.db.execute_query(
-            """
-            INSERT INTO users (user_id, username, first_name, last_name, first_seen, last_seen)
-            VALUES ($1, $2, $3, $4, NOW(), NOW())
-            ON CONFLICT (user_id) DO UPDATE SET 
-                username = $2, last_seen = NOW()
-            """,
-            user.id, user.username, user.first_name, user.last_name
-        )
+        await self.db.create_user(user.id, user.username, user.first_name, user.last_name)
     
     async def _calculate_health_score(self, account: Dict[str, Any]) -> int:
         """Calculate account health score"""
@@ -744,6 +736,7 @@ All data and session files have been cleaned up.
             
         return max(0, score)
     
+    @memoized_keyboard
     def _get_back_keyboard(self) -> InlineKeyboardMarkup:
         """Get back button keyboard"""
         return InlineKeyboardMarkup(inline_keyboard=[
@@ -753,15 +746,10 @@ All data and session files have been cleaned up.
     
     async def _claim_orphaned_accounts(self, user_id: int):
         """Claim orphaned accounts from session recovery"""
-        try:
-            # Update orphaned accounts (user_id IS NULL) to belong to this user
-            await self.db.execute_query(
-                "UPDATE telegram_accounts SET user_id = $1 WHERE user_id IS NULL",
-                user_id
-            )
-        except Exception as e:
-            logger.error(f"Error claiming orphaned accounts: {e}")
+        # Orphaned accounts (user_id IS NULL) come to belong to this user
+        await self.db.claim_orphaned_accounts(user_id)
     
+    @memoized_keyboard
     def _get_retry_keyboard(self) -> InlineKeyboardMarkup:
         """Get retry keyboard"""
         return InlineKeyboardMarkup(inline_keyboard=[
@@ -3,6 +3,8 @@ Analytics Handler
 Provides comprehensive analytics and reporting for all bot operations
 """
 
+import asyncio
+import calendar
 import logging
 import time
 from typing import Dict, Any, List, Optional
@@ -10,16 +12,24 @@ from datetime import datetime, timedelta
 import json
 
 from aiogram import Bot, Dispatcher
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, Message, FSInputFile, BufferedInputFile
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.database.universal_access import UniversalDatabaseAccess
+from core.utils.data_export import StreamingExporter, available_formats
+from core.bot.rendering import renderer, memoized_keyboard
+from core.utils.charts import charts, ChartSpec, ChartSeries
+from core.utils.time_series import sparkline
+from .report_engine import ReportEngine, percent_change
 
 logger = logging.getLogger(__name__)
 
+# Uptime is counted from when the handlers were imported, early in startup
+STARTED_AT = time.monotonic()
+
 
 class AnalyticsHandler:
     """Handler for analytics and reporting"""
@@ -29,9 +39,16 @@ class AnalyticsHandler:
         self.db = db_manager
         self.config = config
         self.universal_db = UniversalDatabaseAccess(db_manager)
+        self.report_engine = ReportEngine(db_manager, config)
         
     async def initialize(self):
         """Initialize analytics handler"""
+        await self.report_engine.start()
+        charts.workers = self.config.CHART_WORKERS
+        # Channel changes on any process make the owner's cached report stale
+        self.db.invalidation.subscribe(
+            'channel', lambda key: self.report_engine.invalidate(int(key) if key else None)
+        )
         logger.info("✅ Analytics handler initialized")
     
     def register_handlers(self, dp: Dispatcher):
@@ -72,12 +89,22 @@ class AnalyticsHandler:
                 await self._handle_boost_stats(callback, state)
             elif callback_data == "an_account_stats":
                 await self._handle_account_stats(callback, state)
+            elif callback_data == "an_channel_growth":
+                await self._handle_growth_chart(callback)
+            elif callback_data.startswith("an_growth_"):
+                await self._handle_growth_chart(callback, int(callback_data[len("an_growth_"):]))
+            elif callback_data == "an_compare":
+                await self._handle_compare_chart(callback)
             elif callback_data.startswith("an_channel_"):
                 await self._handle_specific_channel_analytics(callback, state)
             elif callback_data == "an_overview":
                 await self._handle_analytics_overview(callback, state)
             elif callback_data == "an_export":
                 await self._handle_export_analytics(callback, state)
+            elif callback_data.startswith("an_export_data_"):
+                await self._handle_export_file(callback, callback_data[len("an_export_data_"):])
+            elif callback_data == "an_export_channels":
+                await self._handle_export_file(callback, 'csv', dataset='channels')
             elif callback_data == "an_performance":
                 await self._handle_performance_analytics(callback, state)
             else:
@@ -96,7 +123,7 @@ class AnalyticsHandler:
             channels_stats = await self._get_comprehensive_channel_stats(user_id)
             
             if not channels_stats['channels']:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channel Data Available</b>\n\n"
                     "Add channels first to view analytics.",
                     reply_markup=self._get_no_data_keyboard()
@@ -130,14 +157,14 @@ class AnalyticsHandler:
 • View Boost Growth: {channels_stats['view_growth']:+,}
 
 <b>💡 Insights:</b>
-• Most Active Hour: {channels_stats['peak_hour']}:00
+• Most Active Hour: {self._format_hour(channels_stats['peak_hour'])}
 • Best Performing Day: {channels_stats['best_day']}
 • Average Views per Campaign: {channels_stats['avg_views_per_campaign']:,.0f}
             """
             
             keyboard = self._get_channel_stats_keyboard(len(channels_stats['channels']))
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📈 Channel statistics loaded")
             
         except Exception as e:
@@ -181,6 +208,8 @@ class AnalyticsHandler:
             
             for hour, views in boost_stats['peak_hours'][:3]:
                 text += f"• {hour}:00 - {views:,} views boosted\n"
+            if not boost_stats['peak_hours']:
+                text += "• Not enough boost history yet\n"
             
             text += f"""
 <b>🎯 Top Channels by Boost Performance:</b>
@@ -191,7 +220,7 @@ class AnalyticsHandler:
             
             keyboard = self._get_boost_stats_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🚀 Boost analytics loaded")
             
         except Exception as e:
@@ -207,7 +236,7 @@ class AnalyticsHandler:
             account_stats = await self._get_account_analytics(user_id)
             
             if not account_stats['accounts']:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📱 <b>No Account Data Available</b>\n\n"
                     "Add Telegram accounts first to view analytics.",
                     reply_markup=self._get_no_accounts_keyboard()
@@ -254,7 +283,7 @@ class AnalyticsHandler:
             
             keyboard = self._get_account_stats_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📱 Account analytics loaded")
             
         except Exception as e:
@@ -303,7 +332,7 @@ class AnalyticsHandler:
 • View Growth (30d): {stats['view_growth']:+,}
 
 <b>🕐 Activity Patterns:</b>
-• Most Active Hour: {stats['peak_activity_hour']}:00
+• Most Active Hour: {self._format_hour(stats['peak_activity_hour'])}
 • Most Active Day: {stats['peak_activity_day']}
 • Last Campaign: {stats['last_campaign_date']}
 
@@ -315,7 +344,7 @@ class AnalyticsHandler:
             
             keyboard = self._get_channel_analytics_keyboard(channel_id)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"📊 {channel['title']} analytics")
             
         except Exception as e:
@@ -348,20 +377,19 @@ class AnalyticsHandler:
 <b>🚀 Performance Highlights:</b>
 • Best Channel: {overview['top_channel']}
 • Best Day: {overview['best_day']} ({overview['best_day_views']:,} views)
-• Peak Hour: {overview['peak_hour']}:00
+• Peak Hour: {self._format_hour(overview['peak_hour'])}
 • Avg Daily Views: {overview['avg_daily_views']:,.0f}
 
 <b>💪 System Health:</b>
 • Active Accounts: {overview['active_accounts']}/{overview['total_accounts']}
-• System Uptime: {overview['uptime']:.1f}%
+• Bot Uptime: {overview['uptime']}
 • Success Rate: {overview['overall_success_rate']:.1f}%
-• Response Time: {overview['avg_response_time']:.2f}s
+• Error Rate (24h): {overview['error_rate']:.2f}%
 
-<b>🎭 Feature Usage:</b>
+<b>🎭 Campaign Mix:</b>
 • Auto Boost: {overview['auto_boost_usage']:.1f}%
 • Manual Boost: {overview['manual_boost_usage']:.1f}%
-• Reactions: {overview['reactions_usage']:.1f}%
-• Live Management: {overview['live_usage']:.1f}%
+• Scheduled: {overview['scheduled_campaigns']}
 
 <b>📅 Recent Activity:</b>
 • Last Campaign: {overview['last_activity']}
@@ -371,7 +399,7 @@ class AnalyticsHandler:
             
             keyboard = self._get_overview_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📊 Analytics overview loaded")
             
         except Exception as e:
@@ -389,7 +417,7 @@ class AnalyticsHandler:
             # Format export text
             export_text = f"""
 📋 <b>Analytics Export Report</b>
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+📅 Generated: {report['generated_at'].strftime('%Y-%m-%d %H:%M:%S')}{' (refreshing)' if report['stale'] else ''}
 
 <b>📊 Executive Summary:</b>
 • Report Period: Last 30 Days
@@ -416,13 +444,13 @@ class AnalyticsHandler:
             export_text += f"""
 <b>📱 Account Utilization:</b>
 • Active Accounts: {report['accounts']['active']}/{report['accounts']['total']}
-• Average Health Score: {report['accounts']['avg_health']:.1f}/100
-• Total API Calls: {report['accounts']['api_calls']:,}
+• Verified Accounts: {report['accounts']['verified']}
 
 <b>⚡ Performance Trends:</b>
 • Daily Average Views: {report['trends']['daily_avg']:,.0f}
 • Week-over-Week Growth: {report['trends']['growth']:+.1f}%
-• Peak Activity Hour: {report['trends']['peak_hour']}:00
+• Month-over-Month Growth: {report['trends']['monthly_growth']:+.1f}%
+• Peak Activity Hour: {self._format_hour(report['trends']['peak_hour'])}
 
 <b>📊 Campaign Analysis:</b>
 • Manual Campaigns: {report['campaign_types']['manual']} ({report['campaign_types']['manual_pct']:.1f}%)
@@ -435,13 +463,151 @@ class AnalyticsHandler:
             
             keyboard = self._get_export_keyboard()
             
-            await callback.message.edit_text(export_text, reply_markup=keyboard)
+            await renderer.edit(callback.message, export_text, reply_markup=keyboard)
             await callback.answer("📋 Analytics report generated")
             
         except Exception as e:
             logger.error(f"Error exporting analytics: {e}")
             await callback.answer("❌ Failed to generate report", show_alert=True)
     
+    async def _handle_export_file(self, callback: CallbackQuery, fmt: str, dataset: str = 'analytics'):
+        """Send analytics data points, or the channel list with campaign totals, as a streamed export file"""
+        result = None
+        try:
+            user_id = callback.from_user.id
+            
+            if fmt not in available_formats():
+                await callback.answer(f"❌ {fmt.upper()} export is not available", show_alert=True)
+                return
+            
+            await callback.answer("📤 Preparing export...")
+            
+            if dataset == 'channels':
+                result = await self.db.export_user_channels(user_id, fmt=fmt)
+                title = "📊 <b>Channel Data Export</b>"
+                empty = "📭 No channels to export"
+            else:
+                result = await self.db.export_user_analytics(user_id, days=90, fmt=fmt)
+                title = "📤 <b>Analytics Export (90 days)</b>"
+                empty = "📭 No analytics data recorded in the last 90 days"
+            
+            if not result.rows:
+                await callback.message.answer(empty)
+                return
+            
+            filename = f"{dataset}_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+            await self.bot.send_document(
+                callback.message.chat.id,
+                FSInputFile(result.path, filename=filename),
+                caption=(
+                    f"{title}\n"
+                    f"• Rows: {result.rows:,}\n"
+                    f"• Format: {fmt.upper()}\n"
+                    f"• Size: {result.size_bytes / 1024:.1f} KB\n"
+                    f"• Generated in {result.duration:.1f}s"
+                )
+            )
+            
+        except Exception as e:
+            logger.error(f"Error exporting {dataset} file: {e}")
+            await callback.message.answer(f"❌ Failed to export {dataset} data")
+        finally:
+            if result is not None:
+                StreamingExporter.discard(result.path)
+    
+    async def _handle_growth_chart(self, callback: CallbackQuery, channel_id: Optional[int] = None):
+        """Send daily member growth and boosted views of the last 30 days as a chart"""
+        try:
+            user_id = callback.from_user.id
+            title = "All channels"
+            if channel_id is not None:
+                channel = await self.db.get_channel_by_id(channel_id)
+                if not channel or channel['user_id'] != user_id:
+                    await callback.answer("❌ Channel not found", show_alert=True)
+                    return
+                title = channel['title']
+            
+            rows = await self._get_growth_series(user_id, channel_id)
+            labels = [row['day'].strftime('%m-%d') for row in rows]
+            spec = ChartSpec(
+                title=f"{title} - last 30 days",
+                series=[
+                    ChartSeries("Member growth", list(zip(labels, [float(row['member_growth']) for row in rows]))),
+                    ChartSeries("Views boosted", list(zip(labels, [float(row['views']) for row in rows])))
+                ]
+            )
+            caption = (
+                f"📈 <b>{title} - Growth (30 days)</b>\n"
+                f"• Member Growth: {sum(row['member_growth'] for row in rows):+,}\n"
+                f"• Views Boosted: {sum(row['views'] for row in rows):,}"
+            )
+            await self._send_chart(callback, spec, caption)
+            
+        except Exception as e:
+            logger.error(f"Error sending growth chart: {e}")
+            await callback.answer("❌ Failed to build growth chart", show_alert=True)
+    
+    async def _handle_compare_chart(self, callback: CallbackQuery):
+        """Send a side-by-side comparison of the user's most boosted channels"""
+        try:
+            rows = await self._get_channel_comparison(callback.from_user.id)
+            if not rows:
+                await callback.answer("📭 No channels to compare", show_alert=True)
+                return
+            
+            labels = [row['title'][:16] for row in rows]
+            spec = ChartSpec(
+                title="Channel comparison - last 30 days",
+                kind='bar',
+                series=[
+                    ChartSeries("Members", list(zip(labels, [float(row['members']) for row in rows]))),
+                    ChartSeries("Member growth", list(zip(labels, [float(row['member_growth']) for row in rows]))),
+                    ChartSeries("Views boosted", list(zip(labels, [float(row['views']) for row in rows])))
+                ],
+                height=800
+            )
+            caption = "📊 <b>Channel Comparison (30 days)</b>\n" + "\n".join(
+                f"• {row['title'][:24]}: {row['member_growth']:+,} members, {row['views']:,} views"
+                for row in rows
+            )
+            await self._send_chart(callback, spec, caption)
+            
+        except Exception as e:
+            logger.error(f"Error sending comparison chart: {e}")
+            await callback.answer("❌ Failed to build comparison chart", show_alert=True)
+    
+    async def _send_chart(self, callback: CallbackQuery, spec: ChartSpec, caption: str):
+        """Send a chart as a photo, reusing the upload of an identical chart"""
+        # The chart replaces the screen it was requested from, so that screen is rendered in full next time
+        renderer.forget(callback.message.chat.id, callback.message.message_id)
+        if not charts.available():
+            # Without matplotlib the series are shown as text sparklines
+            lines = [caption, ""]
+            for series in spec.series:
+                lines.append(f"<b>{series.label}:</b> <code>{sparkline(series.values())}</code>")
+            await callback.message.answer("\n".join(lines))
+            await callback.answer()
+            return
+        
+        key = spec.key()
+        file_id = charts.file_id(key)
+        if file_id is not None:
+            try:
+                await callback.message.answer_photo(file_id, caption=caption)
+                await callback.answer()
+                return
+            except Exception as e:
+                logger.warning(f"Cached chart upload rejected, rendering again: {e}")
+                charts.forget_file_id(key)
+        
+        await callback.answer("📈 Rendering chart...")
+        image = await charts.render(spec)
+        message = await callback.message.answer_photo(
+            BufferedInputFile(image, filename=f"chart_{key[:12]}.png"), caption=caption
+        )
+        if message.photo:
+            charts.remember_file_id(key, message.photo[-1].file_id)
+    
     async def _handle_performance_analytics(self, callback: CallbackQuery, state: FSMContext):
         """Handle performance analytics"""
         try:
@@ -454,45 +620,40 @@ class AnalyticsHandler:
 ⚡ <b>Performance Analytics</b>
 
 <b>🚀 System Performance:</b>
-• Average Response Time: {performance['avg_response_time']:.2f}s
 • Success Rate: {performance['success_rate']:.2f}%
-• Uptime: {performance['uptime']:.1f}%
-• Error Rate: {performance['error_rate']:.2f}%
+• Uptime: {performance['uptime']}
+• Error Rate (24h): {performance['error_rate']:.2f}%
+• Updates Handled (24h): {performance['requests_24h']:,}
 
 <b>📊 Throughput Metrics:</b>
 • Views/Hour: {performance['views_per_hour']:,.0f}
 • Campaigns/Hour: {performance['campaigns_per_hour']:.1f}
-• API Calls/Hour: {performance['api_calls_per_hour']:,.0f}
-• Reactions/Hour: {performance['reactions_per_hour']:,.0f}
 
 <b>⚙️ Resource Utilization:</b>
 • Account Usage: {performance['account_utilization']:.1f}%
-• Rate Limit Usage: {performance['rate_limit_usage']:.1f}%
-• Database Load: {performance['db_load']:.1f}%
-• Memory Usage: {performance['memory_usage']:.1f}%
+• Database Pool Usage: {performance['db_pool_usage']:.1f}%
+• Avg Connection Wait: {performance['db_wait_ms']:.1f}ms
 
-<b>📈 Performance Trends (7 days):</b>
-• Speed Improvement: {performance['speed_trend']:+.1f}%
-• Success Rate Change: {performance['success_trend']:+.1f}%
-• Throughput Change: {performance['throughput_trend']:+.1f}%
+<b>📈 Trends:</b>
+• Throughput Change (7 days): {performance['throughput_trend']:+.1f}%
+• Error Change (24h): {performance['error_trend']:+.1f}%
 
-<b>🎯 Optimization Opportunities:</b>
+<b>🎯 Insights:</b>
 """
             
-            for optimization in performance['optimizations']:
-                text += f"• {optimization}\n"
+            for insight in performance['insights']:
+                text += f"• {insight}\n"
             
             text += f"""
-<b>⚠️ Performance Alerts:</b>
-• Slow Queries: {performance['slow_queries']}
-• Failed Operations: {performance['failed_operations']}
-• Rate Limit Hits: {performance['rate_limit_hits']}
-• Timeout Errors: {performance['timeout_errors']}
+<b>⚠️ Alerts (24h):</b>
+• Errors: {performance['errors_24h']}
+• Warnings: {performance['warnings_24h']}
+• Connection Timeouts: {performance['pool_timeouts']}
             """
             
             keyboard = self._get_performance_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚡ Performance analytics loaded")
             
         except Exception as e:
@@ -505,22 +666,13 @@ class AnalyticsHandler:
             channels = await self.universal_db.get_user_channels_with_stats(user_id)
             
             if not channels:
-                return {'channels': [], 'total_members': 0, 'total_campaigns': 0, 'total_views': 0, 'avg_success_rate': 0, 'top_channels': [], 'member_growth': 0, 'new_campaigns': 0, 'view_growth': 0, 'peak_hour': 19, 'best_day': 'Monday', 'avg_views_per_campaign': 0}
+                return {'channels': [], 'total_members': 0, 'total_campaigns': 0, 'total_views': 0, 'avg_success_rate': 0, 'top_channels': [], 'member_growth': 0, 'new_campaigns': 0, 'view_growth': 0, 'peak_hour': None, 'best_day': 'N/A', 'avg_views_per_campaign': 0}
             
             total_members = sum(c.get('member_count', 0) for c in channels)
             total_campaigns = sum(c.get('campaign_stats', {}).get('total', 0) for c in channels)
             
             # Get total views from campaigns
-            total_views_result = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(current_views), 0) as total
-                FROM view_boost_campaigns vbc
-                JOIN telegram_channels c ON vbc.channel_id = c.id
-                WHERE vbc.user_id = $1
-                """,
-                user_id
-            )
-            total_views = total_views_result['total'] if total_views_result else 0
+            total_views = sum(row['current_views'] for row in await self.db.get_campaign_totals(user_id))
             
             # Calculate average success rate
             success_rates = []
@@ -533,17 +685,17 @@ class AnalyticsHandler:
             
             avg_success_rate = sum(success_rates) / len(success_rates) if success_rates else 0
             
-            # Sort channels by performance
-            top_channels = []
-            for channel in channels:
-                top_channels.append({
+            # Channels are already ranked by boosted views in the report
+            report = await self.report_engine.get_report(user_id)
+            top_channels = [
+                {
                     'title': channel['title'],
-                    'members': channel.get('member_count', 0),
-                    'campaigns': channel.get('campaign_stats', {}).get('total', 0),
-                    'views': channel.get('campaign_stats', {}).get('total', 0) * 500  # Estimate
-                })
-            
-            top_channels.sort(key=lambda x: x['views'], reverse=True)
+                    'members': channel['members'] or 0,
+                    'campaigns': channel['campaigns'],
+                    'views': channel['views']
+                }
+                for channel in report['channels']
+            ]
             
             return {
                 'channels': channels,
@@ -552,31 +704,23 @@ class AnalyticsHandler:
                 'total_views': total_views,
                 'avg_success_rate': avg_success_rate,
                 'top_channels': top_channels,
-                'member_growth': 0,  # Would calculate from historical data
-                'new_campaigns': 0,  # Would calculate from recent data
-                'view_growth': 0,  # Would calculate from historical data
-                'peak_hour': 19,  # Would calculate from actual data
-                'best_day': 'Monday',  # Would calculate from actual data
+                'member_growth': report['trends']['member_growth'],
+                'new_campaigns': report['periods'].get('campaigns_30d', 0),
+                'view_growth': report['periods'].get('views_30d', 0) - report['periods'].get('views_prev_30d', 0),
+                'peak_hour': report['trends']['peak_hour'],
+                'best_day': report['metrics']['best_day'],
                 'avg_views_per_campaign': total_views / total_campaigns if total_campaigns > 0 else 0
             }
             
         except Exception as e:
             logger.error(f"Error getting comprehensive channel stats: {e}")
-            return {'channels': [], 'total_members': 0, 'total_campaigns': 0, 'total_views': 0, 'avg_success_rate': 0, 'top_channels': [], 'member_growth': 0, 'new_campaigns': 0, 'view_growth': 0, 'peak_hour': 19, 'best_day': 'Monday', 'avg_views_per_campaign': 0}
+            return {'channels': [], 'total_members': 0, 'total_campaigns': 0, 'total_views': 0, 'avg_success_rate': 0, 'top_channels': [], 'member_growth': 0, 'new_campaigns': 0, 'view_growth': 0, 'peak_hour': None, 'best_day': 'N/A', 'avg_views_per_campaign': 0}
     
     async def _get_comprehensive_boost_stats(self, user_id: int) -> Dict[str, Any]:
         """Get comprehensive boost statistics"""
         try:
-            # Get campaign stats
-            campaign_stats = await self.db.fetch_all(
-                """
-                SELECT status, COUNT(*) as count, SUM(target_views) as target, SUM(current_views) as current
-                FROM view_boost_campaigns
-                WHERE user_id = $1
-                GROUP BY status
-                """,
-                user_id
-            )
+            # Per-status counts and view totals, including recent windows, in one query
+            campaign_stats = await self.db.get_campaign_totals(user_id)
             
             total_campaigns = sum(s['count'] for s in campaign_stats)
             active_campaigns = sum(s['count'] for s in campaign_stats if s['status'] == 'active')
@@ -585,57 +729,30 @@ class AnalyticsHandler:
             success_rate = (completed_campaigns / total_campaigns * 100) if total_campaigns > 0 else 0
             
             # Get view statistics
-            total_views = sum(s['current'] or 0 for s in campaign_stats)
-            
-            # Get time-based statistics
-            monthly_views = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(current_views), 0) as views
-                FROM view_boost_campaigns
-                WHERE user_id = $1 AND created_at >= NOW() - INTERVAL '30 days'
-                """,
-                user_id
-            )
-            
-            weekly_views = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(current_views), 0) as views
-                FROM view_boost_campaigns
-                WHERE user_id = $1 AND created_at >= NOW() - INTERVAL '7 days'
-                """,
-                user_id
-            )
+            total_views = sum(s['current_views'] for s in campaign_stats)
             
-            daily_views = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(current_views), 0) as views
-                FROM view_boost_campaigns
-                WHERE user_id = $1 AND created_at >= NOW() - INTERVAL '1 day'
-                """,
-                user_id
-            )
+            report = await self.report_engine.get_report(user_id)
             
             return {
                 'total_campaigns': total_campaigns,
                 'active_campaigns': active_campaigns,
                 'success_rate': success_rate,
-                'avg_completion_time': 2.5,  # Would calculate from actual data
+                'avg_completion_time': report['metrics']['avg_completion_hours'],
                 'total_views': total_views,
-                'monthly_views': monthly_views['views'] if monthly_views else 0,
-                'weekly_views': weekly_views['views'] if weekly_views else 0,
-                'daily_views': daily_views['views'] if daily_views else 0,
+                'monthly_views': sum(s['views_30d'] for s in campaign_stats),
+                'weekly_views': sum(s['views_7d'] for s in campaign_stats),
+                'daily_views': sum(s['views_1d'] for s in campaign_stats),
                 'daily_average': total_views / 30 if total_views > 0 else 0,
-                'peak_views': daily_views['views'] if daily_views else 0,
-                'growth_rate': 5.0,  # Would calculate from historical data
-                'manual_campaigns': sum(s['count'] for s in campaign_stats if s.get('campaign_type') == 'manual'),
-                'auto_campaigns': sum(s['count'] for s in campaign_stats if s.get('campaign_type') == 'auto'),
-                'manual_percentage': 60.0,  # Would calculate
-                'auto_percentage': 40.0,  # Would calculate
-                'peak_hours': [(19, 1500), (20, 1200), (18, 1000)],  # Would calculate
+                'peak_views': report['trends']['peak_day_views'],
+                'growth_rate': report['trends']['monthly_growth'],
+                'manual_campaigns': report['campaign_types']['manual'],
+                'auto_campaigns': report['campaign_types']['auto'],
+                'manual_percentage': report['campaign_types']['manual_pct'],
+                'auto_percentage': report['campaign_types']['auto_pct'],
+                'peak_hours': report['trends']['peak_hours'],
                 'top_boost_channels': [
-                    {'title': 'Channel 1', 'total_boosted': 5000},
-                    {'title': 'Channel 2', 'total_boosted': 3000},
-                    {'title': 'Channel 3', 'total_boosted': 2000}
+                    {'title': channel['title'], 'total_boosted': channel['views']}
+                    for channel in report['channels'] if channel['views']
                 ]
             }
             
@@ -688,6 +805,14 @@ class AnalyticsHandler:
             logger.error(f"Error getting account analytics: {e}")
             return {'accounts': [], 'active_count': 0, 'verified_count': 0, 'avg_health_score': 0, 'total_api_calls': 0, 'monthly_calls': 0, 'success_rate': 0, 'rate_limit_hits': 0, 'top_accounts': [], 'daily_avg_calls': 0, 'utilization_rate': 0, 'error_rate': 0, 'critical_health': 0, 'rate_limited': 0, 'inactive_count': 0}
     
+    async def _get_growth_series(self, user_id: int, channel_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Daily member growth and boosted views for the last 30 days, one row per day"""
+        return await self.db.get_growth_series(user_id, channel_id, days=30)
+    
+    async def _get_channel_comparison(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Members, 30 day growth and boosted views of the user's most boosted channels"""
+        return await self.db.get_channel_comparison(user_id, limit)
+    
     async def _get_detailed_channel_analytics(self, channel_id: int) -> Optional[Dict[str, Any]]:
         """Get detailed analytics for specific channel"""
         try:
@@ -695,41 +820,51 @@ class AnalyticsHandler:
             if not channel:
                 return None
             
-            # Get campaign stats for this channel
-            campaigns = await self.db.fetch_all(
-                "SELECT * FROM view_boost_campaigns WHERE channel_id = $1",
-                channel_id
+            # Aggregates and bucketed series come from the database; only buckets cross the wire
+            summary, views, campaigns, boosts, members = await asyncio.gather(
+                self.db.get_campaign_summary(channel_id),
+                self.db.get_metric_series('channel', channel_id, 'views_boosted', 'day', 60),
+                self.db.get_metric_series('channel', channel_id, 'campaigns', 'day', 60),
+                self.db.get_metric_series('channel', channel_id, 'boosts', 'hour', 24 * 7),
+                self.db.get_metric_series('channel', channel_id, 'member_growth', 'day', 30)
             )
             
-            total_campaigns = len(campaigns)
-            active_campaigns = len([c for c in campaigns if c['status'] == 'active'])
-            completed_campaigns = len([c for c in campaigns if c['status'] == 'completed'])
-            
+            total_campaigns = summary.get('total_campaigns', 0)
+            completed_campaigns = summary.get('completed_campaigns', 0)
+            total_views_boosted = summary.get('total_views', 0)
             success_rate = (completed_campaigns / total_campaigns * 100) if total_campaigns > 0 else 0
             
-            total_views_boosted = sum(c['current_views'] for c in campaigns)
-            total_target_views = sum(c['target_views'] for c in campaigns)
+            daily_views = [bucket['value'] for bucket in views['buckets']]
+            daily_campaigns = [bucket['value'] for bucket in campaigns['buckets']]
+            views_30d = sum(daily_views[-30:])
+            
+            hour_totals = [0] * 24
+            for bucket in boosts['buckets']:
+                hour_totals[bucket['bucket'].hour] += bucket['value']
+            weekday_totals = [0] * 7
+            for bucket in views['buckets']:
+                weekday_totals[bucket['bucket'].weekday()] += bucket['value']
             
             return {
                 'channel': channel,
                 'stats': {
                     'total_campaigns': total_campaigns,
-                    'active_campaigns': active_campaigns,
+                    'active_campaigns': summary.get('active_campaigns', 0),
                     'completed_campaigns': completed_campaigns,
                     'success_rate': success_rate,
                     'total_views_boosted': total_views_boosted,
-                    'total_target_views': total_target_views,
+                    'total_target_views': summary.get('total_target_views', 0),
                     'avg_views_per_campaign': total_views_boosted / total_campaigns if total_campaigns > 0 else 0,
-                    'best_campaign_views': max((c['current_views'] for c in campaigns), default=0),
-                    'member_growth': 0,  # Would calculate from historical data
-                    'campaign_growth': 0,  # Would calculate
-                    'view_growth': 0,  # Would calculate
-                    'peak_activity_hour': 19,  # Would calculate from actual data
-                    'peak_activity_day': 'Monday',  # Would calculate
-                    'last_campaign_date': max((c['created_at'] for c in campaigns), default=datetime.now()).strftime('%Y-%m-%d') if campaigns else 'Never',
-                    'recent_campaigns': len([c for c in campaigns if c['created_at'] >= datetime.now() - timedelta(days=7)]),
-                    'recent_views': sum(c['current_views'] for c in campaigns if c['created_at'] >= datetime.now() - timedelta(days=7)),
-                    'daily_average': total_views_boosted / 30 if total_views_boosted > 0 else 0
+                    'best_campaign_views': summary.get('best_campaign_views', 0),
+                    'member_growth': members['total'],
+                    'campaign_growth': sum(daily_campaigns[-30:]) - sum(daily_campaigns[:-30]),
+                    'view_growth': views_30d - sum(daily_views[:-30]),
+                    'peak_activity_hour': hour_totals.index(max(hour_totals)) if any(hour_totals) else None,
+                    'peak_activity_day': calendar.day_name[weekday_totals.index(max(weekday_totals))] if any(weekday_totals) else 'N/A',
+                    'last_campaign_date': summary['last_campaign_at'].strftime('%Y-%m-%d') if summary.get('last_campaign_at') else 'Never',
+                    'recent_campaigns': sum(daily_campaigns[-7:]),
+                    'recent_views': sum(daily_views[-7:]),
+                    'daily_average': views_30d / 30
                 }
             }
             
@@ -740,53 +875,38 @@ class AnalyticsHandler:
     async def _get_analytics_overview(self, user_id: int) -> Dict[str, Any]:
         """Get analytics overview"""
         try:
-            # Get basic counts
-            channels_count = await self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM telegram_channels WHERE user_id = $1 AND is_active = TRUE",
-                user_id
-            )
-            
-            accounts_count = await self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM telegram_accounts WHERE user_id = $1",
-                user_id
-            )
-            
-            campaigns_count = await self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM view_boost_campaigns WHERE user_id = $1",
-                user_id
-            )
-            
-            total_views = await self.db.fetch_one(
-                "SELECT COALESCE(SUM(current_views), 0) as total FROM view_boost_campaigns WHERE user_id = $1",
-                user_id
-            )
+            report = await self.report_engine.get_report(user_id)
+            runtime = await self._get_runtime_metrics()
+            summary = report['summary']
+            periods = report['periods']
+            types = report['campaign_types']
+            last_campaign_at = periods.get('last_campaign_at')
             
             return {
-                'channels': channels_count['count'] if channels_count else 0,
-                'accounts': accounts_count['count'] if accounts_count else 0,
-                'campaigns': campaigns_count['count'] if campaigns_count else 0,
-                'total_views': total_views['total'] if total_views else 0,
-                'monthly_campaigns': 15,  # Would calculate from actual data
-                'monthly_views': 5000,  # Would calculate
-                'monthly_success_rate': 95.0,  # Would calculate
-                'monthly_growth': 12.5,  # Would calculate
-                'top_channel': 'My Best Channel',  # Would calculate
-                'best_day': 'Monday',  # Would calculate
-                'best_day_views': 1500,  # Would calculate
-                'peak_hour': 19,  # Would calculate
-                'avg_daily_views': 200,  # Would calculate
-                'active_accounts': 5,  # Would calculate
-                'total_accounts': 8,  # Would calculate
-                'uptime': 99.5,  # Would calculate
-                'overall_success_rate': 96.2,  # Would calculate
-                'avg_response_time': 1.2,  # Would calculate
-                'auto_boost_usage': 60.0,  # Would calculate
-                'manual_boost_usage': 30.0,  # Would calculate
-                'reactions_usage': 8.0,  # Would calculate
-                'live_usage': 2.0,  # Would calculate
-                'last_activity': '2 hours ago',  # Would calculate
-                'today_campaigns': 3,  # Would calculate
-                'today_views': 450  # Would calculate
+                'channels': summary['channels'],
+                'accounts': summary['accounts'],
+                'campaigns': summary['campaigns'],
+                'total_views': summary['views'],
+                'monthly_campaigns': periods.get('campaigns_30d', 0),
+                'monthly_views': periods.get('views_30d', 0),
+                'monthly_success_rate': report['metrics']['success_rate'],
+                'monthly_growth': report['trends']['monthly_growth'],
+                'top_channel': report['metrics']['top_channel'],
+                'best_day': report['metrics']['best_day'],
+                'best_day_views': report['metrics']['best_day_views'],
+                'peak_hour': report['trends']['peak_hour'],
+                'avg_daily_views': report['trends']['daily_avg'],
+                'active_accounts': report['accounts']['active'],
+                'total_accounts': report['accounts']['total'],
+                'uptime': runtime['uptime'],
+                'overall_success_rate': report['metrics']['success_rate'],
+                'error_rate': runtime['error_rate'],
+                'auto_boost_usage': types['auto_pct'],
+                'manual_boost_usage': types['manual_pct'],
+                'scheduled_campaigns': types['scheduled'],
+                'last_activity': last_campaign_at.strftime('%Y-%m-%d %H:%M') if last_campaign_at else 'Never',
+                'today_campaigns': periods.get('campaigns_today', 0),
+                'today_views': periods.get('views_today', 0)
             }
             
         except Exception as e:
@@ -796,50 +916,7 @@ class AnalyticsHandler:
     async def _generate_analytics_report(self, user_id: int) -> Dict[str, Any]:
         """Generate comprehensive analytics report"""
         try:
-            # This would generate a comprehensive report
-            # For now, returning a structured example
-            return {
-                'summary': {
-                    'channels': 5,
-                    'accounts': 8,
-                    'campaigns': 45,
-                    'views': 15000
-                },
-                'metrics': {
-                    'success_rate': 94.5,
-                    'avg_campaign_size': 333,
-                    'best_day': 'Monday',
-                    'top_channel': 'Main Channel'
-                },
-                'channels': [
-                    {'title': 'Channel 1', 'campaigns': 15, 'views': 5000},
-                    {'title': 'Channel 2', 'campaigns': 12, 'views': 4000},
-                ],
-                'accounts': {
-                    'active': 7,
-                    'total': 8,
-                    'avg_health': 89.2,
-                    'api_calls': 25000
-                },
-                'trends': {
-                    'daily_avg': 500,
-                    'growth': 8.5,
-                    'peak_hour': 19
-                },
-                'campaign_types': {
-                    'manual': 25,
-                    'auto': 20,
-                    'scheduled': 3,
-                    'manual_pct': 55.6,
-                    'auto_pct': 44.4
-                },
-                'insights': [
-                    'Peak performance occurs at 7-9 PM',
-                    'Monday shows highest engagement rates',
-                    'Auto campaigns have 5% higher success rate',
-                    'Account health scores are above average'
-                ]
-            }
+            return await self.report_engine.get_report(user_id)
             
         except Exception as e:
             logger.error(f"Error generating analytics report: {e}")
@@ -848,39 +925,68 @@ class AnalyticsHandler:
     async def _get_performance_metrics(self, user_id: int) -> Dict[str, Any]:
         """Get performance metrics"""
         try:
-            # This would calculate actual performance metrics
+            report = await self.report_engine.get_report(user_id)
+            runtime = await self._get_runtime_metrics()
+            periods = report['periods']
+            accounts = report['accounts']
+            
             return {
-                'avg_response_time': 1.25,
-                'success_rate': 96.8,
-                'uptime': 99.2,
-                'error_rate': 1.5,
-                'views_per_hour': 125,
-                'campaigns_per_hour': 0.8,
-                'api_calls_per_hour': 850,
-                'reactions_per_hour': 45,
-                'account_utilization': 78.5,
-                'rate_limit_usage': 65.2,
-                'db_load': 45.8,
-                'memory_usage': 62.3,
-                'speed_trend': 8.5,
-                'success_trend': 2.1,
-                'throughput_trend': 12.8,
-                'optimizations': [
-                    'Consider adding more accounts for better distribution',
-                    'Peak hour scheduling could improve efficiency',
-                    'Database queries could be optimized for better performance'
-                ],
-                'slow_queries': 3,
-                'failed_operations': 12,
-                'rate_limit_hits': 8,
-                'timeout_errors': 2
+                'success_rate': report['metrics']['success_rate'],
+                'views_per_hour': periods.get('views_7d', 0) / (7 * 24),
+                'campaigns_per_hour': periods.get('campaigns_30d', 0) / (30 * 24),
+                'account_utilization': accounts['active'] / accounts['total'] * 100 if accounts['total'] else 0.0,
+                'throughput_trend': report['trends']['growth'],
+                'insights': report['insights'],
+                **runtime
             }
             
         except Exception as e:
             logger.error(f"Error getting performance metrics: {e}")
             return {}
     
+    async def _get_runtime_metrics(self) -> Dict[str, Any]:
+        """Uptime, error rate and connection pool usage measured by this bot process"""
+        metrics = {
+            'uptime': self._format_duration(time.monotonic() - STARTED_AT),
+            'error_rate': 0.0, 'error_trend': 0.0, 'errors_24h': 0, 'warnings_24h': 0, 'requests_24h': 0,
+            'db_pool_usage': 0.0, 'db_wait_ms': 0.0, 'pool_timeouts': 0
+        }
+        try:
+            errors = await self.db.errors.get_summary(hours=24)
+            metrics.update({
+                'error_rate': errors['error_rate'],
+                'error_trend': percent_change(errors['total_errors'], errors['previous_errors']),
+                'errors_24h': errors['total_errors'],
+                'warnings_24h': errors['warnings'],
+                'requests_24h': errors['requests']
+            })
+        except Exception as e:
+            logger.warning(f"Error summary unavailable for analytics: {e}")
+        
+        pools = list((await self.db.coordinator.get_health_status()).get('pools', {}).values())
+        capacity = sum(pool['max_size'] for pool in pools)
+        acquires = sum(pool['acquires'] for pool in pools)
+        if capacity:
+            metrics['db_pool_usage'] = sum(pool['in_use'] for pool in pools) / capacity * 100
+        if acquires:
+            metrics['db_wait_ms'] = sum(pool['avg_wait_ms'] * pool['acquires'] for pool in pools) / acquires
+        metrics['pool_timeouts'] = sum(pool['acquire_timeouts'] for pool in pools)
+        return metrics
+    
+    @staticmethod
+    def _format_duration(seconds: float) -> str:
+        """Format a duration as days, hours and minutes"""
+        days = int(seconds // 86400)
+        hours = int((seconds % 86400) // 3600)
+        minutes = int((seconds % 3600) // 60)
+        return f"{days}d {hours}h {minutes}m"
+    
+    def _format_hour(self, hour: Optional[int]) -> str:
+        """Format an hour of day, or N/A when there is no data"""
+        return f"{hour}:00" if hour is not None else "N/A"
+    
     # Keyboard methods
+    @memoized_keyboard
     def _get_channel_stats_keyboard(self, channel_count: int) -> InlineKeyboardMarkup:
         """Get channel stats keyboard"""
         buttons = [
@@ -903,6 +1009,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_boost_stats_keyboard(self) -> InlineKeyboardMarkup:
         """Get boost stats keyboard"""
         buttons = [
@@ -925,6 +1032,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_account_stats_keyboard(self) -> InlineKeyboardMarkup:
         """Get account stats keyboard"""
         buttons = [
@@ -947,6 +1055,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_channel_analytics_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get channel analytics keyboard"""
         buttons = [
@@ -969,6 +1078,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_overview_keyboard(self) -> InlineKeyboardMarkup:
         """Get overview keyboard"""
         buttons = [
@@ -991,6 +1101,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_export_keyboard(self) -> InlineKeyboardMarkup:
         """Get export keyboard"""
         buttons = [
@@ -1002,6 +1113,10 @@ class AnalyticsHandler:
                 InlineKeyboardButton(text="📧 Email Report", callback_data="an_email_report"),
                 InlineKeyboardButton(text="💾 Save Report", callback_data="an_save_report")
             ],
+            [
+                InlineKeyboardButton(text=f"📄 {fmt.upper()}", callback_data=f"an_export_data_{fmt}")
+                for fmt in available_formats()
+            ],
             [
                 InlineKeyboardButton(text="🔙 Back to Analytics", callback_data="analytics")
             ]
@@ -1009,6 +1124,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_performance_keyboard(self) -> InlineKeyboardMarkup:
         """Get performance keyboard"""
         buttons = [
@@ -1031,6 +1147,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_data_keyboard(self) -> InlineKeyboardMarkup:
         """Get no data keyboard"""
         buttons = [
@@ -1040,6 +1157,7 @@ class AnalyticsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_accounts_keyboard(self) -> InlineKeyboardMarkup:
         """Get no accounts keyboard"""
         buttons = [
@@ -1096,7 +1214,7 @@ class AnalyticsHandler:
                 [InlineKeyboardButton(text="🔙 Back", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("💾 System information loaded")
             
         except Exception as e:
@@ -1152,7 +1270,7 @@ class AnalyticsHandler:
                 [InlineKeyboardButton(text="🔙 Back", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚡ Engine status loaded")
             
         except Exception as e:
@@ -1289,4 +1407,6 @@ class AnalyticsHandler:
     
     async def shutdown(self):
         """Shutdown analytics handler"""
+        await self.report_engine.stop()
+        charts.shutdown()
         logger.info("✅ Analytics handler shut down")
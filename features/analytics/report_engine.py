@@ -0,0 +1,385 @@
+"""
+Analytics Report Engine
+Computes per-user reports from grouped SQL queries and serves them stale-while-revalidate
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+
+from core.config.config import Config
+from core.database.unified_database import DatabaseManager
+from core.database.pools import ANALYTICS
+from core.utils.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def percent_change(current: float, previous: float) -> float:
+    """Period-over-period change in percent"""
+    if not previous:
+        return 100.0 if current else 0.0
+    return (current - previous) / previous * 100
+
+
+class ReportEngine:
+    """Builds analytics reports in the background and caches them per user"""
+    
+    def __init__(self, db_manager: DatabaseManager, config: Config):
+        self.db = db_manager
+        self.config = config
+        self._reports: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._last_access: Dict[int, float] = {}
+        self._refreshing: Dict[int, asyncio.Task] = {}
+        self._running = False
+    
+    async def start(self):
+        """Start the background refresh job"""
+        if self._running:
+            return
+        
+        self._running = True
+        supervisor.spawn_periodic(
+            'analytics.report_refresh', self._refresh_stale_reports,
+            self.config.ANALYTICS_REPORT_TTL, initial_delay=self.config.ANALYTICS_REPORT_TTL
+        )
+        logger.info("✅ Analytics report engine started")
+    
+    async def stop(self):
+        """Stop the background refresh job and pending rebuilds"""
+        self._running = False
+        await supervisor.stop('analytics.report_refresh')
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._refreshing.clear()
+        logger.info("⏹️ Analytics report engine stopped")
+    
+    async def get_report(self, user_id: int, force: bool = False) -> Dict[str, Any]:
+        """Return the cached report, revalidating in the background when stale"""
+        now = time.time()
+        self._last_access[user_id] = now
+        cached = self._reports.get(user_id)
+        
+        if cached and not force:
+            built_at, report = cached
+            age = now - built_at
+            if age >= self.config.ANALYTICS_REPORT_TTL:
+                if age < self.config.ANALYTICS_REPORT_MAX_AGE:
+                    # Serve stale immediately, rebuild off the request path
+                    self._schedule_refresh(user_id)
+                    return self._with_age(report, built_at, stale=True)
+            else:
+                return self._with_age(report, built_at, stale=False)
+        
+        # Nothing usable cached: build now, sharing an in-flight rebuild if there is one
+        task = self._schedule_refresh(user_id)
+        await asyncio.shield(task)
+        built_at, report = self._reports.get(user_id, (now, {}))
+        return self._with_age(report, built_at, stale=False)
+    
+    def invalidate(self, user_id: Optional[int] = None):
+        """Drop a cached report, or every report, so the next request rebuilds it"""
+        if user_id is None:
+            self._reports.clear()
+        else:
+            self._reports.pop(user_id, None)
+    
+    def _with_age(self, report: Dict[str, Any], built_at: float, stale: bool) -> Dict[str, Any]:
+        """Attach cache age metadata to a report"""
+        return {**report, 'age_seconds': int(time.time() - built_at), 'stale': stale}
+    
+    def _schedule_refresh(self, user_id: int) -> asyncio.Task:
+        """Start a rebuild for a user unless one is already running"""
+        task = self._refreshing.get(user_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(user_id))
+            self._refreshing[user_id] = task
+        return task
+    
+    async def _refresh(self, user_id: int):
+        """Rebuild and store a user's report"""
+        try:
+            started = time.perf_counter()
+            report = await self.build_report(user_id)
+            self._reports[user_id] = (time.time(), report)
+            logger.debug(f"Analytics report for {user_id} built in {(time.perf_counter() - started) * 1000:.0f}ms")
+        except Exception as e:
+            logger.error(f"Failed to build analytics report for {user_id}: {e}")
+        finally:
+            self._refreshing.pop(user_id, None)
+    
+    async def _refresh_stale_reports(self):
+        """Keep reports warm for recently active users"""
+        now = time.time()
+        
+        for user_id, accessed_at in list(self._last_access.items()):
+            if now - accessed_at > self.config.ANALYTICS_REPORT_MAX_AGE:
+                # User went idle; let the report expire
+                self._last_access.pop(user_id, None)
+                self._reports.pop(user_id, None)
+                continue
+            
+            built_at = self._reports.get(user_id, (0, None))[0]
+            if now - built_at >= self.config.ANALYTICS_REPORT_TTL:
+                await self._schedule_refresh(user_id)
+    
+    async def build_report(self, user_id: int) -> Dict[str, Any]:
+        """Compute a full report with a handful of grouped queries"""
+        summary, periods, hourly, weekday, channels, growth = await asyncio.gather(
+            self._get_summary(user_id),
+            self._get_period_totals(user_id),
+            self._get_hourly_views(user_id),
+            self._get_weekday_views(user_id),
+            self._get_channel_breakdown(user_id),
+            self._get_member_growth(user_id)
+        )
+        
+        peak_hours = sorted(hourly, key=lambda h: h['views'], reverse=True)
+        best_weekday = max(weekday, key=lambda d: d['views'], default=None)
+        
+        total_campaigns = summary.get('campaigns', 0)
+        completed = summary.get('completed_campaigns', 0)
+        manual = summary.get('manual_campaigns', 0)
+        auto = summary.get('auto_campaigns', 0)
+        views_30d = periods.get('views_30d', 0)
+        
+        report = {
+            'generated_at': datetime.now(),
+            'summary': {
+                'channels': summary.get('channels', 0),
+                'accounts': summary.get('accounts', 0),
+                'campaigns': total_campaigns,
+                'views': summary.get('views', 0)
+            },
+            'metrics': {
+                'success_rate': (completed / total_campaigns * 100) if total_campaigns else 0.0,
+                'avg_campaign_size': (summary.get('views', 0) / total_campaigns) if total_campaigns else 0.0,
+                'avg_completion_hours': summary.get('avg_completion_hours', 0.0),
+                'best_day': WEEKDAY_NAMES[best_weekday['dow'] - 1] if best_weekday else 'N/A',
+                'best_day_views': best_weekday['views'] if best_weekday else 0,
+                'top_channel': channels[0]['title'] if channels else 'N/A'
+            },
+            'channels': channels,
+            'accounts': {
+                'active': summary.get('active_accounts', 0),
+                'total': summary.get('accounts', 0),
+                'verified': summary.get('verified_accounts', 0)
+            },
+            'periods': periods,
+            'trends': {
+                'daily_avg': views_30d / 30,
+                'peak_day_views': periods.get('peak_day_views', 0),
+                'growth': percent_change(periods.get('views_7d', 0), periods.get('views_prev_7d', 0)),
+                'monthly_growth': percent_change(views_30d, periods.get('views_prev_30d', 0)),
+                'campaign_growth': percent_change(periods.get('campaigns_30d', 0), periods.get('campaigns_prev_30d', 0)),
+                'peak_hour': peak_hours[0]['hour'] if peak_hours else None,
+                'peak_hours': [(h['hour'], h['views']) for h in peak_hours[:3]],
+                'member_growth': growth
+            },
+            'campaign_types': {
+                'manual': manual,
+                'auto': auto,
+                'scheduled': summary.get('scheduled_campaigns', 0),
+                'manual_pct': (manual / total_campaigns * 100) if total_campaigns else 0.0,
+                'auto_pct': (auto / total_campaigns * 100) if total_campaigns else 0.0
+            }
+        }
+        report['insights'] = self._build_insights(report)
+        return report
+    
+    async def _get_summary(self, user_id: int) -> Dict[str, Any]:
+        """Entity counts and campaign breakdown for a user"""
+        try:
+            row = await self.db.fetch_one(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM telegram_channels WHERE user_id = $1 AND is_active = TRUE) AS channels,
+                    a.accounts, a.active_accounts, a.verified_accounts,
+                    c.campaigns, c.completed_campaigns, c.manual_campaigns, c.auto_campaigns,
+                    c.scheduled_campaigns, c.views, c.avg_completion_hours
+                FROM (
+                    SELECT
+                        COUNT(*) AS accounts,
+                        COUNT(*) FILTER (WHERE is_active) AS active_accounts,
+                        COUNT(*) FILTER (WHERE is_verified) AS verified_accounts
+                    FROM telegram_accounts WHERE user_id = $1
+                ) a, (
+                    SELECT
+                        COUNT(*) AS campaigns,
+                        COUNT(*) FILTER (WHERE status = 'completed') AS completed_campaigns,
+                        COUNT(*) FILTER (WHERE campaign_type = 'manual') AS manual_campaigns,
+                        COUNT(*) FILTER (WHERE campaign_type = 'auto') AS auto_campaigns,
+                        COUNT(*) FILTER (WHERE status = 'scheduled') AS scheduled_campaigns,
+                        COALESCE(SUM(current_views), 0) AS views,
+                        COALESCE(AVG(EXTRACT(EPOCH FROM (updated_at - created_at)) / 3600)
+                                 FILTER (WHERE status = 'completed'), 0) AS avg_completion_hours
+                    FROM view_boost_campaigns WHERE user_id = $1
+                ) c
+                """,
+                user_id,
+                pool=ANALYTICS
+            )
+            if not row:
+                return {}
+            row['avg_completion_hours'] = float(row['avg_completion_hours'])
+            return row
+        except Exception as e:
+            logger.error(f"Error getting report summary: {e}")
+            return {}
+    
+    async def _get_period_totals(self, user_id: int) -> Dict[str, Any]:
+        """Current and previous period totals for deltas"""
+        try:
+            row = await self.db.fetch_one(
+                """
+                WITH daily AS (
+                    SELECT date_trunc('day', vbl.timestamp) AS day, SUM(vbl.views_added) AS views
+                    FROM view_boost_logs vbl
+                    JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id
+                    WHERE vbc.user_id = $1 AND vbl.success AND vbl.timestamp >= NOW() - INTERVAL '60 days'
+                    GROUP BY 1
+                )
+                SELECT
+                    COALESCE(SUM(views) FILTER (WHERE day >= date_trunc('day', NOW())), 0)::bigint AS views_today,
+                    COALESCE(SUM(views) FILTER (WHERE day >= NOW() - INTERVAL '7 days'), 0)::bigint AS views_7d,
+                    COALESCE(SUM(views) FILTER (
+                        WHERE day < NOW() - INTERVAL '7 days' AND day >= NOW() - INTERVAL '14 days'
+                    ), 0)::bigint AS views_prev_7d,
+                    COALESCE(SUM(views) FILTER (WHERE day >= NOW() - INTERVAL '30 days'), 0)::bigint AS views_30d,
+                    COALESCE(SUM(views) FILTER (WHERE day < NOW() - INTERVAL '30 days'), 0)::bigint AS views_prev_30d,
+                    COALESCE(MAX(views) FILTER (WHERE day >= NOW() - INTERVAL '30 days'), 0)::bigint AS peak_day_views,
+                    (
+                        SELECT COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')
+                        FROM view_boost_campaigns WHERE user_id = $1
+                    ) AS campaigns_30d,
+                    (
+                        SELECT COUNT(*) FILTER (
+                            WHERE created_at < NOW() - INTERVAL '30 days' AND created_at >= NOW() - INTERVAL '60 days'
+                        )
+                        FROM view_boost_campaigns WHERE user_id = $1
+                    ) AS campaigns_prev_30d,
+                    (
+                        SELECT COUNT(*) FILTER (WHERE created_at >= date_trunc('day', NOW()))
+                        FROM view_boost_campaigns WHERE user_id = $1
+                    ) AS campaigns_today,
+                    (SELECT MAX(created_at) FROM view_boost_campaigns WHERE user_id = $1) AS last_campaign_at
+                FROM daily
+                """,
+                user_id,
+                pool=ANALYTICS
+            )
+            return row or {}
+        except Exception as e:
+            logger.error(f"Error getting report period totals: {e}")
+            return {}
+    
+    async def _get_hourly_views(self, user_id: int) -> List[Dict[str, Any]]:
+        """Views boosted per hour of day over the last 30 days"""
+        try:
+            return await self.db.fetch_all(
+                """
+                SELECT EXTRACT(HOUR FROM vbl.timestamp)::int AS hour, SUM(vbl.views_added)::bigint AS views
+                FROM view_boost_logs vbl
+                JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id
+                WHERE vbc.user_id = $1 AND vbl.success AND vbl.timestamp >= NOW() - INTERVAL '30 days'
+                GROUP BY 1
+                """,
+                user_id,
+                pool=ANALYTICS
+            )
+        except Exception as e:
+            logger.error(f"Error getting hourly views: {e}")
+            return []
+    
+    async def _get_weekday_views(self, user_id: int) -> List[Dict[str, Any]]:
+        """Views boosted per ISO weekday over the last 30 days"""
+        try:
+            return await self.db.fetch_all(
+                """
+                SELECT EXTRACT(ISODOW FROM vbl.timestamp)::int AS dow, SUM(vbl.views_added)::bigint AS views
+                FROM view_boost_logs vbl
+                JOIN view_boost_campaigns vbc ON vbl.campaign_id = vbc.id
+                WHERE vbc.user_id = $1 AND vbl.success AND vbl.timestamp >= NOW() - INTERVAL '30 days'
+                GROUP BY 1
+                """,
+                user_id,
+                pool=ANALYTICS
+            )
+        except Exception as e:
+            logger.error(f"Error getting weekday views: {e}")
+            return []
+    
+    async def _get_channel_breakdown(self, user_id: int) -> List[Dict[str, Any]]:
+        """Campaign count and boosted views per channel, best first"""
+        try:
+            return await self.db.fetch_all(
+                """
+                SELECT
+                    c.id, COALESCE(c.title, c.channel_title, c.username, 'Untitled') AS title,
+                    c.member_count AS members,
+                    COUNT(vbc.id) AS campaigns,
+                    COALESCE(SUM(vbc.current_views), 0)::bigint AS views
+                FROM telegram_channels c
+                LEFT JOIN view_boost_campaigns vbc ON vbc.channel_id = c.id
+                WHERE c.user_id = $1 AND c.is_active = TRUE
+                GROUP BY c.id
+                ORDER BY views DESC, campaigns DESC
+                """,
+                user_id,
+                pool=ANALYTICS
+            )
+        except Exception as e:
+            logger.error(f"Error getting channel breakdown: {e}")
+            return []
+    
+    async def _get_member_growth(self, user_id: int) -> int:
+        """Net member change across the user's channels over 30 days"""
+        try:
+            growth = await self.db.execute_query(
+                """
+                SELECT COALESCE(SUM(d.growth), 0)::bigint
+                FROM channel_member_daily d
+                JOIN telegram_channels c ON d.channel_id = c.id
+                WHERE c.user_id = $1 AND d.day > CURRENT_DATE - 30
+                """,
+                user_id,
+                pool=ANALYTICS
+            )
+            return int(growth or 0)
+        except Exception as e:
+            logger.error(f"Error getting member growth: {e}")
+            return 0
+    
+    def _build_insights(self, report: Dict[str, Any]) -> List[str]:
+        """Derive short textual insights from computed figures"""
+        insights = []
+        trends = report['trends']
+        metrics = report['metrics']
+        types = report['campaign_types']
+        
+        if trends['peak_hour'] is not None:
+            insights.append(f"Peak boost activity occurs around {trends['peak_hour']}:00")
+        if metrics['best_day'] != 'N/A':
+            insights.append(f"{metrics['best_day']} has the most boosted views")
+        if report['periods'].get('views_prev_7d'):
+            direction = "up" if trends['growth'] >= 0 else "down"
+            insights.append(f"Weekly views are {direction} {abs(trends['growth']):.1f}% on the previous week")
+        if types['manual'] + types['auto'] > 0:
+            dominant = 'Manual' if types['manual'] >= types['auto'] else 'Auto'
+            insights.append(f"{dominant} campaigns make up most of your activity")
+        accounts = report['accounts']
+        if accounts['total'] and accounts['active'] < accounts['total']:
+            insights.append(f"{accounts['total'] - accounts['active']} accounts are inactive")
+        if not insights:
+            insights.append("Not enough activity yet to derive insights")
+        return insights
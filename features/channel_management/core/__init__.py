@@ -3,5 +3,6 @@ Channel Management Core Module
 """
 
 from .channel_processor import ChannelProcessor
+from .stats_collector import ChannelStatsCollector
 
-__all__ = ['ChannelProcessor']
+__all__ = ['ChannelProcessor', 'ChannelStatsCollector']
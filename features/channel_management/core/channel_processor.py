@@ -5,6 +5,7 @@ Core channel processing and management logic
 
 import asyncio
 import logging
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
@@ -15,6 +16,7 @@ from telethon.errors import FloodWaitError, ChannelPrivateError
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.bot.telegram_bot import TelegramBotCore
+from core.utils.supervisor import supervisor
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +48,12 @@ class ChannelProcessor:
         worker_count = min(3, self.config.MAX_ACTIVE_CLIENTS // 10)  # Limit workers
         
         for i in range(worker_count):
-            worker = asyncio.create_task(self._processing_worker(f"worker-{i}"))
-            self._workers.append(worker)
+            worker_name = f"worker-{i}"
+            supervisor.spawn_worker(
+                f"channel_processor.{worker_name}",
+                lambda name=worker_name: self._processing_worker(name)
+            )
+            self._workers.append(f"channel_processor.{worker_name}")
         
         logger.info(f"✅ Started {worker_count} channel processing workers")
     
@@ -64,10 +70,16 @@ class ChannelProcessor:
                 )
                 
                 # Process the task
-                await self._process_task(task, worker_name)
+                started = time.perf_counter()
+                try:
+                    await self._process_task(task, worker_name)
+                finally:
+                    # Mark task as done
+                    self._processing_queue.task_done()
                 
-                # Mark task as done
-                self._processing_queue.task_done()
+                supervised = supervisor.get(f"channel_processor.{worker_name}")
+                if supervised:
+                    supervised.record_iteration(time.perf_counter() - started)
                 
             except asyncio.TimeoutError:
                 # No tasks, continue waiting
@@ -136,6 +148,11 @@ class ChannelProcessor:
         }
         await self._processing_queue.put(task)
     
+    def _invalidate_owner(self, channel: Dict[str, Any]):
+        """Evict the owner's cached channel lists; a channel without an owner is in none of them"""
+        if channel.get('user_id') is not None:
+            self.db.invalidate('channel', channel['user_id'])
+    
     async def _process_refresh_channel(self, task_data: Dict[str, Any]):
         """Process channel refresh task"""
         try:
@@ -177,11 +194,9 @@ class ChannelProcessor:
                         member_count=getattr(full_channel.full_chat, 'participants_count', 0)
                     )
                     
-                    # Store analytics
-                    await self.db.store_analytics_data(
-                        'channel', channel_id, 'member_count',
-                        getattr(full_channel.full_chat, 'participants_count', 0),
-                        {'event': 'auto_refresh', 'account_id': account['id']}
+                    # Store a member count point if it changed
+                    await self.db.record_member_count(
+                        channel_id, getattr(full_channel.full_chat, 'participants_count', 0)
                     )
                     
                     # Update rate limiter
@@ -200,6 +215,7 @@ class ChannelProcessor:
                         "UPDATE telegram_channels SET is_active = FALSE WHERE id = $1",
                         channel_id
                     )
+                    self._invalidate_owner(channel)
                     break
                 except Exception as e:
                     logger.warning(f"Failed to refresh with account {account['id']}: {e}")
@@ -242,6 +258,7 @@ class ChannelProcessor:
                     "UPDATE telegram_channels SET is_active = FALSE WHERE id = $1",
                     channel_id
                 )
+                self._invalidate_owner(channel)
                 
                 await self.db.log_system_event(
                     'WARNING', 'channel_processor',
@@ -293,36 +310,22 @@ class ChannelProcessor:
             if not channel:
                 return {'error': 'Channel not found'}
             
-            # Get analytics data
-            analytics = await self.db.get_analytics_data(
-                'channel', channel_id, limit=days * 24  # Assuming hourly data
+            # Campaign aggregates and the daily member series are computed in the database
+            summary, members = await asyncio.gather(
+                self.db.get_campaign_summary(channel_id),
+                self.db.get_metric_series('channel', channel_id, 'member_growth', 'day', days)
             )
             
-            # Get campaigns
-            campaigns = await self.db.fetch_all(
-                "SELECT * FROM view_boost_campaigns WHERE channel_id = $1 ORDER BY created_at DESC",
-                channel_id
-            )
-            
-            # Calculate statistics
-            total_campaigns = len(campaigns)
-            active_campaigns = len([c for c in campaigns if c['status'] == 'active'])
-            completed_campaigns = len([c for c in campaigns if c['status'] == 'completed'])
-            
-            total_target_views = sum(c['target_views'] for c in campaigns)
-            total_current_views = sum(c['current_views'] for c in campaigns)
-            
-            # Get member count trend
-            member_analytics = [a for a in analytics if a['metric_name'] == 'member_count']
-            member_trend = []
-            if member_analytics:
-                member_trend = sorted(member_analytics, key=lambda x: x['timestamp'])
+            total_campaigns = summary.get('total_campaigns', 0)
+            completed_campaigns = summary.get('completed_campaigns', 0)
+            total_target_views = summary.get('total_target_views', 0)
+            total_current_views = summary.get('total_views', 0)
             
             return {
                 'channel_info': channel,
                 'campaigns': {
                     'total': total_campaigns,
-                    'active': active_campaigns,
+                    'active': summary.get('active_campaigns', 0),
                     'completed': completed_campaigns,
                     'success_rate': (completed_campaigns / total_campaigns * 100) if total_campaigns > 0 else 0
                 },
@@ -331,8 +334,8 @@ class ChannelProcessor:
                     'current_total': total_current_views,
                     'completion_rate': (total_current_views / total_target_views * 100) if total_target_views > 0 else 0
                 },
-                'member_trend': member_trend,
-                'analytics_points': len(analytics)
+                'member_trend': members['buckets'],
+                'member_growth': members['total']
             }
             
         except Exception as e:
@@ -365,6 +368,7 @@ class ChannelProcessor:
                     "UPDATE telegram_channels SET is_active = FALSE, updated_at = NOW() WHERE id = $1",
                     channel['id']
                 )
+                self._invalidate_owner(channel)
                 
                 # Log cleanup
                 await self.db.log_system_event(
@@ -387,7 +391,10 @@ class ChannelProcessor:
             'running': self._running,
             'workers': len(self._workers),
             'queue_size': self._processing_queue.qsize(),
-            'active_workers': len([w for w in self._workers if not w.done()])
+            'active_workers': len([
+                name for name in self._workers
+                if (supervisor.get(name) and supervisor.get(name).state == 'running')
+            ])
         }
     
     async def shutdown(self):
@@ -397,13 +404,8 @@ class ChannelProcessor:
             
             self._running = False
             
-            # Cancel all workers
-            for worker in self._workers:
-                worker.cancel()
-            
-            # Wait for workers to finish
-            if self._workers:
-                await asyncio.gather(*self._workers, return_exceptions=True)
+            # Cancel all workers and wait for them to finish
+            await supervisor.stop(*self._workers)
             
             # Clear queue
             while not self._processing_queue.empty():
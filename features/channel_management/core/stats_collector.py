@@ -0,0 +1,176 @@
+"""
+Channel Statistics Collector
+Samples member counts of active channels at an adaptive cadence and stores only changes
+"""
+
+import asyncio
+import logging
+import random
+from typing import Dict, Any, Optional
+
+from telethon.tl import functions
+from telethon.errors import FloodWaitError, ChannelPrivateError
+
+from core.config.config import Config
+from core.database.unified_database import DatabaseManager
+from core.utils.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+# Interval multipliers applied after a sample that changed or did not change the count
+SPEEDUP_FACTOR = 0.5
+BACKOFF_FACTOR = 1.5
+# Spread of the next sample time so channels sampled together drift apart
+JITTER = 0.1
+
+
+class ChannelStatsCollector:
+    """Samples often while a channel's count moves and backs off while it is stable"""
+    
+    def __init__(self, config: Config, db_manager: DatabaseManager, bot_core):
+        self.config = config
+        self.db = db_manager
+        self.bot_core = bot_core
+        self.stats = {
+            'samples': 0,
+            'changed': 0,
+            'unchanged': 0,
+            'failures': 0,
+            'flood_waits': 0
+        }
+    
+    async def start(self):
+        """Start the sampling loop on the leader instance"""
+        supervisor.spawn_periodic(
+            'channel_stats.collector', self.collect_due, self.config.CHANNEL_STATS_TICK,
+            initial_delay=self.config.CHANNEL_STATS_TICK,
+            gate=lambda: self.db.leadership is None or self.db.leadership.is_leader
+        )
+        logger.info("✅ Channel statistics collector started")
+    
+    async def stop(self):
+        """Stop the sampling loop"""
+        await supervisor.stop('channel_stats.collector')
+        logger.info("⏹️ Channel statistics collector stopped")
+    
+    def next_interval(self, interval: Optional[int], changed: bool) -> int:
+        """Shorten the interval after a change and lengthen it after a stable sample"""
+        low = self.config.CHANNEL_STATS_MIN_INTERVAL
+        high = self.config.CHANNEL_STATS_MAX_INTERVAL
+        if interval is None:
+            return low
+        factor = SPEEDUP_FACTOR if changed else BACKOFF_FACTOR
+        return int(min(high, max(low, interval * factor)))
+    
+    @staticmethod
+    def _jittered(seconds: float) -> float:
+        """Randomize a delay by a small fraction"""
+        return seconds * random.uniform(1 - JITTER, 1 + JITTER)
+    
+    async def collect_due(self):
+        """Sample the channels whose next sample time has passed, oldest first"""
+        due = await self.db.fetch_all(
+            """
+            SELECT c.id, c.channel_id, c.user_id, c.member_count,
+                   s.last_value, s.interval_seconds, s.unchanged_samples, s.failures
+            FROM telegram_channels c
+            LEFT JOIN channel_stat_schedule s ON s.channel_id = c.id
+            WHERE c.is_active = TRUE AND (s.next_sample_at IS NULL OR s.next_sample_at <= NOW())
+            ORDER BY s.next_sample_at NULLS FIRST
+            LIMIT $1
+            """,
+            self.config.CHANNEL_STATS_BATCH_SIZE
+        )
+        
+        for index, channel in enumerate(due):
+            if index:
+                # Spread the API calls of one tick instead of bursting them
+                await asyncio.sleep(self.config.CHANNEL_STATS_CALL_SPACING)
+            try:
+                member_count = await self._sample(channel)
+            except FloodWaitError as e:
+                self.stats['flood_waits'] += 1
+                logger.warning(f"⚠️ Channel sampling rate limited for {e.seconds}s, resuming next tick")
+                await self._schedule_retry(channel, e.seconds)
+                break
+            
+            if member_count is None:
+                self.stats['failures'] += 1
+                interval = channel['interval_seconds'] or self.config.CHANNEL_STATS_MIN_INTERVAL
+                backoff = interval * 2 ** (channel['failures'] or 0)
+                await self._schedule_retry(channel, min(backoff, self.config.CHANNEL_STATS_MAX_INTERVAL))
+                continue
+            
+            await self._record(channel, member_count)
+    
+    async def _sample(self, channel: Dict[str, Any]) -> Optional[int]:
+        """Read the member count through one of the owner's accounts"""
+        accounts = await self.db.get_user_accounts(channel['user_id'], active_only=True)
+        for account in accounts:
+            client = await self.bot_core.get_client(account['id'])
+            if not client or not await self.bot_core.check_rate_limit(account['id']):
+                continue
+            try:
+                entity = await client.get_entity(channel['channel_id'])
+                full_channel = await client(functions.channels.GetFullChannelRequest(entity))
+            except ChannelPrivateError:
+                logger.warning(f"Channel {channel['channel_id']} is private, skipping sample")
+                return None
+            except FloodWaitError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to sample channel {channel['id']} with account {account['id']}: {e}")
+                continue
+            finally:
+                await self.bot_core.increment_rate_limit(account['id'])
+            return getattr(full_channel.full_chat, 'participants_count', None)
+        return None
+    
+    async def _record(self, channel: Dict[str, Any], member_count: int):
+        """Store the sample if it changed and schedule the next one"""
+        self.stats['samples'] += 1
+        delta = await self.db.record_member_count(channel['id'], member_count)
+        changed = bool(delta)
+        if changed:
+            self.stats['changed'] += 1
+        else:
+            self.stats['unchanged'] += 1
+        
+        if member_count != channel['member_count']:
+            await self.db.update_channel_info(channel['id'], member_count=member_count)
+        
+        interval = self.next_interval(channel['interval_seconds'], changed)
+        await self.db.execute_query(
+            """
+            INSERT INTO channel_stat_schedule
+                (channel_id, last_value, last_sampled_at, interval_seconds, next_sample_at, unchanged_samples, failures)
+            VALUES ($1, $2, NOW(), $3, NOW() + make_interval(secs => $4), $5, 0)
+            ON CONFLICT (channel_id) DO UPDATE SET
+                last_value = EXCLUDED.last_value,
+                last_sampled_at = EXCLUDED.last_sampled_at,
+                interval_seconds = EXCLUDED.interval_seconds,
+                next_sample_at = EXCLUDED.next_sample_at,
+                unchanged_samples = EXCLUDED.unchanged_samples,
+                failures = 0
+            """,
+            channel['id'], member_count, interval, self._jittered(interval),
+            0 if changed else (channel['unchanged_samples'] or 0) + 1
+        )
+    
+    async def _schedule_retry(self, channel: Dict[str, Any], delay: float):
+        """Push a failed channel back without touching its cadence"""
+        await self.db.execute_query(
+            """
+            INSERT INTO channel_stat_schedule (channel_id, interval_seconds, next_sample_at, failures)
+            VALUES ($1, $2, NOW() + make_interval(secs => $3), 1)
+            ON CONFLICT (channel_id) DO UPDATE SET
+                next_sample_at = EXCLUDED.next_sample_at,
+                failures = channel_stat_schedule.failures + 1
+            """,
+            channel['id'], channel['interval_seconds'] or self.config.CHANNEL_STATS_MIN_INTERVAL,
+            self._jittered(delay)
+        )
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Sampling counters; unchanged samples are the calls saved by backing off"""
+        return dict(self.stats)
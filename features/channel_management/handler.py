@@ -17,6 +17,8 @@ from aiogram.fsm.state import State, StatesGroup
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.bot.rendering import renderer, memoized_keyboard
+from .core.stats_collector import ChannelStatsCollector
 
 logger = logging.getLogger(__name__)
 
@@ -35,15 +37,25 @@ class ChannelManagementHandler:
         self.config = config
         self.bot_core = bot_core
         self._pending_channels = {}  # Store temporary channel data during setup
+        self.stats_collector: Optional[ChannelStatsCollector] = None
         
     async def initialize(self):
         """Initialize channel management handler"""
         try:
+            if self.bot_core and self.config.CHANNEL_STATS_ENABLED:
+                self.stats_collector = ChannelStatsCollector(self.config, self.db, self.bot_core)
+                await self.stats_collector.start()
             logger.info("✅ Channel management handler initialized")
         except Exception as e:
             logger.error(f"Failed to initialize channel management handler: {e}")
             raise
     
+    async def shutdown(self):
+        """Shutdown channel management handler"""
+        if self.stats_collector:
+            await self.stats_collector.stop()
+        logger.info("✅ Channel management handler shut down")
+    
     def register_handlers(self, dp: Dispatcher):
         """Register handlers with dispatcher"""
         # FSM message handlers
@@ -87,7 +99,7 @@ class ChannelManagementHandler:
             # Check channel limit
             channels = await self._get_user_channels(user_id)
             if len(channels) >= 50:  # Reasonable limit for channels
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | Channel Limit Reached</b>\\n\\n"
                     "You have reached the maximum limit of 50 channels.\\n"
                     "Remove some channels before adding new ones.",
@@ -119,7 +131,7 @@ Send any channel link and the bot will automatically detect and add it:
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await state.set_state(ChannelStates.waiting_for_channel_link)
             await callback.answer("📺 Send channel link")
             
@@ -178,6 +190,7 @@ Send any channel link and the bot will automatically detect and add it:
                 user_id, channel_data['identifier'], channel_data['title'], 
                 channel_data['type'], channel_uuid, link
             )
+            self.db.invalidate('channel', user_id)
             
             text = f"""✅ <b>ArcX | Channel Added Successfully!</b>
 
@@ -212,7 +225,7 @@ Channel is available for all bot features!
             
             channels = await self._get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | No Channels Found</b>\\n\\n"
                     "You don't have any channels to remove.",
                     reply_markup=self._get_back_keyboard()
@@ -235,7 +248,7 @@ Channel is available for all bot features!
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🗑️ Select channel to remove")
             
         except Exception as e:
@@ -249,7 +262,7 @@ Channel is available for all bot features!
             
             channels = await self._get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | No Channels</b>\\n\\n"
                     "You haven't added any channels yet.\\n"
                     "Add your first channel to get started!",
@@ -282,7 +295,7 @@ Channel is available for all bot features!
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"📋 {len(channels)} channels loaded")
             
         except Exception as e:
@@ -294,9 +307,7 @@ Channel is available for all bot features!
         try:
             channel_id = int(callback.data.split('_')[2])
             
-            channel = await self.db.fetch_one(
-                "SELECT * FROM telegram_channels WHERE id = $1", channel_id
-            )
+            channel = await self.db.get_channel_by_id(channel_id)
             
             if not channel:
                 await callback.answer("❌ Channel not found", show_alert=True)
@@ -346,7 +357,7 @@ Channel is available for all bot features!
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🔄 Channels refreshed!")
             
         except Exception as e:
@@ -359,9 +370,7 @@ Channel is available for all bot features!
             channel_id = int(callback.data.split('_')[2])
             
             # Get channel details
-            channel = await self.db.fetch_one(
-                "SELECT * FROM telegram_channels WHERE id = $1", channel_id
-            )
+            channel = await self.db.get_channel_by_id(channel_id)
             
             if not channel:
                 await callback.answer("❌ Channel not found", show_alert=True)
@@ -371,6 +380,7 @@ Channel is available for all bot features!
             await self.db.execute_query(
                 "DELETE FROM telegram_channels WHERE id = $1", channel_id
             )
+            self.db.invalidate('channel', channel['user_id'])
             
             text = f"""✅ <b>ArcX | Channel Removed</b>
 
@@ -388,7 +398,7 @@ All associated data has been cleaned up.
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("✅ Channel removed successfully!")
             
         except Exception as e:
@@ -484,23 +494,13 @@ All associated data has been cleaned up.
     # Helper methods
     async def _get_user_channels(self, user_id: int) -> List[Dict[str, Any]]:
         """Get user's channels"""
-        return await self.db.fetch_all(
-            "SELECT * FROM telegram_channels WHERE user_id = $1 ORDER BY created_at DESC",
-            user_id
-        )
+        return await self.db.get_user_channels(user_id, active_only=False)
     
     async def _ensure_user_exists(self, user):
         """Ensure user exists in database"""
-        await self.db.execute_query(
-            """
-            INSERT INTO users (user_id, username, first_name, last_name, first_seen, last_seen)
-            VALUES ($1, $2, $3, $4, NOW(), NOW())
-            ON CONFLICT (user_id) DO UPDATE SET 
-                username = $2, last_seen = NOW()
-            """,
-            user.id, user.username, user.first_name, user.last_name
-        )
+        await self.db.create_user(user.id, user.username, user.first_name, user.last_name)
     
+    @memoized_keyboard
     def _get_back_keyboard(self) -> InlineKeyboardMarkup:
         """Get back button keyboard"""
         return InlineKeyboardMarkup(inline_keyboard=[
@@ -508,6 +508,7 @@ All associated data has been cleaned up.
             [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
         ])
     
+    @memoized_keyboard
     def _get_retry_keyboard(self) -> InlineKeyboardMarkup:
         """Get retry keyboard"""
         return InlineKeyboardMarkup(inline_keyboard=[
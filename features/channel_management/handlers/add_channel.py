@@ -13,6 +13,7 @@ from aiogram.fsm.context import FSMContext
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.bot.rendering import renderer
 from ..states import ChannelManagementStates
 from ..utils import ChannelValidator
 
@@ -93,7 +94,7 @@ Contact support if you continue having issues.
             from ..keyboards import ChannelManagementKeyboards
             keyboards = ChannelManagementKeyboards()
             
-            await callback.message.edit_text(
+            await renderer.edit(callback.message,
                 help_text,
                 reply_markup=keyboards.get_add_channel_retry_keyboard()
             )
@@ -129,7 +130,7 @@ Send your channel list now:
             from ..keyboards import ChannelManagementKeyboards
             keyboards = ChannelManagementKeyboards()
             
-            await callback.message.edit_text(
+            await renderer.edit(callback.message,
                 text,
                 reply_markup=keyboards.get_bulk_add_keyboard()
             )
@@ -160,8 +161,8 @@ Send your channel list now:
             for i, channel in enumerate(channel_list):
                 try:
                     # Update progress
-                    await status_msg.edit_text(
-                        f"🔄 Processing ({i+1}/{len(channel_list)}): {channel}"
+                    await renderer.edit(
+                        status_msg, f"🔄 Processing ({i+1}/{len(channel_list)}): {channel}"
                     )
                     
                     # Validate and add channel
@@ -195,7 +196,7 @@ Send your channel list now:
                 for fail in results['failed']:
                     result_text += f"• {fail['channel']}: {fail['error']}\n"
             
-            await status_msg.edit_text(result_text)
+            await renderer.edit(status_msg, result_text)
             await state.clear()
             
         except Exception as e:
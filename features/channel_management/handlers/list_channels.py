@@ -14,6 +14,8 @@ from aiogram.fsm.context import FSMContext
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.database.universal_access import UniversalDatabaseAccess
+from core.utils.data_export import StreamingExporter, available_formats
+from core.bot.rendering import renderer, memoized_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +54,7 @@ class ListChannelsHandler:
         
         dp.callback_query.register(
             self.handle_export_data,
-            lambda c: c.data == 'cm_export_data'
+            lambda c: c.data == 'cm_export_data' or c.data.startswith('cm_export_data:')
         )
     
     async def handle_view_all_channels(self, callback: CallbackQuery, state: FSMContext):
@@ -74,7 +76,7 @@ class ListChannelsHandler:
             all_channels = await self.universal_db.get_user_channels_with_stats(user_id)
             
             if not all_channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Found</b>\n\n"
                     "You haven't added any channels yet.",
                     reply_markup=self._get_no_channels_keyboard()
@@ -114,7 +116,7 @@ class ListChannelsHandler:
             # Create keyboard with pagination
             keyboard = self._get_paginated_keyboard(page, total_pages, page_channels)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"📄 Page {page} of {total_pages}")
             
         except Exception as e:
@@ -175,6 +177,7 @@ class ListChannelsHandler:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_channels_keyboard(self):
         """Get keyboard when no channels exist"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -206,7 +209,7 @@ class ListChannelsHandler:
             # Create keyboard
             keyboard = self._get_channel_details_keyboard(channel_id)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📋 Channel details loaded")
             
         except Exception as e:
@@ -233,8 +236,8 @@ class ListChannelsHandler:
                 channel_id
             )
             
-            # Get recent analytics
-            analytics = await self.db.get_analytics_data('channel', channel_id, limit=30)
+            # Daily member growth recorded by the statistics collector
+            analytics = await self.db.get_metric_series('channel', channel_id, 'member_growth', 'day', 30)
             
             # Get boost logs
             recent_boosts = await self.db.fetch_all(
@@ -310,18 +313,16 @@ class ListChannelsHandler:
         text += "\n"
         
         # Analytics summary
-        if analytics:
+        if analytics['samples']:
             text += f"📊 <b>Analytics:</b>\n"
-            text += f"• Data Points: {len(analytics)}\n"
-            
-            # Get latest member count if available
-            member_analytics = [a for a in analytics if a['metric_name'] == 'member_count']
-            if member_analytics:
-                latest_count = member_analytics[0]['metric_value']
-                text += f"• Latest Member Count: {latest_count:,.0f}\n"
+            text += f"• Days With Changes: {analytics['samples']}\n"
+            text += f"• Member Growth (30d): {analytics['total']:+,}\n"
+            if analytics['peak']:
+                text += f"• Best Day: {analytics['peak']:+,} on {analytics['peak_bucket'].strftime('%m/%d')}\n"
         
         return text
     
+    @memoized_keyboard
     def _get_channel_details_keyboard(self, channel_id: int):
         """Get keyboard for channel details"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -359,7 +360,7 @@ class ListChannelsHandler:
                 return
             
             # Show progress message
-            await callback.message.edit_text(
+            await renderer.edit(callback.message,
                 f"🔄 <b>Refreshing {len(channels)} channels...</b>\n\n"
                 "This may take a few minutes. Please wait...",
                 reply_markup=None
@@ -392,7 +393,7 @@ class ListChannelsHandler:
             from ..keyboards import ChannelManagementKeyboards
             keyboards = ChannelManagementKeyboards()
             
-            await callback.message.edit_text(
+            await renderer.edit(callback.message,
                 message,
                 reply_markup=keyboards.get_back_to_menu_keyboard()
             )
@@ -404,53 +405,55 @@ class ListChannelsHandler:
             await callback.answer("❌ Refresh failed", show_alert=True)
     
     async def handle_export_data(self, callback: CallbackQuery, state: FSMContext):
-        """Export channel data"""
+        """Export channel data as a document file"""
+        result = None
         try:
             user_id = callback.from_user.id
+            fmt = callback.data.split(':', 1)[1] if ':' in callback.data else 'csv'
             
-            # Get comprehensive user data
-            channels = await self.universal_db.get_user_channels_with_stats(user_id)
-            
-            if not channels:
-                await callback.answer("📭 No data to export", show_alert=True)
+            if fmt not in available_formats():
+                await callback.answer(f"❌ {fmt.upper()} export is not available", show_alert=True)
                 return
             
-            # Create export text
-            export_text = f"📊 <b>Channel Data Export</b>\n"
-            export_text += f"📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            export_text += f"👤 User ID: {user_id}\n\n"
-            
-            for i, channel in enumerate(channels, 1):
-                export_text += f"<b>{i}. {channel['title']}</b>\n"
-                export_text += f"   🆔 ID: {channel['channel_id']}\n"
-                export_text += f"   👥 Members: {channel.get('member_count', 0):,}\n"
-                export_text += f"   📈 Campaigns: {channel.get('campaign_stats', {}).get('total', 0)}\n"
-                export_text += f"   📅 Added: {channel['created_at'].strftime('%Y-%m-%d')}\n"
-                export_text += f"   🔄 Status: {'Active' if channel['is_active'] else 'Inactive'}\n\n"
-            
-            # Summary
-            total_channels = len(channels)
-            active_channels = len([c for c in channels if c['is_active']])
-            total_campaigns = sum(c.get('campaign_stats', {}).get('total', 0) for c in channels)
+            await callback.answer("📤 Preparing export...")
             
-            export_text += f"📋 <b>Summary:</b>\n"
-            export_text += f"• Total Channels: {total_channels}\n"
-            export_text += f"• Active Channels: {active_channels}\n"
-            export_text += f"• Total Campaigns: {total_campaigns}\n"
+            # Rows are streamed from the database and encoded off the event loop
+            result = await self.db.export_user_channels(user_id, fmt)
             
-            # Create keyboard
-            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+            if not result.rows:
+                await callback.message.answer("📭 No data to export")
+                return
+            
+            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, FSInputFile
+            other_formats = [f for f in available_formats() if f != fmt]
             keyboard = InlineKeyboardMarkup(inline_keyboard=[
+                [
+                    InlineKeyboardButton(text=f"📄 Export as {f.upper()}", callback_data=f"cm_export_data:{f}")
+                    for f in other_formats
+                ],
                 [InlineKeyboardButton(text="📋 View Channels", callback_data="cm_list_channels")],
                 [InlineKeyboardButton(text="🔙 Back to Menu", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(export_text, reply_markup=keyboard)
-            await callback.answer("📊 Data exported successfully")
+            filename = f"channels_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+            await self.bot.send_document(
+                callback.message.chat.id,
+                FSInputFile(result.path, filename=filename),
+                caption=(
+                    f"📊 <b>Channel Data Export</b>\n"
+                    f"• Rows: {result.rows:,}\n"
+                    f"• Format: {fmt.upper()}\n"
+                    f"• Size: {result.size_bytes / 1024:.1f} KB"
+                ),
+                reply_markup=keyboard
+            )
             
         except Exception as e:
             logger.error(f"Error exporting data: {e}")
-            await callback.answer("❌ Export failed", show_alert=True)
+            await callback.message.answer("❌ Export failed")
+        finally:
+            if result is not None:
+                StreamingExporter.discard(result.path)
     
     async def get_channel_list_summary(self, user_id: int) -> Dict[str, Any]:
         """Get summary of user's channel list"""
@@ -5,11 +5,13 @@ Inline keyboards for channel management operations
 
 from typing import List, Dict, Any
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from core.bot.rendering import memoized_keyboard
 
 
 class ChannelManagementKeyboards:
     """Keyboards for channel management"""
     
+    @memoized_keyboard
     def get_add_channel_keyboard(self) -> InlineKeyboardMarkup:
         """Get keyboard for add channel start"""
         buttons = [
@@ -19,6 +21,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_channel_added_keyboard(self) -> InlineKeyboardMarkup:
         """Get keyboard after channel is successfully added"""
         buttons = [
@@ -29,6 +32,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_add_channel_retry_keyboard(self) -> InlineKeyboardMarkup:
         """Get keyboard for retry adding channel"""
         buttons = [
@@ -38,6 +42,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_no_channels_keyboard(self) -> InlineKeyboardMarkup:
         """Get keyboard when user has no channels"""
         buttons = [
@@ -85,6 +90,7 @@ class ChannelManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_channel_actions_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get keyboard for individual channel actions"""
         buttons = [
@@ -137,6 +143,7 @@ class ChannelManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_delete_confirmation_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get keyboard for delete confirmation"""
         buttons = [
@@ -150,6 +157,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_edit_channel_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get keyboard for editing channel"""
         buttons = [
@@ -171,6 +179,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_back_to_channel_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get keyboard to go back to channel"""
         buttons = [
@@ -178,6 +187,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_back_to_menu_keyboard(self) -> InlineKeyboardMarkup:
         """Get keyboard to go back to main menu"""
         buttons = [
@@ -185,6 +195,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_channel_settings_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get keyboard for channel-specific settings"""
         buttons = [
@@ -210,6 +221,7 @@ class ChannelManagementKeyboards:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_batch_operations_keyboard(self) -> InlineKeyboardMarkup:
         """Get keyboard for batch operations on channels"""
         buttons = [
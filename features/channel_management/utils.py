@@ -630,12 +630,8 @@ class ChannelValidator:
                 member_count=channel_data.get('member_count', 0)
             )
             
-            # Store initial analytics data
-            await self.db.store_analytics_data(
-                'channel', db_channel_id, 'member_count', 
-                channel_data.get('member_count', 0),
-                {'event': 'channel_added'}
-            )
+            # First member count point of the channel
+            await self.db.record_member_count(db_channel_id, channel_data.get('member_count', 0))
             
             return {
                 'success': True,
@@ -688,11 +684,9 @@ class ChannelValidator:
                     )
                     
                     if updated:
-                        # Store analytics update
-                        await self.db.store_analytics_data(
-                            'channel', channel_db_id, 'member_count',
-                            getattr(full_channel.full_chat, 'participants_count', 0),
-                            {'event': 'info_refresh'}
+                        # Store a member count point if it changed
+                        await self.db.record_member_count(
+                            channel_db_id, getattr(full_channel.full_chat, 'participants_count', 0)
                         )
                     
                     return {
@@ -18,6 +18,7 @@ from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.database.universal_access import UniversalDatabaseAccess
 from core.bot.telegram_bot import TelegramBotCore
+from core.bot.rendering import renderer, memoized_keyboard
 from telethon.tl import functions, types
 
 logger = logging.getLogger(__name__)
@@ -137,7 +138,7 @@ class EmojiReactionsHandler:
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before configuring emoji reactions.",
                     reply_markup=self._get_no_channels_keyboard()
@@ -174,7 +175,7 @@ Select how to configure reactions:
             
             keyboard = self._get_configure_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("😊 Emoji configuration loaded")
             
         except Exception as e:
@@ -228,7 +229,7 @@ Current scheduled reactions:
             
             keyboard = self._get_schedule_keyboard(len(scheduled_reactions) > 0)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⏰ Reaction schedule loaded")
             
         except Exception as e:
@@ -277,7 +278,7 @@ Most active: {stats['peak_hour']}:00 - {stats['peak_hour'] + 1}:00
             
             keyboard = self._get_stats_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📊 Reaction statistics loaded")
             
         except Exception as e:
@@ -323,7 +324,7 @@ Most active: {stats['peak_hour']}:00 - {stats['peak_hour'] + 1}:00
             
             keyboard = self._get_channel_reactions_keyboard(channel_id, len(reactions) > 0)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"🎭 {channel['title']} reactions")
             
         except Exception as e:
@@ -364,7 +365,7 @@ Select how to use this emoji set:
             
             keyboard = self._get_emoji_set_keyboard(set_name)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"🎭 {set_name.title()} emoji set")
             
         except Exception as e:
@@ -414,7 +415,7 @@ Select how to use this emoji set:
                     )
                     enabled_count += 1
             
-            await callback.message.edit_text(
+            await renderer.edit(callback.message,
                 f"✅ <b>Reactions Enabled!</b>\n\n"
                 f"Channel: <b>{channel['title']}</b>\n"
                 f"Enabled Reactions: {' '.join(default_emojis)}\n"
@@ -452,14 +453,7 @@ Select how to use this emoji set:
         while self._running:
             try:
                 # Get channels with active reactions
-                active_channels = await self.db.fetch_all(
-                    """
-                    SELECT DISTINCT c.id, er.channel_id, er.user_id, c.title
-                    FROM telegram_channels c
-                    JOIN emoji_reactions er ON c.id = er.channel_id
-                    WHERE er.auto_react_enabled = TRUE
-                    """
-                )
+                active_channels = await self.db.get_auto_react_channels()
                 
                 # Process each channel
                 for channel in active_channels:
@@ -617,33 +611,14 @@ Select how to use this emoji set:
     async def _get_reaction_summary(self, user_id: int) -> Dict[str, Any]:
         """Get reaction summary for user"""
         try:
-            # Get active channels with reactions
-            active_channels = await self.db.fetch_one(
-                """
-                SELECT COUNT(DISTINCT c.id) as count
-                FROM telegram_channels c
-                JOIN emoji_reactions er ON c.id = er.channel_id
-                WHERE er.user_id = $1 AND er.auto_react_enabled = TRUE
-                """,
-                user_id
-            )
-            
-            # Get reactions today
-            reactions_today = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(reaction_count), 0) as count
-                FROM emoji_reactions
-                WHERE user_id = $1 AND DATE(updated_at) = DATE(NOW())
-                """,
-                user_id
-            )
+            stats = await self.db.get_reaction_stats(user_id, top=0)
             
             # Calculate success rate (placeholder)
             success_rate = 95.0  # Would be calculated based on actual success/failure logs
             
             return {
-                'active_channels': active_channels['count'] if active_channels else 0,
-                'reactions_today': reactions_today['count'] if reactions_today else 0,
+                'active_channels': stats['active_channels'],
+                'reactions_today': stats['reactions_today'],
                 'success_rate': success_rate
             }
             
@@ -654,88 +629,19 @@ Select how to use this emoji set:
     async def _get_reaction_statistics(self, user_id: int) -> Dict[str, Any]:
         """Get comprehensive reaction statistics"""
         try:
-            # Total reactions
-            total_reactions = await self.db.fetch_one(
-                "SELECT COALESCE(SUM(reaction_count), 0) as total FROM emoji_reactions WHERE user_id = $1",
-                user_id
-            )
-            
-            # Reactions today
-            reactions_today = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(reaction_count), 0) as count
-                FROM emoji_reactions 
-                WHERE user_id = $1 AND DATE(updated_at) = DATE(NOW())
-                """,
-                user_id
-            )
-            
-            # Weekly and monthly reactions
-            weekly_reactions = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(reaction_count), 0) as count
-                FROM emoji_reactions 
-                WHERE user_id = $1 AND updated_at >= NOW() - INTERVAL '7 days'
-                """,
-                user_id
-            )
-            
-            monthly_reactions = await self.db.fetch_one(
-                """
-                SELECT COALESCE(SUM(reaction_count), 0) as count
-                FROM emoji_reactions 
-                WHERE user_id = $1 AND updated_at >= NOW() - INTERVAL '30 days'
-                """,
-                user_id
-            )
-            
-            # Top emojis
-            top_emojis = await self.db.fetch_all(
-                """
-                SELECT emoji, SUM(reaction_count) as total
-                FROM emoji_reactions 
-                WHERE user_id = $1 
-                GROUP BY emoji 
-                ORDER BY total DESC 
-                LIMIT 5
-                """,
-                user_id
-            )
-            
-            # Channel stats
-            channel_stats = await self.db.fetch_all(
-                """
-                SELECT c.title, SUM(er.reaction_count) as reactions
-                FROM emoji_reactions er
-                JOIN telegram_channels c ON er.channel_id = c.id
-                WHERE er.user_id = $1
-                GROUP BY c.id, c.title
-                ORDER BY reactions DESC
-                LIMIT 5
-                """,
-                user_id
-            )
-            
-            # Active channels
-            active_channels = await self.db.fetch_one(
-                """
-                SELECT COUNT(DISTINCT channel_id) as count
-                FROM emoji_reactions 
-                WHERE user_id = $1 AND auto_react_enabled = TRUE
-                """,
-                user_id
-            )
+            # Totals, top emojis and top channels come aggregated from the database
+            stats = await self.db.get_reaction_stats(user_id)
             
             return {
-                'total_reactions': total_reactions['total'] if total_reactions else 0,
-                'reactions_today': reactions_today['count'] if reactions_today else 0,
-                'weekly_reactions': weekly_reactions['count'] if weekly_reactions else 0,
-                'monthly_reactions': monthly_reactions['count'] if monthly_reactions else 0,
+                'total_reactions': stats['total_reactions'],
+                'reactions_today': stats['reactions_today'],
+                'weekly_reactions': stats['weekly_reactions'],
+                'monthly_reactions': stats['monthly_reactions'],
                 'success_rate': 95.0,  # Placeholder
-                'active_channels': active_channels['count'] if active_channels else 0,
-                'top_emojis': [(r['emoji'], r['total']) for r in top_emojis],
-                'channel_stats': [{'title': r['title'], 'reactions': r['reactions']} for r in channel_stats],
-                'avg_daily': monthly_reactions['count'] / 30 if monthly_reactions else 0,
+                'active_channels': stats['active_channels'],
+                'top_emojis': [(r['emoji'], r['total']) for r in stats['top_emojis']],
+                'channel_stats': [{'title': r['title'], 'reactions': r['reactions']} for r in stats['top_channels']],
+                'avg_daily': stats['monthly_reactions'] / 30,
                 'peak_hour': 19  # Placeholder - would be calculated from actual data
             }
             
@@ -747,6 +653,7 @@ Select how to use this emoji set:
                 'top_emojis': [], 'channel_stats': [], 'avg_daily': 0, 'peak_hour': 19
             }
     
+    @memoized_keyboard
     def _get_configure_keyboard(self) -> InlineKeyboardMarkup:
         """Get configure emoji keyboard"""
         buttons = [
@@ -770,6 +677,7 @@ Select how to use this emoji set:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_schedule_keyboard(self, has_scheduled: bool) -> InlineKeyboardMarkup:
         """Get schedule keyboard"""
         buttons = [
@@ -797,6 +705,7 @@ Select how to use this emoji set:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_stats_keyboard(self) -> InlineKeyboardMarkup:
         """Get stats keyboard"""
         buttons = [
@@ -819,6 +728,7 @@ Select how to use this emoji set:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_channel_reactions_keyboard(self, channel_id: int, has_reactions: bool) -> InlineKeyboardMarkup:
         """Get channel reactions keyboard"""
         buttons = [
@@ -845,6 +755,7 @@ Select how to use this emoji set:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_emoji_set_keyboard(self, set_name: str) -> InlineKeyboardMarkup:
         """Get emoji set application keyboard"""
         buttons = [
@@ -867,6 +778,7 @@ Select how to use this emoji set:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_reactions_enabled_keyboard(self, channel_id: int) -> InlineKeyboardMarkup:
         """Get reactions enabled keyboard"""
         buttons = [
@@ -882,6 +794,7 @@ Select how to use this emoji set:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_channels_keyboard(self) -> InlineKeyboardMarkup:
         """Get no channels keyboard"""
         buttons = [
@@ -899,7 +812,7 @@ Select how to use this emoji set:
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before reacting to messages.",
                     reply_markup=self._get_no_channels_keyboard()
@@ -931,7 +844,7 @@ Select how many messages to react to:
             
             keyboard = self._get_react_messages_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("😀 Message reactions loaded")
             
         except Exception as e:
@@ -974,7 +887,7 @@ Customize your reaction behavior:
             
             keyboard = self._get_settings_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚙️ Reaction settings loaded")
             
         except Exception as e:
@@ -1020,7 +933,7 @@ Automatically vote on polls in your channels with multiple accounts.
                 [InlineKeyboardButton(text="🔙 Back", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🗳️ Poll voting loaded")
             
         except Exception as e:
@@ -1089,13 +1002,14 @@ Select an option to view detailed analytics:
                 [InlineKeyboardButton(text="🔙 Back", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📊 Poll statistics loaded")
             
         except Exception as e:
             logger.error(f"Error in poll stats: {e}")
             await callback.answer("❌ Failed to load poll statistics", show_alert=True)
     
+    @memoized_keyboard
     def _get_react_messages_keyboard(self) -> InlineKeyboardMarkup:
         """Get react to messages keyboard"""
         buttons = [
@@ -1116,6 +1030,7 @@ Select an option to view detailed analytics:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_settings_keyboard(self) -> InlineKeyboardMarkup:
         """Get reaction settings keyboard"""
         buttons = [
@@ -1143,11 +1058,7 @@ Select an option to view detailed analytics:
     async def _get_available_accounts_count(self, user_id: int) -> int:
         """Get count of available accounts for user"""
         try:
-            accounts = await self.db.fetch_all(
-                "SELECT COUNT(*) as count FROM telegram_accounts WHERE user_id = $1 AND is_active = TRUE",
-                user_id
-            )
-            return accounts[0]['count'] if accounts else 0
+            return len(await self.db.get_user_accounts(user_id))
         except Exception as e:
             logger.error(f"Error getting accounts count: {e}")
             return 0
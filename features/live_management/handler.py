@@ -16,6 +16,7 @@ from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.database.universal_access import UniversalDatabaseAccess
 from core.bot.telegram_bot import TelegramBotCore
+from core.bot.rendering import renderer
 from .keyboards import LiveManagementKeyboards
 from .states import LiveManagementStates
 from .utils import LiveStreamUtils
@@ -155,7 +156,7 @@ class LiveManagementHandler:
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before setting up auto-join for live streams.",
                     reply_markup=self.keyboards.get_no_channels_keyboard()
@@ -193,7 +194,7 @@ Select an option below:
             
             keyboard = self.keyboards.get_auto_join_keyboard(auto_join_status['enabled_channels'] > 0)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🤖 Auto join menu loaded")
             
         except Exception as e:
@@ -208,7 +209,7 @@ Select an option below:
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before manually joining live streams.",
                     reply_markup=self.keyboards.get_no_channels_keyboard()
@@ -254,7 +255,7 @@ Select how you'd like to join streams:
             
             keyboard = self.keyboards.get_manual_join_keyboard(len(active_streams) > 0)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("👆 Manual join menu loaded")
             
         except Exception as e:
@@ -312,7 +313,7 @@ Real-time monitoring of live streams across your channels.
             
             keyboard = self.keyboards.get_monitor_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📊 Live monitor loaded")
             
         except Exception as e:
@@ -365,7 +366,7 @@ Configure how the bot joins and behaves in live streams and voice chats.
             
             keyboard = self.keyboards.get_voice_settings_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚙️ Voice settings loaded")
             
         except Exception as e:
@@ -387,15 +388,13 @@ Configure how the bot joins and behaves in live streams and voice chats.
         
         while self._running:
             try:
+                # Live stream polling runs on the elected process only
+                if not self.db.leadership.is_leader:
+                    await asyncio.sleep(self.config.LEADER_RENEW_INTERVAL)
+                    continue
+                
                 # Get all channels with live monitoring enabled
-                channels_to_monitor = await self.db.fetch_all(
-                    """
-                    SELECT c.*, u.settings
-                    FROM telegram_channels c
-                    JOIN users u ON c.user_id = u.user_id
-                    WHERE c.is_active = TRUE AND u.is_active = TRUE
-                    """
-                )
+                channels_to_monitor = await self.db.get_monitored_channels()
                 
                 # Monitor each channel
                 for channel in channels_to_monitor:
@@ -568,11 +567,7 @@ Configure how the bot joins and behaves in live streams and voice chats.
     async def _get_available_accounts_count(self, user_id: int) -> int:
         """Get count of available accounts for user"""
         try:
-            result = await self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM telegram_accounts WHERE user_id = $1 AND is_active = TRUE",
-                user_id
-            )
-            return result['count'] if result else 0
+            return len(await self.db.get_user_accounts(user_id))
         except Exception as e:
             logger.error(f"Error getting available accounts count: {e}")
             return 0
@@ -751,7 +746,7 @@ Configure how the bot joins and behaves in live streams and voice chats.
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before selecting them for live monitoring.",
                     reply_markup=self.keyboards.get_no_channels_keyboard()
@@ -769,7 +764,7 @@ Configure how the bot joins and behaves in live streams and voice chats.
             
             keyboard = self.keyboards.get_channel_selection_keyboard(channels[:10])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚙️ Channel selection loaded")
             
         except Exception as e:
@@ -819,7 +814,7 @@ The system is now actively scanning your selected channels for live streams.
 You'll be notified when streams are detected and auto-join is available.
             """
             
-            await callback.message.edit_text(text, reply_markup=self.keyboards.get_monitor_keyboard())
+            await renderer.edit(callback.message, text, reply_markup=self.keyboards.get_monitor_keyboard())
             await callback.answer("▶️ Live monitoring started!")
             
         except Exception as e:
@@ -851,7 +846,7 @@ You'll be notified when streams are detected and auto-join is available.
 Live monitoring has been stopped. You can restart it anytime or use manual join options.
             """
             
-            await callback.message.edit_text(text, reply_markup=self.keyboards.get_monitor_keyboard())
+            await renderer.edit(callback.message, text, reply_markup=self.keyboards.get_monitor_keyboard())
             await callback.answer("⏹️ Live monitoring stopped!")
             
         except Exception as e:
@@ -5,11 +5,13 @@ Inline keyboards for live stream management operations
 
 from typing import List, Dict, Any
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from core.bot.rendering import memoized_keyboard
 
 
 class LiveManagementKeyboards:
     """Keyboards for live management"""
     
+    @memoized_keyboard
     def get_auto_join_keyboard(self, has_enabled: bool) -> InlineKeyboardMarkup:
         """Get auto join keyboard"""
         buttons = [
@@ -36,6 +38,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_manual_join_keyboard(self, has_active_streams: bool) -> InlineKeyboardMarkup:
         """Get manual join keyboard"""
         buttons = [
@@ -67,6 +70,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_monitor_keyboard(self) -> InlineKeyboardMarkup:
         """Get monitor keyboard"""
         buttons = [
@@ -93,6 +97,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_voice_settings_keyboard(self) -> InlineKeyboardMarkup:
         """Get voice settings keyboard"""
         buttons = [
@@ -119,6 +124,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_no_channels_keyboard(self) -> InlineKeyboardMarkup:
         """Get no channels keyboard"""
         buttons = [
@@ -128,6 +134,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_stream_details_keyboard(self, stream_id: int) -> InlineKeyboardMarkup:
         """Get stream details keyboard"""
         buttons = [
@@ -150,6 +157,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_join_confirmation_keyboard(self, stream_id: int) -> InlineKeyboardMarkup:
         """Get join confirmation keyboard"""
         buttons = [
@@ -165,6 +173,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_stream_history_keyboard(self) -> InlineKeyboardMarkup:
         """Get stream history keyboard"""
         buttons = [
@@ -191,6 +200,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_auto_join_setup_keyboard(self) -> InlineKeyboardMarkup:
         """Get auto join setup keyboard"""
         buttons = [
@@ -245,6 +255,7 @@ class LiveManagementKeyboards:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def get_stream_scanner_keyboard(self) -> InlineKeyboardMarkup:
         """Get stream scanner keyboard"""
         buttons = [
@@ -14,6 +14,7 @@ from aiogram.fsm.context import FSMContext
 
 from core.database.unified_database import DatabaseManager
 from core.config.config import Config
+from core.bot.rendering import renderer
 
 logger = logging.getLogger(__name__)
 
@@ -87,7 +88,7 @@ class PollManagerHandler:
             ])
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer()
             
         except Exception as e:
@@ -119,7 +120,7 @@ class PollManagerHandler:
             ])
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer()
             
         except Exception as e:
@@ -145,7 +146,7 @@ class PollManagerHandler:
             ])
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer()
             
         except Exception as e:
@@ -175,7 +176,7 @@ class PollManagerHandler:
             ])
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer()
             
         except Exception as e:
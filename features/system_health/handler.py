@@ -4,19 +4,29 @@ Monitors bot performance, database health, and system metrics
 """
 
 import asyncio
+import html
 import logging
+import os
+import signal
+import time
 import psutil
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 from aiogram import Bot, Dispatcher
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, Message, BufferedInputFile
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.database.universal_access import UniversalDatabaseAccess
+from core.utils.time_series import MetricHistory, sparkline
+from core.utils.supervisor import supervisor
+from core.utils.snapshots import snapshots
+from core.utils.profiler import profiler, ProfileResult
+from core.bot.rendering import renderer, memoized_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +39,26 @@ class SystemHealthHandler:
         self.db = db_manager
         self.config = config
         self.universal_db = UniversalDatabaseAccess(db_manager)
-        self._monitoring_task: Optional[asyncio.Task] = None
         self._running = False
-        self._health_history = []
+        self._health_history = MetricHistory(['cpu', 'memory', 'disk', 'pool_size', 'loop_lag'])
+        self._profile_task: Optional[asyncio.Task] = None
+        self._profile_signal: Optional[int] = None
+    
+    # Dashboard snapshots and their background refresh cadence in seconds
+    DASHBOARDS = {
+        'performance': 30,
+        'database': 120,
+        'errors': 60,
+        'realtime': 10
+    }
         
     async def initialize(self):
         """Initialize system health handler"""
         try:
-            await self._start_monitoring()
             self._running = True
+            await self._start_monitoring()
+            self._register_snapshots()
+            self._install_profile_signal()
             logger.info("✅ System health handler initialized")
         except Exception as e:
             logger.error(f"Failed to initialize system health handler: {e}")
@@ -64,20 +85,27 @@ class SystemHealthHandler:
                 await callback.answer("❌ Admin access required!", show_alert=True)
                 return
             
+            # Refresh buttons recompute the snapshot instead of serving the latest one
+            force = callback_data.startswith("sh_refresh_")
+            if force:
+                callback_data = "sh_" + callback_data[len("sh_refresh_"):]
+            
             if callback_data == "sh_performance":
-                await self._handle_performance_overview(callback, state)
+                await self._handle_performance_overview(callback, state, force)
             elif callback_data == "sh_database":
-                await self._handle_database_health(callback, state)
+                await self._handle_database_health(callback, state, force)
             elif callback_data == "sh_accounts":
                 await self._handle_accounts_status(callback, state)
             elif callback_data == "sh_errors":
-                await self._handle_error_monitor(callback, state)
+                await self._handle_error_monitor(callback, state, force)
             elif callback_data == "sh_realtime":
-                await self._handle_realtime_monitor(callback, state)
+                await self._handle_realtime_monitor(callback, state, force)
             elif callback_data == "sh_alerts":
                 await self._handle_alerts_config(callback, state)
             elif callback_data == "sh_maintenance":
                 await self._handle_maintenance_mode(callback, state)
+            elif callback_data == "sh_profile":
+                await self._handle_profile(callback)
             else:
                 await callback.answer("❌ Unknown system health action", show_alert=True)
                 
@@ -85,11 +113,16 @@ class SystemHealthHandler:
             logger.error(f"Error in system health callback: {e}")
             await callback.answer("❌ An error occurred", show_alert=True)
     
-    async def _handle_performance_overview(self, callback: CallbackQuery, state: FSMContext):
+    async def _handle_performance_overview(self, callback: CallbackQuery, state: FSMContext,
+                                           force: bool = False):
         """Handle performance overview"""
         try:
-            # Get current system metrics
-            performance_data = await self._get_system_performance()
+            # Serve the latest background snapshot of the system metrics
+            snapshot = await snapshots.get('health.performance', force)
+            if snapshot is None:
+                await callback.answer("❌ Failed to load performance data", show_alert=True)
+                return
+            performance_data = snapshot.value
             
             text = f"""
 📊 <b>System Performance Overview</b>
@@ -121,22 +154,29 @@ class SystemHealthHandler:
 <b>⚡ Performance Score: {performance_data['performance_score']}/100</b>
 
 <b>🎯 Status:</b> {performance_data['status']}
+
+🕒 Snapshot: {snapshot.age_text()}
             """
             
             keyboard = self._get_performance_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📊 Performance overview loaded")
             
         except Exception as e:
             logger.error(f"Error in performance overview: {e}")
             await callback.answer("❌ Failed to load performance data", show_alert=True)
     
-    async def _handle_database_health(self, callback: CallbackQuery, state: FSMContext):
+    async def _handle_database_health(self, callback: CallbackQuery, state: FSMContext,
+                                      force: bool = False):
         """Handle database health"""
         try:
-            # Get database health information
-            db_health = await self._get_database_health()
+            # Serve the latest background snapshot of the database health
+            snapshot = await snapshots.get('health.database', force)
+            if snapshot is None:
+                await callback.answer("❌ Failed to load database health", show_alert=True)
+                return
+            db_health = snapshot.value
             
             text = f"""
 🗄️ <b>Database Health Report</b>
@@ -165,6 +205,13 @@ class SystemHealthHandler:
             for table in db_health['table_stats']:
                 text += f"• {table['name']}: {table['rows']:,} rows, {table['size']:.1f}MB\n"
             
+            if db_health.get('pools'):
+                text += "\n<b>🔌 Connection Pools:</b>\n"
+                for name, pool in db_health['pools'].items():
+                    source = " (replica)" if pool['replica'] else ""
+                    text += (f"• {name.capitalize()}{source}: {pool['in_use']}/{pool['max_size']} in use, "
+                             f"{pool['waiting']} waiting, avg wait {pool['avg_wait_ms']:.1f}ms\n")
+            
             text += f"""
 <b>🚨 Health Issues:</b>
 """
@@ -179,10 +226,11 @@ class SystemHealthHandler:
 """
             for recommendation in db_health['recommendations']:
                 text += f"• {recommendation}\n"
+            text += f"\n🕒 Snapshot: {snapshot.age_text()}"
             
             keyboard = self._get_database_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🗄️ Database health loaded")
             
         except Exception as e:
@@ -235,18 +283,23 @@ class SystemHealthHandler:
             
             keyboard = self._get_accounts_status_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("📱 Account status loaded")
             
         except Exception as e:
             logger.error(f"Error in accounts status: {e}")
             await callback.answer("❌ Failed to load account status", show_alert=True)
     
-    async def _handle_error_monitor(self, callback: CallbackQuery, state: FSMContext):
+    async def _handle_error_monitor(self, callback: CallbackQuery, state: FSMContext,
+                                    force: bool = False):
         """Handle error monitoring"""
         try:
-            # Get recent errors and system logs
-            error_data = await self._get_error_monitoring_data()
+            # Serve the latest background snapshot of recent errors
+            snapshot = await snapshots.get('health.errors', force)
+            if snapshot is None:
+                await callback.answer("❌ Failed to load error data", show_alert=True)
+                return
+            error_data = snapshot.value
             
             text = f"""
 🚨 <b>Error Monitoring Dashboard</b>
@@ -285,26 +338,33 @@ class SystemHealthHandler:
 • Auto-restarts: {error_data['auto_restarts']}
 • Failover Triggers: {error_data['failovers']}
 • Rate Limit Adjustments: {error_data['rate_adjustments']}
+
+🕒 Snapshot: {snapshot.age_text()}
             """
             
             keyboard = self._get_error_monitor_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🚨 Error monitoring loaded")
             
         except Exception as e:
             logger.error(f"Error in error monitoring: {e}")
             await callback.answer("❌ Failed to load error data", show_alert=True)
     
-    async def _handle_realtime_monitor(self, callback: CallbackQuery, state: FSMContext):
+    async def _handle_realtime_monitor(self, callback: CallbackQuery, state: FSMContext,
+                                       force: bool = False):
         """Handle real-time monitoring"""
         try:
-            # Get real-time metrics
-            realtime_data = await self._get_realtime_metrics()
+            # Serve the latest background snapshot of the live metrics
+            snapshot = await snapshots.get('health.realtime', force)
+            if snapshot is None:
+                await callback.answer("❌ Failed to load real-time data", show_alert=True)
+                return
+            realtime_data = snapshot.value
             
             text = f"""
 ⚡ <b>Real-time System Monitor</b>
-📅 Last Updated: {datetime.now().strftime('%H:%M:%S')}
+📅 Last Updated: {snapshot.taken_at.strftime('%H:%M:%S')} ({snapshot.age_text()})
 
 <b>🔄 Live Operations:</b>
 • Active View Boosts: {realtime_data['active_boosts']}
@@ -335,64 +395,207 @@ class SystemHealthHandler:
 • Active Sessions: {realtime_data['active_sessions']}
 • Concurrent Operations: {realtime_data['concurrent_ops']}
 
+<b>📈 Trends (last hour):</b>
+{realtime_data['trends']}
+
+<b>⚙️ Background Tasks:</b>
+{self._format_task_health()}
+
 <b>🚀 System Status: {realtime_data['overall_status']}</b>
             """
             
             keyboard = self._get_realtime_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚡ Real-time data refreshed")
             
         except Exception as e:
             logger.error(f"Error in real-time monitor: {e}")
             await callback.answer("❌ Failed to load real-time data", show_alert=True)
     
+    async def _handle_profile(self, callback: CallbackQuery):
+        """Profile the event loop and send the result to the requesting admin"""
+        if not self._start_profile([callback.message.chat.id], f"admin {callback.from_user.id}"):
+            await callback.answer("⏳ A profile is already running", show_alert=True)
+            return
+        await callback.answer(
+            f"🔬 Profiling the bot for {self.config.PROFILE_DURATION}s; the stacks will be sent here",
+            show_alert=True
+        )
+    
+    def _install_profile_signal(self):
+        """Let operators start a profile with a Unix signal, e.g. kill -USR2 <pid>"""
+        name = self.config.PROFILE_SIGNAL
+        if not name:
+            return
+        signum = getattr(signal, name, None)
+        if signum is None:
+            logger.warning(f"⚠️ Profile signal {name} is not available on this platform")
+            return
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, self._on_profile_signal)
+            self._profile_signal = signum
+            logger.info(f"🔬 Send {name} to pid {os.getpid()} to profile the event loop")
+        except (NotImplementedError, RuntimeError, ValueError) as e:
+            logger.warning(f"⚠️ Could not install profile signal {name}: {e}")
+    
+    def _on_profile_signal(self):
+        """Profile started by signal; the result goes to every admin"""
+        if not self._start_profile(list(self.config.ADMIN_IDS), self.config.PROFILE_SIGNAL):
+            logger.warning("🔬 Profile signal ignored, a profile is already running")
+    
+    def _start_profile(self, chat_ids: List[int], trigger: str) -> bool:
+        """Run one profile in the background; False when one is already running"""
+        if profiler.running or (self._profile_task and not self._profile_task.done()):
+            return False
+        self._profile_task = asyncio.create_task(self._run_profile(chat_ids, trigger))
+        return True
+    
+    async def _run_profile(self, chat_ids: List[int], trigger: str):
+        """Sample the loop, keep the collapsed stacks on disk and send them as a document"""
+        try:
+            result = await profiler.profile(
+                self.config.PROFILE_DURATION, self.config.PROFILE_INTERVAL,
+                self.config.PROFILE_MAX_OVERHEAD, trigger
+            )
+            path = await asyncio.to_thread(result.write, Path(self.config.PROFILE_DIR))
+            document = BufferedInputFile(result.collapsed().encode('utf-8'), filename=path.name)
+            caption = self._format_profile(result)
+            for chat_id in chat_ids:
+                try:
+                    await self.bot.send_document(chat_id, document, caption=caption)
+                except Exception as e:
+                    logger.warning(f"Could not send profile to {chat_id}: {e}")
+        except Exception as e:
+            logger.error(f"Event loop profile failed: {e}")
+    
+    def _format_profile(self, result: ProfileResult) -> str:
+        """Document caption with the hottest coroutines and functions and the sampling cost"""
+        stats = result.get_stats()
+        
+        def entries(items):
+            return "\n".join(f"• {html.escape(name[:60])}: {pct:.1f}%" for name, pct in items) or "• (loop was idle)"
+        
+        return f"""
+🔬 <b>Event Loop Profile</b> ({html.escape(result.trigger)})
+• Duration: {stats['duration']:.1f}s, {stats['samples']} samples
+• Loop busy: {stats['busy_pct']:.1f}%
+• Sampling: every {stats['interval_ms']:.1f}ms → {stats['final_interval_ms']:.1f}ms
+• Overhead: {stats['overhead_pct']:.2f}% ({stats['wakeups']} loop wakeups, {stats['wakeup_overhead_pct']:.2f}%)
+
+<b>Top coroutines:</b>
+{entries(result.hot_coroutines(3))}
+
+<b>Top functions (self):</b>
+{entries(result.hot_functions(3))}
+
+Open with speedscope.app or flamegraph.pl
+        """.strip()
+    
     async def _start_monitoring(self):
         """Start background system monitoring"""
         try:
-            self._monitoring_task = asyncio.create_task(self._monitoring_loop())
+            # Prime psutil so the first non-blocking reading is meaningful
+            psutil.cpu_percent(interval=None)
+            supervisor.spawn_periodic(
+                'health.monitoring', self._monitor_once, self.config.HEALTH_CHECK_INTERVAL
+            )
+            supervisor.spawn_periodic(
+                'health.sampling', self._sample_metrics, self.config.HEALTH_SAMPLE_INTERVAL,
+                initial_delay=self.config.HEALTH_SAMPLE_INTERVAL
+            )
             logger.info("✅ System health monitoring started")
         except Exception as e:
             logger.error(f"Error starting monitoring: {e}")
             raise
     
-    async def _monitoring_loop(self):
-        """Background monitoring loop"""
-        while self._running:
-            try:
-                # Collect system metrics
-                metrics = await self._collect_system_metrics()
-                
-                # Store metrics in history
-                self._health_history.append({
-                    'timestamp': datetime.now(),
-                    'metrics': metrics
-                })
-                
-                # Keep only last 24 hours of data
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                self._health_history = [
-                    h for h in self._health_history 
-                    if h['timestamp'] > cutoff_time
-                ]
-                
-                # Check for alerts
-                await self._check_health_alerts(metrics)
-                
-                # Sleep for monitoring interval
-                await asyncio.sleep(self.config.HEALTH_CHECK_INTERVAL)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(60)
+    def _register_snapshots(self):
+        """Refresh dashboard data in the background instead of on every open"""
+        producers = {
+            'performance': self._get_system_performance,
+            'database': self._get_database_health,
+            'errors': self._get_error_monitoring_data,
+            'realtime': self._get_realtime_metrics
+        }
+        for name, producer in producers.items():
+            snapshots.register(f"health.{name}", producer, self.DASHBOARDS[name])
+    
+    async def _monitor_once(self):
+        """Collect metrics and raise alerts"""
+        metrics = await self._collect_system_metrics()
+        
+        # Alerts are raised once per deployment, by the elected process
+        if self.db.leadership.is_leader:
+            await self._check_health_alerts(metrics)
+    
+    async def _sample_metrics(self):
+        """Sample lightweight metrics into the fixed-memory history"""
+        # The supervisor measures how late this iteration started, which is the event loop lag
+        sampling = supervisor.get('health.sampling')
+        loop_lag = sampling.last_lag * 1000 if sampling else 0.0
+        
+        pool = self.db.coordinator.pool
+        self._health_history.record({
+            'cpu': psutil.cpu_percent(interval=None),
+            'memory': psutil.virtual_memory().percent,
+            'disk': psutil.disk_usage('/').percent,
+            'pool_size': pool.get_size() if pool else 0,
+            'loop_lag': loop_lag
+        }, time.monotonic())
+    
+    def _format_trends(self, window: int = 3600) -> str:
+        """Format min/avg/max and a sparkline for each sampled metric"""
+        labels = [
+            ('cpu', 'CPU', '%'),
+            ('memory', 'Memory', '%'),
+            ('disk', 'Disk', '%'),
+            ('pool_size', 'DB Pool', ''),
+            ('loop_lag', 'Loop Lag', 'ms')
+        ]
+        lines = []
+        for name, label, unit in labels:
+            stats = self._health_history.stats(name, window)
+            if not stats['count']:
+                lines.append(f"• {label}: collecting...")
+                continue
+            values = [value for _, value in self._health_history.points(name, window)]
+            lines.append(
+                f"• {label}: {stats['avg']:.1f}{unit} avg "
+                f"({stats['min']:.1f}-{stats['max']:.1f}) {sparkline(values)}"
+            )
+        return "\n".join(lines)
+    
+    def _format_task_health(self) -> str:
+        """Summarize supervised loops, listing only the ones that need attention"""
+        statuses = supervisor.get_status()
+        if not statuses:
+            return "• No supervised tasks"
+        
+        unhealthy = supervisor.get_unhealthy()
+        running = sum(1 for s in statuses if s['state'] in ('running', 'backoff'))
+        slowest = max(statuses, key=lambda s: s['avg_duration'])
+        lines = [
+            f"• Running: {running}/{len(statuses)} | Restarts: {sum(s['restarts'] for s in statuses)}",
+            f"• Slowest: {slowest['name']} ({slowest['avg_duration'] * 1000:.0f}ms avg)"
+        ]
+        for status in unhealthy[:5]:
+            if status['stuck']:
+                problem = "stuck"
+            elif status['overdue']:
+                problem = "overdue"
+            else:
+                problem = f"failing ({html.escape((status['last_error'] or 'unknown')[:60])})"
+            lines.append(f"• ⚠️ {status['name']}: {problem}, lag {status['last_lag']:.1f}s")
+        if not unhealthy:
+            lines.append("• ✅ All loops healthy")
+        return "\n".join(lines)
     
     async def _collect_system_metrics(self) -> Dict[str, Any]:
         """Collect comprehensive system metrics"""
         try:
             # System resource metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Non-blocking: measured since the previous call, which the sampler makes regularly
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             network = psutil.net_io_counters()
@@ -425,17 +628,11 @@ class SystemHealthHandler:
         """Get application-specific metrics"""
         try:
             # Get recent operation counts
-            recent_campaigns = await self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM view_boost_campaigns WHERE created_at >= NOW() - INTERVAL '1 hour'"
-            )
-            
-            recent_errors = await self.db.fetch_one(
-                "SELECT COUNT(*) as count FROM system_logs WHERE log_level = 'ERROR' AND timestamp >= NOW() - INTERVAL '1 hour'"
-            )
+            recent = await self.db.get_recent_activity(hours=1)
             
             return {
-                'recent_campaigns': recent_campaigns['count'] if recent_campaigns else 0,
-                'recent_errors': recent_errors['count'] if recent_errors else 0,
+                'recent_campaigns': recent['campaigns'],
+                'recent_errors': recent['errors'],
                 'uptime_hours': self._calculate_uptime_hours()
             }
             
@@ -586,6 +783,14 @@ class SystemHealthHandler:
                 issues.append("Connection pool nearing capacity")
                 recommendations.append("Consider increasing max pool size")
             
+            pools = db_health.get('coordinator', {}).get('pools', {})
+            for name, pool in pools.items():
+                if pool['acquire_timeouts']:
+                    issues.append(f"{pool['acquire_timeouts']} {name} pool acquire timeouts")
+                    recommendations.append(f"Consider increasing the {name} pool size")
+                elif pool['saturation'] >= 80:
+                    issues.append(f"{name.capitalize()} pool {pool['saturation']:.0f}% saturated")
+            
             if not issues:
                 recommendations.append("Database is running optimally")
             
@@ -604,6 +809,7 @@ class SystemHealthHandler:
                 'db_size': 125.6,  # Would calculate actual size
                 'index_efficiency': 94.2,  # Would calculate
                 'table_stats': formatted_tables,
+                'pools': pools,
                 'issues': issues,
                 'recommendations': recommendations
             }
@@ -615,61 +821,38 @@ class SystemHealthHandler:
     async def _get_accounts_system_status(self) -> Dict[str, Any]:
         """Get system-wide account status"""
         try:
-            # Get all accounts across all users
-            all_accounts = await self.db.fetch_all("SELECT * FROM telegram_accounts")
-            all_users = await self.db.fetch_all("SELECT * FROM users")
-            
-            total_accounts = len(all_accounts)
-            active_accounts = len([a for a in all_accounts if a['is_active']])
-            verified_accounts = len([a for a in all_accounts if a['is_verified']])
-            
-            # Calculate health distribution
-            healthy_count = 0
-            warning_count = 0
-            critical_count = 0
-            
-            for account in all_accounts:
-                # Simple health calculation
-                health_score = 100
-                if not account['is_verified']:
-                    health_score -= 30
-                if not account['is_active']:
-                    health_score -= 50
-                if not account['last_login'] or (datetime.now() - account['last_login']).days > 7:
-                    health_score -= 20
-                
-                if health_score >= 80:
-                    healthy_count += 1
-                elif health_score >= 50:
-                    warning_count += 1
-                else:
-                    critical_count += 1
+            # Aggregate on the database side so cost is independent of table size
+            accounts, users = await asyncio.gather(
+                self.db.get_account_status_summary(),
+                self.db.get_user_status_summary()
+            )
             
-            avg_health = (healthy_count * 90 + warning_count * 65 + critical_count * 25) / total_accounts if total_accounts > 0 else 0
+            total_accounts = accounts.get('total_accounts', 0)
+            active_accounts = accounts.get('active_accounts', 0)
             
             return {
                 'total_accounts': total_accounts,
                 'active_accounts': active_accounts,
-                'verified_accounts': verified_accounts,
+                'verified_accounts': accounts.get('verified_accounts', 0),
                 'online_accounts': active_accounts,  # Approximation
-                'healthy_count': healthy_count,
-                'warning_count': warning_count,
-                'critical_count': critical_count,
-                'avg_health': avg_health,
+                'healthy_count': accounts.get('healthy_count', 0),
+                'warning_count': accounts.get('warning_count', 0),
+                'critical_count': accounts.get('critical_count', 0),
+                'avg_health': accounts.get('avg_health', 0.0),
                 'total_api_calls': total_accounts * 1000,  # Estimate
                 'success_rate': 95.5,  # Would calculate from logs
                 'rate_limit_hits': 8,  # Would get from monitoring
                 'utilization': 75.2,  # Would calculate
-                'inactive_accounts': total_accounts - active_accounts,
+                'inactive_accounts': accounts.get('inactive_accounts', 0),
                 'rate_limited': 2,  # Would calculate
-                'auth_issues': 1,  # Would get from logs
+                'auth_issues': accounts.get('auth_issues', 0),
                 'connection_issues': 0,  # Would get from monitoring
-                'total_users': len(all_users),
-                'active_users': len([u for u in all_users if u['is_active']]),
-                'users_with_issues': 3,  # Would calculate
-                'new_accounts_24h': 5,  # Would calculate from timestamps
-                'activated_24h': 2,  # Would calculate
-                'deactivated_24h': 1   # Would calculate
+                'total_users': users.get('total_users', 0),
+                'active_users': users.get('active_users', 0),
+                'users_with_issues': accounts.get('users_with_issues', 0),
+                'new_accounts_24h': accounts.get('new_accounts_24h', 0),
+                'activated_24h': accounts.get('activated_24h', 0),
+                'deactivated_24h': accounts.get('deactivated_24h', 0)
             }
             
         except Exception as e:
@@ -679,43 +862,50 @@ class SystemHealthHandler:
     async def _get_error_monitoring_data(self) -> Dict[str, Any]:
         """Get error monitoring data"""
         try:
-            # Get recent errors
-            recent_errors = await self.db.get_system_logs('ERROR', limit=100)
-            recent_warnings = await self.db.get_system_logs('WARNING', limit=50)
+            # Fingerprinted counters: one indexed query over hourly buckets
+            summary = await self.db.errors.get_summary(hours=24)
             
-            total_errors = len(recent_errors)
-            critical_errors = len([e for e in recent_errors if 'CRITICAL' in e['message']])
-            warning_errors = len(recent_warnings)
+            top_errors = [
+                {
+                    'type': f"{error['module']}: {html.escape(error['message'][:60])}",
+                    'count': error['current_count']
+                }
+                for error in summary['top']
+            ]
+            recent_critical = [
+                {
+                    'timestamp': error['last_seen'].strftime('%H:%M'),
+                    'module': error['module'],
+                    'message': html.escape(error['sample_message'] or error['message'])
+                }
+                for error in summary['recent']
+            ]
             
-            # Calculate error rate (errors per total operations)
-            error_rate = 2.5  # Would calculate from actual metrics
+            previous = summary['previous_errors']
+            trend_change = (summary['total_errors'] - previous) / previous * 100 if previous else 0.0
             
-            # Get top error types
-            error_types = {}
-            for error in recent_errors:
-                error_type = error['module']
-                error_types[error_type] = error_types.get(error_type, 0) + 1
+            module_counts: Dict[str, int] = {}
+            for error in summary['top']:
+                module_counts[error['module']] = module_counts.get(error['module'], 0) + error['current_count']
+            most_affected = max(module_counts, key=module_counts.get) if module_counts else 'None'
             
-            top_errors = [
-                {'type': k, 'count': v} 
-                for k, v in sorted(error_types.items(), key=lambda x: x[1], reverse=True)
-            ][:5]
+            task_statuses = supervisor.get_status()
             
             return {
-                'total_errors': total_errors,
-                'critical_errors': critical_errors,
-                'warning_errors': warning_errors,
-                'error_rate': error_rate,
+                'total_errors': summary['total_errors'],
+                'critical_errors': summary['critical_errors'],
+                'warning_errors': summary['warnings'],
+                'error_rate': summary['error_rate'],
                 'top_errors': top_errors,
-                'trend_change': -15.2,  # Would calculate from historical data
-                'peak_hour': 14,  # Would calculate from timestamps
-                'most_affected_module': top_errors[0]['type'] if top_errors else 'None',
-                'recent_critical': recent_errors[:5],
+                'trend_change': trend_change,
+                'peak_hour': summary['peak_hour'] if summary['peak_hour'] is not None else '--',
+                'most_affected_module': most_affected,
+                'recent_critical': recent_critical,
                 'performance_impact': 'Low',  # Would assess based on error types
                 'ux_impact': 'Minimal',  # Would assess
-                'availability': 99.2,  # Would calculate
-                'auto_restarts': 2,  # Would track
-                'failovers': 0,  # Would track
+                'availability': max(0.0, 100 - summary['error_rate']),
+                'auto_restarts': sum(status['restarts'] for status in task_statuses),
+                'failovers': self.db.leadership.transitions,
                 'rate_adjustments': 5  # Would track
             }
             
@@ -729,6 +919,7 @@ class SystemHealthHandler:
             # Current system state
             cpu_percent = psutil.cpu_percent()
             memory = psutil.virtual_memory()
+            pool_stats = self._health_history.stats('pool_size', 300)
             
             # Would get these from actual monitoring
             return {
@@ -738,7 +929,7 @@ class SystemHealthHandler:
                 'recent_success_rate': 97.2,
                 'api_calls_per_min': 150,
                 'rate_limit_status': 'Normal',
-                'connection_pool_usage': 65.5,
+                'connection_pool_usage': pool_stats['avg'] / max(1, self.config.DB_MAX_POOL_SIZE) * 100,
                 'network_latency': 125,
                 'current_cpu': cpu_percent,
                 'current_memory': memory.percent,
@@ -751,7 +942,8 @@ class SystemHealthHandler:
                 'online_users': 15,
                 'active_sessions': 23,
                 'concurrent_ops': 7,
-                'overall_status': '🟢 Healthy'
+                'overall_status': '🟢 Healthy',
+                'trends': self._format_trends()
             }
             
         except Exception as e:
@@ -759,6 +951,7 @@ class SystemHealthHandler:
             return {}
     
     # Keyboard methods
+    @memoized_keyboard
     def _get_performance_keyboard(self) -> InlineKeyboardMarkup:
         """Get performance keyboard"""
         buttons = [
@@ -771,15 +964,19 @@ class SystemHealthHandler:
                 InlineKeyboardButton(text="🔧 Optimization", callback_data="sh_optimization")
             ],
             [
-                InlineKeyboardButton(text="🔄 Refresh", callback_data="sh_performance"),
+                InlineKeyboardButton(text="🔄 Refresh", callback_data="sh_refresh_performance"),
                 InlineKeyboardButton(text="📤 Export Report", callback_data="sh_export_perf")
             ],
+            [
+                InlineKeyboardButton(text="🔬 Profile Event Loop", callback_data="sh_profile")
+            ],
             [
                 InlineKeyboardButton(text="🔙 Back to System Health", callback_data="system_health")
             ]
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_database_keyboard(self) -> InlineKeyboardMarkup:
         """Get database keyboard"""
         buttons = [
@@ -792,7 +989,7 @@ class SystemHealthHandler:
                 InlineKeyboardButton(text="📈 Growth Trends", callback_data="sh_db_growth")
             ],
             [
-                InlineKeyboardButton(text="🔄 Refresh", callback_data="sh_database"),
+                InlineKeyboardButton(text="🔄 Refresh", callback_data="sh_refresh_database"),
                 InlineKeyboardButton(text="⚙️ DB Settings", callback_data="sh_db_settings")
             ],
             [
@@ -801,6 +998,7 @@ class SystemHealthHandler:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_accounts_status_keyboard(self) -> InlineKeyboardMarkup:
         """Get accounts status keyboard"""
         buttons = [
@@ -822,6 +1020,7 @@ class SystemHealthHandler:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_error_monitor_keyboard(self) -> InlineKeyboardMarkup:
         """Get error monitor keyboard"""
         buttons = [
@@ -834,7 +1033,7 @@ class SystemHealthHandler:
                 InlineKeyboardButton(text="📈 Error Trends", callback_data="sh_error_trends")
             ],
             [
-                InlineKeyboardButton(text="🔄 Refresh", callback_data="sh_errors"),
+                InlineKeyboardButton(text="🔄 Refresh", callback_data="sh_refresh_errors"),
                 InlineKeyboardButton(text="🗑️ Clear Old Logs", callback_data="sh_clear_logs")
             ],
             [
@@ -843,6 +1042,7 @@ class SystemHealthHandler:
         ]
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_realtime_keyboard(self) -> InlineKeyboardMarkup:
         """Get real-time keyboard"""
         buttons = [
@@ -855,7 +1055,7 @@ class SystemHealthHandler:
                 InlineKeyboardButton(text="🎯 Custom Metrics", callback_data="sh_custom_metrics")
             ],
             [
-                InlineKeyboardButton(text="🔄 Refresh Now", callback_data="sh_realtime"),
+                InlineKeyboardButton(text="🔄 Refresh Now", callback_data="sh_refresh_realtime"),
                 InlineKeyboardButton(text="📱 Mobile View", callback_data="sh_mobile_view")
             ],
             [
@@ -870,13 +1070,12 @@ class SystemHealthHandler:
             logger.info("⏹️ Shutting down system health handler...")
             
             self._running = False
-            
-            if self._monitoring_task:
-                self._monitoring_task.cancel()
-                try:
-                    await self._monitoring_task
-                except asyncio.CancelledError:
-                    pass
+            if self._profile_signal is not None:
+                asyncio.get_running_loop().remove_signal_handler(self._profile_signal)
+            if self._profile_task and not self._profile_task.done():
+                self._profile_task.cancel()
+            await supervisor.stop('health.monitoring', 'health.sampling')
+            await snapshots.stop(*[f"health.{name}" for name in self.DASHBOARDS])
             
             logger.info("✅ System health handler shut down")
             
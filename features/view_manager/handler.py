@@ -17,6 +17,7 @@ from aiogram.fsm.state import State, StatesGroup
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.bot.rendering import renderer, memoized_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +167,7 @@ class ViewManagerHandler:
             ])
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
                 await callback.answer("⚙️ Auto boost menu loaded")
             else:
                 await callback.answer("❌ Unable to update message", show_alert=True)
@@ -205,7 +206,7 @@ Configure your auto boost settings:
             ])
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
                 await callback.answer("🎛️ Boost settings loaded")
             else:
                 await callback.answer("❌ Unable to update message", show_alert=True)
@@ -222,7 +223,7 @@ Configure your auto boost settings:
             # Get user's channels
             channels = await self._get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | No Channels Available</b>\\n\\n"
                     "You need to add channels first in Channel Manager.\\n"
                     "Go to Channel Manager → Add Channel",
@@ -260,7 +261,7 @@ Configure your auto boost settings:
             
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚙️ Toggle channels for auto boost")
             
         except Exception as e:
@@ -312,9 +313,7 @@ Configure your auto boost settings:
             user_id = callback.from_user.id
             
             # Get channel and config details
-            channel = await self.db.fetch_one(
-                "SELECT * FROM telegram_channels WHERE id = $1", channel_id
-            )
+            channel = await self.db.get_channel_by_id(channel_id)
             
             config = await self.db.fetch_one(
                 "SELECT * FROM boost_configs WHERE user_id = $1 AND channel_id = $2",
@@ -339,7 +338,7 @@ Configure your auto boost settings:
                     'is_enabled': True,
                     'boost_count': 50,
                     'cooldown_minutes': 30,
-                    'timing_messages': '[]'
+                    'timing_messages': []
                 }
             
             text = f"""🔥 <b>ArcX | Channel Configuration</b>
@@ -350,7 +349,7 @@ Configure your auto boost settings:
 • Status: {"🟢 Enabled" if config['is_enabled'] else "🔴 Disabled"}
 • Boost Count: {config['boost_count']} views per boost
 • Cooldown: {config['cooldown_minutes']} minutes
-• Timing Messages: {len(eval(config.get('timing_messages', '[]')))} configured
+• Timing Messages: {len(config.get('timing_messages') or [])} configured
 
 <b>Advanced Settings:</b>
 Send new configuration in format:
@@ -365,7 +364,7 @@ Send new configuration in format:
                 [InlineKeyboardButton(text="[🔙 Back]", callback_data="vm_select_channels")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await state.set_state(ViewBoostStates.waiting_for_boost_config)
             await callback.answer("⚙️ Send boost configuration")
             
@@ -452,7 +451,7 @@ Settings have been applied to all enabled channels.
             channels = await self._get_user_channels(user_id)
             if not channels:
                 if callback.message:
-                    await callback.message.edit_text(
+                    await renderer.edit(callback.message,
                         "🔥 <b>ArcX | No Channels Available</b>\\n\\n"
                         "Add channels first in Channel Manager.",
                         reply_markup=InlineKeyboardMarkup(inline_keyboard=[
@@ -481,7 +480,7 @@ Settings have been applied to all enabled channels.
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
                 await callback.answer("🚀 Select channel for manual boost")
             else:
                 await callback.answer("❌ Unable to update message", show_alert=True)
@@ -533,7 +532,7 @@ Select boost type for this channel:
             keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
                 await callback.answer("🚀 Manual boost options loaded")
             else:
                 await callback.answer("❌ Unable to update message", show_alert=True)
@@ -555,7 +554,7 @@ Select boost type for this channel:
             # Get enabled channels
             enabled_channels = await self._get_enabled_channels(user_id)
             if not enabled_channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "🔥 <b>ArcX | No Channels Enabled</b>\\n\\n"
                     "Enable channels first in Select Channels.",
                     reply_markup=InlineKeyboardMarkup(inline_keyboard=[
@@ -597,7 +596,7 @@ Engine is now running in the background!
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("🚀 Auto boost engine started!")
             
         except Exception as e:
@@ -636,7 +635,7 @@ Engine has been stopped successfully.
                 [InlineKeyboardButton(text="[🏠 Main Menu]", callback_data="refresh_main")]
             ])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⏹️ Engine stopped successfully!")
             
         except Exception as e:
@@ -705,10 +704,7 @@ Engine has been stopped successfully.
         """Perform the actual boost operation"""
         try:
             # Get user's accounts for boosting
-            accounts = await self.db.fetch_all(
-                "SELECT * FROM telegram_accounts WHERE user_id = $1 AND is_active = TRUE LIMIT 10",
-                user_id
-            )
+            accounts = (await self.db.get_user_accounts(user_id))[:10]
             
             if not accounts:
                 logger.warning(f"No active accounts for user {user_id}")
@@ -736,39 +732,21 @@ Engine has been stopped successfully.
     
     async def _get_user_channels(self, user_id: int) -> List[Dict[str, Any]]:
         """Get user's channels"""
-        return await self.db.fetch_all(
-            "SELECT * FROM telegram_channels WHERE user_id = $1 ORDER BY created_at DESC",
-            user_id
-        )
+        return await self.db.get_user_channels(user_id, active_only=False)
     
     async def _get_enabled_channels(self, user_id: int) -> List[Dict[str, Any]]:
         """Get channels enabled for auto boost"""
-        return await self.db.fetch_all(
-            """
-            SELECT bc.*, tc.channel_title, tc.channel_identifier 
-            FROM boost_configs bc
-            JOIN telegram_channels tc ON bc.channel_id = tc.id
-            WHERE bc.user_id = $1 AND bc.is_enabled = TRUE
-            """,
-            user_id
-        )
+        return await self.db.get_enabled_boost_configs(user_id)
     
     async def _ensure_user_exists(self, user):
         """Ensure user exists in database"""
-        await self.db.execute_query(
-            """
-            INSERT INTO users (user_id, username, first_name, last_name, first_seen, last_seen)
-            VALUES ($1, $2, $3, $4, NOW(), NOW())
-            ON CONFLICT (user_id) DO UPDATE SET 
-                username = $2, last_seen = NOW()
-            """,
-            user.id, user.username, user.first_name, user.last_name
-        )
+        await self.db.create_user(user.id, user.username, user.first_name, user.last_name)
     
     async def _start_monitoring_engine(self):
         """Start the global monitoring engine"""
         logger.info("🚀 Auto boost monitoring engine ready")
     
+    @memoized_keyboard
     def _get_retry_keyboard(self) -> InlineKeyboardMarkup:
         """Get retry keyboard"""
         return InlineKeyboardMarkup(inline_keyboard=[
@@ -805,7 +783,7 @@ Engine has been stopped successfully.
                 [InlineKeyboardButton(text="🔙 Back to Manual Boost", callback_data="vm_manual_boost")]
             ])
 
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
+            await renderer.edit(callback.message, text, reply_markup=keyboard, parse_mode='HTML')
             await callback.answer()
 
         except Exception as e:
@@ -861,7 +839,7 @@ You need to add channels first before using quick boost.
                     [InlineKeyboardButton(text="🔙 Back", callback_data="vm_manual_boost")]
                 ])
 
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
+            await renderer.edit(callback.message, text, reply_markup=keyboard, parse_mode='HTML')
             await callback.answer()
 
         except Exception as e:
@@ -902,7 +880,7 @@ You need to add channels first before using quick boost.
                 [InlineKeyboardButton(text="🔙 Back to Manual Boost", callback_data="vm_manual_boost")]
             ])
 
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
+            await renderer.edit(callback.message, text, reply_markup=keyboard, parse_mode='HTML')
             await callback.answer()
 
         except Exception as e:
@@ -963,15 +941,11 @@ You need to add channels first before using quick boost.
                     [InlineKeyboardButton(text="🔙 Back to Menu", callback_data="vm_manual_boost")]
                 ])
 
-            try:
-                await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
+            if await renderer.edit(callback.message, text, reply_markup=keyboard, parse_mode='HTML'):
                 await callback.answer("🚀 Quick boost initiated!")
-            except Exception as edit_error:
-                if "message is not modified" in str(edit_error):
-                    # Message content is the same, just answer the callback
-                    await callback.answer("🚀 Quick boost already started!")
-                else:
-                    raise edit_error
+            else:
+                # Message content is the same, just answer the callback
+                await callback.answer("🚀 Quick boost already started!")
 
         except Exception as e:
             logger.error(f"Error starting quick boost: {e}")
@@ -1015,7 +989,7 @@ You need to add channels first before using quick boost.
                 [InlineKeyboardButton(text="🔙 Back", callback_data="mb_by_link")]
             ])
 
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode='HTML')
+            await renderer.edit(callback.message, text, reply_markup=keyboard, parse_mode='HTML')
             await callback.answer()
 
         except Exception as e:
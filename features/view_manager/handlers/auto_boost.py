@@ -15,6 +15,7 @@ from aiogram.fsm.context import FSMContext
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.bot.telegram_bot import TelegramBotCore
+from core.bot.rendering import renderer, memoized_keyboard
 from telethon.tl import functions
 
 logger = logging.getLogger(__name__)
@@ -86,7 +87,7 @@ class AutoBoostHandler:
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before setting up auto boosting.",
                     reply_markup=self._get_no_channels_keyboard()
@@ -96,7 +97,7 @@ class AutoBoostHandler:
             # Get user accounts
             accounts = await self.db.get_user_accounts(user_id, active_only=True)
             if not accounts:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📱 <b>No Accounts Available</b>\n\n"
                     "Please add Telegram accounts first before setting up auto boosting.",
                     reply_markup=self._get_no_accounts_keyboard()
@@ -124,7 +125,7 @@ Select channels to enable auto boosting:
             
             keyboard = self._get_setup_channels_keyboard(channels)
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚙️ Auto boost setup loaded")
             
         except Exception as e:
@@ -137,20 +138,10 @@ Select channels to enable auto boosting:
             user_id = callback.from_user.id
             
             # Get auto campaigns
-            campaigns = await self.db.fetch_all(
-                """
-                SELECT vbc.*, c.title as channel_title, c.username as channel_username
-                FROM view_boost_campaigns vbc
-                JOIN telegram_channels c ON vbc.channel_id = c.id
-                WHERE vbc.user_id = $1 AND vbc.campaign_type = 'auto'
-                ORDER BY vbc.created_at DESC
-                LIMIT 10
-                """,
-                user_id
-            )
+            campaigns = await self.db.get_user_campaigns(user_id, campaign_type='auto', limit=10)
             
             if not campaigns:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Auto Campaigns</b>\n\n"
                     "You haven't set up any auto boost campaigns yet.",
                     reply_markup=self._get_no_campaigns_keyboard()
@@ -179,7 +170,7 @@ Select channels to enable auto boosting:
             
             keyboard = self._get_campaigns_keyboard(campaigns[:5])  # Show first 5 in keyboard
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"🤖 {len(campaigns)} auto campaigns loaded")
             
         except Exception as e:
@@ -262,7 +253,7 @@ Select channels to enable auto boosting:
             
             keyboard = self._get_settings_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer("⚙️ Auto boost settings loaded")
             
         except Exception as e:
@@ -291,6 +282,11 @@ Select channels to enable auto boosting:
         
         while self._running:
             try:
+                # Auto campaigns are shared state; only the elected process advances them
+                if not self.db.leadership.is_leader:
+                    await asyncio.sleep(self.config.LEADER_RENEW_INTERVAL)
+                    continue
+                
                 # Get active auto campaigns
                 active_campaigns = await self.db.fetch_all(
                     """
@@ -608,6 +604,7 @@ Select channels to enable auto boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_settings_keyboard(self):
         """Get settings keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -634,6 +631,7 @@ Select channels to enable auto boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_channels_keyboard(self):
         """Get no channels keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -645,6 +643,7 @@ Select channels to enable auto boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_accounts_keyboard(self):
         """Get no accounts keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -656,6 +655,7 @@ Select channels to enable auto boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_campaigns_keyboard(self):
         """Get no campaigns keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -15,6 +15,7 @@ from aiogram.fsm.context import FSMContext
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.bot.telegram_bot import TelegramBotCore
+from core.bot.rendering import renderer, memoized_keyboard
 from ..states.states import ViewBoostStates
 from telethon.tl import functions
 
@@ -112,7 +113,7 @@ Please send the message link:
             
             keyboard = self._get_boost_by_link_keyboard()
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await state.set_state(ViewBoostStates.waiting_for_message_link)
             await callback.answer("🔗 Please send message link")
             
@@ -128,7 +129,7 @@ Please send the message link:
             # Get user channels
             channels = await self.db.get_user_channels(user_id)
             if not channels:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Channels Available</b>\n\n"
                     "Please add channels first before manual boosting.",
                     reply_markup=self._get_no_channels_keyboard()
@@ -148,7 +149,7 @@ Select a channel below to see its recent posts:
             keyboard = self._get_channel_selection_keyboard(channels)
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
                 await callback.answer("📋 Select channel to boost")
             else:
                 await callback.answer("❌ Unable to update message", show_alert=True)
@@ -166,7 +167,7 @@ Select a channel below to see its recent posts:
             channels = await self.db.get_user_channels(user_id)
             if not channels:
                 if callback.message:
-                    await callback.message.edit_text(
+                    await renderer.edit(callback.message,
                         "📭 <b>No Channels Available</b>\n\n"
                         "Please add channels first before quick boosting.",
                         reply_markup=self._get_no_channels_keyboard()
@@ -195,7 +196,7 @@ Select a channel for quick boost:
             keyboard = self._get_quick_boost_keyboard(channels)
             
             if callback.message:
-                await callback.message.edit_text(text, reply_markup=keyboard)
+                await renderer.edit(callback.message, text, reply_markup=keyboard)
                 await callback.answer("🚀 Quick boost options loaded")
             else:
                 await callback.answer("❌ Unable to update message", show_alert=True)
@@ -210,20 +211,10 @@ Select a channel for quick boost:
             user_id = callback.from_user.id
             
             # Get manual campaigns
-            campaigns = await self.db.fetch_all(
-                """
-                SELECT vbc.*, c.title as channel_title, c.username as channel_username
-                FROM view_boost_campaigns vbc
-                JOIN telegram_channels c ON vbc.channel_id = c.id
-                WHERE vbc.user_id = $1 AND vbc.campaign_type = 'manual'
-                ORDER BY vbc.created_at DESC
-                LIMIT 15
-                """,
-                user_id
-            )
+            campaigns = await self.db.get_user_campaigns(user_id, campaign_type='manual', limit=15)
             
             if not campaigns:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     "📭 <b>No Manual Campaigns</b>\n\n"
                     "You haven't created any manual boost campaigns yet.",
                     reply_markup=self._get_no_campaigns_keyboard()
@@ -259,7 +250,7 @@ Select a channel for quick boost:
             
             keyboard = self._get_campaigns_keyboard(campaigns[:5])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"👆 {len(campaigns)} manual campaigns loaded")
             
         except Exception as e:
@@ -281,7 +272,7 @@ Select a channel for quick boost:
             result = await self._create_and_start_campaign(callback.from_user.id, boost_params, message_link)
             
             if result['success']:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     f"✅ <b>Boost Campaign Started!</b>\n\n"
                     f"📊 <b>Campaign Details:</b>\n"
                     f"• Campaign ID: {result['campaign_id']}\n"
@@ -294,7 +285,7 @@ Select a channel for quick boost:
                 
                 await callback.answer("✅ Boost campaign started!")
             else:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     f"❌ <b>Failed to Start Campaign</b>\n\n"
                     f"Error: {result['error']}\n\n"
                     f"Please check your settings and try again.",
@@ -331,7 +322,7 @@ Select a channel for quick boost:
             recent_posts = await self._get_recent_posts(channel, callback.from_user.id)
             
             if not recent_posts:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     f"📭 <b>No Recent Posts</b>\n\n"
                     f"Channel: <b>{channel['title']}</b>\n\n"
                     f"No recent posts found or unable to access channel messages.\n"
@@ -359,7 +350,7 @@ Recent posts available for boosting:
             
             keyboard = self._get_posts_keyboard(channel_id, recent_posts[:3])
             
-            await callback.message.edit_text(text, reply_markup=keyboard)
+            await renderer.edit(callback.message, text, reply_markup=keyboard)
             await callback.answer(f"📋 {len(recent_posts)} posts loaded")
             
         except Exception as e:
@@ -383,7 +374,7 @@ Recent posts available for boosting:
                 return
             
             # Show progress message
-            await callback.message.edit_text(
+            await renderer.edit(callback.message,
                 f"🚀 <b>Starting Quick Boost</b>\n\n"
                 f"Channel: <b>{channel['title']}</b>\n"
                 f"Finding latest post and starting boost...\n\n"
@@ -395,7 +386,7 @@ Recent posts available for boosting:
             result = await self._execute_quick_boost(channel, callback.from_user.id)
             
             if result['success']:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     f"✅ <b>Quick Boost Started!</b>\n\n"
                     f"📋 <b>Details:</b>\n"
                     f"• Channel: {channel['title']}\n"
@@ -408,7 +399,7 @@ Recent posts available for boosting:
                 
                 await callback.answer("✅ Quick boost started!")
             else:
-                await callback.message.edit_text(
+                await renderer.edit(callback.message,
                     f"❌ <b>Quick Boost Failed</b>\n\n"
                     f"Error: {result['error']}\n\n"
                     f"Please try manual boost instead.",
@@ -458,7 +449,7 @@ Recent posts available for boosting:
             
             keyboard = self._get_help_back_keyboard()
             
-            await callback.message.edit_text(help_text, reply_markup=keyboard)
+            await renderer.edit(callback.message, help_text, reply_markup=keyboard)
             await callback.answer("📚 Parameter format help loaded")
             
         except Exception as e:
@@ -503,7 +494,7 @@ Recent posts available for boosting:
             
             keyboard = self._get_help_back_keyboard()
             
-            await callback.message.edit_text(help_text, reply_markup=keyboard)
+            await renderer.edit(callback.message, help_text, reply_markup=keyboard)
             await callback.answer("📚 Message link help loaded")
             
         except Exception as e:
@@ -768,6 +759,7 @@ Recent posts available for boosting:
         # Rough estimate: 1 view per 5 seconds average
         return max(1, views * 5 // 60)
     
+    @memoized_keyboard
     def _get_boost_by_link_keyboard(self):
         """Get boost by link keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -879,6 +871,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_campaign_started_keyboard(self, campaign_id: int):
         """Get campaign started keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -891,6 +884,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_help_back_keyboard(self):
         """Get help back keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -901,6 +895,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_channels_keyboard(self):
         """Get no channels keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -912,6 +907,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_no_campaigns_keyboard(self):
         """Get no campaigns keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -923,6 +919,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_retry_campaign_keyboard(self):
         """Get retry campaign keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -934,6 +931,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_retry_quick_keyboard(self):
         """Get retry quick keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -946,6 +944,7 @@ Recent posts available for boosting:
         
         return InlineKeyboardMarkup(inline_keyboard=buttons)
     
+    @memoized_keyboard
     def _get_back_to_selection_keyboard(self):
         """Get back to selection keyboard"""
         from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
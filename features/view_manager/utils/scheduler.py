@@ -11,9 +11,13 @@ import pytz
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.utils.supervisor import supervisor
 
 logger = logging.getLogger(__name__)
 
+# A campaign claimed by a leader that died before starting it is claimed again after this long
+STALE_START = timedelta(minutes=5)
+
 
 class BoostScheduler:
     """Handles scheduling of boost campaigns"""
@@ -21,9 +25,7 @@ class BoostScheduler:
     def __init__(self, db_manager: DatabaseManager, config: Config):
         self.db = db_manager
         self.config = config
-        self._scheduler_task: Optional[asyncio.Task] = None
         self._running = False
-        self._scheduled_campaigns: Dict[int, Dict[str, Any]] = {}
         
     async def initialize(self):
         """Initialize boost scheduler"""
@@ -31,69 +33,55 @@ class BoostScheduler:
             # Wait for database schema to be ready
             await asyncio.sleep(12)
             
-            # Load existing scheduled campaigns
-            await self._load_scheduled_campaigns()
-            
-            # Start scheduler task
-            self._scheduler_task = asyncio.create_task(self._scheduler_loop())
+            # Start scheduler task; the schedule itself lives in the database
             self._running = True
+            supervisor.spawn_periodic('scheduler.boost', self._scheduler_tick, 60)
             
             logger.info("✅ Boost scheduler initialized")
         except Exception as e:
             logger.error(f"Failed to initialize boost scheduler: {e}")
             raise
     
-    async def _load_scheduled_campaigns(self):
-        """Load scheduled campaigns from database"""
-        try:
-            scheduled = await self.db.fetch_all(
-                """
-                SELECT id, start_time, settings
-                FROM view_boost_campaigns
-                WHERE start_time > NOW() AND status = 'scheduled'
-                ORDER BY start_time ASC
-                """
+    async def _claim_due_campaigns(self) -> List[int]:
+        """Move due scheduled campaigns to 'starting' and return their ids
+        
+        Rows locked by another claim are skipped, so a campaign is only ever claimed once.
+        """
+        rows = await self.db.fetch_all(
+            """
+            UPDATE view_boost_campaigns
+            SET status = 'starting', updated_at = NOW()
+            WHERE id IN (
+                SELECT id FROM view_boost_campaigns
+                WHERE (status = 'scheduled' AND start_time <= NOW())
+                   OR (status = 'starting' AND updated_at < NOW() - $1::interval)
+                ORDER BY start_time
+                FOR UPDATE SKIP LOCKED
             )
-            
-            for campaign in scheduled:
-                self._scheduled_campaigns[campaign['id']] = {
-                    'start_time': campaign['start_time'],
-                    'settings': campaign.get('settings', {})
-                }
-            
-            logger.info(f"✅ Loaded {len(scheduled)} scheduled campaigns")
-            
-        except Exception as e:
-            logger.error(f"Error loading scheduled campaigns: {e}")
+            RETURNING id
+            """,
+            STALE_START
+        )
+        return [row['id'] for row in rows]
     
-    async def _scheduler_loop(self):
-        """Main scheduler loop"""
-        while self._running:
+    async def _scheduler_tick(self):
+        """Start every scheduled campaign that is due"""
+        # Only the elected process starts campaigns; due rows are read from the
+        # database each tick, so campaigns scheduled on any process are seen
+        if not self.db.leadership.is_leader:
+            return
+        
+        try:
+            due = await self._claim_due_campaigns()
+        except Exception as e:
+            logger.error(f"Error claiming due campaigns: {e}")
+            return
+        
+        for campaign_id in due:
             try:
-                current_time = datetime.now()
-                
-                # Check for campaigns to start
-                campaigns_to_start = []
-                for campaign_id, campaign_data in self._scheduled_campaigns.items():
-                    if campaign_data['start_time'] <= current_time:
-                        campaigns_to_start.append(campaign_id)
-                
-                # Start campaigns
-                for campaign_id in campaigns_to_start:
-                    try:
-                        await self._start_scheduled_campaign(campaign_id)
-                        del self._scheduled_campaigns[campaign_id]
-                    except Exception as e:
-                        logger.error(f"Error starting scheduled campaign {campaign_id}: {e}")
-                
-                # Sleep for a minute before next check
-                await asyncio.sleep(60)
-                
-            except asyncio.CancelledError:
-                break
+                await self._start_scheduled_campaign(campaign_id)
             except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
-                await asyncio.sleep(30)
+                logger.error(f"Error starting scheduled campaign {campaign_id}: {e}")
     
     async def _start_scheduled_campaign(self, campaign_id: int):
         """Start a scheduled campaign"""
@@ -124,12 +112,6 @@ class BoostScheduler:
                 campaign_id, start_time, settings or {}
             )
             
-            # Add to internal scheduler
-            self._scheduled_campaigns[campaign_id] = {
-                'start_time': start_time,
-                'settings': settings or {}
-            }
-            
             logger.info(f"✅ Scheduled campaign {campaign_id} for {start_time}")
             return True
             
@@ -143,10 +125,6 @@ class BoostScheduler:
             # Update database
             await self.db.update_campaign_progress(campaign_id, None, 'cancelled')
             
-            # Remove from scheduler
-            if campaign_id in self._scheduled_campaigns:
-                del self._scheduled_campaigns[campaign_id]
-            
             logger.info(f"✅ Cancelled scheduled campaign {campaign_id}")
             return True
             
@@ -163,10 +141,6 @@ class BoostScheduler:
                 campaign_id, new_start_time
             )
             
-            # Update scheduler
-            if campaign_id in self._scheduled_campaigns:
-                self._scheduled_campaigns[campaign_id]['start_time'] = new_start_time
-            
             logger.info(f"✅ Rescheduled campaign {campaign_id} to {new_start_time}")
             return True
             
@@ -304,13 +278,17 @@ class BoostScheduler:
     async def get_scheduler_status(self) -> Dict[str, Any]:
         """Get scheduler status and statistics"""
         try:
+            row = await self.db.fetch_one(
+                """
+                SELECT COUNT(*) AS scheduled_campaigns, MIN(start_time) AS next_scheduled
+                FROM view_boost_campaigns
+                WHERE status = 'scheduled'
+                """
+            )
             return {
                 'running': self._running,
-                'scheduled_campaigns': len(self._scheduled_campaigns),
-                'next_scheduled': min(
-                    (data['start_time'] for data in self._scheduled_campaigns.values()),
-                    default=None
-                )
+                'scheduled_campaigns': row['scheduled_campaigns'] if row else 0,
+                'next_scheduled': row['next_scheduled'] if row else None
             }
             
         except Exception as e:
@@ -323,13 +301,7 @@ class BoostScheduler:
             logger.info("⏹️ Shutting down boost scheduler...")
             
             self._running = False
-            
-            if self._scheduler_task:
-                self._scheduler_task.cancel()
-                try:
-                    await self._scheduler_task
-                except asyncio.CancelledError:
-                    pass
+            await supervisor.stop('scheduler.boost')
             
             logger.info("✅ Boost scheduler shut down")
             
@@ -12,6 +12,7 @@ from aiogram.fsm.context import FSMContext
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.bot.rendering import renderer
 
 logger = logging.getLogger(__name__)
 
@@ -171,7 +172,7 @@ class InlineHandler:
                     hasattr(callback.message, 'edit_text') and 
                     not isinstance(callback.message, type(None))):
                     try:
-                        await callback.message.edit_text(welcome_text, reply_markup=keyboard)
+                        await renderer.edit(callback.message, welcome_text, reply_markup=keyboard)
                     except Exception as e:
                         logger.warning(f"Failed to edit message: {e}")
                 await callback.answer("🔄 Menu refreshed!")
@@ -215,7 +216,7 @@ class InlineHandler:
                 hasattr(callback.message, 'edit_text') and 
                 not isinstance(callback.message, type(None))):
                 try:
-                    await callback.message.edit_text(menu_text, reply_markup=menu_keyboard)
+                    await renderer.edit(callback.message, menu_text, reply_markup=menu_keyboard)
                 except Exception as e:
                     logger.warning(f"Failed to edit feature menu: {e}")
             await callback.answer(f"📋 {feature_name} loaded")
@@ -367,7 +368,7 @@ class InlineHandler:
             hasattr(callback.message, 'edit_text') and 
             not isinstance(callback.message, type(None))):
             try:
-                await callback.message.edit_text(help_text, reply_markup=keyboard)
+                await renderer.edit(callback.message, help_text, reply_markup=keyboard)
             except Exception as e:
                 logger.warning(f"Failed to edit help menu: {e}")
         await callback.answer("📚 Help documentation loaded")
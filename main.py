@@ -16,6 +16,9 @@ sys.path.insert(0, str(project_root))
 
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
+from core.utils.lifecycle import LifecycleManager
+from core.utils.request_batcher import request_batcher
+from core.utils.supervisor import supervisor
 from telegram_bot import TelegramBot
 
 # Configure logging
@@ -33,8 +36,8 @@ logger = logging.getLogger(__name__)
 
 async def main():
     """Main application entry point"""
-    db_manager = None
-    bot = None
+    config = None
+    lifecycle = LifecycleManager()
     try:
         logger.info("🚀 Starting Telegram Channel Management Bot...")
         
@@ -42,14 +45,19 @@ async def main():
         config = Config()
         logger.info("✅ Configuration loaded successfully")
         
-        # Initialize database
         db_manager = DatabaseManager()
-        await db_manager.initialize()
-        logger.info("✅ Database initialized successfully")
-        
-        # Initialize and start the bot
         bot = TelegramBot(config, db_manager)
-        await bot.initialize()
+        
+        # Declare components; whatever does not depend on each other starts in parallel
+        # and shutdown runs in reverse, so the database closes only after its users
+        lifecycle.register('supervisor', stop=supervisor.shutdown)
+        lifecycle.register(
+            'database', db_manager.initialize, db_manager.close, depends_on=['supervisor']
+        )
+        lifecycle.register('request_batcher', stop=request_batcher.stop, depends_on=['database'])
+        bot.register_components(lifecycle, database='database')
+        
+        await lifecycle.start_all()
         logger.info("✅ Bot initialized successfully")
         
         # Start the bot
@@ -62,12 +70,12 @@ async def main():
         logger.error(f"💥 Fatal error: {e}", exc_info=True)
         sys.exit(1)
     finally:
-        # Cleanup resources
+        # Stop polling first, then drain updates and stop components in reverse order
         try:
-            if db_manager is not None:
-                await db_manager.close()
-            if bot is not None:
-                await bot.shutdown()
+            logger.info("⏹️ Shutting down bot...")
+            timeout = config.SHUTDOWN_TIMEOUT if config else 30.0
+            await lifecycle.stop_all(timeout)
+            logger.info("✅ Bot shutdown completed")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
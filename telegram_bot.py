@@ -17,6 +17,9 @@ from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKe
 from core.config.config import Config
 from core.database.unified_database import DatabaseManager
 from core.bot.telegram_bot import TelegramBotCore
+from core.bot.middleware import InFlightMiddleware, CallbackAdmissionMiddleware
+from core.utils.lifecycle import LifecycleManager
+from core.bot.rendering import renderer, memoized_keyboard
 from inline_handler import InlineHandler
 
 # Import all feature handlers
@@ -42,47 +45,84 @@ class TelegramBot:
         self.dp: Optional[Dispatcher] = None
         self.handlers: Dict[str, Any] = {}
         self.bot_core: Optional[TelegramBotCore] = None
-        
-    async def initialize(self):
-        """Initialize bot and all handlers"""
-        try:
-            # Initialize bot instance
-            self.bot = Bot(
-                token=self.config.BOT_TOKEN,
-                default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+        self.in_flight = InFlightMiddleware()
+        self.callback_admission = CallbackAdmissionMiddleware(
+            debounce_seconds=config.CALLBACK_DEBOUNCE_SECONDS,
+            per_user_limit=config.HEAVY_CALLBACKS_PER_USER,
+            global_limit=config.HEAVY_CALLBACKS_GLOBAL
+        )
+        renderer.group_interval = config.EDIT_GROUP_INTERVAL
+        # Handled updates are the denominator of the error rate
+        db_manager.errors.set_request_source(lambda: self.in_flight.handled)
+    
+    # Feature handlers started as separate lifecycle components
+    HANDLER_NAMES = (
+        'channel_management', 'view_manager', 'emoji_reactions', 'analytics',
+        'account_management', 'system_health', 'live_management', 'poll_manager'
+    )
+    
+    def register_components(self, lifecycle: LifecycleManager, database: str = 'database'):
+        """Declare the bot's components and their dependencies"""
+        lifecycle.register('telegram_api', self._create_transport, self._close_transport)
+        lifecycle.register(
+            'bot_core', self._start_bot_core, self._stop_bot_core, depends_on=[database]
+        )
+        lifecycle.register(
+            'handler_registry', self._create_handlers, depends_on=['telegram_api', 'bot_core']
+        )
+        for handler_name in self.HANDLER_NAMES:
+            lifecycle.register(
+                f"handler.{handler_name}",
+                lambda name=handler_name: self._initialize_single_handler(name, self.handlers[name]),
+                lambda name=handler_name: self._shutdown_single_handler(name, self.handlers[name]),
+                depends_on=['handler_registry']
             )
-            
-            # Initialize dispatcher with memory storage
-            storage = MemoryStorage()
-            self.dp = Dispatcher(storage=storage)
-            
-            # Initialize bot core for Telethon clients
-            self.bot_core = TelegramBotCore(self.config, self.db_manager)
-            # Mark as shared instance using setattr to avoid type checker issues
-            setattr(self.bot_core, '_shared', True)
-            await self.bot_core.initialize()
-            
-            # Initialize inline handler
-            self.inline_handler = InlineHandler(self.bot, self.db_manager, self.config)
-            
-            # Initialize feature handlers
-            await self._initialize_handlers()
-            
-            # Register routes
-            self._register_routes()
-            
-            logger.info("✅ Bot initialization completed")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize bot: {e}")
-            raise
+        # The dispatcher stops first: routes go away and in-flight updates drain
+        # before any handler, the bot core or the database is shut down
+        lifecycle.register(
+            'dispatcher', self._register_routes, self._drain_updates,
+            depends_on=[f"handler.{name}" for name in self.HANDLER_NAMES]
+        )
+    
+    async def _create_transport(self):
+        """Create the Bot API client and the dispatcher"""
+        self.bot = Bot(
+            token=self.config.BOT_TOKEN,
+            default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+        )
+        
+        # Initialize dispatcher with memory storage
+        storage = MemoryStorage()
+        self.dp = Dispatcher(storage=storage)
+        self.dp.update.outer_middleware(self.in_flight)
+        self.dp.callback_query.outer_middleware(self.callback_admission)
+    
+    async def _close_transport(self):
+        """Close the Bot API session"""
+        if self.bot:
+            await self.bot.session.close()
+    
+    async def _start_bot_core(self):
+        """Start the shared Telethon client manager"""
+        self.bot_core = TelegramBotCore(self.config, self.db_manager)
+        # Mark as shared instance using setattr to avoid type checker issues
+        setattr(self.bot_core, '_shared', True)
+        await self.bot_core.initialize()
     
-    async def _initialize_handlers(self):
-        """Initialize all feature handlers in parallel for faster startup"""
+    async def _stop_bot_core(self):
+        """Disconnect all Telethon clients"""
+        if self.bot_core:
+            await self.bot_core.shutdown()
+    
+    async def _create_handlers(self):
+        """Create all feature handler instances"""
         try:
             # Ensure bot instance is available
             if self.bot is None:
                 raise RuntimeError("Bot instance not initialized")
+            
+            # Initialize inline handler
+            self.inline_handler = InlineHandler(self.bot, self.db_manager, self.config)
                 
             # Create all handler instances first (fast) - pass bot_core to handlers that need it
             self.handlers['channel_management'] = ChannelManagementHandler(
@@ -109,23 +149,15 @@ class TelegramBot:
             self.handlers['poll_manager'] = PollManagerHandler(
                 self.bot, self.db_manager, self.config, self.bot_core
             )
-            
-            # Initialize all handlers in parallel (much faster)
-            initialization_tasks = []
-            for handler_name, handler in self.handlers.items():
-                if hasattr(handler, 'initialize'):
-                    initialization_tasks.append(self._initialize_single_handler(handler_name, handler))
-            
-            # Wait for all initializations to complete simultaneously
-            if initialization_tasks:
-                await asyncio.gather(*initialization_tasks)
                 
         except Exception as e:
-            logger.error(f"Failed to initialize handlers: {e}")
+            logger.error(f"Failed to create handlers: {e}")
             raise
     
     async def _initialize_single_handler(self, handler_name: str, handler):
         """Initialize a single handler with logging"""
+        if not hasattr(handler, 'initialize'):
+            return
         try:
             await handler.initialize()
             logger.info(f"✅ {handler_name} handler initialized")
@@ -133,7 +165,17 @@ class TelegramBot:
             logger.error(f"❌ Failed to initialize {handler_name}: {e}")
             raise
     
-    def _register_routes(self):
+    async def _shutdown_single_handler(self, handler_name: str, handler):
+        """Shut down a single handler, flushing whatever it buffers"""
+        if hasattr(handler, 'shutdown'):
+            await handler.shutdown()
+    
+    async def _drain_updates(self):
+        """Stop polling, then wait for updates that are still being handled"""
+        await self.stop_polling()
+        await self.in_flight.drain(self.config.UPDATE_DRAIN_TIMEOUT)
+    
+    async def _register_routes(self):
         """Register all bot routes and handlers"""
         try:
             # Ensure dispatcher is available
@@ -188,14 +230,8 @@ class TelegramBot:
             is_admin = user_id in self.config.ADMIN_IDS
             
             # Store user info in database
-            await self.db_manager.execute_query(
-                """
-                INSERT INTO users (user_id, username, is_admin, first_seen, last_seen)
-                VALUES ($1, $2, $3, NOW(), NOW())
-                ON CONFLICT (user_id) 
-                DO UPDATE SET username = $2, last_seen = NOW()
-                """,
-                user_id, username, is_admin
+            await self.db_manager.create_user(
+                user_id, username, message.from_user.first_name, message.from_user.last_name, is_admin
             )
             
             # Create welcome message
@@ -303,6 +339,7 @@ This bot is for authorized users only.
 👨‍💻 Developer: @damn_itd_ravan
             """
     
+    @memoized_keyboard
     def _get_main_keyboard(self, is_admin: bool) -> InlineKeyboardMarkup:
         """Generate main menu keyboard based on user type"""
         if not is_admin:
@@ -346,30 +383,17 @@ This bot is for authorized users only.
                 raise RuntimeError("Bot or dispatcher not initialized")
                 
             logger.info("🎯 Starting bot polling...")
-            await self.dp.start_polling(self.bot)
+            # The lifecycle closes the session after in-flight updates have drained
+            await self.dp.start_polling(self.bot, close_bot_session=False)
         except Exception as e:
             logger.error(f"Error during polling: {e}")
             raise
     
-    async def shutdown(self):
-        """Shutdown the bot gracefully"""
-        try:
-            logger.info("⏹️ Shutting down bot...")
-            
-            # Close all handlers
-            for handler_name, handler in self.handlers.items():
-                if hasattr(handler, 'shutdown'):
-                    await handler.shutdown()
-            
-            # Shutdown bot core (Telethon clients)
-            if self.bot_core:
-                await self.bot_core.shutdown()
-            
-            # Close bot session
-            if self.bot:
-                await self.bot.session.close()
-            
-            logger.info("✅ Bot shutdown completed")
-            
-        except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+    async def stop_polling(self):
+        """Stop receiving new updates"""
+        if self.dp is not None:
+            try:
+                await self.dp.stop_polling()
+            except RuntimeError:
+                # Polling was not running
+                pass
@@ -0,0 +1,37 @@
+"""
+Shared Test Fixtures
+Scratch Postgres beside the benchmark database for tests that write to it
+"""
+
+import asyncio
+import os
+from typing import Optional
+from urllib.parse import urlparse
+
+import asyncpg
+import pytest
+
+from benchmarks.harness import bench_dsn
+
+
+async def ensure_database(dsn: str):
+    """Create the scratch database on first use"""
+    url = urlparse(dsn)
+    name = url.path.lstrip('/')
+    conn = await asyncpg.connect(url._replace(path='/postgres').geturl())
+    try:
+        if not await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", name):
+            await conn.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await conn.close()
+
+
+@pytest.fixture(scope='session')
+def scratch_dsn() -> Optional[str]:
+    """Scratch database, so the seeded benchmark tenant is never truncated; None without BENCH_DB_URL"""
+    if not os.getenv('BENCH_DB_URL'):
+        return None
+    url = urlparse(bench_dsn())
+    dsn = url._replace(path=f"{url.path}_contract").geturl()
+    asyncio.run(ensure_database(dsn))
+    return dsn
@@ -0,0 +1,160 @@
+"""
+Cold Archive Tests
+Archiving, crash recovery, history reads and pruning against the scratch Postgres
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.harness import BenchConfig
+from benchmarks.seed import SEEDED_TABLES
+from core.database.archive import ColdArchive, MANIFEST_NAME
+from core.database.unified_database import DatabaseManager
+from core.utils.cache_manager import cache
+
+
+class ArchiveConfig(BenchConfig):
+    """Benchmark configuration with the archive enabled in a temporary directory"""
+    
+    def __init__(self, dsn: str, root: str):
+        super().__init__(dsn)
+        self._root = root
+    
+    @property
+    def ARCHIVE_ENABLED(self) -> bool:
+        return True
+    
+    @property
+    def ARCHIVE_DIR(self) -> str:
+        return self._root
+    
+    @property
+    def ARCHIVE_RETENTION_DAYS(self) -> int:
+        return 365
+    
+    @property
+    def LOG_CLEANUP_DAYS(self) -> int:
+        return 30
+    
+    @property
+    def MAINTENANCE_BATCH_DELAY(self) -> float:
+        return 0.0
+
+
+@pytest.fixture
+async def db(scratch_dsn, tmp_path):
+    """Manager on the emptied scratch Postgres with its archive under a fresh directory"""
+    if scratch_dsn is None:
+        pytest.skip("BENCH_DB_URL does not point at a benchmark Postgres")
+    db = DatabaseManager(ArchiveConfig(scratch_dsn, str(tmp_path)))
+    await db.initialize()
+    try:
+        await db.execute_query(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+        cache.clear()
+        yield db
+    finally:
+        await db.close()
+
+
+async def _log(db, age_days: int, level: str = 'INFO'):
+    """System log row written the given number of days ago, named after its age"""
+    await db.execute_query(
+        "INSERT INTO system_logs (log_level, module, message, timestamp) VALUES ($1, 'archive', $2, $3)",
+        level, f"age {age_days}", datetime.utcnow() - timedelta(days=age_days)
+    )
+
+
+async def _reopen(db) -> ColdArchive:
+    """Archive started from the manifest on disk, as after a restart"""
+    archive = ColdArchive(db.coordinator, db.config)
+    await archive.start()
+    return archive
+
+
+def _manifest(db) -> dict:
+    with open(os.path.join(db.config.ARCHIVE_DIR, MANIFEST_NAME), encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+async def test_history_merges_archived_and_live_rows(db):
+    for age, level in ((45, 'ERROR'), (40, 'INFO'), (2, 'ERROR'), (1, 'INFO')):
+        await _log(db, age, level)
+    
+    assert await db.archive.archive_older_than('system_logs', 30) == 2
+    assert len(await db.fetch_all("SELECT id FROM system_logs")) == 2
+    assert db.archive.get_status()['tables'] == {'system_logs': {'parts': 2, 'rows': 2}}
+    
+    since = datetime.utcnow() - timedelta(days=60)
+    history = await db.fetch_history('system_logs', since)
+    assert [row['message'] for row in history] == ['age 45', 'age 40', 'age 2', 'age 1']
+    errors = await db.fetch_history('system_logs', since, log_level='ERROR')
+    assert [row['message'] for row in errors] == ['age 45', 'age 2']
+    recent = await db.fetch_history('system_logs', datetime.utcnow() - timedelta(days=10))
+    assert [row['message'] for row in recent] == ['age 2', 'age 1']
+    
+    # Partitions are streamed oldest day first
+    parts = [rows async for rows in db.archive.iter_parts('system_logs', since)]
+    assert [[row['message'] for row in rows] for rows in parts] == [['age 45'], ['age 40']]
+
+
+async def test_pending_part_with_live_rows_is_discarded(db):
+    await _log(db, 40)
+    rows = await db.fetch_all("SELECT * FROM system_logs")
+    # A run that wrote its part and then lost the delete to a rollback or crash
+    parts = await db.archive._write_parts('system_logs', rows)
+    path = os.path.join(db.config.ARCHIVE_DIR, parts[0]['path'])
+    assert os.path.exists(path)
+    
+    archive = await _reopen(db)
+    assert archive.stats['parts_discarded'] == 1
+    assert archive.get_status()['tables'] == {}
+    assert not os.path.exists(path)
+    assert _manifest(db)['parts'] == []
+    assert len(await db.fetch_all("SELECT id FROM system_logs")) == 1
+
+
+async def test_pending_part_with_deleted_rows_is_committed(db):
+    await _log(db, 40)
+    rows = await db.fetch_all("SELECT * FROM system_logs")
+    # A run whose delete committed but which stopped before marking the part committed
+    await db.archive._write_parts('system_logs', rows)
+    await db.execute_query("DELETE FROM system_logs")
+    
+    archive = await _reopen(db)
+    assert archive.stats['parts_discarded'] == 0
+    assert archive.get_status()['tables'] == {'system_logs': {'parts': 1, 'rows': 1}}
+    assert [part['status'] for part in _manifest(db)['parts']] == ['committed']
+    archived = await archive.read('system_logs', datetime.utcnow() - timedelta(days=60))
+    assert [row['message'] for row in archived] == ['age 40']
+
+
+async def test_prune_drops_expired_partitions(db):
+    for age in (400, 40):
+        await _log(db, age)
+    await db.archive.archive_older_than('system_logs', 30)
+    # Parts sort by their date directory, so the first one holds the 400-day-old row
+    expired_path = os.path.join(db.config.ARCHIVE_DIR, min(part['path'] for part in db.archive._manifest['parts']))
+    
+    assert await db.archive.prune(365) == 1
+    assert await db.archive.prune(365) == 0
+    assert db.archive.stats['parts_pruned'] == 1
+    assert not os.path.exists(expired_path)
+    assert not os.path.exists(os.path.dirname(expired_path))
+    assert len(_manifest(db)['parts']) == 1
+    history = await db.fetch_history('system_logs', datetime.utcnow() - timedelta(days=500))
+    assert [row['message'] for row in history] == ['age 40']
+
+
+async def test_retention_archives_and_prunes(db):
+    for age in (400, 40, 1):
+        await _log(db, age)
+    
+    results = await db.maintenance.run_retention()
+    assert results['system_logs'] == 2
+    assert db.archive.stats['parts_pruned'] == 1
+    assert db.archive.get_status()['tables'] == {'system_logs': {'parts': 1, 'rows': 1}}
+    history = await db.fetch_history('system_logs', datetime.utcnow() - timedelta(days=500))
+    assert [row['message'] for row in history] == ['age 40', 'age 1']
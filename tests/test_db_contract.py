@@ -0,0 +1,391 @@
+"""
+Database Contract Tests
+Runs the same behavioural checks against the in-memory double and a scratch Postgres to keep them in step
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.harness import open_database
+from benchmarks.memory_db import InMemoryDatabaseManager
+from benchmarks.seed import SEEDED_TABLES
+from core.database.universal_access import UniversalDatabaseAccess
+from core.utils.cache_manager import cache
+
+USER = 10_001
+OTHER_USER = 10_002
+# Tables the checks write to; truncating users cascades to the rest
+CONTRACT_TABLES = SEEDED_TABLES + ('emoji_reactions', 'boost_configs')
+
+
+@pytest.fixture(params=['memory', 'postgres'])
+async def db(request, scratch_dsn):
+    """Empty database per test: a fresh double, or the scratch Postgres with every bot table truncated"""
+    if request.param == 'memory':
+        db = InMemoryDatabaseManager()
+        await db.initialize()
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+    
+    if scratch_dsn is None:
+        pytest.skip("BENCH_DB_URL does not point at a benchmark Postgres")
+    async with open_database(scratch_dsn) as db:
+        await db.execute_query(f"TRUNCATE {', '.join(CONTRACT_TABLES)} RESTART IDENTITY CASCADE")
+        # Rows cached by an earlier test would outlive the truncate
+        cache.clear()
+        yield db
+
+
+async def _owner(db, user_id: int = USER):
+    await db.create_user(user_id, f"contract_{user_id}", "Contract", None)
+
+
+async def _channel(db, channel_id: int = -100_500, user_id: int = USER) -> int:
+    await _owner(db, user_id)
+    return await db.add_channel(user_id, channel_id, f"channel{abs(channel_id)}", f"Channel {abs(channel_id)}")
+
+
+async def _account(db, phone: str = '+15550001', user_id: int = USER) -> int:
+    await _owner(db, user_id)
+    return await db.add_telegram_account(user_id, phone, 12345, 'hash', f"acc{phone[-4:]}")
+
+
+async def _reaction(db, channel: int, emoji: str, count: int, auto_react: bool = False, message_id: int = 1):
+    """Reactions are only written by the Telethon worker, so the rows are inserted directly"""
+    if isinstance(db, InMemoryDatabaseManager):
+        db.tables['emoji_reactions'].insert(
+            user_id=USER, channel_id=channel, message_id=message_id, emoji=emoji,
+            reaction_count=count, auto_react_enabled=auto_react
+        )
+    else:
+        await db.execute_query(
+            """
+            INSERT INTO emoji_reactions (user_id, channel_id, message_id, emoji, reaction_count, auto_react_enabled)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            """,
+            USER, channel, message_id, emoji, count, auto_react
+        )
+
+
+async def test_users(db):
+    await db.create_user(USER, 'first', 'First', 'Last', is_admin=True)
+    user = await db.get_user(USER)
+    assert user['username'] == 'first' and user['is_admin'] is True
+    assert user['is_active'] is True and user['settings'] == {}
+    assert set(user) == {
+        'user_id', 'username', 'first_name', 'last_name', 'is_admin', 'is_active',
+        'first_seen', 'last_seen', 'settings', 'created_at', 'updated_at'
+    }
+    
+    # A repeat create refreshes the profile but never demotes or promotes
+    await db.create_user(USER, 'renamed', 'First', 'Last', is_admin=False)
+    user = await db.get_user(USER)
+    assert user['username'] == 'renamed' and user['is_admin'] is True
+    
+    await db.update_user_settings(USER, {'language': 'en', 'alerts': True})
+    assert (await db.get_user(USER))['settings'] == {'language': 'en', 'alerts': True}
+    assert await db.get_user(OTHER_USER) is None
+    
+    await db.create_user(OTHER_USER, 'second')
+    users = await db.get_all_users()
+    assert {row['user_id'] for row in users} == {USER, OTHER_USER}
+    assert 'settings' not in users[0]
+    
+    summary = await db.get_user_status_summary()
+    assert summary['total_users'] == 2 and summary['admin_users'] == 1
+    assert summary['new_users_24h'] == 2 and summary['seen_users_24h'] == 2
+
+
+async def test_accounts(db):
+    first = await _account(db, '+15550001')
+    second = await _account(db, '+15550002')
+    assert isinstance(first, int) and second > first
+    assert await db.add_telegram_account(USER, '+15550001', 1, 'dup') is None, "duplicate phone accepted"
+    
+    accounts = await db.get_user_accounts(USER)
+    assert [row['id'] for row in accounts] == [second, first]
+    assert 'session_data' not in accounts[0] and 'rate_limit_data' not in accounts[0]
+    
+    await db.update_account_session(first, 'session-string')
+    account = await db.get_account_by_id(first)
+    assert account['is_verified'] is True and account['last_login'] is not None
+    assert 'session_data' not in account
+    
+    await db.deactivate_account(second)
+    assert [row['id'] for row in await db.get_user_accounts(USER)] == [first]
+    assert len(await db.get_user_accounts(USER, active_only=False)) == 2
+    assert await db.get_account_by_id(999_999) is None
+    
+    summary = await db.get_account_status_summary()
+    assert summary['total_accounts'] == 2 and summary['active_accounts'] == 1
+    assert summary['verified_accounts'] == 1 and summary['inactive_accounts'] == 1
+    assert summary['healthy_count'] == 1 and summary['critical_count'] == 1
+    assert summary['avg_health'] == 50.0 and isinstance(summary['avg_health'], float)
+    assert summary['deactivated_24h'] == 1 and summary['activated_24h'] == 1
+
+
+async def test_verified_accounts(db):
+    accounts = [await _account(db, f"+1555000{index}") for index in range(1, 5)]
+    for account in accounts[:3]:
+        await db.update_account_session(account, 'session-string')
+    await db.deactivate_account(accounts[1])
+    
+    # Keyset pages skip unverified and inactive accounts and never return session blobs
+    page = await db.get_verified_accounts(0, 1)
+    assert [row['id'] for row in page] == [accounts[0]]
+    assert set(page[0]) == {'id', 'phone_number', 'api_id', 'api_hash'}
+    assert [row['id'] for row in await db.get_verified_accounts(page[-1]['id'], 10)] == [accounts[2]]
+    assert await db.get_verified_accounts(accounts[2], 10) == []
+
+
+async def test_claim_orphaned_accounts(db):
+    owned = await _account(db, '+15550001')
+    orphan = await db.add_telegram_account(None, '+15550002', 12345, 'hash')
+    
+    assert await db.claim_orphaned_accounts(USER) == 1
+    assert (await db.get_account_by_id(orphan))['user_id'] == USER
+    assert (await db.get_account_by_id(owned))['user_id'] == USER
+    assert await db.claim_orphaned_accounts(USER) == 0
+
+
+async def test_channels(db):
+    channel = await _channel(db, -100_500)
+    assert isinstance(channel, int)
+    # Re-adding a known Telegram channel updates the existing row
+    again = await db.add_channel(USER, -100_500, 'renamed', 'Renamed')
+    assert again == channel
+    
+    row = await db.get_channel_by_id(channel)
+    assert row['title'] == 'Renamed' and row['member_count'] == 0 and row['is_active'] is True
+    assert (await db.get_channel_by_channel_id(-100_500))['id'] == channel
+    assert await db.get_channel_by_channel_id(-1) is None
+    assert await db.get_channel_by_id(999_999) is None
+    
+    await db.update_channel_info(channel, member_count=1500)
+    row = await db.get_channel_by_id(channel)
+    assert row['member_count'] == 1500 and row['title'] == 'Renamed'
+    
+    newer = await _channel(db, -100_501)
+    assert [row['id'] for row in await db.get_user_channels(USER)] == [newer, channel]
+    assert await db.get_user_channels(OTHER_USER) == []
+    
+    # Rows handed out are copies; editing one must not change what the next caller sees
+    row['title'] = 'mutated'
+    assert (await db.get_channel_by_id(channel))['title'] == 'Renamed'
+
+
+async def test_monitored_channels(db):
+    channel = await _channel(db, -100_500)
+    other = await _channel(db, -100_501, OTHER_USER)
+    await db.update_user_settings(USER, {'alerts': True})
+    
+    monitored = {row['id']: row for row in await db.get_monitored_channels()}
+    assert sorted(monitored) == sorted([channel, other])
+    # The owner's settings stand in for the channel's own
+    assert monitored[channel]['settings'] == {'alerts': True}
+    assert monitored[other]['settings'] == {}
+    assert monitored[channel]['channel_id'] == -100_500
+
+
+async def test_campaigns(db):
+    channel = await _channel(db)
+    first = await db.create_view_boost_campaign(USER, channel, 10, 500)
+    second = await db.create_view_boost_campaign(USER, channel, 11, 300, campaign_type='auto')
+    
+    campaigns = await db.get_user_campaigns(USER)
+    assert [row['id'] for row in campaigns] == [second, first]
+    assert campaigns[0]['channel_title'] == 'Channel 100500'
+    assert campaigns[0]['channel_username'] == 'channel100500' and campaigns[0]['status'] == 'pending'
+    assert [row['id'] for row in await db.get_user_campaigns(USER, campaign_type='manual')] == [first]
+    assert [row['id'] for row in await db.get_user_campaigns(USER, limit=1)] == [second]
+    
+    await db.update_campaign_progress(first, 500, status='completed')
+    await db.update_campaign_progress(second, 120, status='active')
+    assert [row['id'] for row in await db.get_user_campaigns(USER, status='completed')] == [first]
+    assert await db.get_user_campaigns(USER, status='completed', campaign_type='auto') == []
+    
+    summary = await db.get_campaign_summary(channel)
+    assert summary['total_campaigns'] == 2 and summary['active_campaigns'] == 1
+    assert summary['total_views'] == 620 and summary['total_target_views'] == 800
+    assert summary['best_campaign_views'] == 500 and summary['last_campaign_at'] is not None
+    
+    status = await db.get_campaign_status_summary()
+    assert status['total_campaigns'] == 2 and status['completed_campaigns'] == 1
+    
+    empty = await db.get_campaign_summary(999_999)
+    assert empty['total_campaigns'] == 0 and empty['total_views'] == 0 and empty['last_campaign_at'] is None
+
+
+async def test_campaign_totals(db):
+    channel = await _channel(db)
+    first = await db.create_view_boost_campaign(USER, channel, 10, 500)
+    second = await db.create_view_boost_campaign(USER, channel, 11, 300)
+    third = await db.create_view_boost_campaign(USER, channel, 12, 200)
+    await db.update_campaign_progress(first, 500, status='completed')
+    await db.update_campaign_progress(second, 250, status='completed')
+    await db.update_campaign_progress(third, 40, status='active')
+    
+    totals = await db.get_campaign_totals(USER)
+    assert [row['status'] for row in totals] == ['active', 'completed']
+    assert totals[1] == {
+        'status': 'completed', 'count': 2, 'target_views': 800, 'current_views': 750,
+        'views_1d': 750, 'views_7d': 750, 'views_30d': 750
+    }
+    assert totals[0]['current_views'] == 40 and totals[0]['count'] == 1
+    assert await db.get_campaign_totals(OTHER_USER) == []
+
+
+async def test_growth_and_comparison(db):
+    channel = await _channel(db, -100_500)
+    quiet = await _channel(db, -100_501)
+    account = await _account(db)
+    campaign = await db.create_view_boost_campaign(USER, channel, 10, 500)
+    await db.log_view_boost(campaign, account, 40, True)
+    await db.log_view_boost(campaign, account, 25, False, 'FloodWaitError')
+    await db.record_member_count(channel, 1000)
+    await asyncio.sleep(0.01)
+    await db.record_member_count(channel, 1030)
+    await db.update_channel_info(quiet, member_count=5000)
+    
+    series = await db.get_growth_series(USER, days=7)
+    assert len(series) == 7 and series[0]['day'] < series[-1]['day']
+    assert series[-1]['member_growth'] == 30 and series[-1]['views'] == 40
+    assert all(row['member_growth'] == 0 and row['views'] == 0 for row in series[:-1])
+    only_quiet = await db.get_growth_series(USER, quiet, days=3)
+    assert [(row['member_growth'], row['views']) for row in only_quiet] == [(0, 0)] * 3
+    
+    comparison = await db.get_channel_comparison(USER)
+    assert comparison == [
+        {'title': 'Channel 100500', 'members': 0, 'member_growth': 30, 'views': 40},
+        {'title': 'Channel 100501', 'members': 5000, 'member_growth': 0, 'views': 0},
+    ]
+    assert len(await db.get_channel_comparison(USER, limit=1)) == 1
+
+
+async def test_reactions(db):
+    channel = await _channel(db, -100_500)
+    other = await _channel(db, -100_501)
+    await _reaction(db, channel, 'fire', 7, auto_react=True)
+    await _reaction(db, channel, 'like', 2, auto_react=True, message_id=2)
+    await _reaction(db, other, 'fire', 4)
+    
+    stats = await db.get_reaction_stats(USER)
+    assert stats['total_reactions'] == 13 and stats['reactions_today'] == 13
+    assert stats['weekly_reactions'] == 13 and stats['monthly_reactions'] == 13
+    assert stats['active_channels'] == 1
+    assert stats['top_emojis'] == [{'emoji': 'fire', 'total': 11}, {'emoji': 'like', 'total': 2}]
+    assert stats['top_channels'] == [
+        {'title': 'Channel 100500', 'reactions': 9}, {'title': 'Channel 100501', 'reactions': 4}
+    ]
+    assert len((await db.get_reaction_stats(USER, top=1))['top_emojis']) == 1
+    
+    totals = await db.get_reaction_stats(USER, top=0)
+    assert totals['total_reactions'] == 13 and totals['top_emojis'] == [] and totals['top_channels'] == []
+    
+    assert await db.get_auto_react_channels() == [
+        {'id': channel, 'channel_id': channel, 'user_id': USER, 'title': 'Channel 100500'}
+    ]
+    empty = await db.get_reaction_stats(OTHER_USER)
+    assert empty['total_reactions'] == 0 and empty['active_channels'] == 0
+
+
+async def test_boost_series(db):
+    channel = await _channel(db)
+    account = await _account(db)
+    campaign = await db.create_view_boost_campaign(USER, channel, 10, 500)
+    await db.log_view_boost(campaign, account, 40, True)
+    await db.log_view_boost(campaign, account, 25, True)
+    await db.log_view_boost(campaign, account, 0, False, 'FloodWaitError')
+    
+    series = await db.get_metric_series('channel', channel, 'views_boosted', bucket='day', buckets=7)
+    assert len(series['buckets']) == 7
+    assert series['buckets'][-1]['value'] == 65 and series['buckets'][-1]['samples'] == 2
+    assert series['buckets'][0]['value'] == 0
+    assert series['total'] == 65 and series['peak'] == 65 and series['samples'] == 2
+    assert series['peak_bucket'] == series['buckets'][-1]['bucket']
+    assert series['average'] == pytest.approx(65 / 7)
+    
+    boosts = await db.get_metric_series('account', account, 'boosts', bucket='hour', buckets=24)
+    assert boosts['total'] == 3 and len(boosts['buckets']) == 24
+    failed = await db.get_metric_series('account', account, 'failed_boosts', bucket='week', buckets=4)
+    assert failed['total'] == 1
+    campaigns = await db.get_metric_series('channel', channel, 'campaigns', bucket='month', buckets=12)
+    assert campaigns['total'] == 1 and len(campaigns['buckets']) == 12
+    
+    # Extremes leave empty buckets empty instead of zero
+    best = await db.get_metric_series('channel', channel, 'views_boosted', buckets=3, aggregate='max')
+    assert best['buckets'][0]['value'] is None and best['peak'] == 40
+    
+    with pytest.raises(ValueError):
+        await db.get_metric_series('channel', channel, 'views_boosted', bucket='minute')
+
+
+async def test_analytics(db):
+    channel = await _channel(db)
+    await db.store_analytics_data('channel', channel, 'views', 10.5)
+    await db.store_analytics_data('channel', channel, 'views', 4)
+    await db.store_analytics_data('channel', channel, 'reactions', 3, {'emoji': 'fire'})
+    await db.store_analytics_data('account', channel, 'views', 99)
+    
+    points = await db.get_analytics_data('channel', channel)
+    assert len(points) == 3 and points[0]['metric_name'] == 'reactions'
+    assert points[0]['metadata'] == {'emoji': 'fire'}
+    assert len(await db.get_analytics_data('channel', channel, 'views')) == 2
+    assert len(await db.get_analytics_data('channel', limit=1)) == 1
+    
+    views = await db.get_metric_series('channel', channel, 'views', buckets=2)
+    assert views['total'] == 14.5 and views['samples'] == 2
+    average = await db.get_metric_series('channel', channel, 'views', buckets=2, aggregate='avg')
+    assert average['buckets'][-1]['value'] == 7.25 and average['average'] == 7.25
+
+
+async def test_member_counts(db):
+    channel = await _channel(db)
+    assert await db.record_member_count(channel, 1000) == 0
+    assert await db.record_member_count(channel, 1000) is None
+    # Points are keyed by time; keep consecutive samples apart
+    await asyncio.sleep(0.01)
+    assert await db.record_member_count(channel, 1040) == 40
+    await asyncio.sleep(0.01)
+    assert await db.record_member_count(channel, 1025) == -15
+    
+    growth = await db.get_metric_series('channel', channel, 'member_growth', buckets=7)
+    assert growth['buckets'][-1]['value'] == 25 and growth['total'] == 25
+
+
+async def test_system_logs(db):
+    await db.log_system_event('INFO', 'contract', 'first')
+    await db.log_system_event('ERROR', 'contract', 'second', {'code': 7})
+    await db.log_system_event('ERROR', 'other', 'third')
+    
+    logs = await db.get_system_logs()
+    assert [row['message'] for row in logs] == ['third', 'second', 'first']
+    errors = await db.get_system_logs(log_level='ERROR', module='contract')
+    assert len(errors) == 1 and errors[0]['metadata'] == {'code': 7}
+    assert len(await db.get_system_logs(limit=2)) == 2
+    assert await db.cleanup_old_logs(days=1) == 0
+    assert len(await db.get_system_logs()) == 3
+
+
+async def test_recent_activity(db):
+    channel = await _channel(db)
+    await db.create_view_boost_campaign(USER, channel, 10, 500)
+    await db.log_system_event('ERROR', 'contract', 'failed')
+    await db.log_system_event('WARNING', 'contract', 'slow')
+    
+    assert await db.get_recent_activity(hours=1) == {'campaigns': 1, 'errors': 1}
+
+
+async def test_universal_access(db):
+    access = UniversalDatabaseAccess(db)
+    user = await access.ensure_user_exists(USER, 'universal', 'Uni')
+    assert user['username'] == 'universal'
+    
+    added = await access.add_channel_safe(USER, -100_700, 'uni', 'Universal')
+    assert added['success'] is True
+    duplicate = await access.add_channel_safe(USER, -100_700, 'uni', 'Universal')
+    assert duplicate['success'] is False and duplicate['channel_id'] == added['channel_id']
@@ -0,0 +1,36 @@
+"""
+Query Plan Regression Tests
+Runs the plan suite against the seeded benchmark database named by BENCH_DB_URL
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from benchmarks.harness import bench_dsn
+from benchmarks.query_plans import CASES, BASELINE_PATH, run_suite
+from benchmarks.seed import Volumes
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv('BENCH_DB_URL'), reason="BENCH_DB_URL does not point at a benchmark Postgres"
+)
+
+
+@pytest.fixture(scope='module')
+def results():
+    """Plans of every case, checked against the committed baseline; seeds on first use"""
+    return asyncio.run(run_suite(bench_dsn(), Volumes(), baseline_path=BASELINE_PATH))
+
+
+def test_baseline_covers_every_case():
+    with open(BASELINE_PATH, encoding='utf-8') as handle:
+        recorded = json.load(handle)['cases']
+    assert sorted(recorded) == sorted(case.name for case in CASES)
+
+
+@pytest.mark.parametrize('case', [case.name for case in CASES])
+def test_query_plan(results, case):
+    result = results[case]
+    assert result['passed'], "\n".join(result['failures'])
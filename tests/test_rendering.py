@@ -0,0 +1,114 @@
+"""
+Message Renderer Tests
+Unchanged, superseded, not-modified and rate-limited edits through MessageRenderer
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.methods import EditMessageText
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from core.bot.rendering import MessageRenderer
+
+PRIVATE_CHAT = 1001
+GROUP_CHAT = -1001
+
+
+class RecordingMessage:
+    """Stands in for a bot message: records edits and raises queued Telegram errors"""
+    
+    def __init__(self, chat_id: int, message_id: int = 1):
+        self.chat = SimpleNamespace(id=chat_id)
+        self.message_id = message_id
+        self.edits = []
+        self.errors = []
+    
+    async def edit_text(self, text: str, reply_markup=None, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.edits.append((text, time.monotonic()))
+
+
+def _method(message: RecordingMessage) -> EditMessageText:
+    return EditMessageText(text='', chat_id=message.chat.id, message_id=message.message_id)
+
+
+def _markup(data: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="Button", callback_data=data)]])
+
+
+async def test_unchanged_edit_is_skipped():
+    renderer = MessageRenderer()
+    message = RecordingMessage(PRIVATE_CHAT)
+    
+    assert await renderer.edit(message, "text", reply_markup=_markup('a'))
+    assert not await renderer.edit(message, "text", reply_markup=_markup('a'))
+    assert renderer.stats['skipped_unchanged'] == 1
+    # Any part of the content changing is a real edit
+    assert await renderer.edit(message, "text", reply_markup=_markup('b'))
+    assert await renderer.edit(message, "text", reply_markup=_markup('b'), parse_mode='HTML')
+    assert len(message.edits) == 3
+    
+    # A forgotten message, e.g. one that was deleted and replaced, is edited again
+    renderer.forget(PRIVATE_CHAT, message.message_id)
+    assert await renderer.edit(message, "text", reply_markup=_markup('b'), parse_mode='HTML')
+    assert len(message.edits) == 4
+
+
+async def test_edit_superseded_while_waiting_for_the_chat():
+    renderer = MessageRenderer(group_interval=0.05)
+    first = RecordingMessage(GROUP_CHAT, 1)
+    second = RecordingMessage(GROUP_CHAT, 2)
+    
+    assert await renderer.edit(first, "first")
+    # Both renders of the second message queue behind the group interval; only the newest is sent
+    results = await asyncio.gather(renderer.edit(second, "stale"), renderer.edit(second, "fresh"))
+    assert results == [False, True]
+    assert [text for text, _ in second.edits] == ["fresh"]
+    assert renderer.stats['superseded'] == 1
+    assert renderer.stats['throttled'] == 2
+    # Edits in the group stay spaced by the interval
+    assert second.edits[0][1] - first.edits[0][1] >= 0.09
+
+
+async def test_not_modified_is_remembered():
+    renderer = MessageRenderer()
+    message = RecordingMessage(PRIVATE_CHAT)
+    message.errors.append(TelegramBadRequest(_method(message), "Bad Request: message is not modified"))
+    
+    assert not await renderer.edit(message, "same")
+    assert renderer.stats['not_modified'] == 1
+    # The message already shows this content, so the next identical render is skipped locally
+    assert not await renderer.edit(message, "same")
+    assert renderer.stats['skipped_unchanged'] == 1
+    assert message.edits == []
+    
+    message.errors.append(TelegramBadRequest(_method(message), "Bad Request: message to edit not found"))
+    with pytest.raises(TelegramBadRequest):
+        await renderer.edit(message, "other")
+
+
+async def test_retry_after_paces_a_private_chat():
+    renderer = MessageRenderer()
+    first = RecordingMessage(PRIVATE_CHAT, 1)
+    second = RecordingMessage(PRIVATE_CHAT, 2)
+    first.errors.append(TelegramRetryAfter(_method(first), "Too Many Requests", 1))
+    
+    started = time.monotonic()
+    limited = asyncio.create_task(renderer.edit(first, "first"))
+    await asyncio.sleep(0.05)
+    # The rate limit window applies to every message in the chat, not just the one that hit it
+    assert await renderer.edit(second, "second")
+    assert await limited
+    assert second.edits[0][1] - started >= 0.95
+    assert first.edits[0][1] - started >= 0.95
+    assert renderer.stats['throttled'] == 1
+    
+    # Once the window has passed the private chat edits without waiting again
+    assert PRIVATE_CHAT not in renderer._next_edit
+    assert await renderer.edit(second, "third")
+    assert renderer.stats['throttled'] == 1